@@ -0,0 +1,52 @@
+package oracle.weblogic.deploy.testing.defaults;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.List;
+
+/**
+ * The WLST data type and default value(s) of a model attribute.
+ */
+public final class DefaultValue {
+    private final String dataType;
+    private final Class<?> type;
+    private final List<String> defaultValues;
+
+    DefaultValue(String dataType, Class<?> type, List<String> defaultValues) {
+        this.dataType = dataType;
+        this.type = type;
+        this.defaultValues = Collections.unmodifiableList(new ArrayList<String>(defaultValues));
+    }
+
+    /**
+     * Get the WLST data type name, as it appears in the defaults file (e.g. int, boolean or str).
+     *
+     * @return the data type name
+     */
+    public String getDataType() {
+        return dataType;
+    }
+
+    /**
+     * Get the Java class that corresponds to the data type.
+     *
+     * @return the Java class
+     */
+    public Class<?> getType() {
+        return type;
+    }
+
+    /**
+     * Get the default values, as strings.
+     *
+     * @return the unmodifiable list of default values
+     */
+    public List<String> getDefaultValues() {
+        return defaultValues;
+    }
+
+    @Override
+    public String toString() {
+        return dataType + defaultValues;
+    }
+}
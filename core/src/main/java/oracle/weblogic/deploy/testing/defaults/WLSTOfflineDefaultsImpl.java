@@ -1,9 +1,8 @@
 package oracle.weblogic.deploy.testing.defaults;
 
-import java.util.ArrayList;
-import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
 
 import oracle.weblogic.deploy.testing.logging.WLSDeployTestingLogFactory;
 import oracle.weblogic.deploy.testing.logging.PlatformLogger;
@@ -15,11 +14,16 @@ public class WLSTOfflineDefaultsImpl implements WLSTOfflineDefaults {
         WLSDeployTestingLogFactory.getLogger("wlsdeploy.system_test");
 
     private String folderName;
-    private Map<String, DefaultValueStruct> attributesDefaultValues;
+    private WLSTOfflineDefaultsIndex index;
+    private WLSTOfflineDefaultsIndex.Cursor cursor;
+    private Map<String, DefaultValue> attributesDefaultValues;
 
-    /* package */ WLSTOfflineDefaultsImpl(String folderName) {
+    /* package */ WLSTOfflineDefaultsImpl(String folderName, WLSTOfflineDefaultsIndex index,
+                                          WLSTOfflineDefaultsIndex.Cursor cursor) {
         this.folderName = folderName;
-        this.attributesDefaultValues = new HashMap<String, DefaultValueStruct>();
+        this.index = index;
+        this.cursor = cursor;
+        this.attributesDefaultValues = new ConcurrentHashMap<String, DefaultValue>();
     }
 
     public String getFolderName() {
@@ -64,18 +68,17 @@ public class WLSTOfflineDefaultsImpl implements WLSTOfflineDefaults {
         final String METHOD = "isDefaultValue";
 
         logger.entering(CLASS, METHOD, attributeName, value);
-        logDefaults();
 
         boolean result;
-        DefaultValueStruct defaults = attributesDefaultValues.get(attributeName);
+        DefaultValue defaults = getDefaultValue(attributeName);
         if (defaults != null) {
             logger.finest("default = {0}", defaults);
             String valueString = null;
             if (value != null) {
                 valueString = value.toString();
             }
-            Class<?> type = defaults.type;
-            List<String> defaultValues = defaults.values;
+            Class<?> type = defaults.getType();
+            List<String> defaultValues = defaults.getDefaultValues();
 
             result = isValidDefaultValue(type, valueString, defaultValues);
         } else if (value == null) {
@@ -93,10 +96,23 @@ public class WLSTOfflineDefaultsImpl implements WLSTOfflineDefaults {
     }
 
     public void setAttributeDefaults(String attributeName, Class<?> type, List<String> defaultValues) {
-        DefaultValueStruct value = new DefaultValueStruct();
-        value.type = type;
-        value.values = new ArrayList<String>(defaultValues);
-        attributesDefaultValues.put(attributeName, value);
+        attributesDefaultValues.put(attributeName,
+            new DefaultValue(type.getSimpleName().toLowerCase(), type, defaultValues));
+    }
+
+    /**
+     * Get the default value of an attribute in the folder. Defaults set with setAttributeDefaults()
+     * take precedence over the ones in the defaults index.
+     *
+     * @param attributeName the attribute name
+     * @return the default value, or null if there isn't one
+     */
+    public DefaultValue getDefaultValue(String attributeName) {
+        DefaultValue result = attributesDefaultValues.get(attributeName);
+        if (result == null) {
+            result = index.lookup(cursor, attributeName);
+        }
+        return result;
     }
 
     private boolean isValidDefaultValue(Class<?> type, String actualValue, List<String> values) {
@@ -145,15 +161,6 @@ public class WLSTOfflineDefaultsImpl implements WLSTOfflineDefaults {
         return result;
     }
 
-    private void logDefaults() {
-        logger.finest("{0} default attribute map has {1} entries", folderName, attributesDefaultValues.size());
-        for (Map.Entry<String, DefaultValueStruct> attributeDefault: attributesDefaultValues.entrySet()) {
-            String key = attributeDefault.getKey();
-            DefaultValueStruct value = attributeDefault.getValue();
-            logger.finest("{0} is a {1} and set to [{2}]", key, value.type.getName(), value.values);
-        }
-    }
-
     private boolean isPossibleBooleanValue(Object value) {
         boolean result = false;
         if (value != null) {
@@ -175,9 +182,4 @@ public class WLSTOfflineDefaultsImpl implements WLSTOfflineDefaults {
         }
         return result;
     }
-
-    class DefaultValueStruct {
-        Class type;
-        List<String> values = new ArrayList<String>();
-    }
 }
@@ -0,0 +1,521 @@
+package oracle.weblogic.deploy.testing.defaults;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.Reader;
+import java.text.MessageFormat;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Properties;
+import java.util.regex.Pattern;
+
+import oracle.weblogic.deploy.testing.logging.WLSDeployTestingLogFactory;
+import oracle.weblogic.deploy.testing.logging.PlatformLogger;
+import oracle.weblogic.deploy.util.StringUtils;
+
+/**
+ * The precompiled index of the WLST offline default values in the defaults files under
+ * resources/defaults. It is built once per JVM, and shared by the Java WLSTOfflineDefaults
+ * objects and the Python model comparer.
+ *
+ * The item paths of each model section are stored in a trie of folder name segments. A
+ * wildcard segment (e.g. ".+" or "[^/]+") matches any one folder name, without a regular
+ * expression being evaluated. Callers walking a model carry a Cursor down the folders:
+ *
+ *     Cursor cursor = index.getRootCursor("topology");
+ *     cursor = index.descend(cursor, "Server");
+ *     cursor = index.descend(cursor, "AdminServer");
+ *     DefaultValue defaultValue = index.lookup(cursor, "AcceptBacklog");
+ *
+ * The keys in the properties format defaults files leave out instance names and wrapper
+ * folders (e.g. JDBCSystemResource.JDBCDriverParams.UsePasswordIndirection), so for those
+ * sections, any number of folders can also be skipped between the folder names in a key.
+ */
+public final class WLSTOfflineDefaultsIndex {
+    private static final String CLASS = WLSTOfflineDefaultsIndex.class.getName();
+    private static PlatformLogger logger =
+        WLSDeployTestingLogFactory.getLogger("wlsdeploy.system_test");
+
+    private static final String PACKAGE_PATH = "defaults";
+    private static final String TOPOLOGY_DEFAULTS = PACKAGE_PATH + "/topology-defaults.json";
+    private static final String RESOURCES_DEFAULTS = PACKAGE_PATH + "/resources-defaults.json";
+    private static final String APPDEPLOYMENTS_DEFAULTS = PACKAGE_PATH + "/appDeployments-default.json";
+    private static final String DATA_TYPE = "data_type";
+    private static final String DEFAULT_VALUE = "default_value";
+    private static final String DEFAULT_DATA_TYPE = "str";
+    private static final List<String> WILDCARD_SEGMENTS = Arrays.asList(".+", "[^/]+", "(.+)", "([^/]+)", "*");
+    private static final Pattern TYPE_PATTERN = Pattern.compile("^\\{[a-zA-Z]+\\}[.].+");
+    private static final Cursor EMPTY_CURSOR = new Cursor(new Node[0]);
+
+    private static WLSTOfflineDefaultsIndex instance = null;
+
+    private final Map<String, Node> sectionRoots = new HashMap<String, Node>();
+    private int entriesCount = 0;
+
+    private WLSTOfflineDefaultsIndex() {
+        // hide the default constructor
+    }
+
+    /**
+     * Get the index, building it from the defaults files the first time.
+     *
+     * @return the index
+     * @throws IllegalStateException if a defaults file cannot be loaded
+     */
+    public static synchronized WLSTOfflineDefaultsIndex getInstance() {
+        if (instance == null) {
+            WLSTOfflineDefaultsIndex index = new WLSTOfflineDefaultsIndex();
+            index.addJsonDefaults("topology", TOPOLOGY_DEFAULTS);
+            index.addPropertiesDefaults("resources", RESOURCES_DEFAULTS);
+            index.addJsonDefaults("appDeployments", APPDEPLOYMENTS_DEFAULTS);
+            logger.fine("Built the WLST offline defaults index with {0} entries", index.entriesCount);
+            instance = index;
+        }
+        return instance;
+    }
+
+    /**
+     * Get the number of attribute defaults in the index.
+     *
+     * @return the number of entries
+     */
+    public int getEntriesCount() {
+        return entriesCount;
+    }
+
+    /**
+     * Get the cursor for the top of a model section.
+     *
+     * @param sectionName the model section name (e.g. topology)
+     * @return the cursor, which is empty if the section doesn't have a defaults file
+     */
+    public Cursor getRootCursor(String sectionName) {
+        Node root = sectionRoots.get(sectionName);
+        if (root == null) {
+            return EMPTY_CURSOR;
+        }
+        return new Cursor(new Node[] { root });
+    }
+
+    /**
+     * Get the cursor for a child folder of the folder that cursor is for.
+     *
+     * @param cursor     the cursor of the parent folder
+     * @param folderName the name of the child folder
+     * @return the cursor of the child folder
+     */
+    public Cursor descend(Cursor cursor, String folderName) {
+        if (cursor.isEmpty()) {
+            return cursor;
+        }
+
+        List<Node> result = new ArrayList<Node>(cursor.nodes.length + 2);
+        for (Node node : cursor.nodes) {
+            if (node.skippable) {
+                addNode(result, node);
+            }
+            addNode(result, node.children.get(folderName));
+            addNode(result, node.wildcard);
+        }
+        if (result.isEmpty()) {
+            return EMPTY_CURSOR;
+        }
+        return new Cursor(result.toArray(new Node[result.size()]));
+    }
+
+    /**
+     * Get the cursor for a folder, starting from the top of a model section.
+     *
+     * @param sectionName the model section name
+     * @param folderNames the folder names, from the top of the section down
+     * @return the cursor of the folder
+     */
+    public Cursor getCursor(String sectionName, List<String> folderNames) {
+        Cursor cursor = getRootCursor(sectionName);
+        for (String folderName : folderNames) {
+            cursor = descend(cursor, folderName);
+        }
+        return cursor;
+    }
+
+    /**
+     * Get the default value of an attribute, in the folder that cursor is for. If more
+     * than one entry matches, the one with the most folder names wins.
+     *
+     * @param cursor        the cursor of the folder the attribute is in
+     * @param attributeName the attribute name
+     * @return the default value, or null if there isn't one
+     */
+    public DefaultValue lookup(Cursor cursor, String attributeName) {
+        DefaultValue result = null;
+        int resultDepth = -1;
+        for (Node node : cursor.nodes) {
+            DefaultValue defaultValue = node.attributes.get(attributeName);
+            if (defaultValue != null && node.depth > resultDepth) {
+                result = defaultValue;
+                resultDepth = node.depth;
+            }
+        }
+        return result;
+    }
+
+    /**
+     * A position in the index, for one model folder. Cursors are immutable.
+     */
+    public static final class Cursor {
+        private final Node[] nodes;
+
+        private Cursor(Node[] nodes) {
+            this.nodes = nodes;
+        }
+
+        /**
+         * Whether or not any entries can match at, or below, the folder.
+         *
+         * @return true, if no entries can match
+         */
+        public boolean isEmpty() {
+            return nodes.length == 0;
+        }
+    }
+
+    /* package */ static Class<?> parseType(String typeString) {
+        Class<?> result;
+        if (typeString.equalsIgnoreCase("int") || typeString.equalsIgnoreCase("Integer")) {
+            result = Integer.class;
+        } else if (typeString.equalsIgnoreCase("long")) {
+            result = Long.class;
+        } else if (typeString.equalsIgnoreCase("boolean")) {
+            result = Boolean.class;
+        } else if (typeString.equalsIgnoreCase("float")) {
+            result = Float.class;
+        } else if (typeString.equalsIgnoreCase("double")) {
+            result = Double.class;
+        } else {
+            result = String.class;
+        }
+        return result;
+    }
+
+    private static void addNode(List<Node> nodes, Node node) {
+        if (node != null && !nodes.contains(node)) {
+            nodes.add(node);
+        }
+    }
+
+    private void addDefault(String sectionName, boolean skipFolders, List<String> folderNames, String attributeName,
+                            String dataType, List<String> defaultValues) {
+        Node node = sectionRoots.get(sectionName);
+        if (node == null) {
+            node = new Node(0, false);
+            sectionRoots.put(sectionName, node);
+        }
+
+        for (String folderName : folderNames) {
+            if (WILDCARD_SEGMENTS.contains(folderName)) {
+                if (node.wildcard == null) {
+                    node.wildcard = new Node(node.depth + 1, skipFolders);
+                }
+                node = node.wildcard;
+            } else {
+                Node child = node.children.get(folderName);
+                if (child == null) {
+                    child = new Node(node.depth + 1, skipFolders);
+                    node.children.put(folderName, child);
+                }
+                node = child;
+            }
+        }
+
+        String normalizedDataType = dataType.toLowerCase();
+        node.attributes.put(attributeName,
+            new DefaultValue(normalizedDataType, parseType(normalizedDataType), defaultValues));
+        entriesCount++;
+    }
+
+    // The format of the JSON defaults file is:
+    //
+    //    {
+    //      "<section>:/<folder>/.../@<attributeName>": { "data_type": "<type>", "default_value": <value> },
+    //      ...
+    //    }
+    //
+    private void addJsonDefaults(String sectionName, String fileName) {
+        final String METHOD = "addJsonDefaults";
+
+        logger.entering(CLASS, METHOD, sectionName, fileName);
+        Map<String, Object> data;
+        InputStream inputStream = openResource(fileName);
+        try {
+            data = new JsonReader(fileName, new BufferedReader(new InputStreamReader(inputStream, "UTF-8")))
+                .readObject();
+        } catch (IOException ioe) {
+            String message = MessageFormat.format("Failed to load defaults file {0}: {1}", fileName, ioe.getMessage());
+            throw new IllegalStateException(message, ioe);
+        } finally {
+            try { inputStream.close(); } catch (IOException ignore) { }
+        }
+
+        String sectionPrefix = sectionName + ":/";
+        for (Map.Entry<String, Object> entry : data.entrySet()) {
+            String itemPath = entry.getKey();
+            int attributeIndex = itemPath.lastIndexOf("/@");
+            if (!itemPath.startsWith(sectionPrefix) || attributeIndex == -1 || !(entry.getValue() instanceof Map)) {
+                logger.warning("Skipping the {0} entry in the {1} defaults file, because it is not an attribute " +
+                    "item path of the {2} section", itemPath, fileName, sectionName);
+                continue;
+            }
+
+            List<String> folderNames = new ArrayList<String>();
+            for (String folderName : itemPath.substring(sectionPrefix.length(), attributeIndex).split("/")) {
+                if (folderName.length() > 0) {
+                    folderNames.add(folderName);
+                }
+            }
+
+            Map<?, ?> attributeData = (Map<?, ?>) entry.getValue();
+            Object dataType = attributeData.get(DATA_TYPE);
+            Object defaultValue = attributeData.get(DEFAULT_VALUE);
+            List<String> defaultValues = new ArrayList<String>();
+            if (defaultValue != null) {
+                defaultValues.add(defaultValue.toString());
+            }
+            addDefault(sectionName, false, folderNames, itemPath.substring(attributeIndex + 2),
+                dataType == null ? DEFAULT_DATA_TYPE : dataType.toString(), defaultValues);
+        }
+        logger.exiting(CLASS, METHOD);
+    }
+
+    // The format of the properties file key is:
+    //
+    //    [{<type>}.][<folder>.]<attributeName>
+    //
+    //    where:  type is String, Boolean, Integer, or Double.
+    //                 If not present, the default is String.
+    //
+    //            folder is the dot separated path.
+    //
+    //            attributeName is the WLST Offline attribute name.
+    //
+    // The value is a comma separated list of default values.
+    //
+    private void addPropertiesDefaults(String sectionName, String fileName) {
+        final String METHOD = "addPropertiesDefaults";
+
+        logger.entering(CLASS, METHOD, sectionName, fileName);
+        Properties data = new Properties();
+        InputStream inputStream = openResource(fileName);
+        try {
+            data.load(inputStream);
+        } catch (IOException ioe) {
+            String message = MessageFormat.format("Failed to load defaults file {0}: {1}", fileName, ioe.getMessage());
+            throw new IllegalStateException(message, ioe);
+        } finally {
+            try { inputStream.close(); } catch (IOException ignore) { }
+        }
+
+        for (String key : data.stringPropertyNames()) {
+            String dataType = DEFAULT_DATA_TYPE;
+            String remainingKey = key;
+            if (TYPE_PATTERN.matcher(key).matches()) {
+                dataType = key.substring(1, key.indexOf('}'));
+                remainingKey = key.substring(key.indexOf('}') + 2);
+            }
+
+            List<String> segments = Arrays.asList(remainingKey.split("\\."));
+            addDefault(sectionName, true, segments.subList(0, segments.size() - 1),
+                segments.get(segments.size() - 1), dataType, parseValue(data.getProperty(key)));
+        }
+        logger.exiting(CLASS, METHOD);
+    }
+
+    private static InputStream openResource(String fileName) {
+        InputStream inputStream = WLSTOfflineDefaultsIndex.class.getClassLoader().getResourceAsStream(fileName);
+        if (inputStream == null) {
+            String message = MessageFormat.format("Failed to get InputStream for defaults file {0}", fileName);
+            throw new IllegalStateException(message);
+        }
+        return inputStream;
+    }
+
+    private static List<String> parseValue(String valueString) {
+        ArrayList<String> result = new ArrayList<String>();
+        if (!StringUtils.isEmpty(valueString)) {
+            String[] resultArray = valueString.split(",");
+            for (String item : resultArray) {
+                result.add(item.trim());
+            }
+        }
+        return result;
+    }
+
+    private static class Node {
+        final int depth;
+        final boolean skippable;
+        final Map<String, Node> children = new HashMap<String, Node>();
+        final Map<String, DefaultValue> attributes = new HashMap<String, DefaultValue>();
+        Node wildcard;
+
+        Node(int depth, boolean skippable) {
+            this.depth = depth;
+            // the root is never skippable, so the first folder name has to match
+            this.skippable = skippable && depth > 0;
+        }
+    }
+
+    /**
+     * Just enough of a JSON reader for the defaults files: objects, strings, numbers,
+     * true, false and null. Arrays are read as lists.
+     */
+    private static class JsonReader {
+        private final String fileName;
+        private final Reader reader;
+        private int lineNumber = 1;
+        private int peeked = -2;
+
+        JsonReader(String fileName, Reader reader) {
+            this.fileName = fileName;
+            this.reader = reader;
+        }
+
+        Map<String, Object> readObject() throws IOException {
+            expect('{');
+            Map<String, Object> result = new LinkedHashMap<String, Object>();
+            if (peekToken() == '}') {
+                next();
+                return result;
+            }
+            while (true) {
+                expect('"');
+                String key = readString();
+                expect(':');
+                result.put(key, readValue());
+                int c = nextToken();
+                if (c == '}') {
+                    return result;
+                } else if (c != ',') {
+                    throw error("expected , or }");
+                }
+            }
+        }
+
+        private Object readValue() throws IOException {
+            int c = peekToken();
+            if (c == '{') {
+                return readObject();
+            } else if (c == '[') {
+                next();
+                List<Object> result = new ArrayList<Object>();
+                if (peekToken() == ']') {
+                    next();
+                    return result;
+                }
+                while (true) {
+                    result.add(readValue());
+                    c = nextToken();
+                    if (c == ']') {
+                        return result;
+                    } else if (c != ',') {
+                        throw error("expected , or ]");
+                    }
+                }
+            } else if (c == '"') {
+                next();
+                return readString();
+            }
+
+            StringBuilder literal = new StringBuilder();
+            while (true) {
+                c = peek();
+                if (c == -1 || c == ',' || c == '}' || c == ']' || Character.isWhitespace(c)) {
+                    break;
+                }
+                literal.append((char) next());
+            }
+            String value = literal.toString();
+            if (value.equals("null")) {
+                return null;
+            } else if (value.equals("true") || value.equals("false")) {
+                return Boolean.valueOf(value);
+            } else if (value.length() == 0) {
+                throw error("expected a value");
+            }
+            return value;
+        }
+
+        private String readString() throws IOException {
+            StringBuilder result = new StringBuilder();
+            while (true) {
+                int c = next();
+                if (c == -1) {
+                    throw error("unterminated string");
+                } else if (c == '"') {
+                    return result.toString();
+                } else if (c == '\\') {
+                    c = next();
+                    switch (c) {
+                        case 'n': result.append('\n'); break;
+                        case 'r': result.append('\r'); break;
+                        case 't': result.append('\t'); break;
+                        case 'b': result.append('\b'); break;
+                        case 'f': result.append('\f'); break;
+                        case 'u':
+                            char[] hex = new char[4];
+                            for (int i = 0; i < hex.length; i++) {
+                                hex[i] = (char) next();
+                            }
+                            result.append((char) Integer.parseInt(new String(hex), 16));
+                            break;
+                        default: result.append((char) c);
+                    }
+                } else {
+                    result.append((char) c);
+                }
+            }
+        }
+
+        private void expect(char expected) throws IOException {
+            if (nextToken() != expected) {
+                throw error("expected " + expected);
+            }
+        }
+
+        private int nextToken() throws IOException {
+            peekToken();
+            return next();
+        }
+
+        private int peekToken() throws IOException {
+            while (peek() != -1 && Character.isWhitespace(peek())) {
+                next();
+            }
+            return peek();
+        }
+
+        private int peek() throws IOException {
+            if (peeked == -2) {
+                peeked = reader.read();
+            }
+            return peeked;
+        }
+
+        private int next() throws IOException {
+            int c = peek();
+            peeked = -2;
+            if (c == '\n') {
+                lineNumber++;
+            }
+            return c;
+        }
+
+        private IOException error(String reason) {
+            return new IOException(MessageFormat.format("{0} at line {1} of {2}", reason, lineNumber, fileName));
+        }
+    }
+}
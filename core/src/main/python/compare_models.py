@@ -15,6 +15,7 @@ from oracle.weblogic.deploy.util import WebLogicDeployToolingVersion
 
 # java classes from weblogic-deploy-tooling-ct
 from oracle.weblogic.deploy.testing import CompareModelsException
+from oracle.weblogic.deploy.testing import TestingException
 from oracle.weblogic.deploy.testing import TestingConstants
 
 sys.path.append(os.path.dirname(os.path.realpath(sys.argv[0])))
@@ -24,12 +25,13 @@ from wlsdeploy.util import wlst_helper
 from wlsdeploy.util.model_context import ModelContext
 from wlsdeploy.util.weblogic_helper import WebLogicHelper
 from wlsdeploy.util.cla_utils import CommandLineArgUtil
-from wlsdeploy.util.model_translator import FileToPython
 
 # python classes from weblogic-deploy-tooling-ct
 from wlsdeploy.testing.exception import exception_helper
 from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+from wlsdeploy.testing.compare.batch_model_comparer import BatchModelComparer
 from wlsdeploy.testing.compare.model_comparer import ModelComparer
+from wlsdeploy.testing.common import model_cache
 from wlsdeploy.testing.common import testing_common
 
 _program_name = 'compareModels'
@@ -42,6 +44,21 @@ _ACTUAL_MODEL_FILE_SWITCH = '-actual_model_file'
 _EXPECTED_MODEL_OVERRIDES_FILE_SWITCH = '-expected_model_overrides_file'
 _ACTUAL_MODEL_OVERRIDES_FILE_SWITCH = '-actual_model_overrides_file'
 _COMPARE_RESULT_FILE_SWITCH = '-compare_results_file'
+_FINGERPRINT_FILE_SWITCH = '-fingerprint_file'
+_STREAM_MODELS_SWITCH = '-stream_models'
+_COMPARE_MANIFEST_FILE_SWITCH = '-compare_manifest_file'
+_EXPECTED_MODELS_DIR_SWITCH = '-expected_models_dir'
+_ACTUAL_MODELS_DIR_SWITCH = '-actual_models_dir'
+_COMPARE_RESULTS_DIR_SWITCH = '-compare_results_dir'
+_COMPARE_THREADS_SWITCH = '-compare_threads'
+
+_BATCH_SWITCHES = [
+    _COMPARE_MANIFEST_FILE_SWITCH,
+    _EXPECTED_MODELS_DIR_SWITCH,
+    _ACTUAL_MODELS_DIR_SWITCH,
+    _COMPARE_RESULTS_DIR_SWITCH,
+    _COMPARE_THREADS_SWITCH
+]
 
 __required_arguments = [
     CommandLineArgUtil.ORACLE_HOME_SWITCH,
@@ -230,7 +247,50 @@ def __verify_actual_model_overrides_file_arg(compare_models_args_map):
     return
 
 
+def __is_batch_mode(compare_models_args_map):
+    return compare_models_args_map[_COMPARE_MANIFEST_FILE_SWITCH] is not None or \
+        compare_models_args_map[_EXPECTED_MODELS_DIR_SWITCH] is not None
+
+
+def __verify_batch_args(compare_models_args_map):
+    """
+    Verify the arguments used when comparing a batch of model pairs.
+
+    :param compare_models_args_map:
+    :raises VerificationException: if a required argument is missing, or -compare_threads isn't a number
+    """
+    _method_name = '__verify_batch_args'
+
+    required_switches = [_COMPARE_RESULTS_DIR_SWITCH]
+    if compare_models_args_map[_COMPARE_MANIFEST_FILE_SWITCH] is None:
+        required_switches.append(_ACTUAL_MODELS_DIR_SWITCH)
+
+    for required_switch in required_switches:
+        if compare_models_args_map[required_switch] is None:
+            ex = exception_helper.create_verification_exception('WLSDPLY-20005', _program_name, required_switch)
+            ex.setExitCode(CommandLineArgUtil.ARG_VALIDATION_ERROR_EXIT_CODE)
+            __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+            raise ex
+
+    compare_threads = compare_models_args_map[_COMPARE_THREADS_SWITCH]
+    if compare_threads is not None:
+        try:
+            compare_models_args_map[_COMPARE_THREADS_SWITCH] = int(compare_threads)
+        except ValueError:
+            ex = exception_helper.create_verification_exception('WLSDPLY-20014', _COMPARE_THREADS_SWITCH,
+                                                                compare_threads)
+            ex.setExitCode(CommandLineArgUtil.ARG_VALIDATION_ERROR_EXIT_CODE)
+            __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+            raise ex
+
+    return
+
+
 def __process_compare_models_args(compare_models_args_map):
+    if __is_batch_mode(compare_models_args_map):
+        __verify_batch_args(compare_models_args_map)
+        return
+
     __verify_expected_model_file_arg(compare_models_args_map)
     __verify_actual_model_file_arg(compare_models_args_map)
     __verify_expected_model_overrides_file_arg(compare_models_args_map)
@@ -249,11 +309,15 @@ def __compare_models(compare_models_args_map):
     """
     _method_name = '__compare_models'
 
+    if compare_models_args_map[_STREAM_MODELS_SWITCH]:
+        __compare_model_streams(compare_models_args_map)
+        return
+
     expected_model_file = None
 
     try:
         expected_model_file = compare_models_args_map[_EXPECTED_MODEL_FILE_SWITCH]
-        expected_model_dict = FileToPython(expected_model_file.getAbsolutePath(), True).parse()
+        expected_model_dict = model_cache.get_model_cache().parse(expected_model_file.getAbsolutePath())
     except TranslateException, te:
         __logger.severe('WLSDPLY-20009', _program_name, expected_model_file.getAbsolutePath(), te.getLocalizedMessage(),
                         error=te, class_name=_class_name, method_name=_method_name)
@@ -265,7 +329,7 @@ def __compare_models(compare_models_args_map):
 
     try:
         actual_model_file = compare_models_args_map[_ACTUAL_MODEL_FILE_SWITCH]
-        actual_model_dict = FileToPython(actual_model_file.getAbsolutePath(), True).parse()
+        actual_model_dict = model_cache.get_model_cache().parse(actual_model_file.getAbsolutePath())
     except TranslateException, te:
         __logger.severe('WLSDPLY-20009', _program_name, actual_model_file.getAbsolutePath(), te.getLocalizedMessage(),
                         error=te, class_name=_class_name, method_name=_method_name)
@@ -288,20 +352,85 @@ def __compare_models(compare_models_args_map):
         testing_common.apply_substitution_variables_file(actual_model_overrides_file, actual_model_dict, __logger)
 
     if expected_model_dict is not None and actual_model_dict is not None:
-        model_comparer = ModelComparer(logger=__logger)
+        # When a compare results file is specified, the messages are streamed
+        # to it while the comparison runs, rather than collected in memory
+        compare_results_file = compare_models_args_map[_COMPARE_RESULT_FILE_SWITCH]
+        # When a fingerprint file is specified, the folders that changed since
+        # the previous run are reported, the stored results of the folders that
+        # didn't change in either model are reused, and the file is updated
+        model_comparer = ModelComparer(logger=__logger, results_file=compare_results_file,
+                                       fingerprint_file=compare_models_args_map[_FINGERPRINT_FILE_SWITCH])
 
         comparison_results = model_comparer.compare_models(expected_model_dict,
                                                            actual_model_dict)
         comparison_results.log_results(__logger)
 
-        compare_results_file = compare_models_args_map[_COMPARE_RESULT_FILE_SWITCH]
+    return
 
-        if compare_results_file is not None:
-            model_comparer.write_compare_results(compare_results_file)
+
+def __compare_model_streams(compare_models_args_map):
+    """
+    Compares the expected and actual model files a folder at a time, without
+    reading either of them into a model dictionary first.
+
+    :param compare_models_args_map:
+    :return:
+    :raises CompareModelsException:
+    :raises TestingException:
+    """
+    _method_name = '__compare_model_streams'
+
+    expected_model_overrides_file = compare_models_args_map[_EXPECTED_MODEL_OVERRIDES_FILE_SWITCH]
+    if expected_model_overrides_file is not None:
+        __logger.info('WLSDPLY-09924', expected_model_overrides_file, "expected",
+                      class_name=_class_name, method_name=_method_name)
+
+    actual_model_overrides_file = compare_models_args_map[_ACTUAL_MODEL_OVERRIDES_FILE_SWITCH]
+    if actual_model_overrides_file is not None:
+        __logger.info('WLSDPLY-09924', actual_model_overrides_file, "actual",
+                      class_name=_class_name, method_name=_method_name)
+
+    model_comparer = ModelComparer(logger=__logger,
+                                   results_file=compare_models_args_map[_COMPARE_RESULT_FILE_SWITCH],
+                                   fingerprint_file=compare_models_args_map[_FINGERPRINT_FILE_SWITCH])
+
+    comparison_results = \
+        model_comparer.compare_model_files(compare_models_args_map[_EXPECTED_MODEL_FILE_SWITCH].getAbsolutePath(),
+                                           compare_models_args_map[_ACTUAL_MODEL_FILE_SWITCH].getAbsolutePath(),
+                                           expected_model_overrides_file, actual_model_overrides_file)
+    comparison_results.log_results(__logger)
 
     return
 
 
+def __compare_model_batch(compare_models_args_map):
+    """
+    Compares all the model pairs in a manifest file, or in a pair of directories,
+    in this process.
+
+    :param compare_models_args_map:
+    :return: the number of pairs that failed or had errors
+    :raises CompareModelsException:
+    :raises TestingException:
+    """
+    batch_comparer = BatchModelComparer(compare_models_args_map[_COMPARE_RESULTS_DIR_SWITCH],
+                                        threads=compare_models_args_map[_COMPARE_THREADS_SWITCH],
+                                        logger=__logger)
+
+    if compare_models_args_map[_COMPARE_MANIFEST_FILE_SWITCH] is not None:
+        batch_comparer.add_manifest_pairs(compare_models_args_map[_COMPARE_MANIFEST_FILE_SWITCH])
+    else:
+        batch_comparer.add_directory_pairs(compare_models_args_map[_EXPECTED_MODELS_DIR_SWITCH],
+                                           compare_models_args_map[_ACTUAL_MODELS_DIR_SWITCH])
+
+    failed_pairs_count = 0
+    for pair_result in batch_comparer.compare_all():
+        if pair_result['status'] == BatchModelComparer.STATUS_FAILED or pair_result['errors_count'] > 0:
+            failed_pairs_count += 1
+
+    return failed_pairs_count
+
+
 def main(args):
     """
     The entry point for run test program
@@ -323,7 +452,14 @@ def main(args):
         _ACTUAL_MODEL_FILE_SWITCH: None,
         _EXPECTED_MODEL_OVERRIDES_FILE_SWITCH: None,
         _ACTUAL_MODEL_OVERRIDES_FILE_SWITCH: None,
-        _COMPARE_RESULT_FILE_SWITCH: None
+        _COMPARE_RESULT_FILE_SWITCH: None,
+        _FINGERPRINT_FILE_SWITCH: None,
+        _STREAM_MODELS_SWITCH: False,
+        _COMPARE_MANIFEST_FILE_SWITCH: None,
+        _EXPECTED_MODELS_DIR_SWITCH: None,
+        _ACTUAL_MODELS_DIR_SWITCH: None,
+        _COMPARE_RESULTS_DIR_SWITCH: None,
+        _COMPARE_THREADS_SWITCH: None
     }
 
     if _EXPECTED_MODEL_FILE_SWITCH in args:
@@ -361,6 +497,25 @@ def main(args):
         sys.argv.remove(_COMPARE_RESULT_FILE_SWITCH)
         sys.argv.remove(value)
 
+    if _FINGERPRINT_FILE_SWITCH in args:
+        index = sys.argv.index(_FINGERPRINT_FILE_SWITCH)
+        value = sys.argv[index+1]
+        compare_models_args_map[_FINGERPRINT_FILE_SWITCH] = value
+        sys.argv.remove(_FINGERPRINT_FILE_SWITCH)
+        sys.argv.remove(value)
+
+    if _STREAM_MODELS_SWITCH in args:
+        compare_models_args_map[_STREAM_MODELS_SWITCH] = True
+        sys.argv.remove(_STREAM_MODELS_SWITCH)
+
+    for batch_switch in _BATCH_SWITCHES:
+        if batch_switch in args:
+            index = sys.argv.index(batch_switch)
+            value = sys.argv[index+1]
+            compare_models_args_map[batch_switch] = value
+            sys.argv.remove(batch_switch)
+            sys.argv.remove(value)
+
     try:
         __process_args(args)
         __process_compare_models_args(compare_models_args_map)
@@ -372,9 +527,16 @@ def main(args):
         sys.exit(exit_code)
 
     try:
-        __compare_models(compare_models_args_map)
-
-    except (CompareModelsException, VerificationException), e:
+        if __is_batch_mode(compare_models_args_map):
+            failed_pairs_count = __compare_model_batch(compare_models_args_map)
+            model_cache.get_model_cache().log_statistics(__logger)
+            if failed_pairs_count > 0:
+                sys.exit(CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
+        else:
+            __compare_models(compare_models_args_map)
+            model_cache.get_model_cache().log_statistics(__logger)
+
+    except (CompareModelsException, VerificationException, TestingException), e:
         __logger.severe('WLSDPLY-09812', _program_name,
                         e.getClass().getSimpleName(),
                         e.getLocalizedMessage(), error=e,
@@ -30,9 +30,14 @@ from wlsdeploy.util.weblogic_helper import WebLogicHelper
 from wlsdeploy.util.cla_utils import CommandLineArgUtil
 
 # python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import admin_server_leases
+from wlsdeploy.testing.common import model_cache
+from wlsdeploy.testing.common import resource_metrics
+from wlsdeploy.testing.common import tool_daemon
 from wlsdeploy.testing.exception import exception_helper
 from wlsdeploy.testing.logging.platform_logger import PlatformLogger
 from wlsdeploy.testing.test_runner import TestRunner
+from wlsdeploy.testing.test_suite_runner import TestSuiteRunner
 
 _program_name = 'runTest'
 _class_name = 'run_test'
@@ -45,6 +50,18 @@ _TEST_DEF_OVERRIDES_FILE_SWITCH = '-test_def_overrides_file'
 _TEST_DEF_VERIFIER_NAME_SWITCH = '-test_def_verifier_name'
 _TEST_DEF_METADATA_FILE_SWITCH = '-test_def_metadata_file'
 _VERIFY_ONLY_SWITCH = '-verify_only'
+_TEST_DEF_DIR_SWITCH = '-test_def_dir'
+_TEST_SUITE_SWITCH = '-test_suite'
+_TEST_RESULTS_DIR_SWITCH = '-test_results_dir'
+_TEST_THREADS_SWITCH = '-test_threads'
+_TEST_TRACE_FILE_SWITCH = '-test_trace_file'
+
+_SUITE_SWITCHES = [
+    _TEST_DEF_DIR_SWITCH,
+    _TEST_SUITE_SWITCH,
+    _TEST_RESULTS_DIR_SWITCH,
+    _TEST_THREADS_SWITCH
+]
 
 __required_arguments = [
     CommandLineArgUtil.ORACLE_HOME_SWITCH,
@@ -200,6 +217,41 @@ def __verify_test_def_metadata_file_arg(run_test_args_map):
     return
 
 
+def __is_suite_mode(run_test_args_map):
+    return run_test_args_map[_TEST_DEF_DIR_SWITCH] is not None or \
+        run_test_args_map[_TEST_SUITE_SWITCH] is not None
+
+
+def __verify_suite_args(run_test_args_map):
+    """
+    Verify the arguments used when running a suite of test definitions.
+
+    :param run_test_args_map:
+    :raises VerificationException: if -test_results_dir is missing, or -test_threads isn't a number
+    """
+    _method_name = '__verify_suite_args'
+
+    if run_test_args_map[_TEST_RESULTS_DIR_SWITCH] is None:
+        ex = exception_helper.create_verification_exception('WLSDPLY-20005', _program_name,
+                                                            _TEST_RESULTS_DIR_SWITCH)
+        ex.setExitCode(CommandLineArgUtil.ARG_VALIDATION_ERROR_EXIT_CODE)
+        __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+        raise ex
+
+    test_threads = run_test_args_map[_TEST_THREADS_SWITCH]
+    if test_threads is not None:
+        try:
+            run_test_args_map[_TEST_THREADS_SWITCH] = int(test_threads)
+        except ValueError:
+            ex = exception_helper.create_verification_exception('WLSDPLY-20014', _TEST_THREADS_SWITCH,
+                                                                test_threads)
+            ex.setExitCode(CommandLineArgUtil.ARG_VALIDATION_ERROR_EXIT_CODE)
+            __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+            raise ex
+
+    return
+
+
 def __process_run_test_args(run_test_args_map):
     _method_name = '__process_run_test_args'
 
@@ -217,7 +269,10 @@ def __process_run_test_args(run_test_args_map):
         __logger.throwing(ex, class_name=_class_name, method_name=_method_name)
         raise ex
 
-    __verify_test_def_file_arg(run_test_args_map)
+    if __is_suite_mode(run_test_args_map):
+        __verify_suite_args(run_test_args_map)
+    else:
+        __verify_test_def_file_arg(run_test_args_map)
     __verify_test_def_overrides_file_arg(run_test_args_map)
     __verify_test_def_metadata_file_arg(run_test_args_map)
 
@@ -251,6 +306,57 @@ def __run_test(run_test_args_map):
     return
 
 
+def __run_test_suite(run_test_args_map):
+    """
+    Runs all the test definitions in a test suite file, or in a directory, in this process.
+
+    :param run_test_args_map:
+    :return: the number of tests that didn't pass
+    :raises TestingException:
+    """
+    suite_runner = TestSuiteRunner(run_test_args_map[_TEST_RESULTS_DIR_SWITCH],
+                                   threads=run_test_args_map[_TEST_THREADS_SWITCH],
+                                   logger=__logger)
+
+    if run_test_args_map[_TEST_SUITE_SWITCH] is not None:
+        suite_runner.add_suite_test_defs(run_test_args_map[_TEST_SUITE_SWITCH])
+    else:
+        suite_runner.add_directory_test_defs(run_test_args_map[_TEST_DEF_DIR_SWITCH],
+                                             run_test_args_map[_TEST_DEF_OVERRIDES_FILE_SWITCH],
+                                             run_test_args_map[_TEST_DEF_METADATA_FILE_SWITCH])
+
+    test_runner = TestRunner(logger=__logger)
+    failed_tests_count = 0
+    for test_result in suite_runner.run_all(test_runner, run_test_args_map[_TEST_TYPE_SWITCH],
+                                            run_test_args_map[_TEST_DEF_VERIFIER_NAME_SWITCH],
+                                            run_test_args_map[_VERIFY_ONLY_SWITCH]):
+        if test_result['status'] != TestSuiteRunner.STATUS_PASSED:
+            failed_tests_count += 1
+
+    return failed_tests_count
+
+
+def __write_trace_file(run_test_args_map):
+    """
+    Writes the timings of the stages that ran to the -test_trace_file, if it was given.
+    A trace file that can't be written is logged, rather than failing the run.
+
+    :param run_test_args_map:
+    """
+    _method_name = '__write_trace_file'
+
+    trace_file = run_test_args_map[_TEST_TRACE_FILE_SWITCH]
+    if trace_file is None:
+        return
+
+    try:
+        resource_metrics.get_trace_recorder().write_trace_file(trace_file)
+    except TestingException, te:
+        __logger.warning('WLSDPLY-09996', _TEST_TRACE_FILE_SWITCH, te.getLocalizedMessage(), error=te,
+                         class_name=_class_name, method_name=_method_name)
+    return
+
+
 def main(args):
     """
     The entry point for run test program
@@ -270,7 +376,12 @@ def main(args):
     run_test_args_map = {
         _TEST_DEF_OVERRIDES_FILE_SWITCH: None,
         _TEST_DEF_VERIFIER_NAME_SWITCH: None,
-        _TEST_DEF_METADATA_FILE_SWITCH: None
+        _TEST_DEF_METADATA_FILE_SWITCH: None,
+        _TEST_DEF_DIR_SWITCH: None,
+        _TEST_SUITE_SWITCH: None,
+        _TEST_RESULTS_DIR_SWITCH: None,
+        _TEST_THREADS_SWITCH: None,
+        _TEST_TRACE_FILE_SWITCH: None
     }
 
     if _TEST_TYPE_SWITCH in args:
@@ -313,6 +424,21 @@ def main(args):
         run_test_args_map[_VERIFY_ONLY_SWITCH] = value
         sys.argv.remove(_VERIFY_ONLY_SWITCH)
 
+    if _TEST_TRACE_FILE_SWITCH in args:
+        index = sys.argv.index(_TEST_TRACE_FILE_SWITCH)
+        value = sys.argv[index+1]
+        run_test_args_map[_TEST_TRACE_FILE_SWITCH] = value
+        sys.argv.remove(_TEST_TRACE_FILE_SWITCH)
+        sys.argv.remove(value)
+
+    for suite_switch in _SUITE_SWITCHES:
+        if suite_switch in args:
+            index = sys.argv.index(suite_switch)
+            value = sys.argv[index+1]
+            run_test_args_map[suite_switch] = value
+            sys.argv.remove(suite_switch)
+            sys.argv.remove(value)
+
     try:
         __process_args(args)
         __process_run_test_args(run_test_args_map)
@@ -323,16 +449,31 @@ def main(args):
                             class_name=_class_name, method_name=_method_name)
         sys.exit(exit_code)
 
+    if run_test_args_map[_TEST_TRACE_FILE_SWITCH] is not None:
+        resource_metrics.enable_tracing()
+
     try:
-        __run_test(run_test_args_map)
-
-    except (TestingException, TestDefinitionException, VerificationException,
-            IntegrationTestException, SystemTestException), e:
-        __logger.severe('WLSDPLY-09812', _program_name,
-                        e.getClass().getSimpleName(),
-                        e.getLocalizedMessage(), error=e,
-                        class_name=_class_name, method_name=_method_name)
-        sys.exit(CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
+        try:
+            if __is_suite_mode(run_test_args_map):
+                failed_tests_count = __run_test_suite(run_test_args_map)
+                model_cache.get_model_cache().log_statistics(__logger)
+                if failed_tests_count > 0:
+                    sys.exit(CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
+            else:
+                __run_test(run_test_args_map)
+                model_cache.get_model_cache().log_statistics(__logger)
+
+        except (TestingException, TestDefinitionException, VerificationException,
+                IntegrationTestException, SystemTestException), e:
+            __logger.severe('WLSDPLY-09812', _program_name,
+                            e.getClass().getSimpleName(),
+                            e.getLocalizedMessage(), error=e,
+                            class_name=_class_name, method_name=_method_name)
+            sys.exit(CommandLineArgUtil.PROG_ERROR_EXIT_CODE)
+    finally:
+        __write_trace_file(run_test_args_map)
+        admin_server_leases.shutdown_admin_server_leases()
+        tool_daemon.shutdown_tool_daemon()
 
     return
 
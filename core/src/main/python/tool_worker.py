@@ -0,0 +1,123 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+The entry point of a tool daemon worker. The testing tool starts it with WLST,
+passing the loopback port to connect to, the worker's id, and the random token the
+worker sends when it connects, to show that it is the one the port was opened for:
+
+    wlst.sh -skipWLSModuleScanning tool_worker.py <port> <worker-id> <token>
+
+The worker then runs the main() of the tool modules it is sent, one at a time,
+until the connection is closed. See wlsdeploy.testing.common.tool_daemon for
+the other end of the connection.
+"""
+import imp
+import os
+import sys
+
+import java.io.BufferedInputStream as JBufferedInputStream
+import java.io.BufferedOutputStream as JBufferedOutputStream
+import java.io.DataInputStream as JDataInputStream
+import java.io.DataOutputStream as JDataOutputStream
+import java.io.EOFException as JEOFException
+import java.io.IOException as JIOException
+import java.lang.Throwable as JThrowable
+import java.net.Socket as JSocket
+
+sys.path.append(os.path.dirname(os.path.realpath(sys.argv[0])))
+
+# python classes from weblogic-deploy-tooling
+from wlsdeploy.util import wlst_helper
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import testing_constants
+from wlsdeploy.testing.common import tool_daemon
+
+
+def main(args):
+    """
+    Connects to the testing tool, and runs the tool invocations it sends.
+
+    :param args: The script path, the port to connect to, the worker's id and its token
+    """
+    wlst_helper.silence()
+
+    socket = JSocket('127.0.0.1', int(args[1]))
+    socket.setTcpNoDelay(True)
+    input_stream = JDataInputStream(JBufferedInputStream(socket.getInputStream()))
+    output_stream = JDataOutputStream(JBufferedOutputStream(socket.getOutputStream()))
+
+    try:
+        output_stream.writeUTF(args[3])
+        output_stream.flush()
+
+        while True:
+            try:
+                module_name = input_stream.readUTF()
+            except JEOFException:
+                break
+
+            tool_args = []
+            for i in range(input_stream.readInt()):
+                tool_args.append(input_stream.readUTF())
+            env = {}
+            for i in range(input_stream.readInt()):
+                key = input_stream.readUTF()
+                env[key] = input_stream.readUTF()
+
+            status, value = _run_tool(module_name, tool_args, env)
+
+            output_stream.writeInt(status)
+            output_stream.writeBoolean(value is not None)
+            if value is not None:
+                output_stream.writeUTF(value)
+            output_stream.flush()
+    finally:
+        try:
+            socket.close()
+        except JIOException:
+            pass
+    return
+
+
+def _run_tool(module_name, tool_args, env):
+    """
+    Runs the main() of the tool module with tool_args, as sys.argv, and env added to
+    os.environ, putting them back afterwards, so that the next call doesn't see them. The tool module is loaded again each time,
+    so that its module-level state starts out fresh.
+
+    :return: a (status, value) tuple, with status one of tool_daemon.RETURNED,
+             tool_daemon.EXITED or tool_daemon.FAILED
+    """
+    saved_argv = sys.argv
+    saved_environ = os.environ.copy()
+
+    sys.argv = tool_args
+    os.environ.update(env)
+
+    fp = None
+    try:
+        try:
+            fp, pathname, description = imp.find_module(module_name, [testing_constants.TOOL_MODULES_PATH])
+            tool_module = imp.load_module(module_name, fp, pathname, description)
+            result = tool_module.main(tool_args)
+            if result is None:
+                return tool_daemon.RETURNED, None
+            return tool_daemon.RETURNED, str(result)
+        except SystemExit, se:
+            return tool_daemon.EXITED, str(se)
+        except JThrowable, t:
+            return tool_daemon.FAILED, str(t.getLocalizedMessage())
+        except Exception, e:
+            return tool_daemon.FAILED, str(e)
+    finally:
+        if fp is not None:
+            fp.close()
+        sys.argv = saved_argv
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+
+if __name__ == "main":
+    main(sys.argv)
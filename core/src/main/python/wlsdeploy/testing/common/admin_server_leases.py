@@ -0,0 +1,536 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+Reference counted leases on running admin servers, so that the start_admin_server
+and shutdown_admin_server stages of the tests that use the same domain share one
+admin server, instead of each test booting and stopping its own. Only the admin
+servers that were started in this process are shared.
+"""
+import jarray
+
+import java.io.File as JFile
+import java.io.IOException as JIOException
+import java.lang.Integer as JInteger
+import java.lang.System as JSystem
+import java.lang.Thread as JThread
+import java.lang.Throwable as JThrowable
+import java.net.InetSocketAddress as JInetSocketAddress
+import java.net.Socket as JSocket
+import java.net.URL as JURL
+import java.security.cert.X509Certificate as JX509Certificate
+import java.util.Timer as JTimer
+import java.util.TimerTask as JTimerTask
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+import javax.net.ssl.HostnameVerifier as JHostnameVerifier
+import javax.net.ssl.HttpsURLConnection as JHttpsURLConnection
+import javax.net.ssl.SSLContext as JSSLContext
+import javax.net.ssl.TrustManager as JTrustManager
+import javax.net.ssl.X509TrustManager as JX509TrustManager
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'admin_server_leases'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# Java system property with the number of seconds an admin server that no test
+# has a lease on is left running, in case another test needs it. With the default
+# of 0, the server is stopped as soon as the last lease on it is released.
+IDLE_TIMEOUT_PROPERTY = 'wlsdeploy.testing.admin_server.idle_timeout'
+
+# The WebLogic Server readiness endpoint, which answers 200 once the server is RUNNING
+READY_PATH = '/weblogic/ready'
+
+_DEFAULT_IDLE_TIMEOUT_SECONDS = 0
+_FIRST_PROBE_DELAY_MILLIS = 250
+_MAX_PROBE_DELAY_MILLIS = 5000
+_PROBE_BACKOFF_FACTOR = 1.5
+_PROBE_TIMEOUT_MILLIS = 2000
+_SECURE_PROTOCOLS = ['t3s', 'https', 'iiops']
+
+_admin_server_leases = None
+_admin_server_leases_lock = JReentrantLock()
+_probe_socket_factory = None
+
+
+def get_admin_server_leases():
+    """
+    Returns the process-wide AdminServerLeases, creating it the first time.
+    """
+    global _admin_server_leases
+
+    _admin_server_leases_lock.lock()
+    try:
+        if _admin_server_leases is None:
+            _admin_server_leases = AdminServerLeases()
+    finally:
+        _admin_server_leases_lock.unlock()
+    return _admin_server_leases
+
+
+def shutdown_admin_server_leases():
+    """
+    Stops the admin servers that are only still running because they are idle, if
+    the process-wide AdminServerLeases was created. Servers that a test still has a
+    lease on are left alone, just like they would be without the leases.
+    """
+    global _admin_server_leases
+
+    _admin_server_leases_lock.lock()
+    try:
+        if _admin_server_leases is not None:
+            _admin_server_leases.shutdown()
+            _admin_server_leases = None
+    finally:
+        _admin_server_leases_lock.unlock()
+    return
+
+
+class AdminServerLeases(object):
+    """
+    Keeps track of the admin servers the stages started, by domain home and admin URL.
+
+    acquire() starts the server if this process hasn't already started it, and returns
+    once it is ready, and release() stops it, once there are no more leases on it and it has
+    been idle for the idle timeout. A server is ready when its readiness endpoint
+    answers, which is polled with a delay that starts out short and grows, so that a
+    quick boot is noticed quickly, without hammering a slow one. When a server for the
+    domain has been started before, the first delay is based on how long it took to
+    get ready then.
+    """
+    _class_name = 'AdminServerLeases'
+
+    def __init__(self, idle_timeout_seconds=None, logger=None):
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if idle_timeout_seconds is None:
+            idle_timeout_seconds = JInteger.getInteger(IDLE_TIMEOUT_PROPERTY, _DEFAULT_IDLE_TIMEOUT_SECONDS)
+        self._idle_timeout_seconds = max(0, idle_timeout_seconds)
+
+        # (domain home, admin URL) -> _Lease
+        self._leases = {}
+        # (domain home, admin URL) -> milliseconds it took the server to get ready the last time
+        self._ready_millis = {}
+        self._lock = JReentrantLock()
+        self._idle_timer = None
+
+        self._starts_count = 0
+        self._reuses_count = 0
+        self._boot_millis = 0L
+        self._total_ready_millis = 0L
+
+    def acquire(self, domain_home, admin_url, admin_server_name, start_server, timeout_millis):
+        """
+        Takes a lease on the admin server of domain_home, listening at admin_url,
+        starting it if this process hasn't already started it. A server that is
+        listening at admin_url, but wasn't started by this process, is never used,
+        because it may not be the server of domain_home.
+
+        :param domain_home: The domain home of the admin server
+        :param admin_url: The admin URL of the admin server (e.g. t3://localhost:7001)
+        :param admin_server_name: The name of the admin server, used in messages
+        :param start_server: A function, taking no arguments, that starts the admin server
+        :param timeout_millis: The number of milliseconds to wait for the server to be ready
+        :raises TestingException: if the port of admin_url is already in use, or the server
+                                  isn't ready in time
+        """
+        _method_name = 'acquire'
+
+        key = _get_key(domain_home, admin_url)
+
+        self._lock.lock()
+        try:
+            lease = self._leases.get(key)
+            if lease is None:
+                lease = _Lease(admin_server_name, domain_home, admin_url)
+                self._leases[key] = lease
+            lease.leases_count += 1
+            if lease.idle_task is not None:
+                lease.idle_task.cancel()
+                lease.idle_task = None
+        finally:
+            self._lock.unlock()
+
+        lease.lock.lock()
+        try:
+            try:
+                if lease.running:
+                    self._logger.info('WLSDPLY-09984', admin_server_name, domain_home, admin_url,
+                                      lease.leases_count, class_name=self._class_name, method_name=_method_name)
+                    self.__count('_reuses_count')
+                elif _is_listening(admin_url):
+                    # e.g. started by an earlier run, that left it running, or another domain's
+                    ex = exception_helper.create_testing_exception('WLSDPLY-09985', admin_server_name,
+                                                                   domain_home, admin_url)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+                    raise ex
+                else:
+                    self.__start(key, lease, start_server, timeout_millis)
+            except:
+                self.__release_lease(key, lease)
+                raise
+        finally:
+            lease.lock.unlock()
+        return
+
+    def release(self, domain_home, admin_url, stop_server):
+        """
+        Gives up a lease on the admin server of domain_home, listening at admin_url.
+        If it was the last lease, the server is stopped right away, when the idle
+        timeout is 0, or after the idle timeout, if no test takes a lease on it in
+        the meantime. A server that there isn't a lease on (e.g. one that wasn't
+        started by a stage) is stopped right away.
+
+        :param domain_home: The domain home of the admin server
+        :param admin_url: The admin URL of the admin server
+        :param stop_server: A function, taking no arguments, that stops the admin server
+        :return: True if stop_server was called, False if the server was left running
+        """
+        _method_name = 'release'
+
+        key = _get_key(domain_home, admin_url)
+        count_lease = True
+
+        self._lock.lock()
+        try:
+            lease = self._leases.get(key)
+            if lease is not None:
+                lease.stop_server = stop_server
+                if lease.leases_count == 0:
+                    # an idle server, that the caller didn't take a lease on
+                    count_lease = False
+                    if lease.idle_task is not None:
+                        lease.idle_task.cancel()
+                        lease.idle_task = None
+                elif lease.leases_count > 1 or self._idle_timeout_seconds > 0:
+                    lease.leases_count -= 1
+                    if lease.leases_count == 0:
+                        self._logger.info('WLSDPLY-09987', lease.admin_server_name, domain_home,
+                                          self._idle_timeout_seconds,
+                                          class_name=self._class_name, method_name=_method_name)
+                        lease.idle_task = _IdleTask(self, key, lease)
+                        self.__get_idle_timer().schedule(lease.idle_task, self._idle_timeout_seconds * 1000L)
+                    return False
+        finally:
+            self._lock.unlock()
+
+        if lease is None:
+            stop_server()
+            return True
+
+        lease.lock.lock()
+        try:
+            try:
+                stop_server()
+            finally:
+                lease.running = False
+                self.__release_lease(key, lease, count_lease)
+        finally:
+            lease.lock.unlock()
+        return True
+
+    def get_statistics(self):
+        """
+        Returns a dictionary with the number of servers started and reused, and the
+        total milliseconds spent booting them and waiting for them to be ready.
+        """
+        self._lock.lock()
+        try:
+            return {
+                'starts_count': self._starts_count,
+                'reuses_count': self._reuses_count,
+                'boot_millis': self._boot_millis,
+                'ready_millis': self._total_ready_millis
+            }
+        finally:
+            self._lock.unlock()
+
+    def shutdown(self):
+        """
+        Stops the servers that no test has a lease on right away, instead of waiting
+        for their idle timeout.
+        """
+        _method_name = 'shutdown'
+
+        idle_leases = []
+        self._lock.lock()
+        try:
+            for key, lease in self._leases.items():
+                if lease.idle_task is not None:
+                    lease.idle_task.cancel()
+                    lease.idle_task = None
+                    idle_leases.append((key, lease))
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+        finally:
+            self._lock.unlock()
+
+        for key, lease in idle_leases:
+            self._stop_idle_server(key, lease, None)
+
+        statistics = self.get_statistics()
+        self._logger.fine('WLSDPLY-09991', statistics['starts_count'], statistics['reuses_count'],
+                          statistics['boot_millis'], statistics['ready_millis'],
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def _stop_idle_server(self, key, lease, idle_task):
+        """
+        Stops the server of an idle lease, unless a test took a lease on it in the
+        meantime. idle_task is the task that found it idle, or None when shutting down.
+        """
+        _method_name = '_stop_idle_server'
+
+        self._lock.lock()
+        try:
+            if idle_task is not None:
+                if lease.idle_task is not idle_task:
+                    return
+                lease.idle_task = None
+        finally:
+            self._lock.unlock()
+
+        lease.lock.lock()
+        try:
+            if lease.leases_count > 0 or not lease.running:
+                return
+            self._logger.info('WLSDPLY-09988', lease.admin_server_name, lease.domain_home,
+                              class_name=self._class_name, method_name=_method_name)
+            try:
+                lease.stop_server()
+            except JThrowable, t:
+                self._logger.warning('WLSDPLY-09989', lease.admin_server_name, lease.domain_home,
+                                     t.getLocalizedMessage(), class_name=self._class_name, method_name=_method_name)
+            except Exception, e:
+                self._logger.warning('WLSDPLY-09989', lease.admin_server_name, lease.domain_home, str(e),
+                                     class_name=self._class_name, method_name=_method_name)
+            lease.running = False
+            self.__release_lease(key, lease, False)
+        finally:
+            lease.lock.unlock()
+        return
+
+    def __start(self, key, lease, start_server, timeout_millis):
+        _method_name = '__start'
+
+        start = JSystem.currentTimeMillis()
+        start_server()
+        boot_millis = JSystem.currentTimeMillis() - start
+
+        self._lock.lock()
+        try:
+            delay = self._ready_millis.get(key)
+        finally:
+            self._lock.unlock()
+        if delay is None or delay <= boot_millis:
+            delay = _FIRST_PROBE_DELAY_MILLIS
+        else:
+            # it's probably not ready before it was the last time
+            delay = min(_MAX_PROBE_DELAY_MILLIS, max(_FIRST_PROBE_DELAY_MILLIS, (delay - boot_millis) / 2))
+
+        probes_count = 1
+        ready = _probe(lease.admin_url)
+        while not ready:
+            remaining = start + timeout_millis - JSystem.currentTimeMillis()
+            if remaining <= 0:
+                ex = exception_helper.create_testing_exception('WLSDPLY-09986', lease.admin_server_name,
+                                                               lease.admin_url, timeout_millis, probes_count)
+                self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+                raise ex
+            JThread.sleep(long(min(delay, remaining)))
+            delay = min(_MAX_PROBE_DELAY_MILLIS, int(delay * _PROBE_BACKOFF_FACTOR))
+            probes_count += 1
+            ready = _probe(lease.admin_url)
+
+        ready_millis = JSystem.currentTimeMillis() - start
+        lease.running = True
+        lease.boot_millis = boot_millis
+        lease.ready_millis = ready_millis
+
+        self._lock.lock()
+        try:
+            self._ready_millis[key] = ready_millis
+            self._starts_count += 1
+            self._boot_millis += boot_millis
+            self._total_ready_millis += ready_millis
+        finally:
+            self._lock.unlock()
+
+        self._logger.info('WLSDPLY-09990', lease.admin_server_name, lease.admin_url, ready_millis, boot_millis,
+                          probes_count, class_name=self._class_name, method_name=_method_name)
+        return
+
+    def __release_lease(self, key, lease, count_lease=True):
+        """
+        Takes one off the leases on the server, when count_lease is True, and forgets
+        about the server once there are no leases on it, and it isn't running.
+        """
+        self._lock.lock()
+        try:
+            if count_lease:
+                lease.leases_count -= 1
+            if lease.leases_count <= 0 and not lease.running and self._leases.get(key) is lease:
+                del self._leases[key]
+        finally:
+            self._lock.unlock()
+        return
+
+    def __count(self, counter_name):
+        self._lock.lock()
+        try:
+            setattr(self, counter_name, getattr(self, counter_name) + 1)
+        finally:
+            self._lock.unlock()
+        return
+
+    def __get_idle_timer(self):
+        # called with self._lock held
+        if self._idle_timer is None:
+            self._idle_timer = JTimer('wlsdeploy-testing-admin-server-idle', True)
+        return self._idle_timer
+
+
+class _Lease(object):
+    def __init__(self, admin_server_name, domain_home, admin_url):
+        self.admin_server_name = admin_server_name
+        self.domain_home = domain_home
+        self.admin_url = admin_url
+        self.lock = JReentrantLock()
+        self.leases_count = 0
+        self.running = False
+        self.idle_task = None
+        self.stop_server = None
+        self.boot_millis = 0
+        self.ready_millis = 0
+
+
+class _IdleTask(JTimerTask):
+    """
+    Stops a server once it has been idle for the idle timeout.
+    """
+    def __init__(self, leases, key, lease):
+        JTimerTask.__init__(self)
+        self._leases = leases
+        self._key = key
+        self._lease = lease
+
+    def run(self):
+        self._leases._stop_idle_server(self._key, self._lease, self)
+
+
+def _get_key(domain_home, admin_url):
+    return JFile(str(domain_home)).getAbsolutePath(), str(admin_url).lower()
+
+
+def _is_listening(admin_url):
+    """
+    Returns True if something accepts connections on the port of admin_url.
+    """
+    protocol, host, port = _parse_admin_url(admin_url)
+    if port is None:
+        return False
+
+    try:
+        socket = JSocket()
+        try:
+            socket.connect(JInetSocketAddress(host, port), _PROBE_TIMEOUT_MILLIS)
+        finally:
+            socket.close()
+        return True
+    except JIOException:
+        return False
+
+
+def _probe(admin_url):
+    """
+    Returns True if the admin server at admin_url is ready, which is when its readiness
+    endpoint answers 200. Secure protocols are probed over HTTPS, on the same port,
+    without checking the server's certificate, so that no trust store is needed. Only
+    the response code is read, and nothing is sent but the request for the endpoint.
+    """
+    protocol, host, port = _parse_admin_url(admin_url)
+    if port is None:
+        return False
+
+    try:
+        if protocol in _SECURE_PROTOCOLS:
+            connection = JURL('https', host, port, READY_PATH).openConnection()
+            connection.setSSLSocketFactory(_get_probe_socket_factory())
+            connection.setHostnameVerifier(_AnyHostnameVerifier())
+        else:
+            connection = JURL('http', host, port, READY_PATH).openConnection()
+        connection.setConnectTimeout(_PROBE_TIMEOUT_MILLIS)
+        connection.setReadTimeout(_PROBE_TIMEOUT_MILLIS)
+        connection.setUseCaches(False)
+        try:
+            response_code = connection.getResponseCode()
+        finally:
+            connection.disconnect()
+        return response_code == JHttpsURLConnection.HTTP_OK
+    except JIOException:
+        return False
+
+
+def _get_probe_socket_factory():
+    """
+    Returns the SSL socket factory of the readiness probes, which trusts any certificate,
+    because the test domains use the demo certificates, or self-signed ones.
+    """
+    global _probe_socket_factory
+
+    if _probe_socket_factory is None:
+        ssl_context = JSSLContext.getInstance('TLS')
+        ssl_context.init(None, jarray.array([_AnyTrustManager()], JTrustManager), None)
+        _probe_socket_factory = ssl_context.getSocketFactory()
+    return _probe_socket_factory
+
+
+class _AnyTrustManager(JX509TrustManager):
+    def checkClientTrusted(self, chain, auth_type):
+        return
+
+    def checkServerTrusted(self, chain, auth_type):
+        return
+
+    def getAcceptedIssuers(self):
+        return jarray.zeros(0, JX509Certificate)
+
+
+class _AnyHostnameVerifier(JHostnameVerifier):
+    def verify(self, host_name, ssl_session):
+        return True
+
+
+def _parse_admin_url(admin_url):
+    """
+    Returns the (protocol, host, port) of admin_url, with a port of None if it
+    doesn't have one.
+    """
+    admin_url = str(admin_url)
+    protocol = 't3'
+    if admin_url.find('://') >= 0:
+        protocol, admin_url = admin_url.split('://', 1)
+    address = admin_url.split('/', 1)[0]
+
+    index = address.rfind(':')
+    if index < 0:
+        return protocol.lower(), address, None
+    try:
+        return protocol.lower(), address[:index], int(address[index + 1:])
+    except ValueError:
+        return protocol.lower(), address, None
@@ -0,0 +1,261 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+A process-wide registry of the JSON configuration resources in the binary of the
+installable (e.g. the stages maps, and the excludes files), so that each one is
+parsed once per JVM, no matter how many comparisons or test runs use it.
+"""
+import java.io.IOException as JIOException
+import java.lang.Boolean as JBoolean
+import java.lang.Thread as JThread
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import FileUtils
+from oracle.weblogic.deploy.util import TranslateException
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling
+from wlsdeploy.json.json_translator import JsonStreamToPython
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import model_cache
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'config_registry'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# When this Java system property is set to "true", the last modified time of a
+# resource is checked every time it's asked for, and a resource that changed is
+# parsed again. This is only useful when the resources are on the file system
+# (e.g. when running from a development tree), so it's off by default.
+CHECK_MODIFIED_PROPERTY = 'wlsdeploy.testing.config_registry.check_modified'
+
+_config_registry = None
+_config_registry_lock = JReentrantLock()
+
+
+def get_config_registry():
+    """
+    Returns the process-wide ConfigRegistry, creating it the first time.
+    """
+    global _config_registry
+
+    _config_registry_lock.lock()
+    try:
+        if _config_registry is None:
+            _config_registry = ConfigRegistry()
+    finally:
+        _config_registry_lock.unlock()
+    return _config_registry
+
+
+class ConfigRegistry(object):
+    """
+    Parses JSON configuration resources once, and hands them out either as read-only
+    ConfigViews, which share the parsed dictionary, or as copies the caller can change.
+    The number of times each resource was parsed is counted, so that it can be checked
+    that there is one parse per resource per process.
+    """
+    _class_name = 'ConfigRegistry'
+
+    def __init__(self, check_modified=None, logger=None):
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if check_modified is None:
+            check_modified = JBoolean.getBoolean(CHECK_MODIFIED_PROPERTY)
+        self._check_modified = check_modified
+
+        # resource path -> _ConfigEntry
+        self._entries = {}
+        # resource path -> number of times it was parsed
+        self._parse_counts = {}
+        self._lock = JReentrantLock()
+
+    def get_config(self, resource_path, logger=None):
+        """
+        Returns a read-only view of the parsed resource. The view is shared with
+        every other caller, so it cannot be changed.
+
+        :param resource_path: The path of the resource (e.g. testdefs/user_defined_stages.json)
+        :param logger: The PlatformLogger to use, or None to use the registry's
+        :return: A ConfigView of the resource's dictionary
+        :raises TestingException: if the resource doesn't exist, or cannot be translated
+        """
+        return self.__get_entry(resource_path, logger).view
+
+    def get_config_copy(self, resource_path, logger=None):
+        """
+        Returns a new copy of the parsed resource's dictionary, for callers that
+        change it.
+
+        :param resource_path: The path of the resource
+        :param logger: The PlatformLogger to use, or None to use the registry's
+        :return: A Python dictionary that belongs to the caller
+        :raises TestingException: if the resource doesn't exist, or cannot be translated
+        """
+        return model_cache.decode_model(self.__get_entry(resource_path, logger).encoded)
+
+    def get_parse_count(self, resource_path):
+        """
+        Returns the number of times resource_path was parsed in this process.
+        """
+        self._lock.lock()
+        try:
+            return self._parse_counts.get(resource_path, 0)
+        finally:
+            self._lock.unlock()
+
+    def get_parse_counts(self):
+        """
+        Returns a dictionary of resource path -> number of times it was parsed in this process.
+        """
+        self._lock.lock()
+        try:
+            return self._parse_counts.copy()
+        finally:
+            self._lock.unlock()
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __get_entry(self, resource_path, logger):
+        _method_name = '__get_entry'
+
+        if logger is None:
+            logger = self._logger
+
+        self._lock.lock()
+        try:
+            entry = self._entries.get(resource_path)
+            last_modified = None
+            if self._check_modified:
+                last_modified = _get_last_modified(resource_path)
+                if entry is not None and entry.last_modified != last_modified:
+                    entry = None
+
+            if entry is None:
+                config_dict = _parse_resource(resource_path, logger)
+                entry = _ConfigEntry(config_dict, last_modified)
+                self._entries[resource_path] = entry
+                parse_count = self._parse_counts.get(resource_path, 0) + 1
+                self._parse_counts[resource_path] = parse_count
+                logger.fine('WLSDPLY-09956', resource_path, parse_count,
+                            class_name=self._class_name, method_name=_method_name)
+        finally:
+            self._lock.unlock()
+        return entry
+
+
+class _ConfigEntry(object):
+    def __init__(self, config_dict, last_modified):
+        self.view = ConfigView(config_dict)
+        self.encoded = model_cache.encode_model(config_dict)
+        self.last_modified = last_modified
+
+
+class ConfigView(object):
+    """
+    A read-only view of a parsed configuration dictionary. It supports the dictionary
+    read operations. Folder values are returned as ConfigViews, and list values as
+    tuples, so nothing below the view can be changed either.
+    """
+    def __init__(self, config_dict):
+        self._config_dict = config_dict
+
+    def __getitem__(self, key):
+        return _to_view(self._config_dict[key])
+
+    def __contains__(self, key):
+        return key in self._config_dict
+
+    def __iter__(self):
+        return iter(self._config_dict.keys())
+
+    def __len__(self):
+        return len(self._config_dict)
+
+    def has_key(self, key):
+        return key in self._config_dict
+
+    def get(self, key, default=None):
+        if key in self._config_dict:
+            return _to_view(self._config_dict[key])
+        return default
+
+    def keys(self):
+        return list(self._config_dict.keys())
+
+    def values(self):
+        values = []
+        for value in self._config_dict.values():
+            values.append(_to_view(value))
+        return values
+
+    def items(self):
+        items = []
+        for key, value in self._config_dict.items():
+            items.append((key, _to_view(value)))
+        return items
+
+    def iteritems(self):
+        return iter(self.items())
+
+
+def _to_view(value):
+    if isinstance(value, dict):
+        return ConfigView(value)
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            items.append(_to_view(item))
+        return tuple(items)
+    return value
+
+
+def _get_last_modified(resource_path):
+    """
+    Returns the last modified time of the resource, or None if it isn't known.
+    """
+    url = JThread.currentThread().getContextClassLoader().getResource(resource_path)
+    if url is None:
+        return None
+    try:
+        connection = url.openConnection()
+        connection.setUseCaches(False)
+        last_modified = connection.getLastModified()
+        connection.getInputStream().close()
+    except JIOException:
+        return None
+    return last_modified
+
+
+def _parse_resource(resource_path, logger):
+    _method_name = '_parse_resource'
+
+    json_inputstream = FileUtils.getResourceAsStream(resource_path)
+    if json_inputstream is None:
+        ex = exception_helper.create_testing_exception('WLSDPLY-09824', resource_path)
+        logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+        raise ex
+
+    try:
+        try:
+            return JsonStreamToPython(resource_path, json_inputstream, True).parse()
+        except TranslateException, te:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09807', resource_path,
+                                                           te.getLocalizedMessage(), error=te)
+            logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+            raise ex
+    finally:
+        json_inputstream.close()
@@ -0,0 +1,514 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+A cache of snapshots of the domain homes built by the create_domain stage, so
+that a domain whose inputs haven't changed since it was last built is copied
+into place, instead of being created again.
+"""
+import jarray
+
+import java.io.File as JFile
+import java.io.FileInputStream as JFileInputStream
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.lang.Long as JLong
+import java.lang.ProcessBuilder as JProcessBuilder
+import java.lang.String as JString
+import java.lang.System as JSystem
+import java.lang.UnsupportedOperationException as JUnsupportedOperationException
+import java.nio.file.CopyOption as JCopyOption
+import java.nio.file.Files as JFiles
+import java.nio.file.LinkOption as JLinkOption
+import java.nio.file.StandardCopyOption as JStandardCopyOption
+import java.nio.file.attribute.FileAttribute as JFileAttribute
+import java.security.MessageDigest as JMessageDigest
+import java.util.Properties as JProperties
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import WebLogicDeployToolingVersion
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'domain_snapshot_cache'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# Java system properties used to configure the cache. Domain homes are big, so
+# the cache is only used when it is enabled.
+ENABLED_PROPERTY = 'wlsdeploy.testing.domain_cache.enabled'
+DIR_PROPERTY = 'wlsdeploy.testing.domain_cache.dir'
+MAX_BYTES_PROPERTY = 'wlsdeploy.testing.domain_cache.max_bytes'
+LINK_FILES_PROPERTY = 'wlsdeploy.testing.domain_cache.link_files'
+
+_DEFAULT_DIR_NAME = 'wdt-ct-domain-cache'
+_DEFAULT_MAX_BYTES = 8 * 1024 * 1024 * 1024L
+
+# Bump this whenever the layout of a snapshot changes, so that snapshots
+# stored by an older version are never restored.
+_FORMAT_VERSION = '1'
+_SNAPSHOT_DOMAIN_DIR_NAME = 'domain'
+_SNAPSHOT_PROPERTIES_FILE_NAME = 'snapshot.properties'
+_DOMAIN_NAME_PROPERTY = 'domain_name'
+_SIZE_PROPERTY = 'size'
+_TMP_DIR_PREFIX = '.'
+# Temporary directories left behind by a process that died while storing
+# a snapshot are deleted once they are this old.
+_STALE_TMP_DIR_MILLIS = 24 * 60 * 60 * 1000L
+_READ_BUFFER_SIZE = 65536
+
+_COPY_OPTIONS = jarray.array([JStandardCopyOption.COPY_ATTRIBUTES, JLinkOption.NOFOLLOW_LINKS], JCopyOption)
+_NO_FOLLOW_LINKS = jarray.array([JLinkOption.NOFOLLOW_LINKS], JLinkOption)
+_NO_FILE_ATTRIBUTES = jarray.array([], JFileAttribute)
+
+_domain_snapshot_cache = None
+_domain_snapshot_cache_lock = JReentrantLock()
+
+# Whether "cp --reflink=auto" can be used to copy trees, or None until it's been tried
+_reflink_copy_supported = None
+
+
+def get_domain_snapshot_cache():
+    """
+    Returns the process-wide DomainSnapshotCache, creating it the first time, or None
+    if the wlsdeploy.testing.domain_cache.enabled property isn't set to true.
+    """
+    global _domain_snapshot_cache
+
+    _domain_snapshot_cache_lock.lock()
+    try:
+        if _domain_snapshot_cache is None:
+            if JSystem.getProperty(ENABLED_PROPERTY, 'false').lower() == 'true':
+                _domain_snapshot_cache = DomainSnapshotCache()
+    finally:
+        _domain_snapshot_cache_lock.unlock()
+    return _domain_snapshot_cache
+
+
+class DomainSnapshotCache(object):
+    """
+    A directory of domain home snapshots, keyed by the SHA-256 digest of the inputs
+    the domain was built from: the tool and its arguments (e.g. oracle_home,
+    domain_parent and domain_type), and the bytes of the model, archive and variable
+    files, rather than their paths. The WebLogic Deploy Tooling version is part of
+    the key, so an upgraded tool always results in a miss.
+
+    Each snapshot is a <key> directory, holding a copy of the domain home and a
+    snapshot.properties file with the domain's directory name and size. Snapshots
+    are stored under a temporary name and renamed into place, so a snapshot that
+    can be seen is always complete. When the total size of the snapshots grows
+    past the limit, the least recently used ones are deleted.
+
+    Trees are copied with "cp -a --reflink=auto" where it is available, so that
+    file systems with copy-on-write support (e.g. btrfs, XFS) share the blocks,
+    and the hard links in the tree are kept. Otherwise, they are copied file by
+    file. When wlsdeploy.testing.domain_cache.link_files is set to true, the files
+    of a restored domain are hard links to the snapshot's files instead, which is
+    much faster, but is only safe when the later stages don't change the domain's
+    files in place.
+    """
+    _class_name = 'DomainSnapshotCache'
+
+    def __init__(self, cache_dir=None, max_bytes=None, link_files=None, logger=None):
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if cache_dir is None:
+            cache_dir = JSystem.getProperty(DIR_PROPERTY)
+        if cache_dir is None:
+            cache_dir = JFile(JSystem.getProperty('java.io.tmpdir'), _DEFAULT_DIR_NAME).getAbsolutePath()
+        self._cache_dir = JFile(str(cache_dir))
+
+        if max_bytes is None:
+            max_bytes = JLong.getLong(MAX_BYTES_PROPERTY, _DEFAULT_MAX_BYTES)
+        self._max_bytes = max_bytes
+
+        if link_files is None:
+            link_files = JSystem.getProperty(LINK_FILES_PROPERTY, 'false').lower() == 'true'
+        self._link_files = link_files
+
+        self._key_prefix = '%s:%s:' % (WebLogicDeployToolingVersion.getVersion(), _FORMAT_VERSION)
+        self._lock = JReentrantLock()
+
+    def get_cache_dir(self):
+        return self._cache_dir
+
+    def get_key(self, tool_name, tool_args, content_switches):
+        """
+        Returns the key of the domain built by running tool_name with tool_args.
+
+        :param tool_name: The name of the tool module, or the path of the script, that builds the domain
+        :param tool_args: The arguments passed to the tool
+        :param content_switches: The switches in tool_args whose values are files, that go into
+                                 the key by their bytes, instead of their paths
+        :return: The hex SHA-256 digest of the inputs, or None if one of the files can't be read
+        """
+        _method_name = 'get_key'
+
+        digest = JMessageDigest.getInstance('SHA-256')
+        _update_digest(digest, self._key_prefix)
+        _update_digest(digest, tool_name)
+
+        i = 0
+        while i < len(tool_args):
+            arg = str(tool_args[i])
+            _update_digest(digest, arg)
+            if arg in content_switches and i + 1 < len(tool_args):
+                i += 1
+                try:
+                    _update_digest_from_file(digest, JFile(str(tool_args[i])))
+                except JIOException, ioe:
+                    self._logger.fine('WLSDPLY-09982', tool_args[i], ioe.getLocalizedMessage(),
+                                      class_name=self._class_name, method_name=_method_name)
+                    return None
+            i += 1
+
+        hex_chars = []
+        for b in digest.digest():
+            hex_chars.append('%02x' % (b & 0xff))
+        return ''.join(hex_chars)
+
+    def list_domain_names(self, domain_parent):
+        """
+        Returns the names of the directories in domain_parent, so that the one the domain
+        is created in can be found afterwards, if its name isn't known up front.
+        """
+        names = JFile(str(domain_parent)).list()
+        if names is None:
+            return []
+        return list(names)
+
+    def restore(self, key, domain_parent):
+        """
+        Copies the snapshot with the key to domain_parent, if there is one, and
+        the domain's directory doesn't already have something in it.
+
+        :param key: The key returned by get_key()
+        :param domain_parent: The directory to put the domain home in
+        :return: True if the domain home was restored, otherwise False
+        """
+        _method_name = 'restore'
+
+        snapshot_dir = JFile(self._cache_dir, key)
+        properties_file = JFile(snapshot_dir, _SNAPSHOT_PROPERTIES_FILE_NAME)
+        properties = _load_properties(properties_file)
+        if properties is None:
+            self._logger.fine('WLSDPLY-09975', key, self._cache_dir.getAbsolutePath(),
+                              class_name=self._class_name, method_name=_method_name)
+            return False
+
+        domain_home = JFile(str(domain_parent), properties.getProperty(_DOMAIN_NAME_PROPERTY))
+        names = domain_home.list()
+        if names is not None and len(names) > 0:
+            self._logger.fine('WLSDPLY-09976', key, domain_home.getAbsolutePath(),
+                              class_name=self._class_name, method_name=_method_name)
+            return False
+
+        start = JSystem.currentTimeMillis()
+        try:
+            _delete_tree(domain_home)
+            _copy_tree(JFile(snapshot_dir, _SNAPSHOT_DOMAIN_DIR_NAME), domain_home, self._link_files)
+        except JIOException, ioe:
+            # e.g. another process deleted the snapshot while it was being copied
+            self._logger.warning('WLSDPLY-09977', key, domain_home.getAbsolutePath(), ioe.getLocalizedMessage(),
+                                 class_name=self._class_name, method_name=_method_name)
+            try:
+                _delete_tree(domain_home)
+            except JIOException:
+                pass
+            return False
+
+        # Used as the "last used" time when the cache is trimmed
+        properties_file.setLastModified(JSystem.currentTimeMillis())
+
+        self._logger.info('WLSDPLY-09978', domain_home.getAbsolutePath(), key,
+                          JSystem.currentTimeMillis() - start,
+                          class_name=self._class_name, method_name=_method_name)
+        return True
+
+    def store(self, key, domain_parent, domain_name=None, existing_names=None):
+        """
+        Stores a snapshot of the domain home that was just created in domain_parent,
+        and trims the cache. Nothing is stored if the domain home can't be found, and a
+        domain home that can't be copied is logged, rather than raised, because the
+        domain itself was created.
+
+        :param key: The key returned by get_key(), before the domain was created
+        :param domain_parent: The directory the domain home was created in
+        :param domain_name: The name of the domain home's directory, or None if it isn't known
+        :param existing_names: The list_domain_names() of domain_parent before the domain was
+                               created, used to find the domain home when it isn't in domain_name
+        """
+        _method_name = 'store'
+
+        domain_home = None
+        if domain_name is not None:
+            domain_home = JFile(str(domain_parent), str(domain_name))
+        if (domain_home is None or not domain_home.isDirectory()) and existing_names is not None:
+            new_names = []
+            for name in self.list_domain_names(domain_parent):
+                if name not in existing_names:
+                    new_names.append(name)
+            if len(new_names) == 1:
+                domain_home = JFile(str(domain_parent), new_names[0])
+        if domain_home is None or not domain_home.isDirectory():
+            self._logger.fine('WLSDPLY-09979', domain_parent, key,
+                              class_name=self._class_name, method_name=_method_name)
+            return
+
+        snapshot_dir = JFile(self._cache_dir, key)
+        tmp_dir = JFile(self._cache_dir, '%s%s.%d' % (_TMP_DIR_PREFIX, key, JSystem.nanoTime()))
+        try:
+            try:
+                if not self._cache_dir.isDirectory():
+                    self._cache_dir.mkdirs()
+                # The domain goes on changing after it is created, so the snapshot
+                # is always a copy, never hard links
+                _copy_tree(domain_home, JFile(tmp_dir, _SNAPSHOT_DOMAIN_DIR_NAME), False)
+                size = _get_tree_size(tmp_dir)
+
+                properties = JProperties()
+                properties.setProperty(_DOMAIN_NAME_PROPERTY, domain_home.getName())
+                properties.setProperty(_SIZE_PROPERTY, str(size))
+                _store_properties(properties, JFile(tmp_dir, _SNAPSHOT_PROPERTIES_FILE_NAME))
+
+                # Another thread or process may have stored the same snapshot,
+                # which is fine, because it has the same content
+                if not snapshot_dir.exists() and tmp_dir.renameTo(snapshot_dir):
+                    self._logger.info('WLSDPLY-09980', domain_home.getAbsolutePath(), key, size,
+                                      class_name=self._class_name, method_name=_method_name)
+            except JIOException, ioe:
+                self._logger.warning('WLSDPLY-09981', domain_home.getAbsolutePath(), key, ioe.getLocalizedMessage(),
+                                     class_name=self._class_name, method_name=_method_name)
+        finally:
+            try:
+                _delete_tree(tmp_dir)
+            except JIOException:
+                pass
+
+        self.__trim_snapshots()
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __trim_snapshots(self):
+        """
+        Deletes the least recently used snapshots, until their total size is under
+        the limit, along with any stale temporary directories.
+        """
+        _method_name = '__trim_snapshots'
+
+        self._lock.lock()
+        try:
+            cache_entries = self._cache_dir.listFiles()
+            if cache_entries is None:
+                return
+
+            now = JSystem.currentTimeMillis()
+            total_bytes = 0
+            snapshots = []
+            for cache_entry in cache_entries:
+                if cache_entry.getName().startswith(_TMP_DIR_PREFIX):
+                    if now - cache_entry.lastModified() > _STALE_TMP_DIR_MILLIS:
+                        _delete_tree_quietly(cache_entry)
+                    continue
+
+                properties_file = JFile(cache_entry, _SNAPSHOT_PROPERTIES_FILE_NAME)
+                properties = _load_properties(properties_file)
+                if properties is None:
+                    continue
+                size = JLong.parseLong(properties.getProperty(_SIZE_PROPERTY, '0'))
+                total_bytes += size
+                snapshots.append((properties_file.lastModified(), size, cache_entry))
+
+            if total_bytes <= self._max_bytes:
+                return
+
+            snapshots.sort()
+            for last_used, size, snapshot_dir in snapshots:
+                if total_bytes <= self._max_bytes:
+                    break
+                if _delete_tree_quietly(snapshot_dir):
+                    total_bytes -= size
+                    self._logger.fine('WLSDPLY-09983', snapshot_dir.getName(), size, self._max_bytes,
+                                      class_name=self._class_name, method_name=_method_name)
+        finally:
+            self._lock.unlock()
+        return
+
+
+def _update_digest(digest, value):
+    # the terminator keeps ['ab', 'c'] and ['a', 'bc'] from having the same digest
+    digest.update(JString(str(value) + '\0').getBytes('UTF-8'))
+    return
+
+
+def _update_digest_from_file(digest, j_file):
+    stream = JFileInputStream(j_file)
+    try:
+        buf = jarray.zeros(_READ_BUFFER_SIZE, 'b')
+        count = stream.read(buf)
+        while count > 0:
+            digest.update(buf, 0, count)
+            count = stream.read(buf)
+    finally:
+        stream.close()
+    _update_digest(digest, j_file.length())
+    return
+
+
+def _load_properties(properties_file):
+    """
+    Returns the Properties in properties_file, or None if it can't be read.
+    """
+    if not properties_file.isFile():
+        return None
+
+    properties = JProperties()
+    try:
+        stream = JFileInputStream(properties_file)
+        try:
+            properties.load(stream)
+        finally:
+            stream.close()
+    except JIOException:
+        return None
+    return properties
+
+
+def _store_properties(properties, properties_file):
+    stream = JFileOutputStream(properties_file)
+    try:
+        properties.store(stream, None)
+    finally:
+        stream.close()
+    return
+
+
+def _copy_tree(source_dir, target_dir, link_files):
+    """
+    Copies source_dir to target_dir, which must not exist yet.
+
+    :raises IOException: if the tree can't be copied
+    """
+    global _reflink_copy_supported
+
+    parent_dir = target_dir.getAbsoluteFile().getParentFile()
+    if parent_dir is not None and not parent_dir.isDirectory():
+        parent_dir.mkdirs()
+
+    if not link_files and _reflink_copy_supported is not False:
+        if _copy_tree_with_cp(source_dir, target_dir):
+            _reflink_copy_supported = True
+            return
+        _delete_tree(target_dir)
+        if _reflink_copy_supported is None:
+            _reflink_copy_supported = False
+
+    _copy_entry(source_dir, target_dir, link_files)
+    return
+
+
+def _copy_tree_with_cp(source_dir, target_dir):
+    """
+    Returns True if "cp -a --reflink=auto" copied source_dir to target_dir.
+    """
+    if JFile.separator != '/':
+        return False
+
+    command = ['cp', '-a', '--reflink=auto', source_dir.getAbsolutePath(), target_dir.getAbsolutePath()]
+    try:
+        process_builder = JProcessBuilder(jarray.array(command, JString))
+        process_builder.redirectErrorStream(True)
+        process = process_builder.start()
+        stream = process.getInputStream()
+        try:
+            buf = jarray.zeros(_READ_BUFFER_SIZE, 'b')
+            while stream.read(buf) >= 0:
+                pass
+        finally:
+            stream.close()
+        return process.waitFor() == 0
+    except JIOException:
+        return False
+
+
+def _copy_entry(source, target, link_files):
+    """
+    Copies source to target, one file at a time, keeping symbolic links as links,
+    and hard linking the files instead of copying them, when link_files is True
+    and the file system allows it.
+
+    :return: the link_files value to use for the rest of the tree
+    """
+    source_path = source.toPath()
+    target_path = target.toPath()
+
+    if JFiles.isSymbolicLink(source_path):
+        JFiles.createSymbolicLink(target_path, JFiles.readSymbolicLink(source_path), _NO_FILE_ATTRIBUTES)
+    elif JFiles.isDirectory(source_path, _NO_FOLLOW_LINKS):
+        if not target.mkdir():
+            raise JIOException(target.getAbsolutePath())
+        names = list(source.list())
+        names.sort()
+        for name in names:
+            link_files = _copy_entry(JFile(source, name), JFile(target, name), link_files)
+        target.setLastModified(source.lastModified())
+    else:
+        if link_files:
+            try:
+                JFiles.createLink(target_path, source_path)
+                return link_files
+            except JUnsupportedOperationException:
+                link_files = False
+            except JIOException:
+                # e.g. the snapshot is on another file system
+                link_files = False
+        JFiles.copy(source_path, target_path, _COPY_OPTIONS)
+    return link_files
+
+
+def _get_tree_size(j_file):
+    """
+    Returns the total size of the files in the tree, not following symbolic links.
+    """
+    if JFiles.isSymbolicLink(j_file.toPath()):
+        return 0
+    if j_file.isDirectory():
+        size = 0
+        for child in j_file.listFiles():
+            size += _get_tree_size(child)
+        return size
+    return j_file.length()
+
+
+def _delete_tree(j_file):
+    """
+    Deletes j_file, and everything under it, without following symbolic links.
+
+    :raises IOException: if something can't be deleted
+    """
+    path = j_file.toPath()
+    if not JFiles.isSymbolicLink(path) and j_file.isDirectory():
+        for child in j_file.listFiles():
+            _delete_tree(child)
+    JFiles.deleteIfExists(path)
+    return
+
+
+def _delete_tree_quietly(j_file):
+    try:
+        _delete_tree(j_file)
+    except JIOException:
+        return False
+    return True
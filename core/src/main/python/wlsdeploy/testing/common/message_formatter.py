@@ -0,0 +1,110 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+Formats the messages in the testing resource bundle, loading the bundle once, and
+compiling the MessageFormat of each message once.
+"""
+import jarray
+
+import java.lang.Integer as JInteger
+import java.lang.Object as JObject
+import java.lang.StringBuffer as JStringBuffer
+import java.text.FieldPosition as JFieldPosition
+import java.text.MessageFormat as JMessageFormat
+import java.util.LinkedHashMap as JLinkedHashMap
+import java.util.ResourceBundle as JResourceBundle
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# Java system property used to configure the formatter
+MAX_ENTRIES_PROPERTY = 'wlsdeploy.testing.message_formatter.max_entries'
+
+_DEFAULT_MAX_ENTRIES = 512
+
+_message_formatter = None
+_message_formatter_lock = JReentrantLock()
+
+
+def get_message_formatter():
+    """
+    Returns the process-wide MessageFormatter, creating it the first time.
+    """
+    global _message_formatter
+
+    _message_formatter_lock.lock()
+    try:
+        if _message_formatter is None:
+            _message_formatter = MessageFormatter()
+    finally:
+        _message_formatter_lock.unlock()
+    return _message_formatter
+
+
+class MessageFormatter(object):
+    """
+    Formats messages from a ResourceBundle, keeping an LRU map of message key ->
+    compiled MessageFormat, limited by the number of entries.
+
+    A MessageFormat isn't thread-safe, so the map, and every use of the formats
+    in it, is guarded by a lock. Formatting a message takes much less time than
+    compiling its MessageFormat, so stages running in parallel can share one
+    MessageFormatter.
+    """
+    _class_name = 'MessageFormatter'
+
+    def __init__(self, resource_bundle_name=None, max_entries=None):
+        if resource_bundle_name is None:
+            resource_bundle_name = TestingConstants.RESOURCE_BUNDLE_NAME
+        self._bundle = JResourceBundle.getBundle(resource_bundle_name)
+
+        if max_entries is None:
+            max_entries = JInteger.getInteger(MAX_ENTRIES_PROPERTY, _DEFAULT_MAX_ENTRIES)
+        self._max_entries = max_entries
+
+        # access-ordered, so iteration starts at the least recently used entry
+        self._formats = JLinkedHashMap(16, 0.75, True)
+        self._lock = JReentrantLock()
+
+    def get_bundle(self):
+        return self._bundle
+
+    def format(self, key, *args):
+        """
+        Returns the message for key, with args filled in. Like MessageFormat.format(),
+        except that a message without args is returned as is.
+
+        :param key: The message key
+        :param args: The arguments for the message
+        :return: The formatted message
+        :raises MissingResourceException: if there is no message for key
+        """
+        if len(args) == 0:
+            return self._bundle.getString(key)
+
+        self._lock.lock()
+        try:
+            message_format = self._formats.get(key)
+            if message_format is None:
+                message_format = JMessageFormat(self._bundle.getString(key))
+                self._formats.put(key, message_format)
+                if self._formats.size() > self._max_entries:
+                    iterator = self._formats.entrySet().iterator()
+                    iterator.next()
+                    iterator.remove()
+            result = message_format.format(jarray.array(list(args), JObject), JStringBuffer(), JFieldPosition(0))
+            return result.toString()
+        finally:
+            self._lock.unlock()
+
+    def get_formats_count(self):
+        """
+        Returns the number of compiled MessageFormats that are cached.
+        """
+        self._lock.lock()
+        try:
+            return self._formats.size()
+        finally:
+            self._lock.unlock()
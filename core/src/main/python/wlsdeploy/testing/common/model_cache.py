@@ -0,0 +1,587 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+A cache of parsed model (and other YAML/JSON) files, so that the same file
+doesn't go through FileToPython more than once.
+"""
+import jarray
+
+import java.io.ByteArrayInputStream as JByteArrayInputStream
+import java.io.ByteArrayOutputStream as JByteArrayOutputStream
+import java.io.DataInputStream as JDataInputStream
+import java.io.DataOutputStream as JDataOutputStream
+import java.io.File as JFile
+import java.io.FileInputStream as JFileInputStream
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.lang.Long as JLong
+import java.lang.String as JString
+import java.lang.System as JSystem
+import java.nio.file.Files as JFiles
+import java.nio.file.LinkOption as JLinkOption
+import java.nio.file.attribute.FileAttribute as JFileAttribute
+import java.nio.file.attribute.PosixFilePermission as JPosixFilePermission
+import java.nio.file.attribute.PosixFilePermissions as JPosixFilePermissions
+import java.security.MessageDigest as JMessageDigest
+import java.util.LinkedHashMap as JLinkedHashMap
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import PyOrderedDict
+from oracle.weblogic.deploy.util import WebLogicDeployToolingVersion
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling
+from wlsdeploy.util.model_translator import FileToPython
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'model_cache'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# Java system properties used to configure the cache
+ENABLED_PROPERTY = 'wlsdeploy.testing.model_cache.enabled'
+DIR_PROPERTY = 'wlsdeploy.testing.model_cache.dir'
+MAX_MEMORY_BYTES_PROPERTY = 'wlsdeploy.testing.model_cache.max_memory_bytes'
+MAX_DISK_BYTES_PROPERTY = 'wlsdeploy.testing.model_cache.max_disk_bytes'
+
+_DEFAULT_DIR_NAME = 'wdt-ct-model-cache'
+_USER_NAME_PROPERTY = 'user.name'
+_DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+_DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+# Bump this whenever the encoding below changes, so that entries
+# written by an older version are never read back.
+_FORMAT_VERSION = '2'
+_CACHE_FILE_SUFFIX = '.model'
+_READ_BUFFER_SIZE = 65536
+
+_DICT = 0x44
+_LIST = 0x4c
+_STRING = 0x53
+_INT = 0x49
+_LONG = 0x4a
+_BIG_LONG = 0x42
+_FLOAT = 0x46
+_TRUE = 0x54
+_FALSE = 0x66
+_NONE = 0x4e
+
+_MIN_INT = -2147483648
+_MAX_INT = 2147483647
+_MIN_LONG = -9223372036854775808L
+_MAX_LONG = 9223372036854775807L
+
+# The cache directory is only used if no one else can write to it, because the
+# entries in it are trusted to be what the model files they are keyed by parse to
+_POSIX_VIEW = 'posix'
+_OWNER_ONLY_PERMISSIONS = 'rwx------'
+_OTHERS_WRITE_PERMISSIONS = [JPosixFilePermission.GROUP_WRITE, JPosixFilePermission.OTHERS_WRITE]
+_NO_FOLLOW_LINKS = jarray.array([JLinkOption.NOFOLLOW_LINKS], JLinkOption)
+
+_model_cache = None
+_model_cache_lock = JReentrantLock()
+
+
+def get_model_cache():
+    """
+    Returns the process-wide ModelCache, creating it the first time.
+    """
+    global _model_cache
+
+    _model_cache_lock.lock()
+    try:
+        if _model_cache is None:
+            _model_cache = ModelCache()
+    finally:
+        _model_cache_lock.unlock()
+    return _model_cache
+
+
+class ModelCache(object):
+    """
+    Two-level cache of parsed YAML/JSON files.
+
+    Entries are keyed by the SHA-256 digest of the file's bytes, together with
+    the WebLogic Deploy Tooling version (whose FileToPython does the parsing)
+    and the version of the encoding used here. So an edited file, or an upgraded
+    parser, always results in a miss, regardless of file names or timestamps.
+
+    The parsed dictionary is stored in a compact binary encoding, rather than as
+    the dictionary itself. Decoding is much faster than parsing YAML, and gives
+    every caller its own copy, so callers can change the dictionary they get
+    back (e.g. applying variable substitutions) without affecting anyone else.
+
+    The first level is an in-memory LRU map, limited by the total size of the
+    encoded entries. The second level is a directory of <key>.model files,
+    which outlives the process. When it grows past its size limit, the least
+    recently used files are deleted.
+
+    The keys can be computed by anyone who can read the model files, so the
+    directory is only used if it belongs to the user running the tool, and no
+    one else can write to it. By default it is a directory of that user's in
+    java.io.tmpdir, that is created readable by that user only. Otherwise the
+    files are only cached in memory.
+    """
+    _class_name = 'ModelCache'
+
+    def __init__(self, cache_dir=None, max_memory_bytes=None, max_disk_bytes=None, enabled=None, logger=None):
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if enabled is None:
+            enabled = JSystem.getProperty(ENABLED_PROPERTY, 'true').lower() != 'false'
+        self._enabled = enabled
+
+        if cache_dir is None:
+            cache_dir = JSystem.getProperty(DIR_PROPERTY)
+        if cache_dir is None:
+            cache_dir = JFile(JSystem.getProperty('java.io.tmpdir'),
+                              '%s-%s' % (_DEFAULT_DIR_NAME, JSystem.getProperty(_USER_NAME_PROPERTY))).getAbsolutePath()
+        self._cache_dir = JFile(str(cache_dir))
+        # None until the cache directory has been checked
+        self._disk_enabled = None
+
+        if max_memory_bytes is None:
+            max_memory_bytes = JLong.getLong(MAX_MEMORY_BYTES_PROPERTY, _DEFAULT_MAX_MEMORY_BYTES)
+        self._max_memory_bytes = max_memory_bytes
+
+        if max_disk_bytes is None:
+            max_disk_bytes = JLong.getLong(MAX_DISK_BYTES_PROPERTY, _DEFAULT_MAX_DISK_BYTES)
+        self._max_disk_bytes = max_disk_bytes
+
+        self._key_prefix = '%s:%s:' % (WebLogicDeployToolingVersion.getVersion(), _FORMAT_VERSION)
+
+        # access-ordered, so iteration starts at the least recently used entry
+        self._memory_entries = JLinkedHashMap(16, 0.75, True)
+        self._memory_bytes = 0
+        self._lock = JReentrantLock()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._parse_millis = 0L
+        self._load_millis = 0L
+
+    def is_enabled(self):
+        return self._enabled
+
+    def get_cache_dir(self):
+        return self._cache_dir
+
+    def parse(self, file_path):
+        """
+        Returns the Python dictionary for the YAML/JSON file at file_path, just like
+        FileToPython(file_path, True).parse() does, but from the cache, when possible.
+
+        :param file_path: The path of the file to parse
+        :return: A Python dictionary, which belongs to the caller
+        :raises TranslateException: if the file has to be parsed, and it cannot be
+        """
+        _method_name = 'parse'
+
+        file_path = str(file_path)
+        if not self._enabled:
+            return FileToPython(file_path, True).parse()
+
+        start = JSystem.currentTimeMillis()
+        key = self.__get_key(file_path)
+        if key is None:
+            # The file couldn't be read, so let FileToPython report why
+            return FileToPython(file_path, True).parse()
+
+        encoded = self.__get_memory_entry(key)
+        if encoded is not None:
+            self.__count('_memory_hits', start)
+        else:
+            encoded = self.__read_disk_entry(key)
+            if encoded is not None:
+                self.__put_memory_entry(key, encoded)
+                self.__count('_disk_hits', start)
+
+        if encoded is not None:
+            self._logger.finer('WLSDPLY-09943', file_path, key, class_name=self._class_name, method_name=_method_name)
+            return decode_model(encoded)
+
+        model_dict = FileToPython(file_path, True).parse()
+        encoded = encode_model(model_dict)
+        self.__put_memory_entry(key, encoded)
+        self.__write_disk_entry(key, encoded)
+        self.__count('_misses', start)
+        self._logger.finer('WLSDPLY-09944', file_path, key, class_name=self._class_name, method_name=_method_name)
+        return model_dict
+
+    def get_statistics(self):
+        """
+        Returns a dictionary of the cache's hit and miss counters.
+        """
+        self._lock.lock()
+        try:
+            return {
+                'memory_hits': self._memory_hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'memory_entries': self._memory_entries.size(),
+                'memory_bytes': self._memory_bytes,
+                'load_millis': self._load_millis,
+                'parse_millis': self._parse_millis
+            }
+        finally:
+            self._lock.unlock()
+
+    def log_statistics(self, logger=None):
+        """
+        Logs the cache's hit and miss counters, if the cache was used.
+        """
+        _method_name = 'log_statistics'
+
+        if logger is None:
+            logger = self._logger
+
+        stats = self.get_statistics()
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        if lookups == 0:
+            return
+
+        logger.info('WLSDPLY-09945', lookups, stats['memory_hits'], stats['disk_hits'], stats['misses'],
+                    stats['load_millis'], stats['parse_millis'], self._cache_dir.getAbsolutePath(),
+                    class_name=self._class_name, method_name=_method_name)
+        return
+
+    def clear(self):
+        """
+        Removes all the entries from the in-memory level. The files in the
+        cache directory are left alone.
+        """
+        self._lock.lock()
+        try:
+            self._memory_entries.clear()
+            self._memory_bytes = 0
+        finally:
+            self._lock.unlock()
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __count(self, counter_name, start):
+        elapsed = JSystem.currentTimeMillis() - start
+        self._lock.lock()
+        try:
+            setattr(self, counter_name, getattr(self, counter_name) + 1)
+            if counter_name == '_misses':
+                self._parse_millis += elapsed
+            else:
+                self._load_millis += elapsed
+        finally:
+            self._lock.unlock()
+        return
+
+    def __get_key(self, file_path):
+        """
+        Returns the hex SHA-256 digest of the parser version plus the file's bytes,
+        or None if the file can't be read.
+        """
+        digest = JMessageDigest.getInstance('SHA-256')
+        digest.update(JString(self._key_prefix).getBytes('UTF-8'))
+
+        stream = None
+        try:
+            try:
+                stream = JFileInputStream(file_path)
+                buf = jarray.zeros(_READ_BUFFER_SIZE, 'b')
+                count = stream.read(buf)
+                while count > 0:
+                    digest.update(buf, 0, count)
+                    count = stream.read(buf)
+            except JIOException:
+                return None
+        finally:
+            if stream is not None:
+                stream.close()
+
+        hex_chars = []
+        for b in digest.digest():
+            hex_chars.append('%02x' % (b & 0xff))
+        return ''.join(hex_chars)
+
+    def __get_memory_entry(self, key):
+        self._lock.lock()
+        try:
+            return self._memory_entries.get(key)
+        finally:
+            self._lock.unlock()
+
+    def __put_memory_entry(self, key, encoded):
+        entry_size = len(encoded)
+        if entry_size > self._max_memory_bytes:
+            return
+
+        self._lock.lock()
+        try:
+            previous = self._memory_entries.put(key, encoded)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory_bytes += entry_size
+
+            iterator = self._memory_entries.entrySet().iterator()
+            while self._memory_bytes > self._max_memory_bytes and iterator.hasNext():
+                eldest = iterator.next()
+                self._memory_bytes -= len(eldest.getValue())
+                iterator.remove()
+        finally:
+            self._lock.unlock()
+        return
+
+    def __is_disk_enabled(self):
+        """
+        Returns True if the cache directory can be used, checking it, and creating
+        it if it doesn't exist, the first time.
+        """
+        _method_name = '__is_disk_enabled'
+
+        self._lock.lock()
+        try:
+            if self._disk_enabled is None:
+                message = _check_cache_dir(self._cache_dir)
+                self._disk_enabled = message is None
+                if message is not None:
+                    self._logger.warning(message[0], *message[1:],
+                                         **{'class_name': self._class_name, 'method_name': _method_name})
+            return self._disk_enabled
+        finally:
+            self._lock.unlock()
+
+    def __read_disk_entry(self, key):
+        _method_name = '__read_disk_entry'
+
+        if not self.__is_disk_enabled():
+            return None
+
+        cache_file = JFile(self._cache_dir, key + _CACHE_FILE_SUFFIX)
+        if not cache_file.isFile():
+            return None
+
+        encoded = jarray.zeros(cache_file.length(), 'b')
+        stream = None
+        try:
+            try:
+                stream = JDataInputStream(JFileInputStream(cache_file))
+                stream.readFully(encoded)
+            except JIOException, ioe:
+                self._logger.fine('WLSDPLY-09946', cache_file.getAbsolutePath(), ioe.getLocalizedMessage(),
+                                  class_name=self._class_name, method_name=_method_name)
+                return None
+        finally:
+            if stream is not None:
+                stream.close()
+
+        # Used as the "last used" time when the directory is trimmed
+        cache_file.setLastModified(JSystem.currentTimeMillis())
+        return encoded
+
+    def __write_disk_entry(self, key, encoded):
+        _method_name = '__write_disk_entry'
+
+        if len(encoded) > self._max_disk_bytes or not self.__is_disk_enabled():
+            return
+
+        cache_file = JFile(self._cache_dir, key + _CACHE_FILE_SUFFIX)
+        tmp_file = JFile(self._cache_dir, '%s.%d.tmp' % (key, JSystem.nanoTime()))
+        stream = None
+        try:
+            try:
+                stream = JFileOutputStream(tmp_file)
+                stream.write(encoded)
+                stream.close()
+                stream = None
+                # Another thread or process may have written the same entry,
+                # which is fine, because it has the same content
+                if not tmp_file.renameTo(cache_file):
+                    tmp_file.delete()
+            except JIOException, ioe:
+                self._logger.fine('WLSDPLY-09946', cache_file.getAbsolutePath(), ioe.getLocalizedMessage(),
+                                  class_name=self._class_name, method_name=_method_name)
+                tmp_file.delete()
+                return
+        finally:
+            if stream is not None:
+                stream.close()
+
+        self.__trim_disk_entries()
+        return
+
+    def __trim_disk_entries(self):
+        """
+        Deletes the least recently used cache files, until the total size
+        of the cache directory is under the limit.
+        """
+        cache_files = self._cache_dir.listFiles()
+        if cache_files is None:
+            return
+
+        total_bytes = 0
+        entries = []
+        for cache_file in cache_files:
+            if cache_file.getName().endswith(_CACHE_FILE_SUFFIX):
+                total_bytes += cache_file.length()
+                entries.append((cache_file.lastModified(), cache_file))
+
+        if total_bytes <= self._max_disk_bytes:
+            return
+
+        entries.sort()
+        for last_modified, cache_file in entries:
+            if total_bytes <= self._max_disk_bytes:
+                break
+            length = cache_file.length()
+            if cache_file.delete():
+                total_bytes -= length
+        return
+
+
+def _check_cache_dir(cache_dir):
+    """
+    Creates the cache directory, readable by its owner only, if it doesn't exist,
+    and checks that no one else can have put entries in it.
+
+    :param cache_dir: The cache directory
+    :return: None if the directory can be used, otherwise a list of the key and
+             arguments of the message that says why it can't be
+    """
+    path = cache_dir.toPath()
+    posix = path.getFileSystem().supportedFileAttributeViews().contains(_POSIX_VIEW)
+    try:
+        if not cache_dir.exists():
+            if posix:
+                permissions = JPosixFilePermissions.asFileAttribute(
+                    JPosixFilePermissions.fromString(_OWNER_ONLY_PERMISSIONS))
+                JFiles.createDirectories(path, jarray.array([permissions], JFileAttribute))
+            else:
+                JFiles.createDirectories(path, jarray.array([], JFileAttribute))
+
+        if JFiles.isSymbolicLink(path) or not cache_dir.isDirectory():
+            return ['WLSDPLY-09890', cache_dir.getAbsolutePath()]
+
+        if posix:
+            owner = JFiles.getOwner(path, _NO_FOLLOW_LINKS).getName()
+            user = JSystem.getProperty(_USER_NAME_PROPERTY)
+            if owner != user:
+                return ['WLSDPLY-09998', cache_dir.getAbsolutePath(), owner, user]
+            permissions = JFiles.getPosixFilePermissions(path, _NO_FOLLOW_LINKS)
+            for permission in _OTHERS_WRITE_PERMISSIONS:
+                if permissions.contains(permission):
+                    return ['WLSDPLY-09999', cache_dir.getAbsolutePath(), user]
+    except JIOException, ioe:
+        return ['WLSDPLY-09891', cache_dir.getAbsolutePath(), ioe.getLocalizedMessage()]
+    return None
+
+
+def encode_model(model_dict):
+    """
+    Encodes a parsed model into a byte array. Dictionaries keep their key order.
+
+    :param model_dict: The dictionary returned by FileToPython
+    :return: A Java byte array
+    """
+    byte_stream = JByteArrayOutputStream()
+    stream = JDataOutputStream(byte_stream)
+    _encode_value(stream, model_dict)
+    stream.flush()
+    return byte_stream.toByteArray()
+
+
+def decode_model(encoded):
+    """
+    Decodes a byte array created by encode_model(), into a new dictionary. The
+    values have the same types as those that were encoded (e.g. a long stays a
+    long, even when its value would fit in an int).
+
+    :param encoded: A Java byte array
+    :return: The model dictionary
+    """
+    return _decode_value(JDataInputStream(JByteArrayInputStream(encoded)))
+
+
+def _encode_value(stream, value):
+    if value is None:
+        stream.writeByte(_NONE)
+    elif value is True:
+        stream.writeByte(_TRUE)
+    elif value is False:
+        stream.writeByte(_FALSE)
+    elif isinstance(value, dict):
+        stream.writeByte(_DICT)
+        stream.writeInt(len(value))
+        for key, child in value.iteritems():
+            _encode_value(stream, key)
+            _encode_value(stream, child)
+    elif isinstance(value, list) or isinstance(value, tuple):
+        stream.writeByte(_LIST)
+        stream.writeInt(len(value))
+        for child in value:
+            _encode_value(stream, child)
+    elif isinstance(value, int) and _MIN_INT <= value <= _MAX_INT:
+        stream.writeByte(_INT)
+        stream.writeInt(value)
+    elif (isinstance(value, int) or isinstance(value, long)) and _MIN_LONG <= value <= _MAX_LONG:
+        stream.writeByte(_LONG)
+        stream.writeLong(value)
+    elif isinstance(value, long):
+        data = JString(str(value)).getBytes('UTF-8')
+        stream.writeByte(_BIG_LONG)
+        stream.writeInt(len(data))
+        stream.write(data)
+    elif isinstance(value, float):
+        stream.writeByte(_FLOAT)
+        stream.writeDouble(value)
+    else:
+        data = JString(value).getBytes('UTF-8')
+        stream.writeByte(_STRING)
+        stream.writeInt(len(data))
+        stream.write(data)
+    return
+
+
+def _decode_value(stream):
+    tag = stream.readByte()
+    if tag == _STRING:
+        data = jarray.zeros(stream.readInt(), 'b')
+        stream.readFully(data)
+        # not str(), which would fail on values that aren't ASCII
+        return JString(data, 'UTF-8').toString()
+    elif tag == _DICT:
+        result = PyOrderedDict()
+        for i in range(stream.readInt()):
+            key = _decode_value(stream)
+            result[key] = _decode_value(stream)
+        return result
+    elif tag == _LIST:
+        result = []
+        for i in range(stream.readInt()):
+            result.append(_decode_value(stream))
+        return result
+    elif tag == _INT:
+        return stream.readInt()
+    elif tag == _LONG:
+        return long(stream.readLong())
+    elif tag == _BIG_LONG:
+        data = jarray.zeros(stream.readInt(), 'b')
+        stream.readFully(data)
+        return long(str(JString(data, 'UTF-8')))
+    elif tag == _FLOAT:
+        return stream.readDouble()
+    elif tag == _TRUE:
+        return True
+    elif tag == _FALSE:
+        return False
+    return None
@@ -0,0 +1,842 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+A streaming reader for YAML and JSON model files. It returns the leaves of a
+model one at a time, in document order, instead of building the whole model
+dictionary, like FileToPython does.
+"""
+import re
+
+import jarray
+
+import java.io.BufferedReader as JBufferedReader
+import java.io.File as JFile
+import java.io.FileInputStream as JFileInputStream
+import java.io.IOException as JIOException
+import java.io.InputStreamReader as JInputStreamReader
+import java.lang.String as JString
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import PyOrderedDict
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'model_stream_reader'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+_JSON_FILE_EXTENSION = '.json'
+_READ_BUFFER_SIZE = 65536
+
+_NULL_VALUES = ['~', 'null', 'Null', 'NULL']
+_INTEGER_PATTERN = re.compile(r'^[-+]?[0-9]+$')
+_FLOAT_PATTERN = re.compile(r'^[-+]?([0-9]+\.[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$')
+_BLOCK_SCALAR_PATTERN = re.compile(r'^([|>])([-+]?)[0-9]?([-+]?)$')
+_DOUBLE_QUOTED_ESCAPES = {
+    '0': '\0', 'b': '\b', 't': '\t', 'n': '\n', 'r': '\r', 'f': '\f',
+    '"': '"', '/': '/', '\\': '\\', ' ': ' '
+}
+_JSON_WHITESPACE = ' \t\r\n'
+_JSON_DELIMITERS = ',]}' + _JSON_WHITESPACE
+
+
+class ModelStreamReader(object):
+    """
+    Reads a YAML or JSON model file as a stream of leaf events:
+
+        for names, value in ModelStreamReader(model_file):
+            ...
+
+    names is a tuple of the keys from the top of the model down to the leaf
+    (e.g. ('topology', 'Server', 'AdminServer', 'ListenPort')), and value is a
+    scalar or a list. A folder without any children is returned as a leaf with
+    an empty dictionary, or None, value.
+
+    Only the path to the current leaf is kept in memory, so the memory used
+    doesn't depend on the size of the model. The file is read as JSON if its
+    name ends with .json, and as YAML otherwise. The YAML reader handles what
+    model files are written with: block mappings and sequences, flow sequences
+    and mappings, plain and quoted scalars, literal and folded block scalars,
+    and comments. It doesn't handle anchors, aliases, tags or sequences of
+    mappings, which models don't usually use, so a caller that gets a parse error
+    (see get_parse_error()) can read the model file with FileToPython instead.
+    """
+    _class_name = 'ModelStreamReader'
+
+    def __init__(self, model_file, logger=None):
+        """
+        :param model_file: The path, or java.io.File, of the model file
+        :param logger: The PlatformLogger to use, or None to use the default one
+        """
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        self._model_file = JFile(str(model_file)).getAbsoluteFile()
+        self._reader = None
+        self._parser = None
+        self._events = []
+        self._done = False
+        self._parse_error = None
+
+    def get_model_file(self):
+        return self._model_file
+
+    def get_parse_error(self):
+        """
+        Returns the reason the model file couldn't be parsed, with the line number,
+        if next() raised a TestingException for that, rather than because the file
+        couldn't be read. Otherwise, returns None.
+        """
+        return self._parse_error
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """
+        Returns the next (names, value) leaf event.
+
+        :raises StopIteration: when there are no more leaves in the model
+        :raises TestingException: if the model file cannot be read, or parsed
+        """
+        while len(self._events) == 0:
+            if self._done:
+                raise StopIteration
+            self.__read_more()
+        return self._events.pop(0)
+
+    def close(self):
+        """
+        Closes the model file. The reader returns no more events after this.
+        """
+        self._done = True
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __read_more(self):
+        _method_name = '__read_more'
+
+        try:
+            if self._parser is None:
+                self._logger.fine('WLSDPLY-09952', self._model_file.getAbsolutePath(),
+                                  class_name=self._class_name, method_name=_method_name)
+                self._reader = JBufferedReader(JInputStreamReader(JFileInputStream(self._model_file), 'UTF-8'))
+                if self._model_file.getName().lower().endswith(_JSON_FILE_EXTENSION):
+                    self._parser = _JsonParser(self._reader, self._events)
+                else:
+                    self._parser = _YamlParser(self._reader, self._events)
+
+            if not self._parser.parse_next():
+                self.close()
+        except JIOException, ioe:
+            self.close()
+            self.__raise_error(ioe.getLocalizedMessage(), ioe)
+        except _ParseError, pe:
+            self.close()
+            self._parse_error = 'line %s: %s' % (self._parser.get_line_number(), pe.message)
+            self.__raise_error(pe.message, None)
+        return
+
+    def __raise_error(self, message, error):
+        _method_name = '__raise_error'
+
+        line_number = 0
+        if self._parser is not None:
+            line_number = self._parser.get_line_number()
+        ex = exception_helper.create_testing_exception('WLSDPLY-09953', self._model_file.getAbsolutePath(),
+                                                       line_number, message, error=error)
+        self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+        raise ex
+
+
+class _ParseError(Exception):
+    def __init__(self, message):
+        Exception.__init__(self, message)
+        self.message = message
+
+
+class _YamlParser(object):
+    """
+    Parses a YAML model one line at a time. The block mappings that are open
+    are kept on a stack of (indent, names) tuples.
+    """
+    def __init__(self, reader, events):
+        self._reader = reader
+        self._events = events
+        self._line_number = 0
+        self._root_indent = None
+        self._folders = []
+        # (indent, names) of a key that doesn't have its value on the same line
+        self._pending_key = None
+        # [indent, names, items] of the block sequence being read
+        self._sequence = None
+        # [key indent, names, style, chomping, lines, content indent] of the block scalar being read
+        self._block_scalar = None
+        # [names, text, empty lines count] of a flow collection, or quoted scalar, that
+        # continues on the next line. names is None for a block sequence item.
+        self._flow = None
+
+    def get_line_number(self):
+        return self._line_number
+
+    def parse_next(self):
+        """
+        Parses the next line, adding any leaf events it completes.
+
+        :return: False at the end of the file, True otherwise
+        """
+        line = self._reader.readLine()
+        if line is None:
+            self.__finish()
+            return False
+
+        self._line_number += 1
+        self.__parse_line(line)
+        return True
+
+    def __parse_line(self, line):
+        if self._block_scalar is not None and self.__continue_block_scalar(line):
+            return
+
+        if self._flow is not None:
+            self.__continue_flow(line)
+            return
+
+        stripped = line.strip()
+        if len(stripped) == 0 or stripped.startswith('#'):
+            return
+        if stripped == '---' or stripped.startswith('--- ') or stripped == '...':
+            return
+
+        indent = len(line) - len(line.lstrip(' '))
+        if line[indent] == '\t':
+            raise _ParseError('tabs cannot be used for indentation')
+
+        content = line[indent:].rstrip()
+        if content == '-' or content.startswith('- '):
+            self.__parse_sequence_item(indent, content[1:].strip())
+        else:
+            self.__parse_mapping_entry(indent, content)
+        return
+
+    def __parse_sequence_item(self, indent, item_text):
+        if self._sequence is not None and indent == self._sequence[0]:
+            pass
+        elif self._sequence is None and self._pending_key is not None and indent >= self._pending_key[0]:
+            self._sequence = [indent, self._pending_key[1], []]
+            self._pending_key = None
+        else:
+            raise _ParseError('unexpected sequence item')
+
+        item_text = _strip_comment(item_text)
+        if item_text == '-' or item_text.startswith('- ') or _find_mapping_colon(item_text) >= 0:
+            raise _ParseError('sequences of sequences, or mappings, are not supported')
+
+        if len(item_text) > 0 and item_text[0] in '[{"\'' and not _is_balanced(item_text):
+            self._flow = [None, item_text, 0]
+        else:
+            self._sequence[2].append(_parse_value(item_text))
+        return
+
+    def __parse_mapping_entry(self, indent, content):
+        if self._sequence is not None:
+            if indent > self._sequence[0]:
+                raise _ParseError('multi-line sequence items are not supported')
+            self.__end_sequence()
+
+        if self._pending_key is not None:
+            key_indent, key_names = self._pending_key
+            self._pending_key = None
+            if indent > key_indent:
+                self._folders.append((indent, key_names))
+            else:
+                self._events.append((key_names, None))
+
+        while len(self._folders) > 0 and indent < self._folders[-1][0]:
+            self._folders.pop()
+
+        if len(self._folders) > 0:
+            if indent != self._folders[-1][0]:
+                raise _ParseError('unexpected indentation')
+            parent_names = self._folders[-1][1]
+        else:
+            if self._root_indent is None:
+                self._root_indent = indent
+            elif indent != self._root_indent:
+                raise _ParseError('unexpected indentation')
+            parent_names = ()
+
+        key, value_text = _split_mapping_entry(content)
+        names = parent_names + (key,)
+        value_text = _strip_comment(value_text)
+
+        if len(value_text) == 0:
+            self._pending_key = (indent, names)
+            return
+
+        match = _BLOCK_SCALAR_PATTERN.match(value_text)
+        if match is not None:
+            self._block_scalar = [indent, names, match.group(1), match.group(2) + match.group(3), [], None]
+        elif value_text[0] in '[{"\'' and not _is_balanced(value_text):
+            self._flow = [names, value_text, 0]
+        else:
+            self.__add_value(names, _parse_value(value_text))
+        return
+
+    def __continue_block_scalar(self, line):
+        """
+        Adds line to the block scalar being read.
+
+        :return: False if line isn't part of the block scalar, True otherwise
+        """
+        key_indent, names, style, chomping, lines, content_indent = self._block_scalar
+
+        if len(line.strip()) == 0:
+            lines.append('')
+            return True
+
+        indent = len(line) - len(line.lstrip(' '))
+        if indent <= key_indent:
+            self.__end_block_scalar()
+            return False
+
+        if content_indent is None:
+            content_indent = indent
+            self._block_scalar[5] = content_indent
+        elif indent < content_indent:
+            raise _ParseError('unexpected indentation in a block scalar')
+
+        lines.append(line[content_indent:])
+        return True
+
+    def __end_block_scalar(self):
+        key_indent, names, style, chomping, lines, content_indent = self._block_scalar
+        self._block_scalar = None
+
+        trailing_count = 0
+        while len(lines) > 0 and lines[-1] == '':
+            lines.pop()
+            trailing_count += 1
+
+        if style == '|':
+            text = '\n'.join(lines)
+        else:
+            parts = []
+            for line in lines:
+                if line == '':
+                    parts.append('\n')
+                elif len(parts) > 0 and parts[-1] != '\n':
+                    parts.append(' ')
+                    parts.append(line)
+                else:
+                    parts.append(line)
+            text = ''.join(parts)
+
+        if len(lines) > 0:
+            if chomping == '+':
+                text = text + '\n' * (trailing_count + 1)
+            elif chomping != '-':
+                text = text + '\n'
+
+        self._events.append((names, text))
+        return
+
+    def __continue_flow(self, line):
+        names, text, empty_lines_count = self._flow
+        stripped = line.strip()
+        if len(stripped) == 0:
+            self._flow[2] = empty_lines_count + 1
+            return
+
+        quote = _scan(text)[1]
+        if quote is None:
+            text = '%s %s' % (text, _strip_comment(stripped))
+        elif quote == '"' and (len(text) - len(text.rstrip('\\'))) % 2 == 1:
+            # An escaped line break in a double-quoted scalar
+            text = '%s%s' % (text[:-1], stripped)
+        elif empty_lines_count > 0:
+            # The line breaks in a multi-line quoted scalar are folded into a
+            # space, unless they are followed by empty lines
+            text = '%s%s%s' % (text, '\n' * empty_lines_count, stripped)
+        else:
+            text = '%s %s' % (text, stripped)
+        self._flow[2] = 0
+
+        if _is_balanced(text):
+            self._flow = None
+            if names is None:
+                self._sequence[2].append(_parse_value(text))
+            else:
+                self.__add_value(names, _parse_value(text))
+        else:
+            self._flow[1] = text
+        return
+
+    def __end_sequence(self):
+        indent, names, items = self._sequence
+        self._sequence = None
+        self._events.append((names, items))
+        return
+
+    def __add_value(self, names, value):
+        if isinstance(value, dict) and len(value) > 0:
+            for key, child_value in value.iteritems():
+                self.__add_value(names + (key,), child_value)
+        else:
+            self._events.append((names, value))
+        return
+
+    def __finish(self):
+        if self._block_scalar is not None:
+            self.__end_block_scalar()
+        if self._flow is not None:
+            raise _ParseError('a flow collection, or quoted scalar, is not closed')
+        if self._sequence is not None:
+            self.__end_sequence()
+        if self._pending_key is not None:
+            self._events.append((self._pending_key[1], None))
+            self._pending_key = None
+        return
+
+
+class _JsonParser(object):
+    """
+    Parses a JSON model one object member at a time. The objects that are open
+    are kept on a stack of [names, member count] lists. Arrays are leaf values,
+    so they are parsed whole.
+    """
+    def __init__(self, reader, events):
+        self._reader = reader
+        self._events = events
+        self._buffer = jarray.zeros(_READ_BUFFER_SIZE, 'c')
+        self._text = ''
+        self._pos = 0
+        self._eof = False
+        self._line_number = 1
+        self._objects = None
+
+    def get_line_number(self):
+        return self._line_number
+
+    def parse_next(self):
+        """
+        Parses the next object member, or the end of an object.
+
+        :return: False at the end of the file, True otherwise
+        """
+        if self._objects is None:
+            self.__expect('{')
+            self._objects = [[(), 0]]
+            return True
+
+        if len(self._objects) == 0:
+            if self.__peek() is not None:
+                raise _ParseError('unexpected text after the end of the model')
+            return False
+
+        current = self._objects[-1]
+        c = self.__peek()
+        if c == '}':
+            self._pos += 1
+            self._objects.pop()
+            if current[1] == 0 and len(current[0]) > 0:
+                self._events.append((current[0], PyOrderedDict()))
+            return True
+
+        if current[1] > 0:
+            self.__expect(',')
+        current[1] += 1
+
+        self.__expect('"')
+        names = current[0] + (self.__read_string(),)
+        self.__expect(':')
+        if self.__peek() == '{':
+            self._pos += 1
+            self._objects.append([names, 0])
+        else:
+            self._events.append((names, self.__read_value()))
+        return True
+
+    def __read_value(self):
+        c = self.__peek()
+        if c is None:
+            raise _ParseError('unexpected end of the model')
+
+        if c == '"':
+            self._pos += 1
+            return self.__read_string()
+
+        if c == '[':
+            self._pos += 1
+            result = []
+            if self.__peek() == ']':
+                self._pos += 1
+                return result
+            while True:
+                result.append(self.__read_value())
+                c = self.__peek()
+                self._pos += 1
+                if c == ']':
+                    return result
+                if c != ',':
+                    raise _ParseError('expected , or ] in an array')
+
+        if c == '{':
+            self._pos += 1
+            result = PyOrderedDict()
+            if self.__peek() == '}':
+                self._pos += 1
+                return result
+            while True:
+                self.__expect('"')
+                key = self.__read_string()
+                self.__expect(':')
+                result[key] = self.__read_value()
+                c = self.__peek()
+                self._pos += 1
+                if c == '}':
+                    return result
+                if c != ',':
+                    raise _ParseError('expected , or } in an object')
+
+        chars = []
+        while self.__fill() and self._text[self._pos] not in _JSON_DELIMITERS:
+            chars.append(self._text[self._pos])
+            self._pos += 1
+        literal = ''.join(chars)
+        if literal == 'null':
+            return None
+        if literal == 'true' or literal == 'false':
+            return literal
+        if _INTEGER_PATTERN.match(literal):
+            return _to_integer(literal)
+        if _FLOAT_PATTERN.match(literal):
+            return float(literal)
+        raise _ParseError('unexpected value %s' % literal)
+
+    def __read_string(self):
+        """
+        Reads the rest of a string, after its opening quote.
+        """
+        parts = []
+        while True:
+            if not self.__fill():
+                raise _ParseError('the string is not closed')
+            quote_pos = self._text.find('"', self._pos)
+            escape_pos = self._text.find('\\', self._pos)
+            if escape_pos >= 0 and (quote_pos < 0 or escape_pos < quote_pos):
+                parts.append(self._text[self._pos:escape_pos])
+                self._pos = escape_pos + 1
+                parts.append(self.__read_escape())
+            elif quote_pos >= 0:
+                parts.append(self._text[self._pos:quote_pos])
+                self._pos = quote_pos + 1
+                return ''.join(parts)
+            else:
+                parts.append(self._text[self._pos:])
+                self._pos = len(self._text)
+
+    def __read_escape(self):
+        c = self.__next_char()
+        if c == 'u':
+            digits = ''
+            while len(digits) < 4:
+                digits += self.__next_char()
+            return unichr(int(digits, 16))
+        if c in _DOUBLE_QUOTED_ESCAPES:
+            return _DOUBLE_QUOTED_ESCAPES[c]
+        raise _ParseError('unexpected escape sequence \\%s' % c)
+
+    def __next_char(self):
+        if not self.__fill():
+            raise _ParseError('unexpected end of the model')
+        c = self._text[self._pos]
+        self._pos += 1
+        return c
+
+    def __expect(self, expected):
+        c = self.__peek()
+        if c != expected:
+            raise _ParseError('expected %s' % expected)
+        self._pos += 1
+        return
+
+    def __peek(self):
+        """
+        Skips whitespace, and returns the next character without consuming it,
+        or None at the end of the file.
+        """
+        while self.__fill():
+            c = self._text[self._pos]
+            if c not in _JSON_WHITESPACE:
+                return c
+            if c == '\n':
+                self._line_number += 1
+            self._pos += 1
+        return None
+
+    def __fill(self):
+        """
+        Makes sure there is at least one unread character in the buffer.
+
+        :return: False at the end of the file, True otherwise
+        """
+        if self._pos < len(self._text):
+            return True
+        if self._eof:
+            return False
+
+        count = self._reader.read(self._buffer, 0, _READ_BUFFER_SIZE)
+        while count == 0:
+            count = self._reader.read(self._buffer, 0, _READ_BUFFER_SIZE)
+        if count < 0:
+            self._eof = True
+            return False
+
+        self._text = JString(self._buffer, 0, count)
+        self._pos = 0
+        return True
+
+
+def _split_mapping_entry(content):
+    """
+    Splits a "key: value" line into the key, and the value text (with any comment).
+    """
+    if content[0] in '"\'':
+        key, end = _parse_quoted(content, 0)
+        rest = content[end:].lstrip()
+        if not rest.startswith(':') or (len(rest) > 1 and rest[1] not in ' \t'):
+            raise _ParseError('expected a : after the key')
+        return key, rest[1:].strip()
+
+    colon_pos = _find_mapping_colon(content)
+    if colon_pos < 0:
+        raise _ParseError('expected a key: value mapping entry')
+    return content[:colon_pos].rstrip(), content[colon_pos + 1:].strip()
+
+
+def _find_mapping_colon(text):
+    """
+    Returns the position of the : that ends the plain key of a mapping entry,
+    or -1 if text isn't a mapping entry.
+    """
+    if len(text) == 0 or text[0] in '"\'[{':
+        return -1
+    pos = text.find(':')
+    while pos >= 0:
+        if pos == len(text) - 1 or text[pos + 1] in ' \t':
+            return pos
+        pos = text.find(':', pos + 1)
+    return -1
+
+
+def _strip_comment(text):
+    """
+    Removes a # comment from the end of text, unless the # is quoted.
+    """
+    comment_pos = _scan(text)[2]
+    if comment_pos < 0:
+        return text
+    return text[:comment_pos].rstrip()
+
+
+def _is_balanced(text):
+    """
+    Returns True if the quotes, and the flow collection brackets, in text are all closed.
+    """
+    depth, quote, comment_pos = _scan(text)
+    return depth <= 0 and quote is None
+
+
+def _scan(text):
+    """
+    Scans text for quoted scalars, flow collection brackets and comments.
+
+    :return: The depth of the flow collection brackets, the quote character of
+             the quoted scalar that isn't closed (or None), and the position of
+             the # comment (or -1)
+    """
+    depth = 0
+    quote = None
+    previous = ' '
+    pos = 0
+    while pos < len(text):
+        c = text[pos]
+        if quote is not None:
+            if c == '\\' and quote == '"':
+                pos += 1
+            elif c == quote:
+                if quote == '\'' and pos + 1 < len(text) and text[pos + 1] == '\'':
+                    pos += 1
+                else:
+                    quote = None
+        elif c in '"\'' and previous in ' \t[{,:':
+            quote = c
+        elif c == '#' and previous in ' \t':
+            return depth, quote, pos
+        elif c in '[{':
+            depth += 1
+        elif c in ']}':
+            depth -= 1
+        previous = c
+        pos += 1
+    return depth, quote, -1
+
+
+def _parse_value(text):
+    """
+    Parses a scalar, or a flow collection, that takes up all of text.
+    """
+    if len(text) == 0:
+        return None
+
+    if text.startswith('!!str '):
+        text = text[6:].strip()
+        if len(text) == 0 or text[0] not in '"\'':
+            return text
+    elif text[0] in '&*!':
+        raise _ParseError('anchors, aliases and tags are not supported')
+
+    value, end = _parse_flow_value(text, 0, False)
+    if len(text[end:].strip()) > 0:
+        raise _ParseError('unexpected text after the value')
+    return value
+
+
+def _parse_flow_value(text, pos, in_flow):
+    """
+    Parses the value that starts at text[pos].
+
+    :return: The value, and the position of the first character after it
+    """
+    while pos < len(text) and text[pos] in ' \t':
+        pos += 1
+    if pos == len(text):
+        if in_flow:
+            raise _ParseError('unexpected end of a flow collection')
+        return None, pos
+
+    c = text[pos]
+    if c in '"\'':
+        return _parse_quoted(text, pos)
+
+    if c == '[':
+        result = []
+        pos = _skip_spaces(text, pos + 1)
+        while pos < len(text) and text[pos] != ']':
+            value, pos = _parse_flow_value(text, pos, True)
+            result.append(value)
+            pos = _skip_flow_separator(text, pos, ']')
+        return result, pos + 1
+
+    if c == '{':
+        result = PyOrderedDict()
+        pos = _skip_spaces(text, pos + 1)
+        while pos < len(text) and text[pos] != '}':
+            if text[pos] in '"\'':
+                key, pos = _parse_quoted(text, pos)
+                pos = _skip_spaces(text, pos)
+            else:
+                end = pos
+                while end < len(text) and text[end] not in ':,}':
+                    end += 1
+                key = text[pos:end].strip()
+                pos = end
+            if pos < len(text) and text[pos] == ':':
+                value, pos = _parse_flow_value(text, pos + 1, True)
+            else:
+                value = None
+            result[key] = value
+            pos = _skip_flow_separator(text, pos, '}')
+        return result, pos + 1
+
+    end = pos
+    if in_flow:
+        while end < len(text) and text[end] not in ',]}':
+            end += 1
+    else:
+        end = len(text)
+    return _parse_plain(text[pos:end].strip()), end
+
+
+def _skip_spaces(text, pos):
+    while pos < len(text) and text[pos] in ' \t':
+        pos += 1
+    return pos
+
+
+def _skip_flow_separator(text, pos, closing):
+    pos = _skip_spaces(text, pos)
+    if pos < len(text) and text[pos] == ',':
+        return _skip_spaces(text, pos + 1)
+    if pos < len(text) and text[pos] == closing:
+        return pos
+    raise _ParseError('expected , or %s in a flow collection' % closing)
+
+
+def _parse_quoted(text, pos):
+    """
+    Parses the quoted scalar that starts at text[pos].
+
+    :return: The string, and the position of the first character after its closing quote
+    """
+    quote = text[pos]
+    parts = []
+    pos += 1
+    while pos < len(text):
+        c = text[pos]
+        if c == quote:
+            if quote == '\'' and pos + 1 < len(text) and text[pos + 1] == '\'':
+                parts.append('\'')
+                pos += 2
+                continue
+            return ''.join(parts), pos + 1
+        if c == '\\' and quote == '"' and pos + 1 < len(text):
+            escape = text[pos + 1]
+            if escape == 'u' or escape == 'x':
+                digits_count = 4
+                if escape == 'x':
+                    digits_count = 2
+                parts.append(unichr(int(text[pos + 2:pos + 2 + digits_count], 16)))
+                pos += 2 + digits_count
+                continue
+            if escape not in _DOUBLE_QUOTED_ESCAPES:
+                raise _ParseError('unexpected escape sequence \\%s' % escape)
+            parts.append(_DOUBLE_QUOTED_ESCAPES[escape])
+            pos += 2
+            continue
+        parts.append(c)
+        pos += 1
+    raise _ParseError('the quoted string is not closed')
+
+
+def _parse_plain(text):
+    if text in _NULL_VALUES:
+        return None
+    if _INTEGER_PATTERN.match(text):
+        return _to_integer(text)
+    if _FLOAT_PATTERN.match(text):
+        return float(text)
+    return text
+
+
+def _to_integer(text):
+    try:
+        return int(text)
+    except ValueError:
+        return long(text)
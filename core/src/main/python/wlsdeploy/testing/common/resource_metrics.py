@@ -0,0 +1,374 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+Wall time, thread CPU time, allocated bytes and peak heap of the stages and steps
+of a test, measured with the java.lang.management MXBeans, and a process-wide
+recorder that writes them to a Chrome trace-event JSON file, that can be opened in
+chrome://tracing, or https://ui.perfetto.dev, to see a whole run on a timeline. The
+recorder only exists once tracing is enabled, so that the metrics aren't kept in
+memory when no trace file is written.
+"""
+import java.io.BufferedWriter as JBufferedWriter
+import java.io.File as JFile
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.io.OutputStreamWriter as JOutputStreamWriter
+import java.lang.System as JSystem
+import java.lang.Thread as JThread
+import java.lang.management.ManagementFactory as JManagementFactory
+import java.util.Timer as JTimer
+import java.util.TimerTask as JTimerTask
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common.results_json import quote_json_string
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+try:
+    # HotSpot's extension of ThreadMXBean, which can count the bytes a thread allocated
+    import com.sun.management.ThreadMXBean as JAllocationThreadMXBean
+except ImportError:
+    JAllocationThreadMXBean = None
+
+_class_name = 'resource_metrics'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# The categories of the measured spans
+STAGE = 'stage'
+STEP = 'step'
+
+# The value of a measurement the JVM doesn't support
+NOT_SUPPORTED = -1
+
+# The trace timestamps are microseconds since this module was loaded
+_ORIGIN_NANOS = JSystem.nanoTime()
+
+# How often the heap usage is sampled, while there are spans being measured
+_HEAP_SAMPLE_MILLIS = 100L
+
+_thread_bean = JManagementFactory.getThreadMXBean()
+_memory_bean = JManagementFactory.getMemoryMXBean()
+
+_cpu_time_supported = _thread_bean.isCurrentThreadCpuTimeSupported()
+if _cpu_time_supported and not _thread_bean.isThreadCpuTimeEnabled():
+    _thread_bean.setThreadCpuTimeEnabled(True)
+
+_allocated_bytes_supported = JAllocationThreadMXBean is not None \
+    and isinstance(_thread_bean, JAllocationThreadMXBean) and _thread_bean.isThreadAllocatedMemorySupported()
+if _allocated_bytes_supported and not _thread_bean.isThreadAllocatedMemoryEnabled():
+    _thread_bean.setThreadAllocatedMemoryEnabled(True)
+
+_trace_recorder = None
+_trace_recorder_lock = JReentrantLock()
+
+# The spans that haven't finished yet, whose peak heap the sampler keeps up to date
+_active_spans = []
+_active_spans_lock = JReentrantLock()
+_heap_sampler = None
+
+
+def start_span(name, category):
+    """
+    Starts measuring a stage or step, on the calling thread.
+
+    :param name: The name of the stage or step
+    :param category: STAGE or STEP
+    :return: A Span, whose finish() method is called, on the same thread, when it's done
+    """
+    return Span(name, category)
+
+
+def enable_tracing():
+    """
+    Creates the process-wide TraceRecorder, if it wasn't created already, so that
+    the metrics of the stages are recorded from now on.
+    """
+    global _trace_recorder
+
+    _trace_recorder_lock.lock()
+    try:
+        if _trace_recorder is None:
+            _trace_recorder = TraceRecorder()
+    finally:
+        _trace_recorder_lock.unlock()
+    return
+
+
+def get_trace_recorder():
+    """
+    Returns the process-wide TraceRecorder, or None if tracing isn't enabled.
+    """
+    _trace_recorder_lock.lock()
+    try:
+        return _trace_recorder
+    finally:
+        _trace_recorder_lock.unlock()
+
+
+class Span(object):
+    """
+    The MXBean readings at the start of a stage or step.
+
+    The peak heap is the highest heap usage of the JVM that was sampled while the
+    span was running, every 100 ms, and when it started and finished. The heap is
+    shared by the whole JVM, so when stages run at the same time, the peak heap of
+    each includes what the others used, but no span resets another's peak.
+    """
+    def __init__(self, name, category):
+        self._name = name
+        self._category = category
+        self._thread = JThread.currentThread()
+        self._peak_heap_bytes = _get_heap_used_bytes()
+        _add_active_span(self)
+        self._start_cpu_nanos = _get_cpu_nanos()
+        self._start_allocated_bytes = _get_allocated_bytes(self._thread)
+        self._start_nanos = JSystem.nanoTime()
+
+    def finish(self, child_metrics=None):
+        """
+        Stops measuring the stage or step.
+
+        :param child_metrics: The ResourceMetrics of the steps of a stage, or None
+        :return: The ResourceMetrics of the span
+        """
+        end_nanos = JSystem.nanoTime()
+        cpu_nanos = _get_cpu_nanos()
+        allocated_bytes = _get_allocated_bytes(self._thread)
+
+        _remove_active_span(self)
+        self.sample_heap(_get_heap_used_bytes())
+        peak_heap_bytes = self._peak_heap_bytes
+        if child_metrics is None:
+            child_metrics = []
+        for metrics in child_metrics:
+            peak_heap_bytes = max(peak_heap_bytes, metrics.get_peak_heap_bytes())
+
+        cpu_millis = NOT_SUPPORTED
+        if cpu_nanos != NOT_SUPPORTED:
+            cpu_millis = (cpu_nanos - self._start_cpu_nanos) / 1000000
+        if allocated_bytes != NOT_SUPPORTED:
+            allocated_bytes = allocated_bytes - self._start_allocated_bytes
+
+        return ResourceMetrics(self._name, self._category, self._thread.getName(), self._thread.getId(),
+                               (self._start_nanos - _ORIGIN_NANOS) / 1000, (end_nanos - self._start_nanos) / 1000,
+                               cpu_millis, allocated_bytes, peak_heap_bytes, child_metrics)
+
+    def sample_heap(self, heap_used_bytes):
+        """
+        Raises the peak heap of the span to heap_used_bytes, if it is higher.
+        """
+        if heap_used_bytes > self._peak_heap_bytes:
+            self._peak_heap_bytes = heap_used_bytes
+        return
+
+
+class ResourceMetrics(object):
+    """
+    What a stage or step used, and when and where it ran.
+    """
+    def __init__(self, name, category, thread_name, thread_id, start_micros, wall_micros, cpu_millis,
+                 allocated_bytes, peak_heap_bytes, child_metrics):
+        self._name = name
+        self._category = category
+        self._thread_name = thread_name
+        self._thread_id = thread_id
+        self._start_micros = start_micros
+        self._wall_micros = wall_micros
+        self._cpu_millis = cpu_millis
+        self._allocated_bytes = allocated_bytes
+        self._peak_heap_bytes = peak_heap_bytes
+        self._child_metrics = child_metrics
+
+    def get_name(self):
+        return self._name
+
+    def get_category(self):
+        return self._category
+
+    def get_thread_name(self):
+        return self._thread_name
+
+    def get_thread_id(self):
+        return self._thread_id
+
+    def get_start_micros(self):
+        return self._start_micros
+
+    def get_wall_millis(self):
+        return self._wall_micros / 1000
+
+    def get_cpu_millis(self):
+        return self._cpu_millis
+
+    def get_allocated_bytes(self):
+        return self._allocated_bytes
+
+    def get_peak_heap_bytes(self):
+        return self._peak_heap_bytes
+
+    def get_child_metrics(self):
+        return self._child_metrics
+
+    def write_trace_event(self, write, pid):
+        """
+        Writes the metrics, and those of the steps, as Chrome trace "complete" events.
+
+        :param write: The function each piece of the JSON is passed to
+        :param pid: The trace process id to put the events under
+        """
+        write('{"name": %s, "cat": "%s", "ph": "X", "ts": %d, "dur": %d, "pid": %d, "tid": %d, '
+              '"args": {"cpu_ms": %d, "allocated_bytes": %d, "peak_heap_bytes": %d, "thread": %s}}'
+              % (quote_json_string(self._name), self._category, self._start_micros, self._wall_micros, pid,
+                 self._thread_id, self._cpu_millis, self._allocated_bytes, self._peak_heap_bytes,
+                 quote_json_string(self._thread_name)))
+        for metrics in self._child_metrics:
+            write(',\n')
+            metrics.write_trace_event(write, pid)
+        return
+
+
+class TraceRecorder(object):
+    """
+    Collects the ResourceMetrics of the stages that ran in this process, by test,
+    and writes them to a Chrome trace-event JSON file. Each test is shown as a
+    process, named after the test, with a row per thread its stages ran on.
+    """
+    _class_name = 'TraceRecorder'
+
+    def __init__(self, logger=None):
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        self._test_names = []
+        # (test name, ResourceMetrics) tuples, in the order the stages finished
+        self._records = []
+        self._lock = JReentrantLock()
+
+    def record(self, test_name, metrics):
+        """
+        Records the metrics of a stage of the test named test_name.
+        """
+        self._lock.lock()
+        try:
+            if test_name not in self._test_names:
+                self._test_names.append(test_name)
+            self._records.append((test_name, metrics))
+        finally:
+            self._lock.unlock()
+        return
+
+    def write_trace_file(self, trace_file):
+        """
+        Writes the recorded metrics to trace_file.
+
+        :param trace_file: The path of the trace file to write
+        :raises TestingException: if the trace file cannot be written
+        """
+        _method_name = 'write_trace_file'
+
+        self._lock.lock()
+        try:
+            test_names = list(self._test_names)
+            records = list(self._records)
+        finally:
+            self._lock.unlock()
+
+        j_file = JFile(str(trace_file)).getAbsoluteFile()
+        try:
+            parent_dir = j_file.getParentFile()
+            if parent_dir is not None and not parent_dir.exists():
+                parent_dir.mkdirs()
+            writer = JBufferedWriter(JOutputStreamWriter(JFileOutputStream(j_file), 'UTF-8'))
+            try:
+                _write_trace(writer.write, test_names, records)
+            finally:
+                writer.close()
+        except JIOException, ioe:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09993', j_file.getAbsolutePath(),
+                                                           ioe.getLocalizedMessage(), error=ioe)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._logger.info('WLSDPLY-09994', len(records), len(test_names), j_file.getAbsolutePath(),
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+
+def _write_trace(write, test_names, records):
+    write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+    separator = ''
+    for i in range(len(test_names)):
+        write('%s{"name": "process_name", "ph": "M", "pid": %d, "args": {"name": %s}}'
+              % (separator, i + 1, quote_json_string(test_names[i])))
+        separator = ',\n'
+    for test_name, metrics in records:
+        write(separator)
+        metrics.write_trace_event(write, test_names.index(test_name) + 1)
+        separator = ',\n'
+    write('\n]}\n')
+    return
+
+
+class _HeapSampleTask(JTimerTask):
+    """
+    Samples the heap usage, for the spans that haven't finished yet.
+    """
+    def run(self):
+        heap_used_bytes = _get_heap_used_bytes()
+        _active_spans_lock.lock()
+        try:
+            for span in _active_spans:
+                span.sample_heap(heap_used_bytes)
+        finally:
+            _active_spans_lock.unlock()
+        return
+
+
+def _add_active_span(span):
+    """
+    Adds span to the spans the sampler keeps up to date, starting the sampler the first time.
+    """
+    global _heap_sampler
+
+    _active_spans_lock.lock()
+    try:
+        _active_spans.append(span)
+        if _heap_sampler is None:
+            _heap_sampler = JTimer('wlsdeploy-testing-heap-sampler', True)
+            _heap_sampler.schedule(_HeapSampleTask(), _HEAP_SAMPLE_MILLIS, _HEAP_SAMPLE_MILLIS)
+    finally:
+        _active_spans_lock.unlock()
+    return
+
+
+def _remove_active_span(span):
+    _active_spans_lock.lock()
+    try:
+        if span in _active_spans:
+            _active_spans.remove(span)
+    finally:
+        _active_spans_lock.unlock()
+    return
+
+
+def _get_heap_used_bytes():
+    return _memory_bean.getHeapMemoryUsage().getUsed()
+
+
+def _get_cpu_nanos():
+    if _cpu_time_supported:
+        return _thread_bean.getCurrentThreadCpuTime()
+    return NOT_SUPPORTED
+
+
+def _get_allocated_bytes(thread):
+    if _allocated_bytes_supported:
+        return _thread_bean.getThreadAllocatedBytes(thread.getId())
+    return NOT_SUPPORTED
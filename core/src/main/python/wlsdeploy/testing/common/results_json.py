@@ -0,0 +1,83 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+JSON serialization of test and compare results. The JSON is passed, a piece at a
+time, to a write function (e.g. the append method of a list that is joined at the
+end, or the write method of a java.io.Writer), so serializing a result with many
+messages takes time proportional to its size.
+"""
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import message_formatter
+
+_JSON_ESCAPES = {
+    '"': '\\"',
+    '\\': '\\\\',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\b': '\\b',
+    '\f': '\\f'
+}
+
+_RESOURCE_ID = 'resource_id'
+_ARGS = 'args'
+
+
+def quote_json_string(value):
+    """
+    Returns value as a double-quoted JSON string, with the characters that JSON
+    requires to be escaped, escaped.
+
+    :param value: The value to quote. It is converted to a string first, and None becomes null
+    :return: The JSON string literal
+    """
+    if value is None:
+        return 'null'
+
+    value = unicode(value)
+    chars = []
+    for c in value:
+        if c in _JSON_ESCAPES:
+            chars.append(_JSON_ESCAPES[c])
+        elif ord(c) < 0x20:
+            chars.append('\\u%04x' % ord(c))
+        else:
+            chars.append(c)
+
+    return '"%s"' % ''.join(chars)
+
+
+def write_result(write, area_key, area, categories, formatter=None):
+    """
+    Writes a result as a JSON object, like:
+
+        {"test_area": "topology", "errors": {"count": 1, "messages": [{"message": "..."}]}}
+
+    The categories without messages are left out.
+
+    :param write: The function each piece of the JSON is passed to
+    :param area_key: The name of the area field (e.g. test_area)
+    :param area: The area of the result
+    :param categories: A list of (category name, messages count, messages) tuples, where
+                       each message is a dictionary with resource_id and args keys
+    :param formatter: The MessageFormatter to format the messages with, or None to use the
+                      process-wide one
+    """
+    if formatter is None:
+        formatter = message_formatter.get_message_formatter()
+
+    write('{"%s": %s' % (area_key, quote_json_string(area)))
+    for category_name, messages_count, messages in categories:
+        if messages_count == 0:
+            continue
+        write(', "%s": {"count": %d, "messages": [' % (category_name, messages_count))
+        separator = ''
+        for message in messages:
+            text = formatter.format(message[_RESOURCE_ID], *message[_ARGS])
+            write('%s{"message": %s}' % (separator, quote_json_string(text)))
+            separator = ', '
+        write(']}')
+    write('}')
+    return
@@ -16,13 +16,52 @@ _class_name = 'testing_common'
 
 
 def apply_substitution_variables_file(variable_file, model_dict, logger):
-    _method_name = 'apply_substitution_variables_file'
+    variable_map = load_substitution_variables_file(variable_file, logger)
+    apply_substitution_variables(variable_file, variable_map, model_dict, logger)
+
+
+def load_substitution_variables_file(variable_file, logger):
+    """
+    Loads a substitution variables file, so that it can be applied to several
+    model dictionaries (e.g. the parts of a model that is read as a stream).
+
+    :param variable_file: The path of the variables file, or None
+    :param logger: The PlatformLogger to use
+    :return: The variables dictionary, or None if variable_file is None
+    :raises TestingException: if the variables file cannot be loaded
+    """
+    _method_name = 'load_substitution_variables_file'
 
     if variable_file is None:
+        return None
+
+    try:
+        return variables.load_variables(variable_file)
+    except VariableException, ve:
+        ex = exception_helper.create_testing_exception('WLSDPLY-09814',
+                                                       variable_file,
+                                                       ve.getLocalizedMessage(), error=ve)
+        logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+        raise ex
+
+
+def apply_substitution_variables(variable_file, variable_map, model_dict, logger):
+    """
+    Substitutes the variables loaded with load_substitution_variables_file() in
+    model_dict.
+
+    :param variable_file: The path of the variables file the variables were loaded from
+    :param variable_map: The variables dictionary, or None
+    :param model_dict: The model dictionary
+    :param logger: The PlatformLogger to use
+    :raises TestingException: if the variables cannot be substituted
+    """
+    _method_name = 'apply_substitution_variables'
+
+    if variable_map is None:
         return
 
     try:
-        variable_map = variables.load_variables(variable_file)
         variables.substitute(model_dict, variable_map)
     except VariableException, ve:
         ex = exception_helper.create_testing_exception('WLSDPLY-09814',
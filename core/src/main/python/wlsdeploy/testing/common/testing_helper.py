@@ -3,37 +3,26 @@ Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
 import imp
-import os.path
 import sys
 
-from java.io import IOException
 from java.lang import IllegalArgumentException
-from java.text import MessageFormat
-from java.util import ResourceBundle
 
 # java classes from weblogic-deploy-tooling
 from oracle.weblogic.deploy.util import FileUtils
 from oracle.weblogic.deploy.util import TranslateException
 
-# java classes from weblogic-deploy-tooling-ct
-import oracle.weblogic.deploy.testing.TestingConstants as TestingConstants
-
 # python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import config_registry
+from wlsdeploy.testing.common import message_formatter
+from wlsdeploy.testing.common import model_cache
 from wlsdeploy.testing.common import testing_constants
 from wlsdeploy.testing.exception import exception_helper
-from wlsdeploy.util.model_translator import FileToPython
 
 _class_name = 'testing_helper'
 
 
 def format_message(key, *args):
-    bundle = ResourceBundle.getBundle(TestingConstants.RESOURCE_BUNDLE_NAME)
-    message = bundle.getString(key)
-    if len(args) > 0:
-        message = MessageFormat.format(message, list(args))
-        #message = MessageFormat.format(message, args)
-
-    return message
+    return message_formatter.get_message_formatter().format(key, *args)
 
 
 def import_stage_module(module_name, logger):
@@ -134,6 +123,9 @@ def translate_file(from_file, logger):
     will be called on it, first. That method returns a Jython File object,
     which is what this translate_file(from_file) method works with.
 
+    Files are parsed through the process-wide ModelCache, so a file with the
+    same content is only run through FileToPython once.
+
     :param from_file: A File
     :param logger: A PlatformLogger instance that will be used for logging
                    any exceptions that are thrown
@@ -146,7 +138,7 @@ def translate_file(from_file, logger):
         if isinstance(from_file, str):
             from_file = verify_file_exists(from_file, logger)
 
-        from_file_dict = FileToPython(from_file.getAbsolutePath(), True).parse()
+        from_file_dict = model_cache.get_model_cache().parse(from_file.getAbsolutePath())
     except TranslateException, te:
         ex = exception_helper.create_testing_exception('WLSDPLY-09807',
                                                        from_file.getAbsolutePath(),
@@ -157,33 +149,21 @@ def translate_file(from_file, logger):
     return from_file_dict
 
 
-def extract_file(from_file_path, logger):
+def load_resource(resource_path, logger):
     """
+    Returns a Python dictionary representation of a JSON resource in the binary of
+    the installable, parsed straight from the resource's InputStream.
+
+    Each resource is only parsed once per process, by the process-wide ConfigRegistry,
+    and every caller gets its own copy of the dictionary, so it can change it.
 
-    :param from_file_path:
+    :param resource_path: The path of the resource (e.g. testdefs/user_defined_stages.json)
     :param logger: A PlatformLogger instance that will be used for logging
                    any exceptions that are thrown
-    :return:
+    :return: A Python dictionary representation of the resource
+    :raises: TestingException: if the resource doesn't exist, or cannot be translated
     """
-    _method_name = 'extract_file'
-
-    from_file_name = os.path.basename(from_file_path)
-
-    json_inputstream = FileUtils.getResourceAsStream(from_file_path)
-    if json_inputstream is None:
-        ex = exception_helper.create_testing_exception('WLSDPLY-09824', from_file_path)
-        logger.throwing(ex, class_name=_class_name, method_name=_method_name)
-        raise ex
-
-    try:
-        j_file = FileUtils.writeInputStreamToFile(json_inputstream, from_file_name)
-    except IOException, ioe:
-        ex = exception_helper.create_testing_exception('WLSDPLY-09825', from_file_name,
-                                                       ioe.getLocalizedMessage(), error=ioe)
-        logger.throwing(ex, class_name=_class_name, method_name=_method_name)
-        raise ex
-
-    return j_file
+    return config_registry.get_config_registry().get_config_copy(resource_path, logger)
 
 
 def get_resource_as_stream(file_path):
@@ -0,0 +1,465 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+A pool of warm worker JVMs that run WLS Deploy Tooling tool modules (e.g. create,
+discover, deploy, validate) for the stages, so that the JVM and WLST start up once
+per worker, instead of once per stage, and the tool modules don't leave global WLST
+state behind in the testing tool's own JVM.
+
+Each worker is a WLST process running the tool_worker.py script, that connects back
+to a loopback port opened for it, and sends the random token it was started with,
+so that a connection from any other process is refused. The pool sends a tool
+invocation (module name, argv and environment variables) to an idle worker, and
+reads back how the tool's main() ended. A worker is recycled after it has run the maximum
+number of calls, or when a call fails.
+
+There is no per-call working directory. A JVM cannot change its working directory,
+so every call runs in the worker's own, which is the testing tool's working directory,
+that the worker is started in. Relative paths in the arguments of a tool resolve to
+the same files in a worker, as they do when the tool runs in the testing tool's JVM.
+"""
+import jarray
+import os
+
+import java.io.BufferedInputStream as JBufferedInputStream
+import java.io.BufferedOutputStream as JBufferedOutputStream
+import java.io.DataInputStream as JDataInputStream
+import java.io.DataOutputStream as JDataOutputStream
+import java.io.File as JFile
+import java.io.IOException as JIOException
+import java.lang.IllegalThreadStateException as JIllegalThreadStateException
+import java.lang.Integer as JInteger
+import java.lang.ProcessBuilder as JProcessBuilder
+import java.lang.String as JString
+import java.lang.System as JSystem
+import java.math.BigInteger as JBigInteger
+import java.net.InetAddress as JInetAddress
+import java.net.ServerSocket as JServerSocket
+import java.net.SocketTimeoutException as JSocketTimeoutException
+import java.security.MessageDigest as JMessageDigest
+import java.security.SecureRandom as JSecureRandom
+import java.util.concurrent.Semaphore as JSemaphore
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import testing_constants
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'tool_daemon'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# Java system properties used to configure the pool. The pool is only used when
+# the number of workers is greater than 0.
+WORKERS_PROPERTY = 'wlsdeploy.testing.tool_daemon.workers'
+MAX_CALLS_PROPERTY = 'wlsdeploy.testing.tool_daemon.max_calls'
+START_TIMEOUT_PROPERTY = 'wlsdeploy.testing.tool_daemon.start_timeout'
+WLST_PROPERTY = 'wlsdeploy.testing.tool_daemon.wlst'
+
+# The environment variable the runTest script puts the path of its WLST script in
+WLST_ENVVAR = 'WLSDEPLOY_TESTING_WLST'
+
+WORKER_SCRIPT = 'tool_worker.py'
+
+# How a tool module's main() ended, as sent back by the worker
+RETURNED = 0
+EXITED = 1
+FAILED = 2
+
+# The string values of a SystemExit that don't mean the tool failed
+_SUCCESS_EXIT_VALUES = ['', '0', 'None']
+
+_DEFAULT_MAX_CALLS = 10
+_DEFAULT_START_TIMEOUT_SECONDS = 120
+# How long a worker is waited for, before checking that its JVM hasn't exited
+_ACCEPT_SLICE_MILLIS = 500
+
+_tool_daemon = None
+_tool_daemon_lock = JReentrantLock()
+_secure_random = JSecureRandom()
+
+
+def is_tool_daemon_enabled():
+    """
+    Returns True if the wlsdeploy.testing.tool_daemon.workers property is greater
+    than 0, so the tools are run in worker processes, rather than in this one.
+    """
+    return JInteger.getInteger(WORKERS_PROPERTY, 0) > 0
+
+
+def get_tool_daemon():
+    """
+    Returns the process-wide ToolDaemon, creating it the first time, or None if
+    the wlsdeploy.testing.tool_daemon.workers property isn't greater than 0.
+    """
+    global _tool_daemon
+
+    _tool_daemon_lock.lock()
+    try:
+        if _tool_daemon is None:
+            workers = JInteger.getInteger(WORKERS_PROPERTY, 0)
+            if workers > 0:
+                _tool_daemon = ToolDaemon(workers)
+    finally:
+        _tool_daemon_lock.unlock()
+    return _tool_daemon
+
+
+def shutdown_tool_daemon():
+    """
+    Stops the workers of the process-wide ToolDaemon, if there is one.
+    """
+    global _tool_daemon
+
+    _tool_daemon_lock.lock()
+    try:
+        if _tool_daemon is not None:
+            _tool_daemon.shutdown()
+            _tool_daemon = None
+    finally:
+        _tool_daemon_lock.unlock()
+    return
+
+
+class ToolDaemon(object):
+    """
+    Runs tool modules on a pool of at most max_workers worker JVMs. The workers are
+    started when they are first needed, and kept running between calls.
+    """
+    _class_name = 'ToolDaemon'
+
+    def __init__(self, max_workers, max_calls=None, wlst_script=None, logger=None):
+        """
+        :param max_workers: The maximum number of workers
+        :param max_calls: The number of calls a worker runs before it is recycled, or None
+                          to use the wlsdeploy.testing.tool_daemon.max_calls property
+        :param wlst_script: The path of the WLST script the workers are started with, or None
+                            to use the wlsdeploy.testing.tool_daemon.wlst property, or the
+                            WLSDEPLOY_TESTING_WLST environment variable
+        :param logger: The PlatformLogger to use, or None to use the module's
+        """
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if max_calls is None:
+            max_calls = JInteger.getInteger(MAX_CALLS_PROPERTY, _DEFAULT_MAX_CALLS)
+        if wlst_script is None:
+            wlst_script = JSystem.getProperty(WLST_PROPERTY, JSystem.getenv(WLST_ENVVAR))
+
+        self._max_calls = max(1, max_calls)
+        self._wlst_script = wlst_script
+        self._start_timeout = JInteger.getInteger(START_TIMEOUT_PROPERTY, _DEFAULT_START_TIMEOUT_SECONDS)
+
+        self._workers_permits = JSemaphore(max(1, max_workers), True)
+        self._idle_workers = []
+        self._lock = JReentrantLock()
+        self._next_worker_id = 1
+        self._started_count = 0
+        self._calls_count = 0
+        self._shutdown = False
+
+    def run_tool(self, module_name, args, env=None):
+        """
+        Runs the main() of a tool module on one of the workers, like calling
+        tool_module.main(args) in this JVM would, but with args as sys.argv, and
+        env added to os.environ, for the call only. The working directory is the
+        worker's own, which is the testing tool's working directory.
+
+        :param module_name: The name of the tool module (e.g. create)
+        :param args: The list of arguments, starting with the path of the tool module
+        :param env: A java.util.Map of the environment variables to set (like the one
+                    passed to ScriptRunner), or None
+        :return: What main() returned, as a string, or None if it returned None. If
+                 main() called sys.exit(), the string value of the SystemExit.
+        :raises TestingException: if main() raised an exception, or the call could not be
+                                  sent to a worker
+        """
+        _method_name = 'run_tool'
+
+        self._logger.entering(module_name, class_name=self._class_name, method_name=_method_name)
+
+        env_items = []
+        if env is not None:
+            iterator = env.entrySet().iterator()
+            while iterator.hasNext():
+                entry = iterator.next()
+                env_items.append((str(entry.getKey()), str(entry.getValue())))
+
+        self._workers_permits.acquire()
+        try:
+            worker = self.__get_worker()
+            recycle = True
+            try:
+                status, value = worker.call(module_name, args, env_items)
+                recycle = status == FAILED or worker.get_calls_count() >= self._max_calls \
+                    or (status == EXITED and value not in _SUCCESS_EXIT_VALUES)
+            finally:
+                self.__release_worker(worker, recycle)
+        finally:
+            self._workers_permits.release()
+
+        if status == FAILED:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09962', module_name, worker.get_id(), value)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._logger.exiting(class_name=self._class_name, method_name=_method_name, result=value)
+        return value
+
+    def get_started_count(self):
+        """
+        Returns the number of workers started so far.
+        """
+        self._lock.lock()
+        try:
+            return self._started_count
+        finally:
+            self._lock.unlock()
+
+    def get_calls_count(self):
+        """
+        Returns the number of tool invocations sent to the workers so far.
+        """
+        self._lock.lock()
+        try:
+            return self._calls_count
+        finally:
+            self._lock.unlock()
+
+    def shutdown(self):
+        """
+        Stops the idle workers. The workers that are running a call are stopped
+        when the call returns.
+        """
+        self._lock.lock()
+        try:
+            self._shutdown = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+        finally:
+            self._lock.unlock()
+
+        for worker in idle_workers:
+            worker.stop()
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __get_worker(self):
+        self._lock.lock()
+        try:
+            self._calls_count += 1
+            if len(self._idle_workers) > 0:
+                return self._idle_workers.pop()
+            worker_id = self._next_worker_id
+            self._next_worker_id += 1
+        finally:
+            self._lock.unlock()
+
+        worker = _ToolWorker(worker_id, self.__get_wlst_script(), self._start_timeout, self._logger)
+        worker.start()
+
+        self._lock.lock()
+        try:
+            self._started_count += 1
+        finally:
+            self._lock.unlock()
+        return worker
+
+    def __release_worker(self, worker, recycle):
+        _method_name = '__release_worker'
+
+        if not recycle:
+            self._lock.lock()
+            try:
+                if not self._shutdown:
+                    self._idle_workers.append(worker)
+                    return
+            finally:
+                self._lock.unlock()
+
+        self._logger.fine('WLSDPLY-09963', worker.get_id(), worker.get_calls_count(),
+                          class_name=self._class_name, method_name=_method_name)
+        worker.stop()
+        return
+
+    def __get_wlst_script(self):
+        _method_name = '__get_wlst_script'
+
+        if self._wlst_script is None:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09964', WLST_ENVVAR, WLST_PROPERTY)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+        return self._wlst_script
+
+
+class _ToolWorker(object):
+    """
+    One worker JVM, and the connection to it.
+    """
+    _class_name = '_ToolWorker'
+
+    def __init__(self, worker_id, wlst_script, start_timeout, logger):
+        self._id = worker_id
+        self._wlst_script = wlst_script
+        self._start_timeout = start_timeout
+        self._logger = logger
+        self._process = None
+        self._socket = None
+        self._input = None
+        self._output = None
+        self._calls_count = 0
+
+    def get_id(self):
+        return self._id
+
+    def get_calls_count(self):
+        return self._calls_count
+
+    def start(self):
+        """
+        Starts the worker JVM, and waits for it to connect, and send the token it was
+        started with. Connections that don't send the token are closed, and nothing is
+        sent to them.
+
+        :raises TestingException: if the worker could not be started, exited before it
+                                  connected, or didn't connect in time
+        """
+        _method_name = 'start'
+
+        worker_script = os.path.join(testing_constants.TOOL_MODULES_PATH, WORKER_SCRIPT)
+        token = JBigInteger(130, _secure_random).toString(32)
+        server_socket = None
+        exit_code = None
+        try:
+            try:
+                server_socket = JServerSocket(0, 1, JInetAddress.getByName('127.0.0.1'))
+                port = server_socket.getLocalPort()
+
+                command = [self._wlst_script, '-skipWLSModuleScanning', worker_script, str(port), str(self._id),
+                           token]
+                process_builder = JProcessBuilder(jarray.array(command, JString))
+                process_builder.directory(JFile(JSystem.getProperty('user.dir')))
+                process_builder.inheritIO()
+                self._process = process_builder.start()
+
+                deadline_millis = JSystem.currentTimeMillis() + self._start_timeout * 1000
+                while self._socket is None and exit_code is None:
+                    # a timeout of 0 would mean no timeout, so wait at least 1 ms
+                    timeout_millis = max(1, deadline_millis - JSystem.currentTimeMillis())
+                    server_socket.setSoTimeout(min(timeout_millis, _ACCEPT_SLICE_MILLIS))
+                    try:
+                        socket = server_socket.accept()
+                    except JSocketTimeoutException:
+                        if JSystem.currentTimeMillis() >= deadline_millis:
+                            raise
+                        # e.g. a bad WLST script, or a crash during startup
+                        exit_code = _get_exit_code(self._process)
+                        continue
+                    socket.setSoTimeout(timeout_millis)
+                    input_stream = JDataInputStream(JBufferedInputStream(socket.getInputStream()))
+                    try:
+                        received_token = input_stream.readUTF()
+                    except JIOException:
+                        received_token = None
+                    if received_token is not None and \
+                            JMessageDigest.isEqual(JString(received_token).getBytes('UTF-8'),
+                                                   JString(token).getBytes('UTF-8')):
+                        socket.setSoTimeout(0)
+                        socket.setTcpNoDelay(True)
+                        self._socket = socket
+                        self._input = input_stream
+                        self._output = JDataOutputStream(JBufferedOutputStream(socket.getOutputStream()))
+                    else:
+                        self._logger.warning('WLSDPLY-09895', self._id, port,
+                                             class_name=self._class_name, method_name=_method_name)
+                        socket.close()
+            except JIOException, ioe:
+                self.stop()
+                ex = exception_helper.create_testing_exception('WLSDPLY-09961', self._wlst_script,
+                                                               ioe.getLocalizedMessage(), error=ioe)
+                self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+                raise ex
+        finally:
+            if server_socket is not None:
+                server_socket.close()
+
+        if exit_code is not None:
+            self.stop()
+            ex = exception_helper.create_testing_exception('WLSDPLY-09897', self._id, self._wlst_script, exit_code)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._logger.fine('WLSDPLY-09960', self._id, self._wlst_script, port,
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+    def call(self, module_name, args, env_items):
+        """
+        Sends a tool invocation to the worker, and waits for it to end.
+
+        :return: a (status, value) tuple, where status is RETURNED, EXITED or FAILED
+        :raises TestingException: if the connection to the worker was lost
+        """
+        _method_name = 'call'
+
+        self._calls_count += 1
+        try:
+            self._output.writeUTF(module_name)
+            self._output.writeInt(len(args))
+            for arg in args:
+                self._output.writeUTF(str(arg))
+            self._output.writeInt(len(env_items))
+            for key, value in env_items:
+                self._output.writeUTF(key)
+                self._output.writeUTF(value)
+            self._output.flush()
+
+            status = self._input.readInt()
+            has_value = self._input.readBoolean()
+            value = None
+            if has_value:
+                value = self._input.readUTF()
+        except JIOException, ioe:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09965', self._id, module_name,
+                                                           ioe.getLocalizedMessage(), error=ioe)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+        return status, value
+
+    def stop(self):
+        """
+        Closes the connection, which makes an idle worker JVM exit, and stops the
+        process the worker was started with.
+        """
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except JIOException:
+                pass
+            self._socket = None
+        if self._process is not None:
+            self._process.destroy()
+            self._process.waitFor()
+            self._process = None
+        return
+
+
+def _get_exit_code(process):
+    """
+    Returns the exit code of process, or None if it is still running.
+    """
+    try:
+        return process.exitValue()
+    except JIllegalThreadStateException:
+        return None
@@ -10,7 +10,10 @@ from wlsdeploy.testing.common.model_constants import APP_DEPLOYMENTS
 from wlsdeploy.testing.compare.model_file_types import ModelFileType
 from wlsdeploy.testing.compare.model_section_differencer import ModelSectionDifferencer
 
-_DEPLOYABLE_LIBRARY_PATTERN = re.compile(r'appDeployments:/Library/([a-z-]+)(#[0-9.]+)(@[0-9._-]+)(/.+)')
+_LIBRARY_FOLDER_PREFIX = '%s:/Library/' % APP_DEPLOYMENTS
+# <name>[#<specification version>][@<implementation version>], where the name can be
+# mixed-case and dotted (e.g. Oracle.Coherence.Web#12.2.1@12.2.1.3.0)
+_DEPLOYABLE_LIBRARY_PATTERN = re.compile(r'([^#@]+)(?:#([^#@]+))?(?:@([^#@]+))?$')
 
 
 class AppDeploymentsSectionDifferencer(ModelSectionDifferencer):
@@ -23,115 +26,92 @@ class AppDeploymentsSectionDifferencer(ModelSectionDifferencer):
     def __init__(self, logger=None):
         self._logger = logger
         ModelSectionDifferencer.__init__(self, self._class_name, self._logger)
-        self._excludes_dict = None
+        self._excludes_index = None
+        self._library_index = None
 
-    def compare_sections(self, expected_section_folder_dict, actual_section_folder_dict, item_paths, comparison_result):
+    def compare_sections(self, expected_section_folder_dict, actual_section_folder_dict, comparison_result):
         _method_name = 'compare_sections'
 
         self._logger.info('WLSDPLY-09916', APP_DEPLOYMENTS, ModelFileType.EXPECTED, ModelFileType.ACTUAL,
                           class_name=self._class_name, method_name=_method_name)
 
-        self._excludes_dict = ModelSectionDifferencer._load_model_section_excludes(self, APP_DEPLOYMENTS)
+        self._excludes_index = ModelSectionDifferencer._load_model_section_excludes_index(self, APP_DEPLOYMENTS)
+        self._defaults_index = ModelSectionDifferencer._load_model_section_defaults_index(self, APP_DEPLOYMENTS)
 
         ModelSectionDifferencer._compare_sections(self, APP_DEPLOYMENTS, expected_section_folder_dict,
-                                                  actual_section_folder_dict, item_paths, comparison_result)
-
-    def _handle_expected_item_path(self, item_path, node_value, item_paths):
-        _method_name = '_handle_expected_item_path'
-
-        exclude_flag = False
-
-        expected_excludes_dict = self._excludes_dict.get(ModelFileType.EXPECTED)
-
-        for regex_pattern in expected_excludes_dict.keys():
-            if re.match(regex_pattern, item_path):
-                self._logger.finest('1 regex_pattern={0}', regex_pattern,
-                                    class_name=self._class_name, method_name=_method_name)
-                exclude_flag = True
-                break
-
-        if exclude_flag:
-            item_paths[item_path] = [node_value, None, node_value]
-        else:
-            item_paths[item_path] = [node_value, None, None]
-
-        return
-
-    def _handle_actual_item_path(self, item_path, node_value, item_paths):
-        _method_name = '_handle_actual_item_path'
-
-        item_value = []
-
-        if item_path in item_paths:
-            # item_path is in actual and expected models. Whether
-            # or not they have matching values, will be determined
-            # in the __match_item_path_values() method
-            item_value = item_paths.get(item_path)
-            item_value[ModelSectionDifferencer.ItemValueTypes.ACTUAL] = node_value
-            item_value[ModelSectionDifferencer.ItemValueTypes.DEFAULT] = None
-        else:
-            # Deployable libraries use versioning scheme, so use a regex pattern
-            # to try to match item_path that way
-            m = _DEPLOYABLE_LIBRARY_PATTERN.match(item_path)
-            if m:
-                #
-                # Found a match, so create a list of all the relevant possible item
-                # paths, which might match an existing item_path in item_paths
-                #
-                #   m.group(1) is the library name (e.g. jax-rs)
-                #   m.group(2) is the major version (e.g. #2.0)
-                #   m.group(3) is the minor version (e.g. @2.22.4.0)
-                #   m.group(4) is the attribute name (e.g. /@ModuleType)
-                #
-                possible_item_paths = [
-                    '%s%s%s' % ('appDeployments:/Library/', m.group(1), m.group(4)),
-                    '%s%s%s%s' % ('appDeployments:/Library/', m.group(1), m.group(2), m.group(4)),
-                    '%s%s%s%s%s' % ('appDeployments:/Library/', m.group(1), m.group(2), m.group(3), m.group(4)),
-                ]
-                for possible_item_path in possible_item_paths:
-                    if possible_item_path in item_paths:
-                        # Found an existing item_path in item_paths, which matches
-                        # the current possible_item_path value
-                        item_path = possible_item_path
-                        self._logger.finest('possible_item_path={0}', item_path,
-                                            class_name=self._class_name, method_name=_method_name)
-                        # Get item_value for item_path
-                        item_value = item_paths.get(item_path)
-                        # Update the ModelSectionDifferencer.ItemValueTypes.ACTUAL
-                        # list index with value assigned to node_value
-                        item_value[ModelSectionDifferencer.ItemValueTypes.ACTUAL] = node_value
-                        # Set ModelSectionDifferencer.ItemValueTypes.DEFAULT list
-                        # index to None, to signal that we aren't using a default value
-                        item_value[ModelSectionDifferencer.ItemValueTypes.DEFAULT] = None
-            else:
-                # item_path is only in the actual model. This is the case
-                # when it is for a WLST attribute with a default value, or
-                # WLST generates automagically. Either way, use the value
-                # from the actual model, as the value for both actual and
-                # default in the item paths collections.
-                exclude_flag = False
-
-                actual_excludes_dict = self._excludes_dict.get(ModelFileType.ACTUAL)
-
-                for regex_pattern in actual_excludes_dict.keys():
-                    if re.match(regex_pattern, item_path):
-                        self._logger.finest('2 regex_pattern={0}', regex_pattern,
-                                            class_name=self._class_name, method_name=_method_name)
-                        exclude_flag = True
-                        break
-
-                if exclude_flag:
-                    item_value = [None, node_value, node_value]
-                else:
-                    item_value = [None, node_value, None]
-
-        item_paths[item_path] = item_value
-
-        self._logger.finer('item_path={0}: [{1}, {2}, {3}]',
-                           item_path,
-                           item_value[ModelSectionDifferencer.ItemValueTypes.EXPECTED],
-                           item_value[ModelSectionDifferencer.ItemValueTypes.ACTUAL],
-                           item_value[ModelSectionDifferencer.ItemValueTypes.DEFAULT],
-                           class_name=self._class_name, method_name=_method_name)
-
-        return
+                                                  actual_section_folder_dict, comparison_result)
+
+    def _resolve_actual_folder_name(self, folder_prefix, actual_name, expected_folder_dict):
+        """
+        Deployable libraries use a versioning scheme, so an actual library folder
+        (e.g. jax-rs#2.0@2.22.4.0) is paired with the expected library folder that
+        has the same name, with fewer of the version parts (e.g. jax-rs#2.0 or jax-rs).
+        The most specific expected library folder is used.
+        """
+        _method_name = '_resolve_actual_folder_name'
+
+        if folder_prefix != _LIBRARY_FOLDER_PREFIX:
+            return None
+
+        if self._library_index is None or not self._library_index.is_index_of(expected_folder_dict):
+            self._library_index = _LibraryVersionIndex(expected_folder_dict)
+
+        expected_name = self._library_index.find_library_name(actual_name)
+        if expected_name is not None:
+            self._logger.finest('possible_name={0}', expected_name,
+                                class_name=self._class_name, method_name=_method_name)
+        return expected_name
+
+
+class _LibraryVersionIndex(object):
+    """
+    The library folder names of an expected appDeployments:/Library folder, indexed
+    by base name -> {specification version -> {implementation version -> folder name}},
+    with None for a version part the name doesn't have. It's built once per Library
+    folder, so each actual library folder is resolved with a few dictionary lookups.
+    """
+    def __init__(self, expected_folder_dict):
+        self._expected_folder_dict = expected_folder_dict
+        self._names = {}
+        for name in expected_folder_dict.keys():
+            m = _DEPLOYABLE_LIBRARY_PATTERN.match(name)
+            if m is None:
+                continue
+            spec_versions = self._names.get(m.group(1))
+            if spec_versions is None:
+                spec_versions = {}
+                self._names[m.group(1)] = spec_versions
+            impl_versions = spec_versions.get(m.group(2))
+            if impl_versions is None:
+                impl_versions = {}
+                spec_versions[m.group(2)] = impl_versions
+            impl_versions[m.group(3)] = name
+
+    def is_index_of(self, expected_folder_dict):
+        return self._expected_folder_dict is expected_folder_dict
+
+    def find_library_name(self, actual_name):
+        """
+        Returns the expected library folder name that actual_name pairs with, or None.
+        """
+        m = _DEPLOYABLE_LIBRARY_PATTERN.match(actual_name)
+        if m is None:
+            return None
+
+        spec_versions = self._names.get(m.group(1))
+        if spec_versions is None:
+            return None
+
+        #   m.group(1) is the library name (e.g. jax-rs)
+        #   m.group(2) is the specification version (e.g. 2.0), or None
+        #   m.group(3) is the implementation version (e.g. 2.22.4.0), or None
+        spec_versions_to_try = []
+        if m.group(3) is not None:
+            spec_versions_to_try.append(m.group(2))
+        if m.group(2) is not None:
+            spec_versions_to_try.append(None)
+        for spec_version in spec_versions_to_try:
+            impl_versions = spec_versions.get(spec_version)
+            if impl_versions is not None and None in impl_versions:
+                return impl_versions[None]
+        return None
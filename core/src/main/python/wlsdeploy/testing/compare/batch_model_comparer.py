@@ -0,0 +1,433 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import os
+
+import java.io.File as JFile
+import java.lang.Runtime as JRuntime
+import java.lang.System as JSystem
+import java.lang.Throwable as JThrowable
+import java.util.concurrent.Callable as JCallable
+import java.util.concurrent.ExecutionException as JExecutionException
+import java.util.concurrent.Executors as JExecutors
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import CompareModelsException
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import testing_common, testing_helper
+from wlsdeploy.testing.common.results_json import quote_json_string
+from wlsdeploy.testing.compare.comparer_results_writer import ComparerResultsWriter
+from wlsdeploy.testing.compare.model_comparer import ModelComparer
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_logger = PlatformLogger('wlsdeploy.compare_models', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+_MODEL_FILE_EXTENSIONS = ['.yaml', '.yml', '.json']
+_RESULTS_FILE_SUFFIX = '-compare-results.jsonl'
+
+_NAME = 'name'
+_EXPECTED_MODEL_FILE = 'expected_model_file'
+_ACTUAL_MODEL_FILE = 'actual_model_file'
+_EXPECTED_MODEL_OVERRIDES_FILE = 'expected_model_overrides_file'
+_ACTUAL_MODEL_OVERRIDES_FILE = 'actual_model_overrides_file'
+_PAIRS = 'pairs'
+_FAILURE = 'failure'
+
+# The pair name is used as the name of its results file, in the results directory,
+# so it can't have anything in it that would put the file somewhere else
+_PATH_SEPARATORS = ['/', '\\']
+_PARENT_DIR = '..'
+
+
+class BatchModelComparer(object):
+    """
+    Compares many expected/actual model file pairs in a single process, using a
+    bounded pool of threads. Each pair gets its own ModelComparer, which streams
+    its messages to <results_dir>/<pair-name>-compare-results.jsonl. When all the
+    pairs are done, an aggregate <results_dir>/compare-summary.jsonl file is written,
+    with one line per pair, followed by a summary trailer:
+
+        {"name": "domain1", "status": "compared", "errors_count": 0, "warnings_count": 3, ...}
+        {"summary": {"pairs_count": 2, "failed_count": 0, "errors_count": 0, ...}}
+
+    Pairs are added from a manifest file, or by matching the model files in two
+    directories by file name.
+    """
+    _class_name = 'BatchModelComparer'
+
+    SUMMARY_FILE_NAME = 'compare-summary.jsonl'
+    STATUS_COMPARED = 'compared'
+    STATUS_FAILED = 'failed'
+
+    def __init__(self, results_dir, threads=None, logger=None):
+        """
+        :param results_dir: The directory the results files are written to
+        :param threads: The maximum number of pairs to compare at the same time. The
+                        default is the number of available processors.
+        :param logger: The PlatformLogger to use, or None to use the default one
+        """
+        self._results_dir = results_dir
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if threads is None or threads < 1:
+            threads = JRuntime.getRuntime().availableProcessors()
+        self._threads = threads
+
+        self._pairs = []
+        self._pair_names = {}
+
+    def get_pairs_count(self):
+        return len(self._pairs)
+
+    def add_pair(self, name, expected_model_file, actual_model_file,
+                 expected_model_overrides_file=None, actual_model_overrides_file=None):
+        """
+        Adds a model pair to compare.
+
+        :param name: The name of the pair, which is also used to name its results file
+        :param expected_model_file: The path of the "expected" model file
+        :param actual_model_file: The path of the "actual" model file
+        :param expected_model_overrides_file: The path of a variables file for the "expected" model, or None
+        :param actual_model_overrides_file: The path of a variables file for the "actual" model, or None
+        :raises CompareModelsException: if there already is a pair with the same name, or
+                                        the name has a path separator or .. in it
+        """
+        _method_name = 'add_pair'
+
+        if not _is_valid_pair_name(name):
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09997', name)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        if name in self._pair_names:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09941', name)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._pair_names[name] = len(self._pairs)
+        self._pairs.append({
+            _NAME: name,
+            _EXPECTED_MODEL_FILE: expected_model_file,
+            _ACTUAL_MODEL_FILE: actual_model_file,
+            _EXPECTED_MODEL_OVERRIDES_FILE: expected_model_overrides_file,
+            _ACTUAL_MODEL_OVERRIDES_FILE: actual_model_overrides_file
+        })
+        return
+
+    def add_manifest_pairs(self, manifest_file):
+        """
+        Adds the model pairs listed in a JSON (or YAML) manifest file, that looks like this:
+
+            {
+                "pairs": [
+                    {
+                        "name": "domain1",
+                        "expected_model_file": "expected/domain1.yaml",
+                        "actual_model_file": "actual/domain1.yaml",
+                        "expected_model_overrides_file": "expected/domain1.properties",
+                        "actual_model_overrides_file": "actual/domain1.properties"
+                    },
+                    ...
+                ]
+            }
+
+        The overrides files are optional. If name is left out, the base name of the
+        expected model file is used. Relative file paths are resolved against the
+        directory the manifest file is in. A pair whose name cannot be used (e.g. it
+        is the name of an earlier pair) is reported as failed, and isn't compared,
+        without stopping the others.
+
+        :param manifest_file: The path of the manifest file
+        :raises TestingException: if the manifest file cannot be translated
+        :raises CompareModelsException: if the manifest file doesn't list any pairs
+        """
+        _method_name = 'add_manifest_pairs'
+
+        manifest_dict = testing_helper.translate_file(str(manifest_file), self._logger)
+        manifest_dir = os.path.dirname(os.path.abspath(str(manifest_file)))
+
+        pairs = []
+        if manifest_dict is not None and _PAIRS in manifest_dict:
+            pairs = manifest_dict[_PAIRS]
+
+        if len(pairs) == 0:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09940', manifest_file)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        for pair in pairs:
+            expected_model_file = _resolve_path(manifest_dir, pair.get(_EXPECTED_MODEL_FILE))
+            actual_model_file = _resolve_path(manifest_dir, pair.get(_ACTUAL_MODEL_FILE))
+            name = pair.get(_NAME)
+            if name is None:
+                name = _get_base_name(expected_model_file)
+            try:
+                self.add_pair(str(name), expected_model_file, actual_model_file,
+                              _resolve_path(manifest_dir, pair.get(_EXPECTED_MODEL_OVERRIDES_FILE)),
+                              _resolve_path(manifest_dir, pair.get(_ACTUAL_MODEL_OVERRIDES_FILE)))
+            except CompareModelsException, cme:
+                self._pairs.append({
+                    _NAME: str(name),
+                    _EXPECTED_MODEL_FILE: expected_model_file,
+                    _ACTUAL_MODEL_FILE: actual_model_file,
+                    _FAILURE: cme
+                })
+        return
+
+    def add_directory_pairs(self, expected_models_dir, actual_models_dir):
+        """
+        Adds a model pair for every model file in expected_models_dir, that has a
+        file with the same name in actual_models_dir. Model files that are only in
+        one of the directories are logged, and skipped. A pair is named after the base
+        name of its model file, unless another model file in expected_models_dir has
+        the same base name (e.g. domain1.yaml and domain1.json), in which case the
+        file name is used.
+
+        :param expected_models_dir: The directory containing the "expected" model files
+        :param actual_models_dir: The directory containing the "actual" model files
+        :raises TestingException: if either directory does not exist
+        """
+        _method_name = 'add_directory_pairs'
+
+        expected_dir = testing_helper.verify_directory_exists(str(expected_models_dir), self._logger)
+        actual_dir = testing_helper.verify_directory_exists(str(actual_models_dir), self._logger)
+
+        expected_names = _list_model_file_names(expected_dir)
+        actual_names = _list_model_file_names(actual_dir)
+
+        base_names_count = {}
+        for file_name in expected_names:
+            base_name = _get_base_name(file_name)
+            base_names_count[base_name] = base_names_count.get(base_name, 0) + 1
+
+        for file_name in expected_names:
+            if file_name in actual_names:
+                name = _get_base_name(file_name)
+                if base_names_count[name] > 1:
+                    name = file_name
+                self.add_pair(name,
+                              JFile(expected_dir, file_name).getAbsolutePath(),
+                              JFile(actual_dir, file_name).getAbsolutePath())
+            else:
+                self._logger.warning('WLSDPLY-09939', file_name, expected_dir.getAbsolutePath(),
+                                     actual_dir.getAbsolutePath(),
+                                     class_name=self._class_name, method_name=_method_name)
+
+        for file_name in actual_names:
+            if file_name not in expected_names:
+                self._logger.warning('WLSDPLY-09939', file_name, actual_dir.getAbsolutePath(),
+                                     expected_dir.getAbsolutePath(),
+                                     class_name=self._class_name, method_name=_method_name)
+        return
+
+    def compare_all(self):
+        """
+        Compares all the model pairs that were added, and writes the aggregate
+        summary file. A pair that cannot be compared (e.g. because one of its model
+        files cannot be parsed) is reported as failed, and doesn't stop the others.
+
+        :return: A list of per-pair result dictionaries, in the order the pairs were added
+        :raises CompareModelsException: if the summary file cannot be written
+        """
+        _method_name = 'compare_all'
+
+        threads = min(self._threads, max(len(self._pairs), 1))
+        self._logger.info('WLSDPLY-09936', len(self._pairs), threads,
+                          class_name=self._class_name, method_name=_method_name)
+
+        tasks = []
+        for pair in self._pairs:
+            if _FAILURE in pair:
+                task = _ComparePairTask(pair, None, self._logger)
+                task.set_failure(pair[_FAILURE])
+            else:
+                results_file = os.path.join(str(self._results_dir), '%s%s' % (pair[_NAME], _RESULTS_FILE_SUFFIX))
+                task = _ComparePairTask(pair, results_file, self._logger)
+            tasks.append(task)
+
+        executor = JExecutors.newFixedThreadPool(threads)
+        try:
+            futures = []
+            for task in tasks:
+                if task.get_result()['status'] == BatchModelComparer.STATUS_FAILED:
+                    futures.append(None)
+                else:
+                    futures.append(executor.submit(task))
+            for i in range(len(futures)):
+                if futures[i] is None:
+                    continue
+                try:
+                    futures[i].get()
+                except JExecutionException, ee:
+                    tasks[i].set_failure(ee.getCause())
+        finally:
+            executor.shutdown()
+
+        pair_results = []
+        for task in tasks:
+            pair_results.append(task.get_result())
+
+        self.__write_summary_file(pair_results)
+        return pair_results
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __write_summary_file(self, pair_results):
+        _method_name = '__write_summary_file'
+
+        summary_file = os.path.join(str(self._results_dir), BatchModelComparer.SUMMARY_FILE_NAME)
+
+        failed_count = 0
+        errors_count = 0
+        warnings_count = 0
+        infos_count = 0
+
+        writer = ComparerResultsWriter(summary_file, self._logger)
+        writer.open()
+        try:
+            for pair_result in pair_results:
+                writer.write_line(_to_json_line(pair_result))
+                if pair_result['status'] == BatchModelComparer.STATUS_FAILED:
+                    failed_count += 1
+                errors_count += pair_result['errors_count']
+                warnings_count += pair_result['warnings_count']
+                infos_count += pair_result['infos_count']
+
+            writer.write_line('{"summary": {"pairs_count": %d, "failed_count": %d, "errors_count": %d, '
+                              '"warnings_count": %d, "infos_count": %d}}'
+                              % (len(pair_results), failed_count, errors_count, warnings_count, infos_count))
+        finally:
+            writer.close()
+
+        self._logger.info('WLSDPLY-09942', len(pair_results), failed_count, errors_count, warnings_count,
+                          infos_count, summary_file, class_name=self._class_name, method_name=_method_name)
+        return
+
+
+class _ComparePairTask(JCallable):
+    """
+    Compares a single model pair, on one of the pool's threads. The outcome is
+    kept on the task, rather than returned through the Future.
+    """
+    _class_name = '_ComparePairTask'
+
+    def __init__(self, pair, results_file, logger):
+        self._pair = pair
+        self._results_file = results_file
+        self._logger = logger
+        self._result = {
+            'name': pair[_NAME],
+            'expected_model_file': pair[_EXPECTED_MODEL_FILE],
+            'actual_model_file': pair[_ACTUAL_MODEL_FILE],
+            'results_file': results_file,
+            'status': BatchModelComparer.STATUS_COMPARED,
+            'errors_count': 0,
+            'warnings_count': 0,
+            'infos_count': 0,
+            'elapsed_ms': 0,
+            'failure': None
+        }
+
+    def get_result(self):
+        return self._result
+
+    def set_failure(self, failure):
+        _method_name = 'set_failure'
+
+        self._result['status'] = BatchModelComparer.STATUS_FAILED
+        if isinstance(failure, JThrowable):
+            self._result['failure'] = failure.getLocalizedMessage()
+        else:
+            self._result['failure'] = str(failure)
+
+        self._logger.severe('WLSDPLY-09938', self._pair[_NAME], self._result['failure'],
+                            class_name=self._class_name, method_name=_method_name)
+        return
+
+    def call(self):
+        _method_name = 'call'
+
+        start = JSystem.currentTimeMillis()
+        try:
+            comparison_results = self.__compare()
+            self._result.update(comparison_results.get_summary())
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            self._logger.info('WLSDPLY-09937', self._pair[_NAME], self._result['errors_count'],
+                              self._result['warnings_count'], self._result['infos_count'],
+                              self._result['elapsed_ms'],
+                              class_name=self._class_name, method_name=_method_name)
+        except JThrowable, t:
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            self.set_failure(t)
+        except Exception, e:
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            self.set_failure(e)
+
+        return None
+
+    def __compare(self):
+        expected_model_dict = testing_helper.translate_file(str(self._pair[_EXPECTED_MODEL_FILE]), self._logger)
+        actual_model_dict = testing_helper.translate_file(str(self._pair[_ACTUAL_MODEL_FILE]), self._logger)
+
+        testing_common.apply_substitution_variables_file(self._pair[_EXPECTED_MODEL_OVERRIDES_FILE],
+                                                         expected_model_dict, self._logger)
+        testing_common.apply_substitution_variables_file(self._pair[_ACTUAL_MODEL_OVERRIDES_FILE],
+                                                         actual_model_dict, self._logger)
+
+        # The pairs already keep the pool's threads busy, so each
+        # pair's sections are compared on the pair's own thread
+        model_comparer = ModelComparer(self._logger, results_file=self._results_file, section_threads=1,
+                                       log_messages=False)
+        return model_comparer.compare_models(expected_model_dict, actual_model_dict)
+
+
+def _resolve_path(base_dir, file_path):
+    if file_path is None or os.path.isabs(file_path):
+        return file_path
+    return os.path.join(base_dir, file_path)
+
+
+def _is_valid_pair_name(name):
+    if name is None or len(name) == 0 or _PARENT_DIR in name:
+        return False
+    for separator in _PATH_SEPARATORS:
+        if separator in name:
+            return False
+    return True
+
+
+def _get_base_name(file_path):
+    return os.path.splitext(os.path.basename(str(file_path)))[0]
+
+
+def _list_model_file_names(j_dir):
+    file_names = []
+    for file_name in j_dir.list():
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension in _MODEL_FILE_EXTENSIONS and JFile(j_dir, file_name).isFile():
+            file_names.append(file_name)
+    file_names.sort()
+    return file_names
+
+
+def _to_json_line(pair_result):
+    fields = []
+    for key in ['name', 'status', 'errors_count', 'warnings_count', 'infos_count', 'elapsed_ms',
+                'expected_model_file', 'actual_model_file', 'results_file', 'failure']:
+        value = pair_result[key]
+        if isinstance(value, int) or isinstance(value, long):
+            fields.append('"%s": %d' % (key, value))
+        else:
+            fields.append('"%s": %s' % (key, quote_json_string(value)))
+    return '{%s}' % ', '.join(fields)
@@ -10,7 +10,9 @@ import java.util.logging.LogRecord as JLogRecord
 import java.util.logging.Logger as JLogger
 from oracle.weblogic.deploy.util import PyOrderedDict
 
-import wlsdeploy.testing.common.testing_helper as testing_helper
+import wlsdeploy.testing.common.message_formatter as message_formatter
+import wlsdeploy.testing.common.results_json as results_json
+from wlsdeploy.testing.compare.comparer_results_writer import ComparerResultsWriter
 
 _RESOURCE_ID = 'resource_id'
 _ARGS = 'args'
@@ -26,44 +28,130 @@ class ComparerResults(object):
     _WARNINGS_COUNT = 'warnings_count'
     _INFOS_COUNT = 'infos_count'
 
-    def __init__(self):
+    def __init__(self, results_writer=None):
         self._comparison_result_dict = PyOrderedDict()
+        # Kept up to date by the ComparerResult objects, so the counts never need a scan
+        self._results_summary = {
+            ComparerResults._ERRORS_COUNT: 0,
+            ComparerResults._WARNINGS_COUNT: 0,
+            ComparerResults._INFOS_COUNT: 0
+        }
+        self._results_writer = results_writer
 
     def __str__(self):
         return self.__to_string()
 
     def set_comparison_result(self, comparison_result):
-        self._comparison_result_dict[comparison_result.get_comparison_area()] = comparison_result
+        area = comparison_result.get_comparison_area()
+        previous_result = self._comparison_result_dict.get(area)
+        if previous_result is not None:
+            previous_result.set_results(None)
+            self.add_to_summary(-previous_result.get_errors_count(), -previous_result.get_warnings_count(),
+                                -previous_result.get_infos_count())
+        self._comparison_result_dict[area] = comparison_result
+        self.add_to_summary(comparison_result.get_errors_count(), comparison_result.get_warnings_count(),
+                            comparison_result.get_infos_count())
+        comparison_result.set_results(self)
+
+    def add_to_summary(self, errors_count, warnings_count, infos_count):
+        """
+        Adds to the summary counts. Called by the ComparerResult objects that were set
+        on this object, as messages are added to them.
+
+        :param errors_count: The number of errors to add
+        :param warnings_count: The number of warnings to add
+        :param infos_count: The number of infos to add
+        """
+        self._results_summary[ComparerResults._ERRORS_COUNT] += errors_count
+        self._results_summary[ComparerResults._WARNINGS_COUNT] += warnings_count
+        self._results_summary[ComparerResults._INFOS_COUNT] += infos_count
+        return
+
+    def get_summary(self):
+        """
+        Returns a snapshot of the summary counts, as a dictionary with errors_count,
+        warnings_count and infos_count keys. The counts are kept up to date as results
+        are set, and messages are added to them, so this doesn't look at the messages.
+
+        :return: A new dictionary with the counts
+        """
+        return self._results_summary.copy()
 
     def get_errors_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[ComparerResults._ERRORS_COUNT]
+        return self._results_summary[ComparerResults._ERRORS_COUNT]
 
     def get_warnings_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[ComparerResults._WARNINGS_COUNT]
+        return self._results_summary[ComparerResults._WARNINGS_COUNT]
 
     def get_infos_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[ComparerResults._INFOS_COUNT]
+        return self._results_summary[ComparerResults._INFOS_COUNT]
+
+    def get_results_writer(self):
+        """
+        Returns the ComparerResultsWriter that messages are streamed to, or None
+        if messages are being collected in memory.
+        """
+        return self._results_writer
+
+    def close_results_writer(self):
+        """
+        Writes the summary trailer to the results writer and closes it. Does nothing
+        if there isn't a results writer.
+        """
+        if self._results_writer is None:
+            return
+
+        try:
+            results_summary = self._results_summary
+            self._results_writer.write_summary(results_summary[ComparerResults._ERRORS_COUNT],
+                                               results_summary[ComparerResults._WARNINGS_COUNT],
+                                               results_summary[ComparerResults._INFOS_COUNT])
+        finally:
+            self._results_writer.close()
+        return
 
     def write_to_file(self, file_path):
-        pass
+        """
+        Writes the collected messages to file_path in JSON Lines format, followed
+        by a summary trailer. When messages were streamed to a results writer, they
+        were not collected, so there is nothing more to write.
+
+        :param file_path: The path of the results file
+        :raises CompareModelsException: if the results file cannot be written
+        """
+        if self._results_writer is not None:
+            return
+
+        results_writer = ComparerResultsWriter(file_path)
+        results_writer.open()
+        try:
+            for comparison_result in self._comparison_result_dict.values():
+                comparison_result.write_messages(results_writer)
+            results_summary = self._results_summary
+            results_writer.write_summary(results_summary[ComparerResults._ERRORS_COUNT],
+                                         results_summary[ComparerResults._WARNINGS_COUNT],
+                                         results_summary[ComparerResults._INFOS_COUNT])
+        finally:
+            results_writer.close()
+        return
 
     def log_results(self, logger):
         """
+        Logs the summary counts, and the messages. The messages that were streamed to
+        a results writer aren't kept, so only their counts are logged here; they were
+        logged as they were written, if the writer was asked to (see ComparerResultsWriter).
 
         :param logger:
         :return:
@@ -73,7 +161,7 @@ class ComparerResults(object):
         if logger is not None:
             # Get counts for all the ComparerResult objects
             # in this ComparerResults object
-            results_summary = self.__get_summary()
+            results_summary = self._results_summary
 
             jlogger = JLogger.getLogger(logger.get_name(), logger.resource_bundle_name)
 
@@ -138,46 +226,34 @@ class ComparerResults(object):
             _log_category_message(jlogger, messages[_RESOURCE_ID], messages[_ARGS],
                                   class_name=self._class_name, method_name=method_name)
 
-    def __get_summary(self):
+    def write_json(self, write):
         """
+        Writes the results with messages as a JSON array, a piece at a time.
 
-        :return:
+        :param write: The function each piece of the JSON is passed to (e.g. the
+                      append method of a list, or the write method of a java.io.Writer)
         """
-
-        results_summary = {
-            ComparerResults._ERRORS_COUNT: 0,
-            ComparerResults._WARNINGS_COUNT: 0,
-            ComparerResults._INFOS_COUNT: 0
-        }
-
+        formatter = message_formatter.get_message_formatter()
+        write('[')
+        separator = ''
         for comparison_result in self._comparison_result_dict.values():
-            if comparison_result is not None:
-                results_summary[ComparerResults._ERRORS_COUNT] += comparison_result.get_errors_count()
-                results_summary[ComparerResults._WARNINGS_COUNT] += comparison_result.get_warnings_count()
-                results_summary[ComparerResults._INFOS_COUNT] += comparison_result.get_infos_count()
-
-        return results_summary
+            if comparison_result.get_errors_count() > 0 \
+                    or comparison_result.get_warnings_count() > 0 \
+                    or comparison_result.get_infos_count() > 0:
+                write(separator)
+                comparison_result.write_json(write, formatter)
+                separator = ','
+        write(']')
+        return
 
     def __to_string(self):
         """
 
         :return:
         """
-
-        tmp = ''
-
-        for comparison_result in self._comparison_result_dict.values():
-            if comparison_result.get_errors_count() > 0 \
-                    or comparison_result.get_warnings_count() > 0 \
-                    or comparison_result.get_infos_count():
-                tmp += str(comparison_result)
-                tmp += ','
-
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-
-        return '[%s]' % tmp
+        chunks = []
+        self.write_json(chunks.append)
+        return ''.join(chunks)
 
 
 def _log_category_message(jlogger, message, *args, **kwargs):
@@ -199,7 +275,8 @@ def _log_category_message(jlogger, message, *args, **kwargs):
 
 class ComparerResult(object):
     """
-    Class for capturing model value comparison results
+    Class for capturing model value comparison results. If a ComparerResultsWriter
+    is provided, messages are written to it as they are added, and only counted here.
     """
     _COMPARISON_AREA = 'comparison_area'
     _ERRORS = 'errors'
@@ -208,7 +285,9 @@ class ComparerResult(object):
     _COUNT = 'count'
     _MESSAGES = 'messages'
 
-    def __init__(self, comparison_area):
+    def __init__(self, comparison_area, results_writer=None):
+        self._results = None
+        self._results_writer = results_writer
         self._result = {
             ComparerResult._COMPARISON_AREA: comparison_area,
             ComparerResult._ERRORS: {
@@ -226,19 +305,9 @@ class ComparerResult(object):
         }
 
     def __str__(self):
-        tmp = '"comparison_area": "%s",' % self._result[ComparerResult._COMPARISON_AREA]
-        if self.get_errors_count() > 0:
-            tmp += self.__to_string(ComparerResult._ERRORS)
-        if self.get_warnings_count() > 0:
-            tmp += self.__to_string(ComparerResult._WARNINGS)
-        if self.get_infos_count() > 0:
-            tmp += self.__to_string(ComparerResult._INFOS)
-
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-
-        return "{%s}" % tmp
+        chunks = []
+        self.write_json(chunks.append)
+        return ''.join(chunks)
 
     def add_error(self, resource_id, *args):
         """
@@ -248,6 +317,12 @@ class ComparerResult(object):
         :return:
         """
         self._result[ComparerResult._ERRORS][ComparerResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(1, 0, 0)
+        if self._results_writer is not None:
+            self._results_writer.write_message(self.get_comparison_area(), ComparerResultsWriter.ERROR,
+                                               resource_id, args)
+            return
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[ComparerResult._ERRORS][ComparerResult._MESSAGES].append(message)
         return
@@ -260,6 +335,12 @@ class ComparerResult(object):
         :return:
         """
         self._result[ComparerResult._WARNINGS][ComparerResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(0, 1, 0)
+        if self._results_writer is not None:
+            self._results_writer.write_message(self.get_comparison_area(), ComparerResultsWriter.WARNING,
+                                               resource_id, args)
+            return
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[ComparerResult._WARNINGS][ComparerResult._MESSAGES].append(message)
         return
@@ -272,10 +353,43 @@ class ComparerResult(object):
         :return:
         """
         self._result[ComparerResult._INFOS][ComparerResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(0, 0, 1)
+        if self._results_writer is not None:
+            self._results_writer.write_message(self.get_comparison_area(), ComparerResultsWriter.INFO,
+                                               resource_id, args)
+            return
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[ComparerResult._INFOS][ComparerResult._MESSAGES].append(message)
         return
 
+    def set_results(self, results):
+        """
+        Sets the ComparerResults object this result was set on, whose summary counts are
+        updated as messages are added, or None to stop updating them.
+
+        :param results: The ComparerResults object, or None
+        """
+        self._results = results
+        return
+
+    def get_results_writer(self):
+        """
+        Returns the ComparerResultsWriter (or ComparerResultsSpool) that messages are
+        written to, or None if they are being collected.
+        """
+        return self._results_writer
+
+    def set_results_writer(self, results_writer):
+        """
+        Sets the ComparerResultsWriter that the messages added from now on are
+        written to.
+
+        :param results_writer: The ComparerResultsWriter
+        """
+        self._results_writer = results_writer
+        return
+
     def get_comparison_area(self):
         """
 
@@ -325,22 +439,31 @@ class ComparerResult(object):
         """
         return self._result[ComparerResult._INFOS][ComparerResult._MESSAGES]
 
-    def __to_string(self, category_name):
-        tmp = ' "%s": {' % category_name
-        tmp += '"count": %d, ' % self._result[category_name][ComparerResult._COUNT]
-        tmp += '"messages": ['
-        for message in self._result[category_name][ComparerResult._MESSAGES]:
-            tmp += "{"
-            tmp += '"%s": "%s",' % ('message', testing_helper.format_message(message[_RESOURCE_ID],
-                                                                          list(message[_ARGS])))
-            if tmp[-1:] == ',':
-                # Strip off trailing ','
-                tmp = tmp[:-1]
-            tmp += "},"
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-        # Concatenate closing ']}'
-        tmp += "]},"
-
-        return tmp
+    def write_messages(self, results_writer):
+        """
+        Writes the collected messages to results_writer, one line per message.
+
+        :param results_writer: An open ComparerResultsWriter
+        """
+        comparison_area = self.get_comparison_area()
+        for severity, category_name in [(ComparerResultsWriter.ERROR, ComparerResult._ERRORS),
+                                        (ComparerResultsWriter.WARNING, ComparerResult._WARNINGS),
+                                        (ComparerResultsWriter.INFO, ComparerResult._INFOS)]:
+            for message in self._result[category_name][ComparerResult._MESSAGES]:
+                results_writer.write_message(comparison_area, severity, message[_RESOURCE_ID], message[_ARGS])
+        return
+
+    def write_json(self, write, formatter=None):
+        """
+        Writes the result as a JSON object, a piece at a time.
+
+        :param write: The function each piece of the JSON is passed to
+        :param formatter: The MessageFormatter to format the messages with, or None to use the
+                          process-wide one
+        """
+        categories = [(ComparerResult._ERRORS, self.get_errors_count(), self.get_errors_messages()),
+                      (ComparerResult._WARNINGS, self.get_warnings_count(), self.get_warnings_messages()),
+                      (ComparerResult._INFOS, self.get_infos_count(), self.get_infos_messages())]
+        results_json.write_result(write, ComparerResult._COMPARISON_AREA, self.get_comparison_area(), categories,
+                                  formatter)
+        return
@@ -0,0 +1,226 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import java.io.BufferedWriter as JBufferedWriter
+import java.io.File as JFile
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.io.OutputStreamWriter as JOutputStreamWriter
+import java.util.logging.Level as JLevel
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import testing_helper
+from wlsdeploy.testing.common.results_json import quote_json_string
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+
+class ComparerResultsWriter(object):
+    """
+    Streams compare results to a file in JSON Lines (NDJSON) format, as the
+    messages are produced. Each message is written as a single line:
+
+        {"comparison_area": "topology", "severity": "error", "resource_id": "WLSDPLY-09915", "message": "..."}
+
+    and the last line written is a summary trailer, with the message counts
+    for the whole comparison:
+
+        {"summary": {"errors_count": 1, "warnings_count": 4, "infos_count": 2}}
+
+    The lines are buffered, and the file is flushed when flush() is called (e.g.
+    at the end of each model section) and when it's closed, so it can be tailed
+    a section at a time, without a write to the disk per message.
+
+    The messages of a comparison that are streamed aren't kept in memory, so
+    ComparerResults.log_results() can only log their counts. With log_messages,
+    each message is also logged as it's written, at the level of its severity.
+    """
+    _class_name = 'ComparerResultsWriter'
+
+    ERROR = 'error'
+    WARNING = 'warning'
+    INFO = 'info'
+
+    _LOG_LEVELS = {
+        ERROR: JLevel.SEVERE,
+        WARNING: JLevel.WARNING,
+        INFO: JLevel.INFO
+    }
+
+    def __init__(self, file_path, logger=None, log_messages=False):
+        self._file_path = file_path
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+        self._log_messages = log_messages
+
+        self._writer = None
+        self._lines_count = 0
+
+    def get_file_path(self):
+        return self._file_path
+
+    def get_lines_count(self):
+        return self._lines_count
+
+    def is_open(self):
+        return self._writer is not None
+
+    def open(self):
+        """
+        Opens the results file for writing, creating any missing parent directories.
+        An existing file is overwritten.
+
+        :raises CompareModelsException: if the results file cannot be opened
+        """
+        _method_name = 'open'
+
+        j_file = JFile(str(self._file_path)).getAbsoluteFile()
+        self._logger.info('WLSDPLY-09934', j_file.getAbsolutePath(),
+                          class_name=self._class_name, method_name=_method_name)
+
+        try:
+            parent_dir = j_file.getParentFile()
+            if parent_dir is not None and not parent_dir.exists():
+                parent_dir.mkdirs()
+            self._writer = JBufferedWriter(JOutputStreamWriter(JFileOutputStream(j_file), 'UTF-8'))
+        except JIOException, ioe:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09935', j_file.getAbsolutePath(),
+                                                                  ioe.getLocalizedMessage(), error=ioe)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._lines_count = 0
+        return
+
+    def write_message(self, comparison_area, severity, resource_id, args):
+        """
+        Writes a single compare result message, as one line.
+
+        :param comparison_area: The name of the model section the message is for
+        :param severity: One of ERROR, WARNING or INFO
+        :param resource_id: The message key of the message
+        :param args: The arguments for the message
+        """
+        _method_name = 'write_message'
+
+        if self._log_messages:
+            self._logger.log(ComparerResultsWriter._LOG_LEVELS[severity], resource_id, *args,
+                             **{'class_name': self._class_name, 'method_name': _method_name})
+
+        message = testing_helper.format_message(resource_id, *args)
+        self.write_line('{"comparison_area": %s, "severity": %s, "resource_id": %s, "message": %s}'
+                        % (quote_json_string(comparison_area), quote_json_string(severity),
+                           quote_json_string(resource_id), quote_json_string(message)))
+        return
+
+    def write_summary(self, errors_count, warnings_count, infos_count):
+        """
+        Writes the summary trailer line.
+        """
+        self.write_line('{"summary": {"errors_count": %d, "warnings_count": %d, "infos_count": %d}}'
+                        % (errors_count, warnings_count, infos_count))
+        return
+
+    def write_line(self, line):
+        """
+        Writes line, which must already be a single line of JSON.
+
+        :param line: The line to write, without a line separator
+        :raises CompareModelsException: if the line cannot be written
+        """
+        _method_name = 'write_line'
+
+        if self._writer is None:
+            self.open()
+
+        try:
+            self._writer.write(line)
+            self._writer.newLine()
+        except JIOException, ioe:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09935', self._file_path,
+                                                                  ioe.getLocalizedMessage(), error=ioe)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._lines_count += 1
+        return
+
+    def flush(self):
+        """
+        Flushes the lines written so far to the results file. Does nothing if the
+        writer isn't open.
+
+        :raises CompareModelsException: if the lines cannot be written
+        """
+        _method_name = 'flush'
+
+        if self._writer is None:
+            return
+
+        try:
+            self._writer.flush()
+        except JIOException, ioe:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09935', self._file_path,
+                                                                  ioe.getLocalizedMessage(), error=ioe)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+        return
+
+    def close(self):
+        """
+        Closes the results file. Calling close() on a writer that isn't open does nothing.
+        """
+        _method_name = 'close'
+
+        if self._writer is None:
+            return
+
+        try:
+            try:
+                self._writer.close()
+            except JIOException, ioe:
+                ex = exception_helper.create_compare_models_exception('WLSDPLY-09935', self._file_path,
+                                                                      ioe.getLocalizedMessage(), error=ioe)
+                self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+                raise ex
+        finally:
+            self._writer = None
+        return
+
+
+class ComparerResultsSpool(object):
+    """
+    Takes the place of the ComparerResultsWriter for a model section that is compared
+    on another thread. The messages are kept in the order they were produced, until
+    write_messages() writes them to the ComparerResultsWriter, in section order.
+    """
+    def __init__(self):
+        # (comparison_area, severity, resource_id, args) tuples
+        self._messages = []
+
+    def write_message(self, comparison_area, severity, resource_id, args):
+        """
+        Keeps a single compare result message, to be written later.
+        """
+        self._messages.append((comparison_area, severity, resource_id, args))
+        return
+
+    def write_messages(self, results_writer):
+        """
+        Writes the kept messages to results_writer, in the order they were produced,
+        and forgets them.
+
+        :param results_writer: The ComparerResultsWriter to write the messages to
+        """
+        for comparison_area, severity, resource_id, args in self._messages:
+            results_writer.write_message(comparison_area, severity, resource_id, args)
+        self._messages = []
+        return
@@ -0,0 +1,112 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import java.lang.IllegalStateException as JIllegalStateException
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+from oracle.weblogic.deploy.testing.defaults import WLSTOfflineDefaultsIndex
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'defaults_index'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+
+def get_defaults_index(section_name, logger=None):
+    """
+    Returns the DefaultsIndex for a model section. The entries come from the
+    WLSTOfflineDefaultsIndex, which is built from the bundled defaults files once
+    per JVM, and shared with the Java WLSTOfflineDefaults objects.
+
+    :param section_name: The name of the model section
+    :param logger: The PlatformLogger to use, or None to use the default one
+    :return: The DefaultsIndex for section_name, which is empty if the section
+             doesn't have a defaults file
+    :raises TestingException: if the defaults files cannot be loaded
+    """
+    _method_name = 'get_defaults_index'
+
+    if logger is None:
+        logger = _logger
+
+    try:
+        j_defaults_index = WLSTOfflineDefaultsIndex.getInstance()
+    except JIllegalStateException, ise:
+        ex = exception_helper.create_testing_exception('WLSDPLY-09948', section_name,
+                                                       ise.getLocalizedMessage(), error=ise)
+        logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+        raise ex
+
+    return DefaultsIndex(section_name, j_defaults_index)
+
+
+class DefaultsIndex(object):
+    """
+    The default values of the attributes in a model section, looked up in the
+    WLSTOfflineDefaultsIndex segment trie.
+
+    Instead of matching a full item path against every pattern in the defaults
+    file, callers walking a model carry a cursor down the folders with them:
+
+        cursor = defaults_index.get_root_cursor()
+        cursor = defaults_index.descend(cursor, 'Server')
+        cursor = defaults_index.descend(cursor, 'AdminServer')
+        default_value = defaults_index.lookup(cursor, 'AcceptBacklog')
+
+    descend() is called once per folder, and lookup() is a map get for each of
+    the (few) trie nodes in the cursor, so the cost per attribute doesn't depend
+    on the number of entries in the defaults files. lookup() returns a Java
+    DefaultValue, with getDataType() and getDefaultValues() methods.
+    """
+    _class_name = 'DefaultsIndex'
+
+    def __init__(self, section_name, j_defaults_index):
+        self._section_name = section_name
+        self._j_defaults_index = j_defaults_index
+        self._root_cursor = j_defaults_index.getRootCursor(section_name)
+
+    def get_section_name(self):
+        return self._section_name
+
+    def get_root_cursor(self):
+        """
+        Returns the cursor for the top of the model section, or None if the
+        section doesn't have any defaults.
+        """
+        if self._root_cursor.isEmpty():
+            return None
+        return self._root_cursor
+
+    def descend(self, cursor, folder_name):
+        """
+        Returns the cursor for the folder_name child folder of the folder that
+        cursor is for, or None if no defaults can match at, or below, it.
+
+        :param cursor: The cursor of the parent folder
+        :param folder_name: The name of the child folder
+        :return: The cursor of the child folder
+        """
+        if cursor is None:
+            return None
+
+        child_cursor = self._j_defaults_index.descend(cursor, folder_name)
+        if child_cursor.isEmpty():
+            return None
+        return child_cursor
+
+    def lookup(self, cursor, attribute_name):
+        """
+        Returns the DefaultValue for attribute_name, in the folder that cursor is
+        for, or None if the defaults files don't have one.
+
+        :param cursor: The cursor of the folder the attribute is in
+        :param attribute_name: The attribute name
+        :return: A DefaultValue, or None
+        """
+        if cursor is None:
+            return None
+        return self._j_defaults_index.lookup(cursor, attribute_name)
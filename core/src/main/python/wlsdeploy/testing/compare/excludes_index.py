@@ -0,0 +1,227 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import re
+
+import java.lang.Boolean as JBoolean
+import java.lang.System as JSystem
+import java.util.concurrent.locks.ReentrantLock as JReentrantLock
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.compare.model_file_types import ModelFileType
+
+# Matches an opening parenthesis that starts a capturing group. These are
+# turned into non-capturing groups, so that combining ~100 patterns into a
+# single alternation doesn't run into the regex engine's group limit.
+_CAPTURING_GROUP_PATTERN = re.compile(r'(?<!\\)\((?!\?)')
+
+# Matches the parts of a pattern that the capturing group rewrite gets wrong: a
+# character class, where "(" is a literal, an escaped backslash, which can come
+# right before a "(" that does start a group, and backreferences and named groups,
+# which refer to group numbers or names the rewrite, or the combining, changes.
+# Patterns with any of these are matched one at a time instead.
+_UNSAFE_TO_COMBINE_PATTERN = re.compile(r'\[|\\\\|\\[1-9]|\(\?P[<=]')
+
+# When this Java system property is set to "true", every lookup is also run
+# through the original linear scan of the uncompiled patterns, so that the
+# comparison report can show how long both approaches took.
+BENCHMARK_PROPERTY = 'wlsdeploy.testing.compare.benchmark_excludes'
+
+_NANOS_PER_MILLI = 1000000.0
+
+# section name -> _CompiledExcludes, shared by every ExcludesIndex in the process
+_compiled_excludes = {}
+_compiled_excludes_lock = JReentrantLock()
+
+
+class ExcludesIndex(object):
+    """
+    Precompiled index of the item path regex patterns in a model section's
+    excludes file.
+
+    The patterns for each item value type side (e.g. "expected", "actual")
+    are combined into a single compiled alternation, so checking whether an
+    item path is excluded is one regex match, instead of one re.match() call
+    per pattern. The patterns are compiled once per section per process, and
+    shared by the indexes, which only keep their own lookup counts and timings.
+    """
+    _class_name = 'ExcludesIndex'
+
+    def __init__(self, section_name, excludes_dict):
+        """
+        :param section_name: The name of the model section the excludes apply to
+        :param excludes_dict: The Python dictionary loaded from the section's excludes file
+        """
+        self._section_name = section_name
+        self._compiled_excludes = _get_compiled_excludes(section_name, excludes_dict)
+        self._lookups_count = 0
+        self._matches_count = 0
+        self._elapsed_nanos = 0L
+        self._linear_elapsed_nanos = 0L
+        self._benchmark = JBoolean.getBoolean(BENCHMARK_PROPERTY)
+
+    def get_section_name(self):
+        return self._section_name
+
+    def get_patterns_count(self, side=None):
+        """
+        Returns the number of exclude patterns for the given side, or for
+        both sides if side is None.
+        """
+        patterns = self._compiled_excludes.patterns
+        if side is not None:
+            return len(patterns.get(side, []))
+        count = 0
+        for side_patterns in patterns.values():
+            count += len(side_patterns)
+        return count
+
+    def is_excluded(self, side, item_path):
+        """
+        Determines if item_path matches one of the exclude patterns for side.
+
+        :param side: A ModelFileType value
+        :param item_path: The item path to check
+        :return: True, if item_path is excluded for side, otherwise False
+        """
+        start = JSystem.nanoTime()
+        response = self._compiled_excludes.is_excluded(side, item_path)
+        self._elapsed_nanos += JSystem.nanoTime() - start
+        self._lookups_count += 1
+        if response:
+            self._matches_count += 1
+
+        if self._benchmark:
+            start = JSystem.nanoTime()
+            _linear_match(self._compiled_excludes.patterns.get(side, []), item_path)
+            self._linear_elapsed_nanos += JSystem.nanoTime() - start
+
+        return response
+
+    def get_lookups_count(self):
+        return self._lookups_count
+
+    def get_matches_count(self):
+        return self._matches_count
+
+    def get_elapsed_millis(self):
+        """
+        Returns the total time spent in is_excluded(), in milliseconds.
+        """
+        return self._elapsed_nanos / _NANOS_PER_MILLI
+
+    def is_benchmark_enabled(self):
+        return self._benchmark
+
+    def get_linear_elapsed_millis(self):
+        """
+        Returns the total time the original linear scan took, for the same
+        lookups, in milliseconds. Always 0, unless the BENCHMARK_PROPERTY
+        Java system property was set to "true".
+        """
+        return self._linear_elapsed_nanos / _NANOS_PER_MILLI
+
+    def report_timing(self, comparison_result):
+        """
+        Adds informational messages about the time spent matching item paths
+        against the exclude patterns, to comparison_result.
+
+        :param comparison_result: The ComparerResult for the section
+        """
+        if self._lookups_count == 0:
+            return
+
+        comparison_result.add_info('WLSDPLY-09932', self._section_name, self._lookups_count,
+                                   self.get_patterns_count(), self._matches_count,
+                                   '%.3f' % self.get_elapsed_millis())
+        if self._benchmark:
+            comparison_result.add_info('WLSDPLY-09933', self._section_name, self._lookups_count,
+                                       '%.3f' % self.get_linear_elapsed_millis(),
+                                       '%.3f' % self.get_elapsed_millis())
+        return
+
+
+def _get_compiled_excludes(section_name, excludes_dict):
+    """
+    Returns the compiled patterns of a section's excludes, compiling them the first
+    time. They are compiled again if the excludes dictionary was reloaded (e.g. when
+    the ConfigRegistry checks the resources for changes).
+    """
+    _compiled_excludes_lock.lock()
+    try:
+        compiled_excludes = _compiled_excludes.get(section_name)
+        if compiled_excludes is None or compiled_excludes.excludes_dict is not excludes_dict:
+            compiled_excludes = _CompiledExcludes(excludes_dict)
+            _compiled_excludes[section_name] = compiled_excludes
+    finally:
+        _compiled_excludes_lock.unlock()
+    return compiled_excludes
+
+
+class _CompiledExcludes(object):
+    """
+    The compiled exclude patterns of a section, for each side: an alternation of the
+    patterns that can be combined, and a list of those that have to be matched one at
+    a time. Only read after it's built, so it's shared between threads without locking.
+    """
+    def __init__(self, excludes_dict):
+        self.excludes_dict = excludes_dict
+        self.patterns = {}
+        self._alternations = {}
+        self._separate_patterns = {}
+
+        for side in [ModelFileType.EXPECTED, ModelFileType.ACTUAL]:
+            patterns = []
+            if excludes_dict is not None and side in excludes_dict:
+                patterns = list(excludes_dict[side].keys())
+            self.patterns[side] = patterns
+            self._alternations[side], self._separate_patterns[side] = _compile_patterns(patterns)
+
+    def is_excluded(self, side, item_path):
+        alternation = self._alternations.get(side)
+        if alternation is not None and alternation.match(item_path) is not None:
+            return True
+        for compiled_pattern in self._separate_patterns.get(side, []):
+            if compiled_pattern.match(item_path) is not None:
+                return True
+        return False
+
+
+def _compile_patterns(patterns):
+    """
+    Combines the patterns that can be combined into a single compiled regex
+    alternation. re.match() semantics are kept, because match() anchors every
+    alternative at the start of the item path. The others, or all of them if
+    the alternation doesn't compile, are compiled one at a time.
+
+    :param patterns: A list of regex pattern strings
+    :return: A tuple of the compiled alternation, or None if there isn't one,
+             and a list of the separately compiled patterns
+    """
+    alternatives = []
+    separate_patterns = []
+    for pattern in patterns:
+        if _UNSAFE_TO_COMBINE_PATTERN.search(pattern) is not None:
+            separate_patterns.append(pattern)
+        else:
+            alternatives.append('(?:%s)' % _CAPTURING_GROUP_PATTERN.sub('(?:', pattern))
+
+    alternation = None
+    if len(alternatives) > 0:
+        try:
+            alternation = re.compile('|'.join(alternatives))
+        except re.error:
+            separate_patterns = patterns
+
+    compiled_patterns = []
+    for pattern in separate_patterns:
+        compiled_patterns.append(re.compile(pattern))
+    return alternation, compiled_patterns
+
+
+def _linear_match(patterns, item_path):
+    for pattern in patterns:
+        if re.match(pattern, item_path):
+            return True
+    return False
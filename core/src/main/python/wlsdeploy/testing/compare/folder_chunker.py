@@ -0,0 +1,158 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import PyOrderedDict
+
+# The depth, below the model section, of the folders whose whole subtree is
+# put in a single chunk (e.g. topology:/Server/AdminServer)
+_SUBTREE_DEPTH = 2
+
+
+class FolderChunk(object):
+    """
+    A part of one model folder: either all the leaves directly in the folder,
+    or one of its child folders, with everything below it. The folder_dict is
+    what the folder's dictionary would have, if the folder only had that part.
+    """
+    def __init__(self, section_name, folder_names, child_name, folder_dict):
+        """
+        :param section_name: The model section the folder is in
+        :param folder_names: The tuple of folder names from the section down to the folder
+        :param child_name: The name of the child folder in folder_dict, or None if
+                           folder_dict has the leaves of the folder
+        :param folder_dict: The part of the folder's dictionary
+        """
+        self.section_name = section_name
+        self.folder_names = folder_names
+        self.child_name = child_name
+        self.folder_dict = folder_dict
+
+    def get_key(self):
+        """
+        Returns the key the chunk is paired with a chunk from the other model by.
+        """
+        return self.section_name, self.folder_names, self.child_name
+
+
+class FolderChunker(object):
+    """
+    Groups the (names, value) leaf events from a ModelStreamReader into
+    FolderChunks, so that two models can be compared a folder at a time.
+
+    The folders at _SUBTREE_DEPTH below a section (e.g. topology:/Server/AdminServer,
+    or resources:/JDBCSystemResource/ds1) are returned whole, as soon as the reader
+    moves past them. The leaves of the folders above them are returned when the
+    reader moves past the folder. A section is always returned as a (possibly
+    empty) chunk of its leaves, so that the sections in the model are known.
+
+    Only the chunk being built is in memory, so the memory used depends on the
+    size of the largest folder, instead of the size of the model.
+    """
+    _class_name = 'FolderChunker'
+
+    def __init__(self, model_reader):
+        """
+        :param model_reader: The ModelStreamReader of the model
+        """
+        self._model_reader = model_reader
+        self._chunks = []
+        self._done = False
+        # (names, leaves dictionary) of the folders above _SUBTREE_DEPTH that are open
+        self._open_folders = []
+        self._subtree_names = None
+        self._subtree_dict = None
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """
+        Returns the next FolderChunk.
+
+        :raises StopIteration: when there are no more chunks in the model
+        :raises TestingException: if the model file cannot be read, or parsed
+        """
+        while len(self._chunks) == 0:
+            if self._done:
+                raise StopIteration
+            try:
+                names, value = self._model_reader.next()
+            except StopIteration:
+                self._done = True
+                self.__close_subtree()
+                self.__close_folders(())
+                continue
+            self.__add_leaf(names, value)
+        return self._chunks.pop(0)
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __add_leaf(self, names, value):
+        depth = len(names)
+
+        subtree_names = None
+        if depth > _SUBTREE_DEPTH + 1 or (depth == _SUBTREE_DEPTH + 1 and isinstance(value, dict)):
+            subtree_names = names[:_SUBTREE_DEPTH + 1]
+        if subtree_names != self._subtree_names:
+            self.__close_subtree()
+
+        # The folder (including the section) the leaf is directly in, or
+        # the parent folder of the subtree it is in
+        if subtree_names is not None:
+            folder_names = names[:_SUBTREE_DEPTH]
+        else:
+            folder_names = names[:max(1, depth - 1)]
+        self.__close_folders(folder_names)
+        self.__open_folders(folder_names)
+
+        if subtree_names is not None:
+            if self._subtree_names is None:
+                self._subtree_names = subtree_names
+                self._subtree_dict = PyOrderedDict()
+            folder_dict = self._subtree_dict
+            for name in names[_SUBTREE_DEPTH + 1:-1]:
+                child_dict = folder_dict.get(name)
+                if not isinstance(child_dict, dict):
+                    child_dict = PyOrderedDict()
+                    folder_dict[name] = child_dict
+                folder_dict = child_dict
+            if depth > _SUBTREE_DEPTH + 1:
+                folder_dict[names[-1]] = value
+        elif depth > 1:
+            self._open_folders[-1][1][names[-1]] = value
+        return
+
+    def __open_folders(self, folder_names):
+        open_count = len(self._open_folders)
+        for depth in range(open_count + 1, len(folder_names) + 1):
+            self._open_folders.append((folder_names[:depth], PyOrderedDict()))
+        return
+
+    def __close_folders(self, folder_names):
+        """
+        Adds the leaves chunks of the open folders that folder_names isn't in.
+        """
+        while len(self._open_folders) > 0:
+            names, leaves_dict = self._open_folders[-1]
+            if folder_names[:len(names)] == names:
+                break
+            self._open_folders.pop()
+            self._chunks.append(FolderChunk(names[0], names[1:], None, leaves_dict))
+        return
+
+    def __close_subtree(self):
+        if self._subtree_names is not None:
+            names = self._subtree_names
+            folder_dict = PyOrderedDict()
+            folder_dict[names[-1]] = self._subtree_dict
+            self._chunks.append(FolderChunk(names[0], names[1:-1], names[-1], folder_dict))
+            self._subtree_names = None
+            self._subtree_dict = None
+        return
@@ -0,0 +1,98 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+
+
+class ItemPathTrie(object):
+    """
+    The folders of a model section that are in both the expected and actual
+    models, as a trie of interned folder names with integer node ids.
+
+    The differencer walks the section with node ids instead of item path prefix
+    strings, so an item path like:
+
+        resources:/JDBCSystemResource/ds1/JdbcResource/JDBCConnectionPoolParams/@MaxCapacity
+
+    is only rendered when it is reported, or has to be checked against the
+    excludes. The nodes are kept in parallel lists indexed by node id, and a
+    folder name that appears under many parents (e.g. JdbcResource) is stored
+    once.
+    """
+    _class_name = 'ItemPathTrie'
+
+    ROOT_ID = 0
+
+    def __init__(self, section_name):
+        self._section_name = section_name
+        self._segments = {}
+        self._parent_ids = [-1]
+        self._names = [None]
+        self._child_ids = {}
+        self._rendered_id = ItemPathTrie.ROOT_ID
+        self._rendered_prefix = '%s:/' % section_name
+
+    def get_section_name(self):
+        return self._section_name
+
+    def get_nodes_count(self):
+        return len(self._parent_ids)
+
+    def get_child_id(self, parent_id, folder_name):
+        """
+        Returns the node id of the folder_name child folder of parent_id, adding
+        it to the trie, if it isn't already there.
+
+        :param parent_id: The node id of the parent folder
+        :param folder_name: The name of the child folder
+        :return: The node id of the child folder
+        """
+        key = (parent_id, folder_name)
+        child_id = self._child_ids.get(key)
+        if child_id is None:
+            name = self._segments.get(folder_name)
+            if name is None:
+                name = folder_name
+                self._segments[name] = name
+            child_id = len(self._parent_ids)
+            self._parent_ids.append(parent_id)
+            self._names.append(name)
+            self._child_ids[key] = child_id
+        return child_id
+
+    def get_folder_prefix(self, node_id):
+        """
+        Returns the item path prefix of a folder (e.g. "topology:/Server/AdminServer/").
+        The most recently rendered prefix is kept, because item paths are usually
+        rendered for several attributes of the same folder in a row.
+
+        :param node_id: The node id of the folder
+        :return: The item path prefix
+        """
+        if node_id == self._rendered_id:
+            return self._rendered_prefix
+
+        names = []
+        current_id = node_id
+        while current_id != ItemPathTrie.ROOT_ID:
+            names.append(self._names[current_id])
+            current_id = self._parent_ids[current_id]
+        names.reverse()
+
+        prefix = '%s:/' % self._section_name
+        if len(names) > 0:
+            prefix = '%s%s/' % (prefix, '/'.join(names))
+
+        self._rendered_id = node_id
+        self._rendered_prefix = prefix
+        return prefix
+
+    def get_item_path(self, node_id, attribute_name):
+        """
+        Returns the item path of an attribute (e.g. "topology:/Server/AdminServer/@ListenPort").
+
+        :param node_id: The node id of the folder the attribute is in
+        :param attribute_name: The attribute name
+        :return: The item path
+        """
+        return '%s@%s' % (self.get_folder_prefix(node_id), attribute_name)
@@ -2,22 +2,36 @@
 Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
+import java.lang.Throwable as JThrowable
+import java.util.concurrent.Callable as JCallable
+import java.util.concurrent.Executors as JExecutors
 
 # java classes from weblogic-deploy-tooling
 from oracle.weblogic.deploy.util import PyOrderedDict
+from oracle.weblogic.deploy.util import TranslateException
 
 # java classes from weblogic-deploy-tooling-ct
 from oracle.weblogic.deploy.testing import TestingConstants
+from oracle.weblogic.deploy.testing import TestingException
 
 # python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.exception import exception_helper
 from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+from wlsdeploy.testing.common import model_cache
+from wlsdeploy.testing.common import testing_common
+from wlsdeploy.testing.common.model_stream_reader import ModelStreamReader
 from wlsdeploy.testing.common.model_constants import APP_DEPLOYMENTS
 from wlsdeploy.testing.common.model_constants import DOMAIN_INFO
 from wlsdeploy.testing.common.model_constants import RESOURCES
 from wlsdeploy.testing.common.model_constants import TOPOLOGY
 from wlsdeploy.testing.compare.model_file_types import ModelFileType
 from wlsdeploy.testing.compare.comparer_results import ComparerResults, ComparerResult
-from wlsdeploy.testing.compare.model_section_differencer import ModelSectionDifferencer
+from wlsdeploy.testing.compare.comparer_results_writer import ComparerResultsSpool
+from wlsdeploy.testing.compare.comparer_results_writer import ComparerResultsWriter
+from wlsdeploy.testing.compare.folder_chunker import FolderChunker
+from wlsdeploy.testing.compare.model_fingerprint import find_changed_folders
+from wlsdeploy.testing.compare.model_fingerprint import load_fingerprints
+from wlsdeploy.testing.compare.model_fingerprint import save_fingerprints
 from wlsdeploy.testing.compare.domain_info_section_differencer import DomainInfoSectionDifferencer
 from wlsdeploy.testing.compare.topology_section_differencer import TopologySectionDifferencer
 from wlsdeploy.testing.compare.resources_section_differencer import ResourcesSectionDifferencer
@@ -25,20 +39,57 @@ from wlsdeploy.testing.compare.app_deployments_section_differencer import AppDep
 
 _class_name = 'ModelComparer'
 
+# The model sections, in the order their results are reported
+_SECTION_DIFFERENCERS = [
+    (DOMAIN_INFO, DomainInfoSectionDifferencer),
+    (TOPOLOGY, TopologySectionDifferencer),
+    (RESOURCES, ResourcesSectionDifferencer),
+    (APP_DEPLOYMENTS, AppDeploymentsSectionDifferencer)
+]
+
 
 class ModelComparer(object):
     """
     Class for comparing values in two model dictionaries
     """
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, results_file=None, section_threads=None, fingerprint_file=None,
+                 log_messages=True):
+        """
+        :param logger: The PlatformLogger to use, or None to use the default one
+        :param results_file: If not None, the path of a file the comparison messages are
+                             streamed to in JSON Lines format, instead of being collected
+                             in memory
+        :param section_threads: The number of threads the model sections are compared on,
+                                or None to use one per section. With 1, the sections are
+                                compared on the calling thread.
+        :param fingerprint_file: If not None, the path of the file the Merkle hash trees
+                                 of the compared model sections, and the results of their
+                                 folders, are kept in. The folders that changed since the
+                                 fingerprints in it were written are reported, the stored
+                                 results of the folders that didn't change in either model
+                                 are reused, and then it is overwritten.
+        :param log_messages: If True, the messages streamed to the results_file are also
+                             logged as they are written, because they aren't kept for
+                             ComparerResults.log_results() to log
+        """
         if logger is None:
             self._logger = \
                 PlatformLogger('wlsdeploy.compare_models', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
         else:
             self._logger = logger
 
-        self._comparator_results = ComparerResults()
+        results_writer = None
+        if results_file is not None:
+            results_writer = ComparerResultsWriter(results_file, self._logger, log_messages)
+
+        self._comparator_results = ComparerResults(results_writer)
+
+        if section_threads is None:
+            section_threads = len(_SECTION_DIFFERENCERS)
+        self._section_threads = max(1, min(section_threads, len(_SECTION_DIFFERENCERS)))
+        self._fingerprint_file = fingerprint_file
+        self._baseline_fingerprints = None
 
     def compare_models(self, expected_model_dict, actual_model_dict):
         """
@@ -73,40 +124,71 @@ class ModelComparer(object):
         """
         _method_name = 'compare_models'
 
-        item_paths = PyOrderedDict()
-
-        domain_info_differencer = DomainInfoSectionDifferencer(self._logger)
-        comparison_result = self.__compare_model_sections(DOMAIN_INFO, expected_model_dict, actual_model_dict,
-                                                          item_paths, domain_info_differencer)
-        self._comparator_results.set_comparison_result(comparison_result)
+        try:
+            self.__compare_all_model_sections(expected_model_dict, actual_model_dict)
+            # Write the summary trailer, if the messages were
+            # streamed to a results file
+            self._comparator_results.close_results_writer()
+        finally:
+            results_writer = self._comparator_results.get_results_writer()
+            if results_writer is not None:
+                results_writer.close()
 
-        topology_differencer = TopologySectionDifferencer(self._logger)
-        comparison_result = self.__compare_model_sections(TOPOLOGY, expected_model_dict, actual_model_dict,
-                                                          item_paths, topology_differencer)
-        self._comparator_results.set_comparison_result(comparison_result)
-
-        resources_differencer = ResourcesSectionDifferencer(self._logger)
-        comparison_result = self.__compare_model_sections(RESOURCES, expected_model_dict, actual_model_dict,
-                                                          item_paths, resources_differencer)
-        self._comparator_results.set_comparison_result(comparison_result)
-
-        app_deployments_differencer = AppDeploymentsSectionDifferencer(self._logger)
-        comparison_result = self.__compare_model_sections(APP_DEPLOYMENTS, expected_model_dict, actual_model_dict,
-                                                          item_paths, app_deployments_differencer)
-        self._comparator_results.set_comparison_result(comparison_result)
-
-        self._logger.finer('item_paths={0}', str(item_paths),
-                           class_name=_class_name, method_name=_method_name)
+        return self._comparator_results
 
-        _match_item_path_values(item_paths, comparison_result)
+    def compare_model_files(self, expected_model_file, actual_model_file, expected_variables_file=None,
+                            actual_variables_file=None):
+        """
+        Compares two model files, like compare_models() does, without reading
+        either of them into a model dictionary.
+
+        Each model file is read with a ModelStreamReader, and a FolderChunker groups
+        its leaves into the parts of folders (e.g. topology:/Server/AdminServer, or
+        the attributes of topology:/). The two streams of parts are read in turns,
+        and each part is compared as soon as the same part has been read from the
+        other model. Only the parts waiting for their match are kept, so when both
+        models have their folders in the same order, the memory used depends on
+        the size of the largest folder, rather than the size of the models.
+
+        The parts that are still waiting at the end (e.g. the folders that are
+        only in one of the models) are compared after both files have been read.
+
+        If a model file uses YAML that the ModelStreamReader can't parse (e.g.
+        anchors, or sequences of mappings), the comparison so far is discarded,
+        and both model files are read into model dictionaries, and compared like
+        compare_models() does.
+
+        :param expected_model_file: The path of the "expected" model file
+        :param actual_model_file: The path of the "actual" model file
+        :param expected_variables_file: The substitution variables file for the
+                                        "expected" model, or None
+        :param actual_variables_file: The substitution variables file for the
+                                      "actual" model, or None
+        :return: A ComparerResults object containing a set of ComparerResult objects
+        :raises TestingException: if a model file cannot be read, or an unrecoverable
+                                  exception occurs during the comparison
+        """
+        try:
+            if not self.__compare_model_streams(expected_model_file, actual_model_file,
+                                                expected_variables_file, actual_variables_file):
+                self.__compare_parsed_model_files(expected_model_file, actual_model_file,
+                                                  expected_variables_file, actual_variables_file)
+            self._comparator_results.close_results_writer()
+        finally:
+            results_writer = self._comparator_results.get_results_writer()
+            if results_writer is not None:
+                results_writer.close()
 
         return self._comparator_results
 
     def write_compare_results(self, file_path):
         """
+        Writes the comparison messages to file_path in JSON Lines format. This
+        does nothing if a results_file was passed to the constructor, because
+        the messages were already streamed to it.
 
-        :param file_path:
-        :return:
+        :param file_path: The path of the results file
+        :raises CompareModelsException: if the results file cannot be written
         """
         self._comparator_results.write_to_file(file_path)
 
@@ -116,62 +198,391 @@ class ModelComparer(object):
     #
     ####################################################################################
 
-    def __compare_model_sections(self, section_name, expected_model_section_dict, actual_model_section_dict,
-                                 item_paths, differencer):
+    def __compare_all_model_sections(self, expected_model_dict, actual_model_dict):
+        """
+        Compares the model sections, each with its own ComparerResult, on up to
+        section_threads threads. The sections don't share any state while they are
+        compared, so the results are added afterwards, in section order, which
+        keeps the results the same from run to run.
+
+        When the messages are streamed to a results file, a section compared on the
+        calling thread writes them as they are produced. A section compared on one
+        of the pool's threads spools them, in the order they were produced, and they
+        are written when the results are added.
+        """
+        results_writer = self._comparator_results.get_results_writer()
+        self.__load_baseline_fingerprints()
+
+        tasks = []
+        for section_name, differencer_class in _SECTION_DIFFERENCERS:
+            if results_writer is None:
+                comparison_result = ComparerResult(section_name)
+            elif self._section_threads == 1:
+                comparison_result = ComparerResult(section_name, results_writer)
+            else:
+                comparison_result = ComparerResult(section_name, ComparerResultsSpool())
+            tasks.append(_CompareSectionTask(self.__compare_model_sections, section_name, expected_model_dict,
+                                             actual_model_dict, self.__create_differencer(section_name,
+                                                                                          differencer_class),
+                                             comparison_result))
+
+        if self._section_threads == 1:
+            for task in tasks:
+                task.call()
+        else:
+            executor = JExecutors.newFixedThreadPool(self._section_threads)
+            try:
+                futures = []
+                for task in tasks:
+                    futures.append(executor.submit(task))
+                for future in futures:
+                    future.get()
+            finally:
+                executor.shutdown()
+
+        section_results = []
+        for task in tasks:
+            task.raise_error()
+            section_results.append((task.get_section_name(), task.get_differencer(), task.get_comparison_result()))
+        self.__add_section_results(section_results)
+        return
+
+    def __compare_model_streams(self, expected_model_file, actual_model_file, expected_variables_file,
+                                actual_variables_file):
         """
+        Compares two model files a folder at a time. See compare_model_files().
 
-        :param section_name:
-        :param expected_model_section_dict:
-        :param actual_model_section_dict:
-        :param item_paths:
-        :param differencer:
-        :return:
+        :return: False if a model file couldn't be parsed a leaf at a time, in which
+                 case the comparison wasn't finished, True otherwise
+        """
+        _method_name = '__compare_model_streams'
+
+        differencer_classes = {}
+        for section_name, differencer_class in _SECTION_DIFFERENCERS:
+            differencer_classes[section_name] = differencer_class
+
+        sides = [ModelFileType.EXPECTED, ModelFileType.ACTUAL]
+        other_sides = {ModelFileType.EXPECTED: ModelFileType.ACTUAL, ModelFileType.ACTUAL: ModelFileType.EXPECTED}
+        model_readers = {
+            ModelFileType.EXPECTED: ModelStreamReader(expected_model_file, self._logger),
+            ModelFileType.ACTUAL: ModelStreamReader(actual_model_file, self._logger)
+        }
+        variables_files = {ModelFileType.EXPECTED: expected_variables_file, ModelFileType.ACTUAL: actual_variables_file}
+        self.__load_baseline_fingerprints()
+        variable_maps = {}
+        chunkers = {}
+        pending_chunks = {}
+        section_names = {}
+        for side in sides:
+            variable_maps[side] = testing_common.load_substitution_variables_file(variables_files[side],
+                                                                                  self._logger)
+            chunkers[side] = FolderChunker(model_readers[side])
+            pending_chunks[side] = {}
+            section_names[side] = {}
+
+        # section name -> (differencer, ComparerResult) of the open sections
+        open_sections = {}
+        compared_count = 0
+        max_pending_count = 0
+        sequence = 0
+
+        try:
+            try:
+                reading_sides = sides[:]
+                while len(reading_sides) > 0:
+                    for side in reading_sides[:]:
+                        try:
+                            chunk = chunkers[side].next()
+                        except StopIteration:
+                            reading_sides.remove(side)
+                            continue
+
+                        if chunk.section_name not in differencer_classes:
+                            continue
+
+                        if variable_maps[side] is not None:
+                            testing_common.apply_substitution_variables(variables_files[side], variable_maps[side],
+                                                                        chunk.folder_dict, self._logger)
+                            if chunk.child_name is not None:
+                                chunk.child_name = chunk.folder_dict.keys()[0]
+                        section_names[side][chunk.section_name] = True
+
+                        key = chunk.get_key()
+                        other_pending_chunks = pending_chunks[other_sides[side]]
+                        if key in other_pending_chunks:
+                            other_chunk = other_pending_chunks.pop(key)[1]
+                            if side == ModelFileType.EXPECTED:
+                                expected_dict, actual_dict = chunk.folder_dict, other_chunk.folder_dict
+                            else:
+                                expected_dict, actual_dict = other_chunk.folder_dict, chunk.folder_dict
+                            differencer = self.__open_section(chunk.section_name, differencer_classes, open_sections)
+                            differencer.compare_folders(chunk.folder_names, expected_dict, actual_dict)
+                            compared_count += 1
+                        else:
+                            pending_chunks[side][key] = (sequence, chunk)
+                            sequence += 1
+                            pending_count = len(pending_chunks[ModelFileType.EXPECTED]) + \
+                                len(pending_chunks[ModelFileType.ACTUAL])
+                            max_pending_count = max(max_pending_count, pending_count)
+            except TestingException, te:
+                parse_error_reader = None
+                for model_reader in model_readers.values():
+                    if model_reader.get_parse_error() is not None:
+                        parse_error_reader = model_reader
+                if parse_error_reader is None:
+                    raise te
+                self._logger.warning('WLSDPLY-09894', parse_error_reader.get_model_file().getAbsolutePath(),
+                                     parse_error_reader.get_parse_error(),
+                                     class_name=_class_name, method_name=_method_name)
+                return False
+        finally:
+            for side in sides:
+                model_readers[side].close()
+
+        self._logger.info('WLSDPLY-09954', model_readers[ModelFileType.EXPECTED].get_model_file().getAbsolutePath(),
+                          model_readers[ModelFileType.ACTUAL].get_model_file().getAbsolutePath(), compared_count,
+                          max_pending_count, class_name=_class_name, method_name=_method_name)
+
+        section_results = []
+        for section_name, differencer_class in _SECTION_DIFFERENCERS:
+            if section_name in open_sections:
+                differencer = open_sections[section_name]
+                self.__compare_unmatched_chunks(differencer, section_name, pending_chunks)
+                comparison_result = differencer.close_section()
+            else:
+                differencer = differencer_class(self._logger)
+                comparison_result = ComparerResult(section_name, self._comparator_results.get_results_writer())
+                if section_name in section_names[ModelFileType.EXPECTED]:
+                    comparison_result.add_warning('WLSDPLY-09911', ModelFileType.EXPECTED,
+                                                  section_name, ModelFileType.ACTUAL)
+            section_results.append((section_name, differencer, comparison_result))
+        self.__add_section_results(section_results)
+        return True
+
+    def __compare_parsed_model_files(self, expected_model_file, actual_model_file, expected_variables_file,
+                                     actual_variables_file):
+        """
+        Reads two model files into model dictionaries, and compares them like compare_models()
+        does. Called when a model file couldn't be compared a folder at a time, so the
+        results of that comparison are discarded first.
+        """
+        _method_name = '__compare_parsed_model_files'
+
+        results_writer = self._comparator_results.get_results_writer()
+        if results_writer is not None:
+            # The results file is written over, the next time a line is written to it
+            results_writer.close()
+        self._comparator_results = ComparerResults(results_writer)
+
+        model_dicts = []
+        for model_file, variables_file in [(expected_model_file, expected_variables_file),
+                                           (actual_model_file, actual_variables_file)]:
+            try:
+                model_dict = model_cache.get_model_cache().parse(str(model_file))
+            except TranslateException, te:
+                ex = exception_helper.create_testing_exception('WLSDPLY-09953', model_file, 0,
+                                                               te.getLocalizedMessage(), error=te)
+                self._logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+                raise ex
+            if variables_file is not None:
+                testing_common.apply_substitution_variables_file(variables_file, model_dict, self._logger)
+            model_dicts.append(model_dict)
+
+        self.__compare_all_model_sections(model_dicts[0], model_dicts[1])
+        return
+
+    def __open_section(self, section_name, differencer_classes, open_sections):
+        """
+        Returns the differencer for section_name, opening the section the first
+        time it's called for it. The model files are compared on the calling thread,
+        so the messages are streamed to the results file, if there is one, as they
+        are produced.
+        """
+        differencer = open_sections.get(section_name)
+        if differencer is None:
+            differencer = self.__create_differencer(section_name, differencer_classes[section_name])
+            differencer.open_section(section_name,
+                                     ComparerResult(section_name, self._comparator_results.get_results_writer()))
+            open_sections[section_name] = differencer
+        return differencer
+
+    def __compare_unmatched_chunks(self, differencer, section_name, pending_chunks):
+        """
+        Compares the parts of the folders in a section that didn't get paired with
+        a part from the other model. The parts of each folder are merged, so that
+        the differencer can still pair up child folders whose names are different
+        in the two models (e.g. versioned library names).
+        """
+        unmatched_chunks = []
+        for side in [ModelFileType.EXPECTED, ModelFileType.ACTUAL]:
+            for sequence, chunk in pending_chunks[side].itervalues():
+                if chunk.section_name == section_name:
+                    unmatched_chunks.append((sequence, side, chunk))
+        unmatched_chunks.sort()
+
+        folder_names_list = []
+        folder_dicts = {}
+        for sequence, side, chunk in unmatched_chunks:
+            if chunk.folder_names not in folder_dicts:
+                folder_names_list.append(chunk.folder_names)
+                folder_dicts[chunk.folder_names] = {
+                    ModelFileType.EXPECTED: PyOrderedDict(),
+                    ModelFileType.ACTUAL: PyOrderedDict()
+                }
+            folder_dicts[chunk.folder_names][side].update(chunk.folder_dict)
+
+        for folder_names in folder_names_list:
+            side_dicts = folder_dicts[folder_names]
+            differencer.compare_folders(folder_names, side_dicts[ModelFileType.EXPECTED],
+                                        side_dicts[ModelFileType.ACTUAL])
+        return
+
+    def __add_section_results(self, section_results):
+        """
+        Adds the ComparerResult of each model section to the ComparerResults, in
+        section order, writes the messages that were spooled for the sections that
+        were compared on other threads, and reports and saves the sections' fingerprints.
+
+        :param section_results: A list of (section name, differencer, ComparerResult) tuples
+        """
+        results_writer = self._comparator_results.get_results_writer()
+        section_fingerprints = []
+        recorded_results = []
+        for section_name, differencer, comparison_result in section_results:
+            section_writer = comparison_result.get_results_writer()
+            if section_writer is not results_writer:
+                section_writer.write_messages(results_writer)
+                comparison_result.set_results_writer(results_writer)
+            self._comparator_results.set_comparison_result(comparison_result)
+            self.__add_section_fingerprints(section_name, differencer, comparison_result, section_fingerprints,
+                                            recorded_results)
+            if results_writer is not None:
+                results_writer.flush()
+
+        if self._fingerprint_file is not None:
+            save_fingerprints(self._fingerprint_file, section_fingerprints, recorded_results, self._logger)
+        return
+
+    def __load_baseline_fingerprints(self):
+        """
+        Reads the baseline fingerprints, and stored results, from the fingerprint
+        file, if there is one.
+        """
+        if self._fingerprint_file is not None:
+            self._baseline_fingerprints = load_fingerprints(self._fingerprint_file, self._logger)
+        return
+
+    def __create_differencer(self, section_name, differencer_class):
+        """
+        Creates the differencer for a model section, which records the results of
+        the folders, and reuses the baseline's, if there is a fingerprint file.
+        """
+        differencer = differencer_class(self._logger)
+        if self._fingerprint_file is not None:
+            baseline_results = None
+            if self._baseline_fingerprints is not None:
+                baseline_results = self._baseline_fingerprints.get_section_results(section_name)
+            differencer.record_results(baseline_results)
+        return differencer
+
+    def __add_section_fingerprints(self, section_name, differencer, comparison_result, section_fingerprints,
+                                   recorded_results):
+        """
+        Reports the folders of a compared model section that changed since the
+        baseline fingerprints, and adds its fingerprints to section_fingerprints,
+        and its folders' results to recorded_results, to be saved as the next baseline.
+        """
+        if self._fingerprint_file is None:
+            return
+
+        baseline_fingerprints = self._baseline_fingerprints
+        if differencer.get_section_results() is not None:
+            recorded_results.append(differencer.get_section_results())
+
+        for side, fingerprint in [(ModelFileType.EXPECTED, differencer.get_expected_fingerprint()),
+                                  (ModelFileType.ACTUAL, differencer.get_actual_fingerprint())]:
+            if fingerprint is None:
+                continue
+            section_fingerprints.append((side, section_name, fingerprint))
+            if baseline_fingerprints is not None:
+                changed_folders = find_changed_folders('%s:/' % section_name, fingerprint,
+                                                       baseline_fingerprints.get_digests(side))
+                if len(changed_folders) > 0:
+                    comparison_result.add_info('WLSDPLY-09951', len(changed_folders), section_name, side,
+                                               self._fingerprint_file, ', '.join(changed_folders))
+        return
+
+    def __compare_model_sections(self, section_name, expected_model_section_dict, actual_model_section_dict,
+                                 differencer, comparison_result):
+        """
+        Compares one model section. Safe to call on any thread, as long as the
+        ComparerResult collects or spools its messages, rather than writing them
+        to the shared results writer.
+
+        :param section_name: The name of the model section
+        :param expected_model_section_dict: The "expected" model dictionary
+        :param actual_model_section_dict: The "actual" model dictionary
+        :param differencer: The ModelSectionDifferencer for the section
+        :param comparison_result: The ComparerResult for the section
+        :return: comparison_result
         """
         _method_name = '__compare_model_sections'
 
         self._logger.entering(section_name, class_name=_class_name, method_name=_method_name)
 
-        comparison_result = ComparerResult(section_name)
-
         if section_name in expected_model_section_dict:
             if section_name not in actual_model_section_dict:
                 comparison_result.add_warning('WLSDPLY-09911', ModelFileType.EXPECTED,
                                               section_name, ModelFileType.ACTUAL)
             else:
                 differencer.compare_sections(expected_model_section_dict[section_name],
-                                             actual_model_section_dict[section_name], item_paths, comparison_result)
+                                             actual_model_section_dict[section_name], comparison_result)
 
         self._logger.exiting(class_name=_class_name, method_name=_method_name)
 
         return comparison_result
 
 
-def _match_item_path_values(item_paths, comparison_result):
+class _CompareSectionTask(JCallable):
     """
-
-    :param item_paths:
-    :param comparison_result:
-    :return:
+    Compares a single model section, on one of the pool's threads. The outcome,
+    or the exception that stopped it, is kept on the task, so that it can be
+    handled on the calling thread.
     """
-    for item_path, item_value in item_paths.iteritems():
-        if item_value[ModelSectionDifferencer.ItemValueTypes.ACTUAL] is None:
-            if item_value[ModelSectionDifferencer.ItemValueTypes.DEFAULT] is None:
-                # item_path is only in expected, so report this as an
-                # ERROR severity level comparison result
-                comparison_result.add_error('WLSDPLY-09915', ModelFileType.EXPECTED,
-                                            item_path, ModelFileType.ACTUAL)
-            else:
-                comparison_result.add_warning('WLSDPLY-09915', ModelFileType.EXPECTED,
-                                              item_path, ModelFileType.ACTUAL)
-
-        elif item_value[ModelSectionDifferencer.ItemValueTypes.EXPECTED] is None:
-            if item_value[ModelSectionDifferencer.ItemValueTypes.DEFAULT] is None:
-                # item_path is only in actual, so report this as a
-                # WARNING severity level comparison result
-                comparison_result.add_warning('WLSDPLY-09915', ModelFileType.ACTUAL,
-                                              item_path, ModelFileType.EXPECTED)
-            else:
-                comparison_result.add_warning('WLSDPLY-09915', ModelFileType.ACTUAL,
-                                              item_path, ModelFileType.EXPECTED)
+    def __init__(self, compare_method, section_name, expected_model_dict, actual_model_dict, differencer,
+                 comparison_result):
+        self._compare_method = compare_method
+        self._section_name = section_name
+        self._expected_model_dict = expected_model_dict
+        self._actual_model_dict = actual_model_dict
+        self._differencer = differencer
+        self._comparison_result = comparison_result
+        self._error = None
+
+    def get_section_name(self):
+        return self._section_name
+
+    def get_differencer(self):
+        return self._differencer
+
+    def get_comparison_result(self):
+        return self._comparison_result
+
+    def raise_error(self):
+        """
+        Raises the exception that stopped the comparison, if there was one.
+        """
+        if self._error is not None:
+            raise self._error
+        return
+
+    def call(self):
+        try:
+            self._compare_method(self._section_name, self._expected_model_dict, self._actual_model_dict,
+                                 self._differencer, self._comparison_result)
+        except JThrowable, t:
+            self._error = t
+        except Exception, e:
+            self._error = e
+        return None
 
-    return
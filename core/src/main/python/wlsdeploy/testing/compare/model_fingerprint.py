@@ -0,0 +1,481 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+
+Merkle hash trees of model sections, used to skip the folders that are the same
+in both models, and to find the folders that changed since a stored baseline.
+The results of the folders that were different in the two models are stored
+with the baseline, so a later comparison can reuse them for the folders that
+haven't changed in either model since.
+"""
+import jarray
+
+import java.io.BufferedReader as JBufferedReader
+import java.io.BufferedWriter as JBufferedWriter
+import java.io.File as JFile
+import java.io.FileInputStream as JFileInputStream
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.io.InputStreamReader as JInputStreamReader
+import java.io.OutputStreamWriter as JOutputStreamWriter
+import java.lang.String as JString
+import java.security.MessageDigest as JMessageDigest
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common.model_cache import decode_model
+from wlsdeploy.testing.common.model_cache import encode_model
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_class_name = 'model_fingerprint'
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+# Bump this whenever the digest input below changes, so that a baseline
+# written by an older version is never compared with a newer one.
+_FORMAT_VERSION = '2'
+_HEADER = '# model fingerprint %s' % _FORMAT_VERSION
+_FIELD_SEPARATOR = '\t'
+
+# The first field of the lines that aren't folder digests
+_CONFIG_LINE = 'config'
+_FOLDER_LINE = 'folder'
+_MESSAGE_LINE = 'message'
+
+_ENTRY_SEPARATOR = u'\x1e'
+_FOLDER_TAG = u'\x01'
+_ATTRIBUTE_TAG = u'\x00'
+
+
+class BaselineFingerprints(object):
+    """
+    What was read from a fingerprint file: the folder digests of each side, and
+    the SectionResults of each model section.
+    """
+    def __init__(self):
+        self._digests = {}
+        self._section_results = {}
+
+    def get_digests(self, side):
+        """
+        Returns the folder item path prefix -> digest dictionary of side.
+        """
+        return self._digests.get(side, {})
+
+    def get_section_results(self, section_name):
+        """
+        Returns the SectionResults of section_name, or None if there aren't any.
+        """
+        return self._section_results.get(section_name)
+
+    def _add_digest(self, side, folder_prefix, digest):
+        side_digests = self._digests.get(side)
+        if side_digests is None:
+            side_digests = {}
+            self._digests[side] = side_digests
+        side_digests[folder_prefix] = digest
+        return
+
+    def _add_section_results(self, section_results):
+        self._section_results[section_results.section_name] = section_results
+        return
+
+
+class FolderResults(object):
+    """
+    The results of comparing a folder that was in both models, with different
+    digests: the value comparison counts, and the range of the section's messages,
+    of everything at, or below, the folder.
+    """
+    def __init__(self, folder_prefix, expected_digest, actual_digest, counts=None, first_message=0, end_message=0):
+        self.folder_prefix = folder_prefix
+        self.expected_digest = expected_digest
+        self.actual_digest = actual_digest
+        # [EQUAL, EQUAL_TO_DEFAULT, DIFFERENT] counts of the ValueComparator
+        self.counts = counts
+        self.first_message = first_message
+        self.end_message = end_message
+
+
+class SectionResults(object):
+    """
+    The FolderResults of the folders of a model section that were compared, in the
+    order they were started (so the folders below a folder come right after it),
+    and the (severity, resource id, args) messages they produced, in order.
+
+    The results depend on the excludes of the section too, so they are only reused
+    when the digest of the excludes, config_digest, is the same.
+    """
+    def __init__(self, section_name, config_digest):
+        self.section_name = section_name
+        self.config_digest = config_digest
+        self.folders = []
+        self.messages = []
+        self._folder_indexes = {}
+
+    def start_folder(self, folder_prefix, expected_digest, actual_digest):
+        """
+        Starts recording the results of a folder.
+
+        :return: The FolderResults, to pass to end_folder() with the counts
+        """
+        folder_results = FolderResults(folder_prefix, expected_digest, actual_digest,
+                                       first_message=len(self.messages))
+        self.folders.append(folder_results)
+        return folder_results
+
+    def end_folder(self, folder_results, counts):
+        """
+        Finishes recording the results of a folder.
+
+        :param folder_results: The FolderResults start_folder() returned
+        :param counts: The value comparison counts of the folder
+        """
+        folder_results.counts = counts
+        folder_results.end_message = len(self.messages)
+        return
+
+    def add_message(self, severity, resource_id, args):
+        self.messages.append((severity, resource_id, args))
+        return
+
+    def find_folder(self, folder_prefix, expected_digest, actual_digest):
+        """
+        Returns the FolderResults of folder_prefix, if it was compared with the same
+        expected and actual digests, or None.
+        """
+        index = self._folder_indexes.get(folder_prefix)
+        if index is None:
+            return None
+        folder_results = self.folders[index]
+        if folder_results.expected_digest != expected_digest or folder_results.actual_digest != actual_digest:
+            return None
+        return folder_results
+
+    def copy_folder(self, baseline_results, folder_results):
+        """
+        Copies the results of a folder, and of the folders below it, from baseline_results.
+
+        :param baseline_results: The SectionResults of the baseline
+        :param folder_results: The FolderResults in baseline_results, which find_folder() returned
+        :return: The messages of the folder, in the order they were produced
+        """
+        index = baseline_results._folder_indexes[folder_results.folder_prefix]
+        offset = len(self.messages) - folder_results.first_message
+        baseline_folders = baseline_results.folders
+        while index < len(baseline_folders) \
+                and baseline_folders[index].folder_prefix.startswith(folder_results.folder_prefix):
+            baseline_folder = baseline_folders[index]
+            self.folders.append(FolderResults(baseline_folder.folder_prefix, baseline_folder.expected_digest,
+                                              baseline_folder.actual_digest, baseline_folder.counts,
+                                              baseline_folder.first_message + offset,
+                                              baseline_folder.end_message + offset))
+            index += 1
+
+        messages = baseline_results.messages[folder_results.first_message:folder_results.end_message]
+        self.messages.extend(messages)
+        return messages
+
+    def _index_folders(self):
+        for index in range(len(self.folders)):
+            self._folder_indexes[self.folders[index].folder_prefix] = index
+        return
+
+
+class FolderFingerprint(object):
+    """
+    The node of a Merkle hash tree for one model folder. The digest covers the
+    names and values of everything at, or below, the folder, but not the order
+    of the folder's keys, so two folders with the same digest produce the same
+    comparison results.
+    """
+    def __init__(self, digest, leaves_count, children):
+        self.digest = digest
+        self.leaves_count = leaves_count
+        self.children = children
+
+
+def compute_fingerprint(folder_dict):
+    """
+    Returns the Merkle hash tree of a model folder dictionary, hashing each value
+    once.
+
+    :param folder_dict: The model folder dictionary (e.g. the topology section)
+    :return: The FolderFingerprint for folder_dict
+    """
+    return _combine_fingerprints(folder_dict, {})
+
+
+class FingerprintBuilder(object):
+    """
+    Builds the Merkle hash tree of a model section from the parts of its folders
+    that a FolderChunker returns, so that the section never has to be in memory.
+    Only the leaves of the folders above the chunks, and the FolderFingerprints
+    of the child folders in the chunks, are kept until get_fingerprint() is called.
+    """
+    _class_name = 'FingerprintBuilder'
+
+    def __init__(self):
+        self._root = _FolderNode()
+
+    def add(self, folder_names, folder_dict, fingerprint):
+        """
+        Adds a part of a folder to the tree.
+
+        :param folder_names: The tuple of folder names from the section down to the folder
+        :param folder_dict: The part of the folder's dictionary
+        :param fingerprint: The FolderFingerprint of folder_dict
+        """
+        if len(folder_dict) == 0:
+            # Don't add a folder that is only in the other model
+            return
+
+        node = self._root
+        for name in folder_names:
+            child_node = node.folder_nodes.get(name)
+            if child_node is None:
+                child_node = _FolderNode()
+                node.folder_nodes[name] = child_node
+            node = child_node
+
+        for name, value in folder_dict.iteritems():
+            if isinstance(value, dict):
+                node.child_fingerprints[name] = fingerprint.children[name]
+            else:
+                node.leaves[name] = value
+        return
+
+    def get_fingerprint(self):
+        """
+        Returns the FolderFingerprint of the section, which is the same as
+        compute_fingerprint() returns for the whole section dictionary.
+        """
+        return self._root.get_fingerprint()
+
+
+class _FolderNode(object):
+    def __init__(self):
+        self.leaves = {}
+        self.child_fingerprints = {}
+        self.folder_nodes = {}
+
+    def get_fingerprint(self):
+        child_fingerprints = self.child_fingerprints.copy()
+        for name, folder_node in self.folder_nodes.iteritems():
+            child_fingerprints[name] = folder_node.get_fingerprint()
+        return _combine_fingerprints(self.leaves, child_fingerprints)
+
+
+def save_fingerprints(file_path, section_fingerprints, section_results, logger=None):
+    """
+    Writes Merkle hash trees to file_path, one folder per line:
+
+        <side><TAB><folder item path prefix><TAB><digest><TAB><leaves count>
+
+    followed by the results of each section, which are a line with the digest of
+    its excludes, a line per compared folder, and a line per message, with its
+    arguments encoded in hex:
+
+        config<TAB><section name><TAB><excludes digest>
+        folder<TAB><folder item path prefix><TAB><expected digest><TAB><actual digest><TAB>
+            <equal count><TAB><equal to default count><TAB><different count><TAB><first message><TAB><end message>
+        message<TAB><severity><TAB><resource id><TAB><encoded args>
+
+    :param file_path: The path of the fingerprint file, which is overwritten
+    :param section_fingerprints: A list of (side, section_name, FolderFingerprint) tuples
+    :param section_results: A list of SectionResults
+    :param logger: The PlatformLogger to use, or None to use the default one
+    :raises CompareModelsException: if the file cannot be written
+    """
+    _method_name = 'save_fingerprints'
+
+    if logger is None:
+        logger = _logger
+
+    j_file = JFile(str(file_path)).getAbsoluteFile()
+    logger.fine('WLSDPLY-09949', j_file.getAbsolutePath(), class_name=_class_name, method_name=_method_name)
+
+    writer = None
+    try:
+        try:
+            parent_dir = j_file.getParentFile()
+            if parent_dir is not None and not parent_dir.exists():
+                parent_dir.mkdirs()
+            writer = JBufferedWriter(JOutputStreamWriter(JFileOutputStream(j_file), 'UTF-8'))
+            writer.write(_HEADER)
+            writer.newLine()
+            for side, section_name, fingerprint in section_fingerprints:
+                _write_folder(writer, side, '%s:/' % section_name, fingerprint)
+            for results in section_results:
+                _write_section_results(writer, results)
+        except JIOException, ioe:
+            ex = exception_helper.create_compare_models_exception('WLSDPLY-09950', j_file.getAbsolutePath(),
+                                                                  ioe.getLocalizedMessage(), error=ioe)
+            logger.throwing(ex, class_name=_class_name, method_name=_method_name)
+            raise ex
+    finally:
+        if writer is not None:
+            writer.close()
+    return
+
+
+def load_fingerprints(file_path, logger=None):
+    """
+    Reads a fingerprint file written by save_fingerprints().
+
+    :param file_path: The path of the fingerprint file
+    :param logger: The PlatformLogger to use, or None to use the default one
+    :return: The BaselineFingerprints, or None if the file doesn't exist, or was
+             written by a different version
+    """
+    _method_name = 'load_fingerprints'
+
+    if logger is None:
+        logger = _logger
+
+    j_file = JFile(str(file_path)).getAbsoluteFile()
+    if not j_file.isFile():
+        return None
+
+    result = BaselineFingerprints()
+    section_results = None
+    reader = None
+    try:
+        try:
+            reader = JBufferedReader(JInputStreamReader(JFileInputStream(j_file), 'UTF-8'))
+            line = reader.readLine()
+            if line != _HEADER:
+                return None
+            line = reader.readLine()
+            while line is not None:
+                fields = line.split(_FIELD_SEPARATOR)
+                if fields[0] == _MESSAGE_LINE and len(fields) == 4 and section_results is not None:
+                    section_results.add_message(fields[1], fields[2], tuple(decode_model(_from_hex(fields[3]))))
+                elif fields[0] == _FOLDER_LINE and len(fields) == 9 and section_results is not None:
+                    section_results.folders.append(
+                        FolderResults(fields[1], fields[2], fields[3],
+                                      [int(fields[4]), int(fields[5]), int(fields[6])],
+                                      int(fields[7]), int(fields[8])))
+                elif fields[0] == _CONFIG_LINE and len(fields) == 3:
+                    section_results = SectionResults(fields[1], fields[2])
+                    result._add_section_results(section_results)
+                elif len(fields) == 4:
+                    result._add_digest(fields[0], fields[1], fields[2])
+                line = reader.readLine()
+        except JIOException, ioe:
+            logger.warning('WLSDPLY-09950', j_file.getAbsolutePath(), ioe.getLocalizedMessage(),
+                           class_name=_class_name, method_name=_method_name)
+            return None
+    finally:
+        if reader is not None:
+            reader.close()
+
+    for results in result._section_results.itervalues():
+        results._index_folders()
+    return result
+
+
+def find_changed_folders(folder_prefix, fingerprint, baseline_digests):
+    """
+    Returns the item path prefixes of the folders at, or below, folder_prefix whose
+    digest is different from the one in baseline_digests. Only the folders whose
+    digest changed are descended into, so the cost depends on the number of changes,
+    not the size of the model.
+
+    :param folder_prefix: The item path prefix of the folder (e.g. "topology:/")
+    :param fingerprint: The FolderFingerprint of the folder
+    :param baseline_digests: The folder item path prefix -> digest dictionary of the baseline
+    :return: A list of item path prefixes, deepest folders last
+    """
+    if baseline_digests.get(folder_prefix) == fingerprint.digest:
+        return []
+
+    changed_folders = [folder_prefix]
+    for name, child in fingerprint.children.iteritems():
+        changed_folders.extend(find_changed_folders('%s%s/' % (folder_prefix, name), child, baseline_digests))
+    return changed_folders
+
+
+def _combine_fingerprints(folder_dict, child_fingerprints):
+    """
+    Returns the FolderFingerprint of a folder with the entries in folder_dict, and
+    child folders with the (already computed) FolderFingerprints in child_fingerprints.
+    """
+    children = {}
+    entries = []
+    leaves_count = 0
+    for name, value in folder_dict.iteritems():
+        if isinstance(value, dict):
+            child = compute_fingerprint(value)
+            children[name] = child
+            leaves_count += child.leaves_count
+            entries.append(u'%s%s%s' % (name, _FOLDER_TAG, child.digest))
+        else:
+            leaves_count += 1
+            entries.append(u'%s%s%s%s%s' % (name, _ATTRIBUTE_TAG, type(value).__name__, _ATTRIBUTE_TAG,
+                                            _to_unicode(value)))
+    for name, child in child_fingerprints.iteritems():
+        children[name] = child
+        leaves_count += child.leaves_count
+        entries.append(u'%s%s%s' % (name, _FOLDER_TAG, child.digest))
+    # The merge-join in the differencer doesn't depend on the key order, so neither does the digest
+    entries.sort()
+
+    digest = JMessageDigest.getInstance('SHA-256')
+    digest.update(JString(_ENTRY_SEPARATOR.join(entries)).getBytes('UTF-8'))
+
+    return FolderFingerprint(_to_hex(digest.digest()), leaves_count, children)
+
+
+def _write_folder(writer, side, folder_prefix, fingerprint):
+    writer.write(_FIELD_SEPARATOR.join([side, folder_prefix, fingerprint.digest, str(fingerprint.leaves_count)]))
+    writer.newLine()
+    for name, child in fingerprint.children.iteritems():
+        _write_folder(writer, side, '%s%s/' % (folder_prefix, name), child)
+    return
+
+
+def _write_section_results(writer, section_results):
+    writer.write(_FIELD_SEPARATOR.join([_CONFIG_LINE, section_results.section_name, section_results.config_digest]))
+    writer.newLine()
+    for folder_results in section_results.folders:
+        fields = [_FOLDER_LINE, folder_results.folder_prefix, folder_results.expected_digest,
+                  folder_results.actual_digest]
+        for count in folder_results.counts:
+            fields.append(str(count))
+        fields.append(str(folder_results.first_message))
+        fields.append(str(folder_results.end_message))
+        writer.write(_FIELD_SEPARATOR.join(fields))
+        writer.newLine()
+    for severity, resource_id, args in section_results.messages:
+        writer.write(_FIELD_SEPARATOR.join([_MESSAGE_LINE, severity, resource_id, _to_hex(encode_model(args))]))
+        writer.newLine()
+    return
+
+
+def _to_hex(data):
+    hex_chars = []
+    for b in data:
+        hex_chars.append('%02x' % (b & 0xff))
+    return ''.join(hex_chars)
+
+
+def _from_hex(text):
+    data = jarray.zeros(len(text) / 2, 'b')
+    for i in range(len(data)):
+        b = int(text[2 * i:2 * i + 2], 16)
+        if b > 127:
+            b -= 256
+        data[i] = b
+    return data
+
+
+def _to_unicode(value):
+    if isinstance(value, list) or isinstance(value, tuple):
+        items = []
+        for item in value:
+            items.append(_to_unicode(item))
+        return u'[%s]' % u','.join(items)
+    return unicode(value)
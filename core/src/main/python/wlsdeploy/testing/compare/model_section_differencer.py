@@ -3,6 +3,8 @@ Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
 
+import re
+
 # java classes from weblogic-deploy-tooling
 from oracle.weblogic.deploy.util import PyOrderedDict
 
@@ -13,12 +15,29 @@ from wlsdeploy.util.enum import Enum
 from oracle.weblogic.deploy.testing import TestingConstants
 
 # python classes from weblogic-deploy-tooling-ct
-from wlsdeploy.testing.common import testing_helper, testing_constants
+from wlsdeploy.testing.common import config_registry, testing_constants
+from wlsdeploy.testing.compare import defaults_index
+from wlsdeploy.testing.compare.comparer_results_writer import ComparerResultsWriter
+from wlsdeploy.testing.compare.excludes_index import ExcludesIndex
+from wlsdeploy.testing.compare.item_path_trie import ItemPathTrie
+from wlsdeploy.testing.compare.model_fingerprint import compute_fingerprint
+from wlsdeploy.testing.compare.model_fingerprint import FingerprintBuilder
+from wlsdeploy.testing.compare.model_fingerprint import SectionResults
 from wlsdeploy.testing.compare.model_file_types import ModelFileType
-from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+from wlsdeploy.testing.compare.value_comparator import ValueComparator
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger, lazy
 
 _logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
 
+# Stands in for the value of an item path that is only on one side, because a
+# model attribute can legitimately have a None (null, or empty) value
+_MISSING = object()
+
+# The values of the attributes whose names match this are never reported
+_MASKED_ATTRIBUTE_PATTERN = re.compile(r'password|passphrase|credential|secret', re.IGNORECASE)
+# What is logged instead of the values of password and credential attributes
+_MASKED_VALUE = '********'
+
 
 class ModelSectionDifferencer(object):
     """
@@ -34,117 +53,315 @@ class ModelSectionDifferencer(object):
             self._logger = logger
 
         self._excludes_dict = PyOrderedDict()
+        self._excludes_index = None
+        self._defaults_index = None
+        self._value_comparator = None
+        self._comparison_result = None
+        self._item_path_trie = None
+        self._expected_fingerprint = None
+        self._actual_fingerprint = None
+        self._expected_fingerprint_builder = None
+        self._actual_fingerprint_builder = None
+        self._record_results = False
+        self._baseline_results = None
+        self._section_results = None
+        self._reused_folders_count = 0
+
+    def record_results(self, baseline_results=None):
+        """
+        Records the results of the folders that are compared, so that they can be
+        saved with the fingerprints. The results of the folders in baseline_results
+        that have the same digests in both models as they had then, are reused
+        instead of comparing the folders again. Called before the section is compared.
 
-    ############################################
-    #
-    # Protected methods exposed to subclasses
-    #
-    ###########################################
+        :param baseline_results: The SectionResults of the section in the baseline, or None
+        """
+        self._record_results = True
+        self._baseline_results = baseline_results
+        return
 
-    def _compare_sections(self, section_name, expected_section_dict, actual_section_dict, item_paths, comparison_result):
-        _method_name = '__compare_sections'
+    def get_section_results(self):
+        """
+        Returns the SectionResults recorded while the section was compared, or None
+        if record_results() wasn't called.
+        """
+        return self._section_results
 
-        self._logger.info('WLSDPLY-09917', ModelFileType.EXPECTED, section_name,
+    def get_expected_fingerprint(self):
+        """
+        Returns the FolderFingerprint (Merkle hash tree) of the expected model section,
+        or None if the section wasn't compared.
+        """
+        return self._expected_fingerprint
+
+    def get_actual_fingerprint(self):
+        """
+        Returns the FolderFingerprint (Merkle hash tree) of the actual model section,
+        or None if the section wasn't compared.
+        """
+        return self._actual_fingerprint
+
+    def open_section(self, section_name, comparison_result):
+        """
+        Starts comparing a model section a folder at a time, instead of as a whole
+        with compare_sections(). The parts of the section's folders are compared
+        with compare_folders(), in any order, and close_section() is called after
+        the last one.
+
+        :param section_name: The name of the model section being compared
+        :param comparison_result: The ComparerResult for the section
+        :raises TestingException: if the excludes or defaults files cannot be loaded
+        """
+        _method_name = 'open_section'
+
+        self._logger.info('WLSDPLY-09916', section_name, ModelFileType.EXPECTED, ModelFileType.ACTUAL,
                           class_name=self._class_name, method_name=_method_name)
 
-        function_name = '_handle_expected_item_path'
-        function = getattr(self, function_name)
-        path_tokens, iterators_count = [], 0
-        iterators = [expected_section_dict.iteritems()]
+        self._excludes_index = self._load_model_section_excludes_index(section_name)
+        self._defaults_index = self._load_model_section_defaults_index(section_name)
+        self.__start_section(section_name, comparison_result)
+        self._expected_fingerprint_builder = FingerprintBuilder()
+        self._actual_fingerprint_builder = FingerprintBuilder()
+        return
+
+    def compare_folders(self, folder_names, expected_folder_dict, actual_folder_dict):
+        """
+        Compares a part of a folder in the section opened with open_section() (e.g.
+        the FolderChunks for the same part of the folder from the two models). Either
+        dictionary may be empty, when the part is only in one of the models.
 
-        while iterators:
-            current_iterator = iterators.pop()
-            for node_name, node_value in current_iterator:
-                if not isinstance(node_value, dict):
-                    item_path = '%s:/%s%s%s' % (section_name,
-                                                '/'.join(path_tokens),
-                                                (path_tokens and ['/'] or [''])[0],
-                                                '@%s' % node_name)
+        :param folder_names: The tuple of folder names from the section down to the folder
+        :param expected_folder_dict: The part of the folder from the "expected" model
+        :param actual_folder_dict: The part of the folder from the "actual" model
+        """
+        trie = self._item_path_trie
+        folder_id = ItemPathTrie.ROOT_ID
+        defaults_cursor = None
+        if self._defaults_index is not None:
+            defaults_cursor = self._defaults_index.get_root_cursor()
+        for folder_name in folder_names:
+            folder_id = trie.get_child_id(folder_id, folder_name)
+            if defaults_cursor is not None:
+                defaults_cursor = self._defaults_index.descend(defaults_cursor, folder_name)
+
+        expected_fingerprint = compute_fingerprint(expected_folder_dict)
+        actual_fingerprint = compute_fingerprint(actual_folder_dict)
+        self._expected_fingerprint_builder.add(folder_names, expected_folder_dict, expected_fingerprint)
+        self._actual_fingerprint_builder.add(folder_names, actual_folder_dict, actual_fingerprint)
+
+        self.__compare_folder(folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                              expected_fingerprint, actual_fingerprint)
+        return
+
+    def close_section(self):
+        """
+        Finishes comparing the section opened with open_section(), and reports the
+        value comparison counts.
 
-                    self._logger.finer('item_path = {0}: [{1}, None, None]', item_path, node_value,
-                                       class_name=self._class_name, method_name=_method_name)
+        :return: The ComparerResult for the section
+        """
+        self._expected_fingerprint = self._expected_fingerprint_builder.get_fingerprint()
+        self._actual_fingerprint = self._actual_fingerprint_builder.get_fingerprint()
+        self._expected_fingerprint_builder = None
+        self._actual_fingerprint_builder = None
+
+        comparison_result = self._comparison_result
+        self.__end_section()
+        self.__report_section(comparison_result)
+        return comparison_result
 
-                    function(item_path, node_value, item_paths)
+    ############################################
+    #
+    # Protected methods exposed to subclasses
+    #
+    ###########################################
 
-                else:
-                    self._logger.finer('node_name={0}', node_name,
-                                       class_name=self._class_name, method_name=_method_name)
+    def _compare_sections(self, section_name, expected_section_dict, actual_section_dict, comparison_result):
+        """
+        Walks the expected and actual model section dictionaries together, folder
+        by folder, in a single pass (i.e. a merge-join of the two trees).
+
+        Each leaf item is handed to one of the following methods, as soon as it
+        is reached:
+
+            _handle_in_both_item_path()     - item path is in both models (IN_BOTH)
+            _handle_expected_item_path()    - item path is only in expected (ONLY_IN_EXPECTED)
+            _handle_actual_item_path()      - item path is only in actual (ONLY_IN_ACTUAL)
+
+        The folders that are in both models are walked by their ItemPathTrie node id,
+        and an item path string is only rendered for the item paths that are reported,
+        or have to be checked against the excludes. A cursor into the section's
+        DefaultsIndex is carried down the folders the same way, so the default value
+        of an IN_BOTH item path is found with a single lookup.
+
+        Both sides are hashed into Merkle hash trees first, and a folder whose hash is
+        the same on both sides isn't walked at all, because it can't produce any
+        comparison results. Its item paths are just counted as equal.
+
+        After record_results(), a folder whose hashes on both sides are the same
+        as in the baseline isn't walked either, and its stored results are reused.
+
+        The handlers match each item path as soon as it is reached, and add any
+        message to the section's comparison_result, so nothing is collected for a
+        second pass over the section.
+
+        :param section_name: The name of the model section being compared
+        :param expected_section_dict: The section dictionary from the "expected" model
+        :param actual_section_dict: The section dictionary from the "actual" model
+        :param comparison_result: The ComparerResult for the section
+        :return: comparison_result
+        """
+        self.__start_section(section_name, comparison_result)
+        self._expected_fingerprint = compute_fingerprint(expected_section_dict)
+        self._actual_fingerprint = compute_fingerprint(actual_section_dict)
 
-                    diff = cmp(iterators_count, len(iterators))
-                    iterators_count = len(iterators)
+        defaults_cursor = None
+        if self._defaults_index is not None:
+            defaults_cursor = self._defaults_index.get_root_cursor()
 
-                    self._logger.finer('iterators_count={0}', iterators_count,
-                                       class_name=self._class_name, method_name=_method_name)
+        try:
+            self.__compare_folder(ItemPathTrie.ROOT_ID, expected_section_dict, actual_section_dict, defaults_cursor,
+                                  self._expected_fingerprint, self._actual_fingerprint)
+        finally:
+            self.__end_section()
 
-                    if diff == -1:
-                        # increased
-                        path_tokens.append(node_name)
-                    elif diff == 1:
-                        # deceased
-                        path_tokens = path_tokens[0:iterators_count]+[node_name]
-                    else:
-                        # remained the same
-                        if path_tokens:
-                            path_tokens.pop()
-                        path_tokens.append(node_name)
+        self.__report_section(comparison_result)
+        return comparison_result
 
-                    self._logger.finer('path_tokens={0}', str(path_tokens),
-                                       class_name=self._class_name, method_name=_method_name)
+    def _handle_in_both_item_path(self, folder_id, attribute_name, expected_value, actual_value,
+                                  default_value=None):
+        """
+        Called for an attribute that is in both the expected and actual models. The
+        values are compared by the ValueComparator, and the item path is only rendered
+        and matched if they are different (and the item path isn't excluded, like
+        password fields are).
+
+        :param folder_id: The ItemPathTrie node id of the folder the attribute is in
+        :param attribute_name: The attribute name
+        :param default_value: The DefaultValue for the item path, or None if there isn't one
+        """
+        _method_name = '_handle_in_both_item_path'
+
+        classification = self._value_comparator.compare(expected_value, actual_value, default_value)
+        masked = _is_masked_attribute_name(attribute_name)
+        if classification != ValueComparator.DIFFERENT:
+            self._logger.finer('item_path={0}: [{1}, {2}, {3}] {4}',
+                               lazy(self._item_path_trie.get_item_path, folder_id, attribute_name),
+                               _get_logged_value(masked, expected_value), _get_logged_value(masked, actual_value),
+                               _get_logged_value(masked, default_value), classification,
+                               class_name=self._class_name, method_name=_method_name)
+            return
+
+        item_path = self._item_path_trie.get_item_path(folder_id, attribute_name)
+        if self._excludes_index is not None \
+                and (self._excludes_index.is_excluded(ModelFileType.EXPECTED, item_path)
+                     or self._excludes_index.is_excluded(ModelFileType.ACTUAL, item_path)):
+            classification = ValueComparator.EQUAL_TO_DEFAULT
+
+        self._logger.finer('item_path={0}: [{1}, {2}, {3}] {4}', item_path,
+                           _get_logged_value(masked, expected_value), _get_logged_value(masked, actual_value),
+                           _get_logged_value(masked, default_value), classification,
+                           class_name=self._class_name, method_name=_method_name)
+
+        if classification == ValueComparator.DIFFERENT:
+            self._match_item_path_value(item_path, expected_value, actual_value, None)
+        return
+
+    def _handle_expected_item_path(self, item_path, node_value):
+        """
+        Called for an item path that is only in the expected model. If the item
+        path is excluded, the expected value is also used as the default value.
+        """
+        _method_name = '_handle_expected_item_path'
 
-                    iterators.append(current_iterator)
-                    iterators.append(node_value.iteritems())
+        default_value = None
+        if self._excludes_index.is_excluded(ModelFileType.EXPECTED, item_path):
+            default_value = node_value
 
-                    break
+        masked = _is_masked_item_path(item_path)
+        self._logger.finer('item_path={0}: [{1}, None, {2}]', item_path, _get_logged_value(masked, node_value),
+                           _get_logged_value(masked, default_value),
+                           class_name=self._class_name, method_name=_method_name)
 
-        self._logger.info('WLSDPLY-09917', ModelFileType.ACTUAL, section_name,
-                          class_name=self._class_name, method_name=_method_name)
+        self._match_item_path_value(item_path, node_value, _MISSING, default_value)
+        return
 
-        function_name = '_handle_actual_item_path'
-        function = getattr(self, function_name)
-        path_tokens, iterators_count = [], 0
-        iterators = [actual_section_dict.iteritems()]
+    def _handle_actual_item_path(self, item_path, node_value):
+        """
+        Called for an item path that is only in the actual model. This is the case
+        when it is for a WLST attribute with a default value, or WLST generates
+        automagically. If the item path is excluded, the actual value is also used
+        as the default value.
+        """
+        _method_name = '_handle_actual_item_path'
 
-        while iterators:
-            current_iterator = iterators.pop()
-            for node_name, node_value in current_iterator:
-                if not isinstance(node_value, dict):
-                    item_path = '%s:/%s%s%s' % (section_name,
-                                                '/'.join(path_tokens),
-                                                (path_tokens and ['/'] or [''])[0],
-                                                '@%s' % node_name)
+        default_value = None
+        if self._excludes_index.is_excluded(ModelFileType.ACTUAL, item_path):
+            default_value = node_value
 
-                    function(item_path, node_value, item_paths)
+        masked = _is_masked_item_path(item_path)
+        self._logger.finer('item_path={0}: [None, {1}, {2}]', item_path, _get_logged_value(masked, node_value),
+                           _get_logged_value(masked, default_value),
+                           class_name=self._class_name, method_name=_method_name)
 
-                else:
-                    self._logger.finer('node_name={0}', node_name,
-                                       class_name=self._class_name, method_name=_method_name)
-
-                    diff = cmp(iterators_count, len(iterators))
-                    iterators_count = len(iterators)
-
-                    self._logger.finer('iterators_count={0}', iterators_count,
-                                       class_name=self._class_name, method_name=_method_name)
-                    if diff == -1:
-                        # increased
-                        path_tokens.append(node_name)
-                    elif diff == 1:
-                        # deceased
-                        path_tokens = path_tokens[0:iterators_count]+[node_name]
-                    else:
-                        # remained the same
-                        if path_tokens:
-                            path_tokens.pop()
-                        path_tokens.append(node_name)
-
-                    self._logger.finer('path_tokens={0}', str(path_tokens),
-                                       class_name=self._class_name, method_name=_method_name)
-
-                    iterators.append(current_iterator)
-                    iterators.append(node_value.iteritems())
-
-                    break
+        self._match_item_path_value(item_path, _MISSING, node_value, default_value)
+        return
 
-        return comparison_result
+    def _match_item_path_value(self, item_path, expected_value, actual_value, default_value):
+        """
+        Adds the comparison result message for an item path that is only on one
+        side, or has different values, to the ComparerResult of the section being
+        compared.
+
+        :param item_path: The item path
+        The values of password and credential attributes are never reported, only
+        the item path of them is.
+
+        :param item_path: The item path
+        :param expected_value: The expected value, or _MISSING if it's only in actual
+        :param actual_value: The actual value, or _MISSING if it's only in expected
+        :param default_value: The default value, or None if there isn't one
+        """
+        if actual_value is _MISSING:
+            if default_value is None:
+                # item_path is only in expected, so report this as an
+                # ERROR severity level comparison result
+                self.__add_message(ComparerResultsWriter.ERROR, 'WLSDPLY-09915', ModelFileType.EXPECTED,
+                                   item_path, ModelFileType.ACTUAL)
+            else:
+                self.__add_message(ComparerResultsWriter.WARNING, 'WLSDPLY-09915', ModelFileType.EXPECTED,
+                                   item_path, ModelFileType.ACTUAL)
+
+        elif expected_value is _MISSING:
+            # item_path is only in actual, so report this as a
+            # WARNING severity level comparison result
+            self.__add_message(ComparerResultsWriter.WARNING, 'WLSDPLY-09915', ModelFileType.ACTUAL,
+                               item_path, ModelFileType.EXPECTED)
+
+        else:
+            # item_path is in both, and the ValueComparator found the
+            # values to be different, so report this as an ERROR severity
+            # level comparison result
+            if _is_masked_item_path(item_path):
+                self.__add_message(ComparerResultsWriter.ERROR, 'WLSDPLY-09892', item_path)
+            else:
+                self.__add_message(ComparerResultsWriter.ERROR, 'WLSDPLY-09923', item_path, expected_value,
+                                   actual_value)
+        return
+
+    def _resolve_actual_folder_name(self, folder_prefix, actual_name, expected_folder_dict):
+        """
+        Returns the name of the folder in expected_folder_dict that actual_name should be
+        paired with, or None if there isn't one. This is only called for names that are
+        not in expected_folder_dict, once per folder child (not once per leaf). Subclasses
+        override it for folders whose names can legitimately differ between the two models.
+
+        :param folder_prefix: The item path prefix of the enclosing folder (e.g. "appDeployments:/Library/")
+        :param actual_name: The name of the child in the actual model folder
+        :param expected_folder_dict: The corresponding expected model folder dictionary
+        :return: None, or a key in expected_folder_dict
+        """
+        return None
 
     def _load_model_section_excludes(self, section_name):
         """
@@ -183,16 +400,253 @@ class ModelSectionDifferencer(object):
         _method_name = '_load_model_section_excludes'
 
         file_path = '%s/%s-excludes.json' % (testing_constants.EXCLUDES_DIR, section_name)
-        j_file = testing_helper.extract_file(file_path, self._logger)
-        self._logger.finer('WLSDPLY-09912', j_file.getAbsolutePath(), section_name,
-                     class_name=self._class_name, method_name=_method_name)
-        excludes_dict = testing_helper.translate_file(j_file, self._logger)
+
+        self._logger.finer('WLSDPLY-09912', file_path, section_name,
+                           class_name=self._class_name, method_name=_method_name)
+        excludes_dict = config_registry.get_config_registry().get_config(file_path, self._logger)
 
         return excludes_dict
 
+    def _load_model_section_excludes_index(self, section_name):
+        """
+        Reads the excludes file for a given model section, and builds
+        a precompiled ExcludesIndex from it. The index is what the
+        _handle_expected_item_path() and _handle_actual_item_path()
+        methods use to determine if an item path is excluded, with a
+        single lookup per item path.
+
+        :param section_name: The name of the model section that the excludes
+                             applies to
+        :return: An ExcludesIndex for the model section
+        :raises TestingException, if file cannot be translated into a python dictionary
+        """
+        self._excludes_dict = self._load_model_section_excludes(section_name)
+        return ExcludesIndex(section_name, self._excludes_dict)
+
+    def _load_model_section_defaults_index(self, section_name):
+        """
+        Returns the DefaultsIndex for a given model section, which has the WLST
+        data type and default value of the attributes in the section's defaults
+        file. The index is built once, and shared by all the comparisons.
+
+        :param section_name: The name of the model section
+        :return: A DefaultsIndex for the model section
+        :raises TestingException, if the defaults file cannot be loaded
+        """
+        return defaults_index.get_defaults_index(section_name, self._logger)
+
     ####################################################################################
     #
     # Private methods, private inner classes and static methods only, beyond here please
     #
     ####################################################################################
 
+    def __start_section(self, section_name, comparison_result):
+        _method_name = '__start_section'
+
+        self._logger.info('WLSDPLY-09917', ModelFileType.EXPECTED, ModelFileType.ACTUAL, section_name,
+                          class_name=self._class_name, method_name=_method_name)
+
+        self._value_comparator = ValueComparator(section_name, self._logger)
+        self._comparison_result = comparison_result
+        self._item_path_trie = ItemPathTrie(section_name)
+        self._reused_folders_count = 0
+
+        if self._record_results:
+            # The results depend on the excludes, so the baseline's
+            # are only reused if the excludes haven't changed since
+            config_digest = compute_fingerprint(self._excludes_dict).digest
+            self._section_results = SectionResults(section_name, config_digest)
+            if self._baseline_results is not None and self._baseline_results.config_digest != config_digest:
+                self._baseline_results = None
+        return
+
+    def __end_section(self):
+        self._comparison_result = None
+        self._item_path_trie = None
+        return
+
+    def __report_section(self, comparison_result):
+        _method_name = '__report_section'
+
+        if self._reused_folders_count > 0:
+            self._logger.info('WLSDPLY-09893', self._reused_folders_count, comparison_result.get_comparison_area(),
+                              class_name=self._class_name, method_name=_method_name)
+        if self._excludes_index is not None:
+            self._excludes_index.report_timing(comparison_result)
+        self._value_comparator.report(comparison_result)
+        return
+
+    def __compare_folder(self, folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                         expected_fingerprint, actual_fingerprint):
+        """
+        Joins the folders, unless they have the same hash, in which case their
+        item paths are just counted as equal.
+        """
+        if expected_fingerprint.digest == actual_fingerprint.digest:
+            self._value_comparator.add_equal(expected_fingerprint.leaves_count)
+        else:
+            self.__join_folders(folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                                expected_fingerprint, actual_fingerprint)
+        return
+
+    def __join_folders(self, folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                       expected_fingerprint, actual_fingerprint):
+        """
+        Pairs up the children of an expected and actual model folder, and either
+        recurses into the child folders that are in both (and have different hashes),
+        or hands the leaves off to the _handle_XXX_item_path() methods.
+        """
+        _method_name = '__join_folders'
+
+        trie = self._item_path_trie
+        self._logger.finer('folder_prefix={0}', lazy(trie.get_folder_prefix, folder_id),
+                           class_name=self._class_name, method_name=_method_name)
+
+        # Map expected child names to the actual child names they pair with. This is
+        # usually the same name, but _resolve_actual_folder_name() gets a chance to
+        # pair up names that are different.
+        paired_names = {}
+        unpaired_actual_names = []
+        for actual_name in actual_folder_dict.keys():
+            expected_name = actual_name
+            if expected_name not in expected_folder_dict:
+                expected_name = self._resolve_actual_folder_name(trie.get_folder_prefix(folder_id), actual_name,
+                                                                 expected_folder_dict)
+            if expected_name is None or expected_name in paired_names:
+                unpaired_actual_names.append(actual_name)
+            else:
+                paired_names[expected_name] = actual_name
+
+        for node_name, expected_value in expected_folder_dict.iteritems():
+            expected_is_folder = isinstance(expected_value, dict)
+
+            if node_name not in paired_names:
+                self.__walk_one_side(trie.get_folder_prefix(folder_id), node_name, expected_value,
+                                     self._handle_expected_item_path)
+                continue
+
+            actual_name = paired_names[node_name]
+            actual_value = actual_folder_dict[actual_name]
+
+            if expected_is_folder and isinstance(actual_value, dict):
+                expected_child_fingerprint = expected_fingerprint.children[node_name]
+                actual_child_fingerprint = actual_fingerprint.children[actual_name]
+                if expected_child_fingerprint.digest == actual_child_fingerprint.digest:
+                    self._value_comparator.add_equal(expected_child_fingerprint.leaves_count)
+                    continue
+
+                child_cursor = None
+                if defaults_cursor is not None:
+                    child_cursor = self._defaults_index.descend(defaults_cursor, node_name)
+                if self._section_results is None:
+                    self.__join_folders(trie.get_child_id(folder_id, node_name), expected_value, actual_value,
+                                        child_cursor, expected_child_fingerprint, actual_child_fingerprint)
+                else:
+                    self.__join_recorded_folders(trie.get_child_id(folder_id, node_name), expected_value,
+                                                 actual_value, child_cursor, expected_child_fingerprint,
+                                                 actual_child_fingerprint)
+            elif not expected_is_folder and not isinstance(actual_value, dict):
+                default_value = None
+                if defaults_cursor is not None:
+                    default_value = self._defaults_index.lookup(defaults_cursor, node_name)
+                self._handle_in_both_item_path(folder_id, node_name, expected_value, actual_value, default_value)
+            else:
+                # A folder on one side and an attribute on the other, so
+                # they are different item paths.
+                folder_prefix = trie.get_folder_prefix(folder_id)
+                self.__walk_one_side(folder_prefix, node_name, expected_value, self._handle_expected_item_path)
+                self.__walk_one_side(folder_prefix, actual_name, actual_value, self._handle_actual_item_path)
+
+        for actual_name in unpaired_actual_names:
+            self.__walk_one_side(trie.get_folder_prefix(folder_id), actual_name, actual_folder_dict[actual_name],
+                                 self._handle_actual_item_path)
+        return
+
+    def __join_recorded_folders(self, folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                                expected_fingerprint, actual_fingerprint):
+        """
+        Joins the folders like __join_folders() does, and records their results,
+        unless the baseline has the results of the folders with the same digests,
+        in which case those are reused.
+        """
+        section_results = self._section_results
+        folder_prefix = self._item_path_trie.get_folder_prefix(folder_id)
+
+        if self._baseline_results is not None:
+            folder_results = self._baseline_results.find_folder(folder_prefix, expected_fingerprint.digest,
+                                                                actual_fingerprint.digest)
+            if folder_results is not None:
+                for severity, resource_id, args in section_results.copy_folder(self._baseline_results,
+                                                                               folder_results):
+                    self.__add_result_message(severity, resource_id, args)
+                self._value_comparator.add_counts(folder_results.counts)
+                self._reused_folders_count += 1
+                return
+
+        start_counts = self._value_comparator.get_counts()
+        folder_results = section_results.start_folder(folder_prefix, expected_fingerprint.digest,
+                                                      actual_fingerprint.digest)
+        self.__join_folders(folder_id, expected_folder_dict, actual_folder_dict, defaults_cursor,
+                            expected_fingerprint, actual_fingerprint)
+        counts = self._value_comparator.get_counts()
+        for i in range(len(counts)):
+            counts[i] -= start_counts[i]
+        section_results.end_folder(folder_results, counts)
+        return
+
+    def __add_message(self, severity, resource_id, *args):
+        """
+        Adds a message to the ComparerResult of the section, and records it, if the
+        results are being recorded.
+        """
+        if self._section_results is not None:
+            self._section_results.add_message(severity, resource_id, args)
+        self.__add_result_message(severity, resource_id, args)
+        return
+
+    def __add_result_message(self, severity, resource_id, args):
+        comparison_result = self._comparison_result
+        if severity == ComparerResultsWriter.ERROR:
+            comparison_result.add_error(resource_id, *args)
+        elif severity == ComparerResultsWriter.WARNING:
+            comparison_result.add_warning(resource_id, *args)
+        else:
+            comparison_result.add_info(resource_id, *args)
+        return
+
+    def __walk_one_side(self, folder_prefix, node_name, node_value, handler):
+        """
+        Hands every leaf at, or below, node_name to handler. Used for the parts of
+        a model that are only on one side of the comparison.
+        """
+        if not isinstance(node_value, dict):
+            handler('%s@%s' % (folder_prefix, node_name), node_value)
+            return
+
+        child_prefix = '%s%s/' % (folder_prefix, node_name)
+        for child_name, child_value in node_value.iteritems():
+            self.__walk_one_side(child_prefix, child_name, child_value, handler)
+        return
+
+
+def _is_masked_item_path(item_path):
+    """
+    Returns True if the value of item_path, whose last segment is "@<attribute name>",
+    is a password or credential, that must not be written to the log or the results.
+    """
+    return _is_masked_attribute_name(item_path[item_path.rfind('@') + 1:])
+
+
+def _is_masked_attribute_name(attribute_name):
+    return _MASKED_ATTRIBUTE_PATTERN.search(attribute_name) is not None
+
+
+def _get_logged_value(masked, value):
+    """
+    Returns what is logged for value, which is _MASKED_VALUE for the value of a
+    password or credential attribute, unless there is no value.
+    """
+    if masked and value is not None:
+        return _MASKED_VALUE
+    return value
@@ -0,0 +1,218 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+_TRUE_VALUES = ['true', '1']
+_FALSE_VALUES = ['false', '0']
+_INTEGER_TYPES = ['int', 'integer', 'long']
+_FLOAT_TYPES = ['double', 'float']
+
+
+class ValueComparator(object):
+    """
+    Compares the values of an item path that is in both the expected and actual
+    models (IN_BOTH), after normalizing them to the WLST data type of the item
+    path, and classifies the pair as:
+
+        EQUAL               - the normalized values are the same
+        EQUAL_TO_DEFAULT    - the normalized values are different, but both are the
+                              default value (an empty value counts as the default)
+        DIFFERENT           - anything else
+
+    The normalization handles the different ways the same value shows up in
+    models (e.g. "True", "true" and 1 for a boolean, "7001" and 7001 for an int,
+    or a list and a comma-separated string). When the data type isn't known, it
+    is inferred from the values.
+    """
+    _class_name = 'ValueComparator'
+
+    EQUAL = 'EQUAL'
+    EQUAL_TO_DEFAULT = 'EQUAL_TO_DEFAULT'
+    DIFFERENT = 'DIFFERENT'
+
+    def __init__(self, section_name, logger=None):
+        self._section_name = section_name
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        self._counts = {
+            ValueComparator.EQUAL: 0,
+            ValueComparator.EQUAL_TO_DEFAULT: 0,
+            ValueComparator.DIFFERENT: 0
+        }
+
+    def get_count(self, classification):
+        return self._counts[classification]
+
+    def compare(self, expected_value, actual_value, default_value=None):
+        """
+        Classifies the expected and actual values of an item path.
+
+        :param expected_value: The value from the expected model
+        :param actual_value: The value from the actual model
+        :param default_value: The DefaultValue for the item path, from the DefaultsIndex,
+                              or None if there isn't one
+        :return: One of EQUAL, EQUAL_TO_DEFAULT or DIFFERENT
+        """
+        data_type = None
+        if default_value is not None:
+            data_type = default_value.getDataType()
+
+        normalized_expected = normalize_value(expected_value, data_type)
+        normalized_actual = normalize_value(actual_value, data_type)
+
+        if normalized_expected == normalized_actual:
+            classification = ValueComparator.EQUAL
+        elif self.__is_default(normalized_expected, default_value, data_type) \
+                and self.__is_default(normalized_actual, default_value, data_type):
+            classification = ValueComparator.EQUAL_TO_DEFAULT
+        else:
+            classification = ValueComparator.DIFFERENT
+
+        self._counts[classification] += 1
+        return classification
+
+    def add_equal(self, count):
+        """
+        Counts item paths that weren't compared one by one, because they are in a
+        folder that is the same in both models.
+
+        :param count: The number of item paths in the folder
+        """
+        self._counts[ValueComparator.EQUAL] += count
+        return
+
+    def get_counts(self):
+        """
+        Returns a list of the EQUAL, EQUAL_TO_DEFAULT and DIFFERENT counts so far.
+        """
+        return [self._counts[ValueComparator.EQUAL], self._counts[ValueComparator.EQUAL_TO_DEFAULT],
+                self._counts[ValueComparator.DIFFERENT]]
+
+    def add_counts(self, counts):
+        """
+        Counts item paths that were classified by an earlier comparison, whose results
+        were reused.
+
+        :param counts: A list of EQUAL, EQUAL_TO_DEFAULT and DIFFERENT counts, like get_counts() returns
+        """
+        self._counts[ValueComparator.EQUAL] += counts[0]
+        self._counts[ValueComparator.EQUAL_TO_DEFAULT] += counts[1]
+        self._counts[ValueComparator.DIFFERENT] += counts[2]
+        return
+
+    def report(self, comparison_result):
+        """
+        Adds an INFO message with the number of IN_BOTH item paths in each
+        classification to comparison_result.
+
+        :param comparison_result: The ComparerResult for the section
+        """
+        _method_name = 'report'
+
+        total_count = self._counts[ValueComparator.EQUAL] + self._counts[ValueComparator.EQUAL_TO_DEFAULT] + \
+            self._counts[ValueComparator.DIFFERENT]
+        if total_count == 0:
+            return
+
+        self._logger.fine('WLSDPLY-09947', self._section_name, total_count, self._counts[ValueComparator.EQUAL],
+                          self._counts[ValueComparator.EQUAL_TO_DEFAULT], self._counts[ValueComparator.DIFFERENT],
+                          class_name=self._class_name, method_name=_method_name)
+        comparison_result.add_info('WLSDPLY-09947', self._section_name, total_count,
+                                   self._counts[ValueComparator.EQUAL],
+                                   self._counts[ValueComparator.EQUAL_TO_DEFAULT],
+                                   self._counts[ValueComparator.DIFFERENT])
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __is_default(self, normalized_value, default_value, data_type):
+        if normalized_value is None:
+            return True
+        if default_value is None:
+            return False
+        for value in default_value.getDefaultValues():
+            if normalize_value(value, data_type) == normalized_value:
+                return True
+        return False
+
+
+def normalize_value(value, data_type=None):
+    """
+    Returns value converted to a canonical form for its WLST data type, so that
+    equal values compare equal with ==. Empty values (None, '' or an empty list)
+    become None. Lists and comma-separated strings both become a list of strings.
+    Values that cannot be converted to data_type are returned as strings.
+
+    :param value: The model value
+    :param data_type: The WLST data type (e.g. "boolean", "int", "str"), or None to
+                      infer it from the value
+    :return: The normalized value
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, list) or isinstance(value, tuple):
+        items = []
+        for item in value:
+            items.append(_to_string(item))
+        if len(items) == 0:
+            return None
+        return items
+
+    if isinstance(value, dict):
+        return value
+
+    str_value = _to_string(value)
+    if len(str_value) == 0:
+        return None
+
+    if data_type == 'boolean' or (data_type is None and str_value.lower() in ['true', 'false']):
+        if str_value.lower() in _TRUE_VALUES:
+            return True
+        if str_value.lower() in _FALSE_VALUES:
+            return False
+        return str_value
+
+    if data_type in _INTEGER_TYPES or data_type is None:
+        try:
+            return long(str_value)
+        except ValueError:
+            if data_type is not None:
+                return str_value
+
+    if data_type in _FLOAT_TYPES or data_type is None:
+        try:
+            return float(str_value)
+        except ValueError:
+            if data_type is not None:
+                return str_value
+
+    if ',' in str_value:
+        items = []
+        for item in str_value.split(','):
+            items.append(item.strip())
+        return items
+
+    return str_value
+
+
+def _to_string(value):
+    if isinstance(value, str) or isinstance(value, unicode):
+        return value.strip()
+    return unicode(value).strip()
@@ -32,16 +32,34 @@ class TestDef(object):
     METADATA_FILE = 'metadata_file'
     OVERRIDES_FILE = 'overrides_file'
 
+    # The directories created under the isolation directory of a test
+    DOMAINS_DIR_NAME = 'domains'
+    LOGS_DIR_NAME = 'logs'
+
     def __init__(self, test_def_file, logger, test_def_overrides_file=None,
-                 test_def_metadata_file=None):
+                 test_def_metadata_file=None, from_resource=False, isolation_dir=None):
+        """
+        :param test_def_file: A File for the test definition file, or the resource
+                              path of the test definition, if from_resource is True
+        :param logger: The PlatformLogger to use
+        :param test_def_overrides_file: The overrides file name, or None
+        :param test_def_metadata_file: The metadata file name, or None
+        :param from_resource: True to load the test definition from the binary of the installable
+        :param isolation_dir: A directory of the test's own, whose domains and logs
+                              subdirectories are used instead of the ones in the test
+                              definition, or None
+        """
         _method_name = '__init__'
 
         self._logger = logger
 
-        self._test_def_file = test_def_file
-
-        self._test_def_dict = testing_helper.translate_file(test_def_file, self._logger)
-        self._logger.finer('self._test_def_dict={0}', str(self._test_def_dict),
+        if from_resource:
+            self._test_def_file_name = test_def_file
+            self._test_def_dict = testing_helper.load_resource(test_def_file, self._logger)
+        else:
+            self._test_def_file_name = test_def_file.getAbsolutePath()
+            self._test_def_dict = testing_helper.translate_file(test_def_file, self._logger)
+        self._logger.finer('self._test_def_dict={0}', self._test_def_dict,
                            class_name=_class_name, method_name=_method_name)
 
         # The best practice is for all test metadata files to make
@@ -72,7 +90,7 @@ class TestDef(object):
             # at yet.
             #  .
             ex = exception_helper.create_test_definition_exception('WLSDPLY-09827',
-                                                                   test_def_file.getAbsolutePath(),
+                                                                   self.get_def_file_name(),
                                                                    TestDef.METADATA_FILE)
             self._logger.throwing(ex, class_name=_class_name, method_name=_method_name)
             raise ex
@@ -93,6 +111,9 @@ class TestDef(object):
         if overrides_file_name is not None:
             _apply_overrides_file(overrides_file_name, self._test_def_dict, self._logger)
 
+        if isolation_dir is not None:
+            self.__apply_isolation_dir(isolation_dir)
+
         self._env_vars_dict = self.__get_env_vars_dict()
 
         settings_dict = self.__get_settings_dict()
@@ -104,7 +125,7 @@ class TestDef(object):
             self._stages = TestDef.StagesIterator(stages_dict, self._test_def_metadata, self._logger)
 
     def get_def_file_name(self):
-        return self._test_def_file.getAbsolutePath()
+        return self._test_def_file_name
 
     def get_metadata(self):
         return self._test_def_metadata
@@ -250,6 +271,34 @@ class TestDef(object):
     #
     ####################################################################################
 
+    def __apply_isolation_dir(self, isolation_dir):
+        """
+        Points the logs directory, and the domain directories in the settings, at
+        subdirectories of isolation_dir, so that tests that run at the same time
+        don't use the same directories. The other paths in the settings and stages
+        (e.g. the model and archive files discover writes) are left as they are.
+        """
+        _method_name = '__apply_isolation_dir'
+
+        isolation_dir = str(isolation_dir)
+        domains_dir = os.path.join(isolation_dir, TestDef.DOMAINS_DIR_NAME)
+
+        self._test_def_dict[testing_constants.LOGS_DIR] = os.path.join(isolation_dir, TestDef.LOGS_DIR_NAME)
+
+        settings_dict = self.__get_settings_dict()
+        if settings_dict is not None:
+            for settings_id_dict in settings_dict.values():
+                if TestDefSettings.DOMAIN_PARENT in settings_id_dict:
+                    settings_id_dict[TestDefSettings.DOMAIN_PARENT] = domains_dir
+                domain_home = dictionary_utils.get_element(settings_id_dict, TestDefSettings.DOMAIN_HOME)
+                if domain_home is not None:
+                    domain_name = os.path.basename(str(domain_home).rstrip('/\\'))
+                    settings_id_dict[TestDefSettings.DOMAIN_HOME] = os.path.join(domains_dir, domain_name)
+
+        self._logger.fine('WLSDPLY-09966', self.get_def_file_name(), isolation_dir,
+                          class_name=_class_name, method_name=_method_name)
+        return
+
     def __get_env_vars_dict(self):
         return dictionary_utils.get_dictionary_element(self._test_def_dict, testing_constants.ENV_VARS)
 
@@ -50,11 +50,11 @@ class TestDefMetadata(object):
             self._logger.info('WLSDPLY-09851', test_def_metadata_file, class_name=_class_name, method_name=_method_name)
 
         self._test_def_metadata_dict = _load_test_def_metadata(test_def_metadata_file, self._logger, use_archive)
-        self._logger.finer('self._test_def_metadata_dict={0}', str(self._test_def_metadata_dict),
+        self._logger.finer('self._test_def_metadata_dict={0}', self._test_def_metadata_dict,
                            class_name=_class_name, method_name=_method_name)
         self._test_def_metadata_index = self.__populate_test_def_metadata_index(self._test_def_metadata_dict,
                                                                                 [], PyOrderedDict())
-        self._logger.finer('self._test_def_metadata_index={0}', str(self._test_def_metadata_index),
+        self._logger.finer('self._test_def_metadata_index={0}', self._test_def_metadata_index,
                            class_name=_class_name, method_name=_method_name)
 
     def get_required_fields(self):
@@ -348,11 +348,9 @@ class TestDefMetadata(object):
 def _load_test_def_metadata(test_def_metadata_file, logger, use_archive=True):
     if use_archive:
         metadata_file_path = '%s/%s' % (testing_constants.METADATA_DIR, test_def_metadata_file)
-        metadata_file = testing_helper.extract_file(metadata_file_path, logger)
-    else:
-        metadata_file = test_def_metadata_file
+        return testing_helper.load_resource(metadata_file_path, logger)
 
-    return testing_helper.translate_file(metadata_file, logger)
+    return testing_helper.translate_file(test_def_metadata_file, logger)
 
 
 def _as_metadata_path(path_tokens):
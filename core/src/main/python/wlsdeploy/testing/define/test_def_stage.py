@@ -18,6 +18,7 @@ class TestDefStage(object):
     """
 
     CONTINUE_WHEN_FAIL = 'continue_when_fail'
+    DEPENDS_ON = 'depends_on'
     STEP_NAMES = 'step_names'
     STEP_NAMES_FILE = 'step_names_file'
     SCRIPT_TO_RUN = 'script_to_run'
@@ -105,3 +106,11 @@ class TestDefStage(object):
         if response is None:
             response = self._test_def_metadata.get_default_value(TestDefStage.CONTINUE_WHEN_FAIL)
         return response
+
+    def get_depends_on(self):
+        """
+        Returns the list of the names of the stages that must finish before this one
+        starts, or None if the stage doesn't have a depends_on field. A stage without
+        one depends on the stage before it, in the test definition.
+        """
+        return dictionary_utils.get_element(self._stage_dict, TestDefStage.DEPENDS_ON)
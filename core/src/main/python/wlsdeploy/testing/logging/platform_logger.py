@@ -114,11 +114,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.CONFIG, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.CONFIG):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.CONFIG, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def log(self, level, message, *args, **kwargs):
@@ -129,11 +130,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(level, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(level):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(level, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def entering(self, *args, **kwargs):
@@ -142,9 +144,10 @@ class PlatformLogger(object):
         :param args: the method args
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        self.logger.entering(clazz, method, args)
+        if self.logger.isLoggable(JLevel.FINER):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            self.logger.entering(clazz, method, args)
         return
 
     def exiting(self, class_name, method_name, result=None):
@@ -167,11 +170,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.FINE, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.FINE):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.FINE, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def finer(self, message, *args, **kwargs):
@@ -181,11 +185,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.FINER, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.FINER):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.FINER, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def finest(self, message, *args, **kwargs):
@@ -195,11 +200,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.FINEST, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.FINEST):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.FINEST, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def info(self, message, *args, **kwargs):
@@ -209,11 +215,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.INFO, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.INFO):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.INFO, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def warning(self, message, *args, **kwargs):
@@ -223,11 +230,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.WARNING, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.WARNING):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.WARNING, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def severe(self, message, *args, **kwargs):
@@ -237,11 +245,12 @@ class PlatformLogger(object):
         :param args: the arguments to use to populate the message placeholders
         :param kwargs: the keyword arguments
         """
-        method = kwargs.pop('method_name', None)
-        clazz = kwargs.pop('class_name', None)
-        error = kwargs.pop('error', None)
-        record = self.__get_log_record(JLevel.SEVERE, clazz, method, message, error, *args)
-        self.logger.log(record)
+        if self.logger.isLoggable(JLevel.SEVERE):
+            method = kwargs.pop('method_name', None)
+            clazz = kwargs.pop('class_name', None)
+            error = kwargs.pop('error', None)
+            record = self.__get_log_record(JLevel.SEVERE, clazz, method, message, error, *args)
+            self.logger.log(record)
         return
 
     def throwing(self, error, method_name=None, class_name=None):
@@ -278,9 +287,39 @@ class PlatformLogger(object):
 
         return record
 
+
+class LazyArg(object):
+    """
+    A log message argument whose value is only computed when the log record
+    is actually going to be published. Use the lazy() function to create one.
+    """
+    def __init__(self, function, *args):
+        self._function = function
+        self._args = args
+
+    def __str__(self):
+        return str(self._function(*self._args))
+
+
+def lazy(function, *args):
+    """
+    Wrap an expensive-to-format log message argument, so that function(*args)
+    is only called if the message's level is enabled. For example:
+
+        logger.finer('item_paths={0}', lazy(str, item_paths), ...)
+
+    :param function: the function that computes the argument value
+    :param args: the arguments to pass to function
+    :return: a LazyArg object that can be passed as a log message argument
+    """
+    return LazyArg(function, *args)
+
+
 def _get_args_as_java_array(*args):
     """
-    Convert the Python args list into a Java array of strings.
+    Convert the Python args list into a Java array of strings. This is only
+    called after the logging level has been checked, so this is where any
+    LazyArg arguments get evaluated.
     :param args: the args list
     :return: the Java array of strings
     """
@@ -5,7 +5,7 @@ The Universal Permissive License (UPL), Version 1.0
 import unittest
 
 # python classes from weblogic-deploy-tooling-ct
-from wlsdeploy.testing.common import testing_helper, testing_constants
+from wlsdeploy.testing.common import config_registry, resource_metrics, testing_helper, testing_constants
 from wlsdeploy.testing.define.test_def_stage import TestDefStage
 from wlsdeploy.testing.exception import exception_helper
 from wlsdeploy.testing.test_results import TestResult
@@ -131,39 +131,39 @@ class StageRunner(object):
         if stage_name not in self._stage_modules_cache:
             self._stage_modules_cache[stage_name] = stage_module
 
-        suite.run(test_result)
+        span = resource_metrics.start_span(stage_name, resource_metrics.STAGE)
+        try:
+            suite.run(test_result)
+        finally:
+            metrics = span.finish(test_result.get_step_metrics())
+            test_result.set_metrics(metrics)
+            trace_recorder = resource_metrics.get_trace_recorder()
+            if trace_recorder is not None:
+                trace_recorder.record(test_def.get_name(), metrics)
 
         return test_result
 
 
 def _load_stages_map(logger):
     """
-    Loads the JSON file that maps stage names to a Python module and class names.
+    Loads the JSON files that map stage names to a Python module and class names.
+    The files are parsed once per process, by the ConfigRegistry.
 
     The map key is the stage name, which is passed to or used in several method calls.
 
     :return: A Python dictionary representation of the stages map
     :raises: TestingException: if the JSON file is malformed or there is problem loading the file
     """
-
-    json_file_path = '%s/%s' % (testing_constants.TESTDEFS_DIR, testing_constants.CERTIFIED_STAGES_MAP_FILE)
-    json_file = testing_helper.extract_file(json_file_path, logger)
-
-    certified_stages = testing_helper.translate_file(json_file, logger)
-    if testing_constants.STAGES not in certified_stages:
-        ex = exception_helper.create_testing_exception('WLSDPLY-09805', json_file_path)
-        raise ex
-
-    stages_map = certified_stages[testing_constants.STAGES]
-
-    json_file_path = '%s/%s' % (testing_constants.TESTDEFS_DIR, testing_constants.USER_DEFINED_STAGES_MAP_FILE)
-    json_file = testing_helper.extract_file(json_file_path, logger)
-
-    user_defined_stages = testing_helper.translate_file(json_file, logger)
-    if testing_constants.STAGES not in user_defined_stages:
-        ex = exception_helper.create_testing_exception('WLSDPLY-09805', json_file_path)
-        raise ex
-
-    stages_map.update(user_defined_stages[testing_constants.STAGES])
+    registry = config_registry.get_config_registry()
+    stages_map = {}
+    for stages_map_file in [testing_constants.CERTIFIED_STAGES_MAP_FILE,
+                            testing_constants.USER_DEFINED_STAGES_MAP_FILE]:
+        json_file_path = '%s/%s' % (testing_constants.TESTDEFS_DIR, stages_map_file)
+        stages = registry.get_config(json_file_path, logger)
+        if testing_constants.STAGES not in stages:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09805', json_file_path)
+            raise ex
+        for stage_name, stage_dict in stages[testing_constants.STAGES].items():
+            stages_map[stage_name] = stage_dict
 
     return stages_map
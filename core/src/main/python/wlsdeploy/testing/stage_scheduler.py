@@ -0,0 +1,336 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import java.lang.Integer as JInteger
+import java.lang.Throwable as JThrowable
+import java.util.concurrent.Callable as JCallable
+import java.util.concurrent.ExecutorCompletionService as JExecutorCompletionService
+import java.util.concurrent.Executors as JExecutors
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import tool_daemon
+from wlsdeploy.testing.define.test_def_stage import TestDefStage
+from wlsdeploy.testing.exception import exception_helper
+
+# Java system property with the maximum number of stages that run at the same
+# time. Setting it to 1 runs the stages one after the other, in the test def order.
+STAGE_THREADS_PROPERTY = 'wlsdeploy.testing.stage_threads'
+
+# The default maximum number of stages that run at the same time, when the tool
+# daemon is enabled. Otherwise, the WLST tools run in this process, where they
+# share the WLST and Jython state (e.g. module_to_import, and wlst.startServer),
+# so by default the stages run one at a time.
+_DEFAULT_STAGE_THREADS = 4
+
+
+class StageScheduler(object):
+    """
+    Runs the stages of a test definition, starting each one as soon as the stages
+    in its depends_on field have finished, so that stages that don't depend on each
+    other run at the same time, on a bounded pool of threads.
+
+    A stage without a depends_on field depends on the stage before it, in the test
+    def, so a test def that doesn't use depends_on runs the way it always has.
+
+    When a stage fails, and it doesn't have continue_when_fail set to true, no more
+    stages are started, but the ones already running are allowed to finish. The
+    TestResult of each stage that ran is added to the TestResults in the test def
+    order, no matter which order the stages finished in.
+    """
+    _class_name = 'StageScheduler'
+
+    def __init__(self, stage_runner, logger, stage_threads=None):
+        """
+        :param stage_runner: The StageRunner used to run each stage
+        :param logger: The PlatformLogger to use
+        :param stage_threads: The maximum number of stages to run at the same time, or
+                              None to use the wlsdeploy.testing.stage_threads property,
+                              which defaults to 1, unless the tool daemon is enabled
+        """
+        self._stage_runner = stage_runner
+        self._logger = logger
+
+        if stage_threads is None:
+            default_stage_threads = 1
+            if tool_daemon.is_tool_daemon_enabled():
+                default_stage_threads = _DEFAULT_STAGE_THREADS
+            stage_threads = JInteger.getInteger(STAGE_THREADS_PROPERTY, default_stage_threads)
+        self._stage_threads = max(1, stage_threads)
+
+    def run_stages(self, test_def, test_results):
+        """
+        Runs the stages of test_def, adding the TestResult of each stage that ran
+        to test_results.
+
+        :param test_def: The TestDef object with the stages to run
+        :param test_results: The TestResults object to add the stage results to
+        :raises TestDefinitionException: if a depends_on field names a stage that isn't in
+                                         the test def, or the depends_on fields have a cycle
+        :raises TestingException: if a TestingException is raised while running a stage
+        :raises SystemTestException: if a SystemTestException is raised while running a stage
+        :raises IntegrationTestException: if a IntegrationTestException is raised while running a stage
+        """
+        _method_name = 'run_stages'
+
+        self._logger.entering(test_def.get_def_file_name(), class_name=self._class_name, method_name=_method_name)
+
+        stages = []
+        for stage_name in test_def.get_stage_names():
+            stages.append(test_def.get_stage(stage_name))
+
+        dependencies = self.__get_dependencies(stages, test_def)
+        stage_threads = min(self._stage_threads, max(1, len(stages)))
+
+        self._logger.fine('WLSDPLY-09959', len(stages), test_def.get_def_file_name(), stage_threads,
+                          class_name=self._class_name, method_name=_method_name)
+
+        run = _StagesRun(self, stages, dependencies, test_def, test_results)
+        if stage_threads == 1:
+            run.run_in_order()
+        else:
+            executor = JExecutors.newFixedThreadPool(stage_threads)
+            try:
+                run.run_on(JExecutorCompletionService(executor), stage_threads)
+            finally:
+                executor.shutdown()
+
+        self._logger.exiting(class_name=self._class_name, method_name=_method_name)
+        return
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def _stage_finished(self, stage, errors_count):
+        """
+        Returns True if stages can still be started, after stage finished with
+        errors_count errors in the test so far.
+        """
+        _method_name = '_stage_finished'
+
+        if errors_count > 0:
+            if stage.continue_when_fail() == 'true':
+                self._logger.warning('WLSDPLY-09849', stage.get_name(), TestDefStage.CONTINUE_WHEN_FAIL,
+                                     class_name=self._class_name, method_name=_method_name)
+            else:
+                return False
+        return True
+
+    def _result_added(self, stage, test_results):
+        _method_name = '_result_added'
+
+        results_summary = test_results.get_summary()
+        self._logger.fine('WLSDPLY-09955', stage.get_name(), results_summary['errors_count'],
+                          results_summary['warnings_count'], results_summary['infos_count'],
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+    def __get_dependencies(self, stages, test_def):
+        """
+        Returns a dictionary of stage name -> list of the names of the stages it depends on.
+        """
+        _method_name = '__get_dependencies'
+
+        stage_names = []
+        for stage in stages:
+            stage_names.append(stage.get_name())
+
+        dependencies = {}
+        previous_names = []
+        for stage in stages:
+            depends_on = stage.get_depends_on()
+            if depends_on is None:
+                depends_on = previous_names
+            elif isinstance(depends_on, str) or isinstance(depends_on, unicode):
+                depends_on = [depends_on]
+            for depends_on_name in depends_on:
+                if depends_on_name not in stage_names or depends_on_name == stage.get_name():
+                    ex = exception_helper.create_test_definition_exception('WLSDPLY-09957', stage.get_name(),
+                                                                           test_def.get_def_file_name(),
+                                                                           depends_on_name)
+                    self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+                    raise ex
+            dependencies[stage.get_name()] = list(depends_on)
+            previous_names = [stage.get_name()]
+
+        # Take away the stages that only depend on stages already taken away,
+        # until nothing changes. The stages that are left are in a cycle.
+        remaining_names = list(stage_names)
+        removed_names = []
+        changed = True
+        while changed:
+            changed = False
+            for stage_name in list(remaining_names):
+                ready = True
+                for depends_on_name in dependencies[stage_name]:
+                    if depends_on_name not in removed_names:
+                        ready = False
+                        break
+                if ready:
+                    remaining_names.remove(stage_name)
+                    removed_names.append(stage_name)
+                    changed = True
+
+        if len(remaining_names) > 0:
+            ex = exception_helper.create_test_definition_exception('WLSDPLY-09958', test_def.get_def_file_name(),
+                                                                   ', '.join(remaining_names))
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        return dependencies
+
+
+class _StagesRun(object):
+    """
+    The state of one run of the stages of a test def.
+    """
+    def __init__(self, scheduler, stages, dependencies, test_def, test_results):
+        self._scheduler = scheduler
+        self._stages = stages
+        self._dependencies = dependencies
+        self._test_def = test_def
+        self._test_results = test_results
+        self._started_names = []
+        # stage name -> TestResult, for the stages that finished
+        self._finished_results = {}
+        self._added_count = 0
+        self._errors_count = 0
+        self._can_start = True
+
+    def run_in_order(self):
+        """
+        Runs the ready stages one at a time, on the calling thread.
+        """
+        while self._can_start:
+            ready_stages = self.__get_ready_stages()
+            if len(ready_stages) == 0:
+                break
+            task = _RunStageTask(self._scheduler, ready_stages[0], self._test_def)
+            self._started_names.append(task.get_stage().get_name())
+            task.call()
+            self.__task_finished(task)
+        self.__add_results(True)
+        return
+
+    def run_on(self, completion_service, stage_threads):
+        """
+        Runs the ready stages on the completion service's executor, with at most
+        stage_threads of them running at the same time.
+        """
+        running_count = 0
+        error_task = None
+        while True:
+            if self._can_start:
+                for stage in self.__get_ready_stages()[:stage_threads - running_count]:
+                    self._started_names.append(stage.get_name())
+                    completion_service.submit(_RunStageTask(self._scheduler, stage, self._test_def))
+                    running_count += 1
+
+            if running_count == 0:
+                break
+
+            task = completion_service.take().get()
+            running_count -= 1
+            if task.has_error():
+                # let the stages that are running finish, before raising it
+                self._can_start = False
+                if error_task is None:
+                    error_task = task
+            else:
+                self.__task_finished(task)
+
+        self.__add_results(True)
+        if error_task is not None:
+            error_task.raise_error()
+        return
+
+    def __get_ready_stages(self):
+        """
+        Returns the stages that haven't started, and only depend on stages that
+        finished, in the test def order.
+        """
+        ready_stages = []
+        for stage in self._stages:
+            stage_name = stage.get_name()
+            if stage_name in self._started_names:
+                continue
+            ready = True
+            for depends_on_name in self._dependencies[stage_name]:
+                if depends_on_name not in self._finished_results:
+                    ready = False
+                    break
+            if ready:
+                ready_stages.append(stage)
+        return ready_stages
+
+    def __task_finished(self, task):
+        task.raise_error()
+
+        stage = task.get_stage()
+        test_result = task.get_test_result()
+        self._finished_results[stage.get_name()] = test_result
+        self._errors_count += test_result.get_errors_count()
+        self.__add_results(False)
+        if not self._scheduler._stage_finished(stage, self._errors_count):
+            self._can_start = False
+        return
+
+    def __add_results(self, finishing):
+        """
+        Adds the results of the stages that finished to the TestResults, in the test def
+        order. While stages are still running, it stops at the first stage that hasn't
+        finished. When finishing, the stages that never ran are skipped.
+        """
+        while self._added_count < len(self._stages):
+            stage = self._stages[self._added_count]
+            stage_name = stage.get_name()
+            if stage_name in self._finished_results:
+                self._test_results.set_test_result(self._finished_results[stage_name])
+                self._scheduler._result_added(stage, self._test_results)
+            elif not finishing:
+                break
+            self._added_count += 1
+        return
+
+
+class _RunStageTask(JCallable):
+    """
+    Runs a single stage, on one of the pool's threads. The TestResult, or the exception
+    that stopped the stage, is kept on the task, so that it can be handled on the
+    calling thread.
+    """
+    def __init__(self, scheduler, stage, test_def):
+        self._stage_runner = scheduler._stage_runner
+        self._stage = stage
+        self._test_def = test_def
+        self._test_result = None
+        self._error = None
+
+    def get_stage(self):
+        return self._stage
+
+    def get_test_result(self):
+        return self._test_result
+
+    def has_error(self):
+        return self._error is not None
+
+    def raise_error(self):
+        """
+        Raises the exception that stopped the stage, if there was one.
+        """
+        if self._error is not None:
+            raise self._error
+        return
+
+    def call(self):
+        try:
+            self._test_result = self._stage_runner.run_stage(self._stage, self._test_def)
+        except JThrowable, t:
+            self._error = t
+        except Exception, e:
+            self._error = e
+        return self
@@ -74,7 +74,7 @@ class CompareModels(unittest.TestCase):
                                   class_name=_class_name, method_name=_method_name)
                 testing_common.apply_substitution_variables_file(variable_file_name, actual_model_dict, self._logger)
 
-        model_comparator = ModelComparer(self._logger)
+        model_comparator = ModelComparer(self._logger, results_file=compare_results_file)
         comparison_results = model_comparator.compare_models(expected_model_dict, actual_model_dict)
         comparison_results.log_results(self._logger)
         self.assertEqual(comparison_results.get_errors_count(), 0)
@@ -2,6 +2,7 @@
 Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
 The Universal Permissive License (UPL), Version 1.0
 """
+import os
 import unittest
 
 from java.util import HashMap
@@ -10,14 +11,26 @@ from java.util import HashMap
 from oracle.weblogic.deploy.create import CreateException
 from oracle.weblogic.deploy.util import ScriptRunner
 
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingException
+
 # python classes from weblogic-deploy-tooling-ct
 from wlsdeploy.testing.common import testing_helper, testing_constants
+from wlsdeploy.testing.common import domain_snapshot_cache
+from wlsdeploy.testing.common import tool_daemon
 from wlsdeploy.testing.define.test_def_settings import TestDefSettings
 from wlsdeploy.testing.define.test_def_stage import TestDefStage
 
 _class_name = 'CreateDomain'
 _SETTINGS_0 = 'settings-0'
 
+# The tool args whose files go into the domain snapshot key by their bytes
+_CONTENT_FILE_SWITCHES = [
+    '-%s' % TestDefSettings.MODEL_FILE,
+    '-%s' % TestDefSettings.ARCHIVE_FILE,
+    '-%s' % TestDefSettings.VARIABLE_FILE
+]
+
 
 class CreateDomain(unittest.TestCase):
     def __init__(self, test_name, stage, test_def, logger):
@@ -35,11 +48,29 @@ class CreateDomain(unittest.TestCase):
         settings_0 = self._test_def.get_settings(_SETTINGS_0)
 
         module_to_import = self._stage.get_module_to_import()
+        script_path = self._stage.get_script_to_run()
+
+        snapshot_cache = domain_snapshot_cache.get_domain_snapshot_cache()
+        snapshot_key = None
+        if snapshot_cache is not None and settings_0.get_domain_parent() is not None and \
+                (module_to_import is not None or script_path is not None):
+            tool_name = module_to_import
+            if tool_name is None:
+                tool_name = script_path
+            snapshot_key = snapshot_cache.get_key(tool_name, _populate_tool_args([], settings_0),
+                                                  _CONTENT_FILE_SWITCHES)
+
+        if snapshot_key is not None and snapshot_cache.restore(snapshot_key, settings_0.get_domain_parent()):
+            self._logger.exiting(class_name=_class_name, method_name=_method_name)
+            return
+
+        existing_domain_names = None
+        if snapshot_key is not None:
+            existing_domain_names = snapshot_cache.list_domain_names(settings_0.get_domain_parent())
 
         if module_to_import is not None:
             self.__run_using_module_to_import(module_to_import, settings_0)
         else:
-            script_path = self._stage.get_script_to_run()
             if script_path is not None:
                 self.__run_using_script_to_run(script_path, settings_0)
             else:
@@ -50,6 +81,10 @@ class CreateDomain(unittest.TestCase):
                                                         TestDefStage.SCRIPT_TO_RUN,
                                                         TestDefStage.MODULE_TO_IMPORT))
 
+        if snapshot_key is not None:
+            snapshot_cache.store(snapshot_key, settings_0.get_domain_parent(), _get_domain_name(settings_0),
+                                 existing_domain_names)
+
         self._logger.exiting(class_name=_class_name, method_name=_method_name)
 
     ####################################################################################
@@ -70,8 +105,6 @@ class CreateDomain(unittest.TestCase):
         self.assertEqual(exit_code, 0, testing_helper.format_message('WLSDPLY-09835', script_to_run, exit_code))
 
     def __run_using_module_to_import(self, module_to_import, settings):
-        tool_module = testing_helper.import_tool_module(module_to_import, self._logger)
-
         args = list()
 
         # args[0] is the file path for the tool_module
@@ -80,19 +113,37 @@ class CreateDomain(unittest.TestCase):
         # Use settings to populate all the other args
         args = _populate_tool_args(args, settings)
 
+        daemon = tool_daemon.get_tool_daemon()
+        if daemon is not None:
+            exit_code = self.__run_using_tool_daemon(daemon, module_to_import, args, settings)
+        else:
+            tool_module = testing_helper.import_tool_module(module_to_import, self._logger)
+
+            try:
+                exit_code = tool_module.main(args)
+            except CreateException, ce:
+                self.fail(testing_helper.format_message('WLSDPLY-09826',
+                                                        self._test_name,
+                                                        self._stage.get_module_name(),
+                                                        self._stage.get_class_name(),
+                                                        ce.getLocalizedMessage()))
+            except SystemExit, se:
+                exit_code = str(se)
+
+        self.assertEqual(exit_code, None, testing_helper.format_message('WLSDPLY-09835',
+                                                                        module_to_import, exit_code))
+
+    def __run_using_tool_daemon(self, daemon, module_to_import, args, settings):
+        exit_code = None
         try:
-            exit_code = tool_module.main(args)
-        except CreateException, ce:
+            exit_code = daemon.run_tool(module_to_import, args, _populate_env_map(settings))
+        except TestingException, te:
             self.fail(testing_helper.format_message('WLSDPLY-09826',
                                                     self._test_name,
                                                     self._stage.get_module_name(),
                                                     self._stage.get_class_name(),
-                                                    ce.getLocalizedMessage()))
-        except SystemExit, se:
-            exit_code = str(se)
-
-        self.assertEqual(exit_code, None, testing_helper.format_message('WLSDPLY-09835',
-                                                                        module_to_import, exit_code))
+                                                    te.getLocalizedMessage()))
+        return exit_code
 
 
 def _populate_env_map(settings):
@@ -107,6 +158,16 @@ def _populate_env_map(settings):
     return env
 
 
+def _get_domain_name(settings):
+    """
+    Returns the name of the domain home's directory, if the settings have it.
+    """
+    domain_home = settings.get_domain_home()
+    if domain_home is not None:
+        return os.path.basename(str(domain_home).rstrip('/\\'))
+    return settings.get_domain_name()
+
+
 def _populate_tool_args(args, settings):
 
     args.append('-%s' % TestDefSettings.ORACLE_HOME)
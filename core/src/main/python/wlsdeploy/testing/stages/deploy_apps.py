@@ -10,8 +10,12 @@ from java.util import HashMap
 from oracle.weblogic.deploy.deploy import DeployException
 from oracle.weblogic.deploy.util import ScriptRunner
 
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingException
+
 # python classes from weblogic-deploy-tooling-ct
 from wlsdeploy.testing.common import testing_helper, testing_constants
+from wlsdeploy.testing.common import tool_daemon
 from wlsdeploy.testing.define.test_def_settings import TestDefSettings
 from wlsdeploy.testing.define.test_def_stage import TestDefStage
 
@@ -74,8 +78,6 @@ class DeployApps(unittest.TestCase):
         self.assertEqual(exit_code, 0, testing_helper.format_message('WLSDPLY-09835', script_to_run, exit_code))
 
     def __run_using_module_to_import(self, module_to_import, settings):
-        tool_module = testing_helper.import_tool_module(module_to_import, self._logger)
-
         args = list()
 
         # args[0] is the file path for the tool_module
@@ -84,19 +86,37 @@ class DeployApps(unittest.TestCase):
         # Use settings to populate all the other args
         args = _populate_tool_args(args, settings)
 
+        daemon = tool_daemon.get_tool_daemon()
+        if daemon is not None:
+            exit_code = self.__run_using_tool_daemon(daemon, module_to_import, args, settings)
+        else:
+            tool_module = testing_helper.import_tool_module(module_to_import, self._logger)
+
+            try:
+                exit_code = tool_module.main(args)
+            except DeployException, de:
+                self.fail(testing_helper.format_message('WLSDPLY-09826',
+                                                        self._test_name,
+                                                        self._stage.get_module_name(),
+                                                        self._stage.get_class_name(),
+                                                        de.getLocalizedMessage()))
+            except SystemExit, se:
+                exit_code = str(se)
+
+        self.assertEqual(exit_code, None, testing_helper.format_message('WLSDPLY-09835',
+                                                                        module_to_import, exit_code))
+
+    def __run_using_tool_daemon(self, daemon, module_to_import, args, settings):
+        exit_code = None
         try:
-            exit_code = tool_module.main(args)
-        except DeployException, de:
+            exit_code = daemon.run_tool(module_to_import, args, _populate_env_map(settings))
+        except TestingException, te:
             self.fail(testing_helper.format_message('WLSDPLY-09826',
                                                     self._test_name,
                                                     self._stage.get_module_name(),
                                                     self._stage.get_class_name(),
-                                                    de.getLocalizedMessage()))
-        except SystemExit, se:
-            exit_code = str(se)
-
-        self.assertEqual(exit_code, None, testing_helper.format_message('WLSDPLY-09835',
-                                                                        module_to_import, exit_code))
+                                                    te.getLocalizedMessage()))
+        return exit_code
 
 
 def _populate_env_map(settings):
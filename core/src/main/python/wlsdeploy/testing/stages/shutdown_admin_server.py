@@ -8,6 +8,7 @@ from java.util import HashMap
 from oracle.weblogic.deploy.util import ScriptRunner
 
 import wlsdeploy.testing.common.testing_helper as testing_helper
+from wlsdeploy.testing.common import admin_server_leases
 from wlsdeploy.testing.define.test_def_settings import TestDefSettings
 
 _class_name = 'ShutdownAdminServer'
@@ -60,10 +61,31 @@ class ShutdownAdminServer(unittest.TestCase):
         self._logger.info('WLSDPLY-09846', admin_server_name, domain_name, admin_url, admin_user,
                           class_name=_class_name, method_name=_method_name)
 
-        exit_code = script_runner.executeScript(script_to_run, True, None, args)
-        self.assertEqual(exit_code, 0, testing_helper.format_message('WLSDPLY-09835', script_to_run, exit_code))
+        shutdown_script = _ShutdownScript(script_runner, script_to_run, args)
+        stopped = admin_server_leases.get_admin_server_leases().release(domain_home, admin_url,
+                                                                        shutdown_script.run)
+        if not stopped:
+            # another test has a lease on the server, or it's kept for reuse
+            return
 
         self._logger.info('WLSDPLY-09847', admin_server_name, domain_name,
                           class_name=_class_name, method_name=_method_name)
 
         return
+
+
+class _ShutdownScript(object):
+    """
+    Runs the shutdown script, when the admin server leases decide to stop the server,
+    which can be after the stage is done, if the server is kept for reuse. A failed
+    script raises the same AssertionError the stage's assertEqual used to.
+    """
+    def __init__(self, script_runner, script_to_run, args):
+        self._script_runner = script_runner
+        self._script_to_run = script_to_run
+        self._args = args
+
+    def run(self):
+        exit_code = self._script_runner.executeScript(self._script_to_run, True, None, self._args)
+        if exit_code != 0:
+            raise AssertionError(testing_helper.format_message('WLSDPLY-09835', self._script_to_run, exit_code))
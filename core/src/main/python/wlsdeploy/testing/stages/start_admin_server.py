@@ -6,7 +6,10 @@ import unittest
 
 import wlstModule as wlst
 
+from oracle.weblogic.deploy.testing import TestingException
+
 import wlsdeploy.testing.common.testing_helper as testing_helper
+from wlsdeploy.testing.common import admin_server_leases
 from wlsdeploy.testing.define.test_def_settings import TestDefSettings
 
 _class_name = 'StartAdminServer'
@@ -73,11 +76,21 @@ class StartAdminServer(unittest.TestCase):
                           self._test_def.get_def_file_name(),
                           class_name=_class_name, method_name=_method_name)
 
-        wlst_wls_id = wlst.startServer(adminServerName=admin_server_name, username=admin_user, password=admin_pass,
-                                       domainName=domain_name, domainDir=domain_home, serverLog=stdout_log,
-                                       timeout=timeout_value, jvmArgs=jvm_args)
-
-        self._logger.info('WLSDPLY-09840', wlst_wls_id, class_name=_class_name, method_name=_method_name)
+        def start_server():
+            # Don't block, so that the lease's readiness probe decides when the
+            # server is ready, rather than WLST's own fixed wait
+            wlst_wls_id = wlst.startServer(adminServerName=admin_server_name, username=admin_user,
+                                           password=admin_pass, domainName=domain_name, domainDir=domain_home,
+                                           serverLog=stdout_log, timeout=timeout_value, jvmArgs=jvm_args,
+                                           block='false')
+            self._logger.info('WLSDPLY-09840', wlst_wls_id, class_name=_class_name, method_name=_method_name)
+
+        try:
+            admin_server_leases.get_admin_server_leases().acquire(domain_home, admin_url, admin_server_name,
+                                                                  start_server, timeout_value)
+        except TestingException, te:
+            self.fail(testing_helper.format_message('WLSDPLY-09826', self._test_name,
+                                                    self._stage.get_class_name(), te.getLocalizedMessage()))
 
         self._logger.exiting(class_name=_class_name, method_name=_method_name)
 
@@ -45,7 +45,7 @@ class VerifyTestDef(unittest.TestCase):
         test_def_metadata = self._test_def.get_metadata()
         wildcard_fields = test_def_metadata.get_wildcard_fields()
 
-        self._logger.finest('wildcard_fields={0}', str(wildcard_fields),
+        self._logger.finest('wildcard_fields={0}', wildcard_fields,
                             class_name=_class_name, method_name=_method_name)
 
         wildcard_field_values = {}
@@ -54,11 +54,11 @@ class VerifyTestDef(unittest.TestCase):
             wildcard_field_values[TestDefMetadata.SETTINGS_ID_WILDCARD] = self._test_def.get_settings_ids()
             wildcard_field_values[TestDefMetadata.STAGE_NAME_WILDCARD] = self._test_def.get_stage_names()
 
-            self._logger.finest('wildcard_field_values={0}', str(wildcard_field_values),
+            self._logger.finest('wildcard_field_values={0}', wildcard_field_values,
                                 class_name=_class_name, method_name=_method_name)
 
         required_fields = test_def_metadata.get_required_fields()
-        self._logger.finer('required_fields={0}', str(required_fields),
+        self._logger.finer('required_fields={0}', required_fields,
                            class_name=_class_name, method_name=_method_name)
         field_values = PyOrderedDict()
 
@@ -71,7 +71,7 @@ class VerifyTestDef(unittest.TestCase):
                     field_values['%s/%s' % (field_path_token, field_name)] = \
                         self._test_def.get_field_value(field_path_token, field_name)
 
-        self._logger.finest('field_values={0}', str(field_values),
+        self._logger.finest('field_values={0}', field_values,
                             class_name=_class_name, method_name=_method_name)
 
         for name, value in field_values.iteritems():
@@ -91,7 +91,7 @@ class VerifyTestDef(unittest.TestCase):
 
         test_def_metadata = self._test_def.get_metadata()
         optional_fields = test_def_metadata.get_optional_fields()
-        self._logger.finer('optional_fields={0}', str(optional_fields),
+        self._logger.finer('optional_fields={0}', optional_fields,
                            class_name=_class_name, method_name=_method_name)
 
         self.assertEqual(True, True)
@@ -115,7 +115,7 @@ class VerifyTestDef(unittest.TestCase):
         #
         eor_fields = test_def_metadata.get_eor_fields()
 
-        self._logger.finer('eor_fields={0}', str(eor_fields),
+        self._logger.finer('eor_fields={0}', eor_fields,
                            class_name=_class_name, method_name=_method_name)
 
         # If eor_fields is an empty Python dictionary, just return because
@@ -142,7 +142,7 @@ class VerifyTestDef(unittest.TestCase):
                 else:
                     eor_fields_present[metadata_path].append(names_list)
 
-        self._logger.finest('eor_fields_present={0}', str(eor_fields_present),
+        self._logger.finest('eor_fields_present={0}', eor_fields_present,
                             class_name=_class_name, method_name=_method_name)
 
         # The message produced when the next assertion fails needs the module
@@ -13,7 +13,7 @@ import java.util.logging.LogRecord as JLogRecord
 import java.util.logging.Logger as JLogger
 from oracle.weblogic.deploy.util import PyOrderedDict
 
-from wlsdeploy.testing.common import testing_helper
+from wlsdeploy.testing.common import message_formatter, resource_metrics, results_json
 from wlsdeploy.util import string_utils
 
 _RESOURCE_ID = 'resource_id'
@@ -32,36 +32,93 @@ class TestResults(object):
 
     def __init__(self):
         self._test_result_dict = PyOrderedDict()
+        # Kept up to date by the TestResult objects, so the counts never need a scan
+        self._results_summary = {
+            TestResults._ERRORS_COUNT: 0,
+            TestResults._WARNINGS_COUNT: 0,
+            TestResults._INFOS_COUNT: 0
+        }
 
     def __str__(self):
         return self.__to_string()
 
     def set_test_result(self, test_result):
-        self._test_result_dict[test_result.get_test_area()] = test_result
+        area = test_result.get_test_area()
+        previous_result = self._test_result_dict.get(area)
+        if previous_result is not None:
+            previous_result.set_results(None)
+            self.add_to_summary(-previous_result.get_errors_count(), -previous_result.get_warnings_count(),
+                                -previous_result.get_infos_count())
+        self._test_result_dict[area] = test_result
+        self.add_to_summary(test_result.get_errors_count(), test_result.get_warnings_count(),
+                            test_result.get_infos_count())
+        test_result.set_results(self)
+
+    def add_test_results(self, name, test_results):
+        """
+        Adds a copy of each result in test_results, with its test area prefixed by
+        name (e.g. create-smoke-test/create_domain), so that the results of many
+        tests can be put in one TestResults object.
+
+        :param name: The name of the test the results are for
+        :param test_results: The TestResults object of the test
+        """
+        for test_result in test_results.get_test_result_list():
+            self.set_test_result(test_result.copy('%s/%s' % (name, test_result.get_test_area())))
+        return
+
+    def get_test_result_list(self):
+        """
+        Returns the TestResult objects that were set, in the order they were set.
+
+        :return: A new list of the TestResult objects
+        """
+        return list(self._test_result_dict.values())
+
+    def add_to_summary(self, errors_count, warnings_count, infos_count):
+        """
+        Adds to the summary counts. Called by the TestResult objects that were set
+        on this object, as messages are added to them.
+
+        :param errors_count: The number of errors to add
+        :param warnings_count: The number of warnings to add
+        :param infos_count: The number of infos to add
+        """
+        self._results_summary[TestResults._ERRORS_COUNT] += errors_count
+        self._results_summary[TestResults._WARNINGS_COUNT] += warnings_count
+        self._results_summary[TestResults._INFOS_COUNT] += infos_count
+        return
+
+    def get_summary(self):
+        """
+        Returns a snapshot of the summary counts, as a dictionary with errors_count,
+        warnings_count and infos_count keys. The counts are kept up to date as results
+        are set, and messages are added to them, so this doesn't look at the messages.
+
+        :return: A new dictionary with the counts
+        """
+        return self._results_summary.copy()
 
     def get_errors_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[TestResults._ERRORS_COUNT]
+        return self._results_summary[TestResults._ERRORS_COUNT]
 
     def get_warnings_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[TestResults._WARNINGS_COUNT]
+        return self._results_summary[TestResults._WARNINGS_COUNT]
 
     def get_infos_count(self):
         """
 
         :return:
         """
-        results_summary = self.__get_summary()
-        return results_summary[TestResults._INFOS_COUNT]
+        return self._results_summary[TestResults._INFOS_COUNT]
 
     def log_results(self, logger):
         """
@@ -74,7 +131,7 @@ class TestResults(object):
         if logger is not None:
             # Get counts for all the TestResult objects
             # in this TestResults object
-            results_summary = self.__get_summary()
+            results_summary = self._results_summary
 
             jlogger = JLogger.getLogger(logger.get_name(), logger.resource_bundle_name)
 
@@ -105,6 +162,8 @@ class TestResults(object):
                 logger.log(jlogger.getLevel(), 'WLSDPLY-09811', total_messages_count,
                            class_name=self._class_name, method_name=_method_name)
 
+            self.__log_metrics(logger, _method_name)
+
             for test_result in self._test_result_dict.values():
                 if test_result.get_infos_count() > 0:
                     jlogger.setLevel(JLevel.INFO)
@@ -124,6 +183,28 @@ class TestResults(object):
 
         return
 
+    def __log_metrics(self, logger, method_name):
+        """
+        Logs the wall time, CPU time, allocated bytes and peak heap of each stage,
+        and of its steps, in the order the results were set.
+
+        :param logger: The logger to log with
+        :param method_name: The name of the calling method
+        """
+        for test_result in self._test_result_dict.values():
+            metrics = test_result.get_metrics()
+            if metrics is None:
+                continue
+            logger.info('WLSDPLY-09992', test_result.get_test_area(), metrics.get_wall_millis(),
+                        metrics.get_cpu_millis(), metrics.get_allocated_bytes(), metrics.get_peak_heap_bytes(),
+                        class_name=self._class_name, method_name=method_name)
+            for step_metrics in metrics.get_child_metrics():
+                logger.fine('WLSDPLY-09995', step_metrics.get_name(), test_result.get_test_area(),
+                            step_metrics.get_wall_millis(), step_metrics.get_cpu_millis(),
+                            step_metrics.get_allocated_bytes(), step_metrics.get_peak_heap_bytes(),
+                            class_name=self._class_name, method_name=method_name)
+        return
+
     def __log_results_category_details(self, category_messages, method_name, jlogger):
         """
 
@@ -138,46 +219,34 @@ class TestResults(object):
             _log_category_message(jlogger, messages[_RESOURCE_ID], messages[_ARGS],
                                   class_name=self._class_name, method_name=method_name)
 
-    def __get_summary(self):
+    def write_json(self, write):
         """
+        Writes the results with messages as a JSON array, a piece at a time.
 
-        :return:
+        :param write: The function each piece of the JSON is passed to (e.g. the
+                      append method of a list, or the write method of a java.io.Writer)
         """
-
-        results_summary = {
-            TestResults._ERRORS_COUNT: 0,
-            TestResults._WARNINGS_COUNT: 0,
-            TestResults._INFOS_COUNT: 0
-        }
-
+        formatter = message_formatter.get_message_formatter()
+        write('[')
+        separator = ''
         for test_result in self._test_result_dict.values():
-            if test_result is not None:
-                results_summary[TestResults._ERRORS_COUNT] += test_result.get_errors_count()
-                results_summary[TestResults._WARNINGS_COUNT] += test_result.get_warnings_count()
-                results_summary[TestResults._INFOS_COUNT] += test_result.get_infos_count()
-
-        return results_summary
+            if test_result.get_errors_count() > 0 \
+                    or test_result.get_warnings_count() > 0 \
+                    or test_result.get_infos_count() > 0:
+                write(separator)
+                test_result.write_json(write, formatter)
+                separator = ','
+        write(']')
+        return
 
     def __to_string(self):
         """
 
         :return:
         """
-
-        tmp = ''
-
-        for test_result in self._test_result_dict.values():
-            if test_result.get_errors_count() > 0 \
-                    or test_result.get_warnings_count() > 0 \
-                    or test_result.get_infos_count():
-                tmp += str(test_result)
-                tmp += ','
-
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-
-        return '[%s]' % tmp
+        chunks = []
+        self.write_json(chunks.append)
+        return ''.join(chunks)
 
 
 def _log_category_message(jlogger, message, *args, **kwargs):
@@ -209,6 +278,11 @@ class TestResult(unittest.TestResult):
     _MESSAGES = 'messages'
 
     def __init__(self, test_area):
+        self._results = None
+        self._metrics = None
+        # The ResourceMetrics of the steps that have run, and the Span of the running one
+        self._step_metrics = []
+        self._step_span = None
         self._result = {
             TestResult._TEST_AREA: test_area,
             TestResult._ERRORS: {
@@ -234,19 +308,9 @@ class TestResult(unittest.TestResult):
         self.buffer = False
 
     def __str__(self):
-        tmp = '"test_area": "%s",' % self._result[TestResult._TEST_AREA]
-        if self.get_errors_count() > 0:
-            tmp += self.__to_string(TestResult._ERRORS)
-        if self.get_warnings_count() > 0:
-            tmp += self.__to_string(TestResult._WARNINGS)
-        if self.get_infos_count() > 0:
-            tmp += self.__to_string(TestResult._INFOS)
-
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-
-        return "{%s}" % tmp
+        chunks = []
+        self.write_json(chunks.append)
+        return ''.join(chunks)
 
     def add_error(self, resource_id, *args):
         """
@@ -256,6 +320,8 @@ class TestResult(unittest.TestResult):
         :return:
         """
         self._result[TestResult._ERRORS][TestResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(1, 0, 0)
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[TestResult._ERRORS][TestResult._MESSAGES].append(message)
         self.stop()
@@ -269,6 +335,8 @@ class TestResult(unittest.TestResult):
         :return:
         """
         self._result[TestResult._WARNINGS][TestResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(0, 1, 0)
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[TestResult._WARNINGS][TestResult._MESSAGES].append(message)
         return
@@ -281,10 +349,43 @@ class TestResult(unittest.TestResult):
         :return:
         """
         self._result[TestResult._INFOS][TestResult._COUNT] += 1
+        if self._results is not None:
+            self._results.add_to_summary(0, 0, 1)
         message = {_RESOURCE_ID: resource_id, _ARGS: args}
         self._result[TestResult._INFOS][TestResult._MESSAGES].append(message)
         return
 
+    def set_results(self, results):
+        """
+        Sets the TestResults object this result was set on, whose summary counts are
+        updated as messages are added, or None to stop updating them.
+
+        :param results: The TestResults object, or None
+        """
+        self._results = results
+        return
+
+    def set_metrics(self, metrics):
+        """
+        Sets the ResourceMetrics of the stage this is the result of.
+
+        :param metrics: The ResourceMetrics, or None
+        """
+        self._metrics = metrics
+        return
+
+    def get_metrics(self):
+        """
+        Returns the ResourceMetrics of the stage this is the result of, or None if it wasn't measured.
+        """
+        return self._metrics
+
+    def get_step_metrics(self):
+        """
+        Returns the ResourceMetrics of the steps that were run with this result, in the order they ran.
+        """
+        return list(self._step_metrics)
+
     def get_test_area(self):
         """
 
@@ -292,6 +393,25 @@ class TestResult(unittest.TestResult):
         """
         return self._result[TestResult._TEST_AREA]
 
+    def copy(self, test_area=None):
+        """
+        Returns a new TestResult with the same messages, that isn't set on any
+        TestResults object.
+
+        :param test_area: The test area of the copy, or None to use this result's
+        :return: The new TestResult
+        """
+        if test_area is None:
+            test_area = self.get_test_area()
+
+        test_result = TestResult(test_area)
+        for category in [TestResult._ERRORS, TestResult._WARNINGS, TestResult._INFOS]:
+            test_result._result[category][TestResult._COUNT] = self._result[category][TestResult._COUNT]
+            test_result._result[category][TestResult._MESSAGES] = list(self._result[category][TestResult._MESSAGES])
+        test_result._metrics = self._metrics
+        test_result._step_metrics = list(self._step_metrics)
+        return test_result
+
     def get_errors_count(self):
         """
 
@@ -334,6 +454,19 @@ class TestResult(unittest.TestResult):
         """
         return self._result[TestResult._INFOS][TestResult._MESSAGES]
 
+    # override startTest(test) method
+    def startTest(self, test):
+        unittest.TestResult.startTest(self, test)
+        step_name = string_utils.rsplit(test.id(), '.', 1)[-1]
+        self._step_span = resource_metrics.start_span(step_name, resource_metrics.STEP)
+
+    # override stopTest(test) method
+    def stopTest(self, test):
+        unittest.TestResult.stopTest(self, test)
+        if self._step_span is not None:
+            self._step_metrics.append(self._step_span.finish())
+            self._step_span = None
+
     # override addError(test, err) method
     def addError(self, test, err):
         test_name_sections = string_utils.rsplit(test.id(), '.', 1)
@@ -357,22 +490,16 @@ class TestResult(unittest.TestResult):
         test_name_sections = string_utils.rsplit(test.id(), '.', 1)
         self.add_info('WLSDPLY-09803', test_name_sections[1], test_name_sections[0])
 
-    def __to_string(self, category_name):
-        tmp = ' "%s": {' % category_name
-        tmp += '"count": %d, ' % self._result[category_name][TestResult._COUNT]
-        tmp += '"messages": ['
-        for message in self._result[category_name][TestResult._MESSAGES]:
-            tmp += "{"
-            tmp += '"%s": "%s",' % ('message', testing_helper.format_message(message[_RESOURCE_ID],
-                                                                             list(message[_ARGS])))
-            if tmp[-1:] == ',':
-                # Strip off trailing ','
-                tmp = tmp[:-1]
-            tmp += "},"
-        if tmp[-1:] == ',':
-            # Strip off trailing ','
-            tmp = tmp[:-1]
-        # Concatenate closing ']}'
-        tmp += "]},"
-
-        return tmp
+    def write_json(self, write, formatter=None):
+        """
+        Writes the result as a JSON object, a piece at a time.
+
+        :param write: The function each piece of the JSON is passed to
+        :param formatter: The MessageFormatter to format the messages with, or None to use the
+                          process-wide one
+        """
+        categories = [(TestResult._ERRORS, self.get_errors_count(), self.get_errors_messages()),
+                      (TestResult._WARNINGS, self.get_warnings_count(), self.get_warnings_messages()),
+                      (TestResult._INFOS, self.get_infos_count(), self.get_infos_messages())]
+        results_json.write_result(write, TestResult._TEST_AREA, self.get_test_area(), categories, formatter)
+        return
@@ -7,9 +7,9 @@ import unittest
 # python classes from weblogic-deploy-tooling-ct
 from wlsdeploy.testing.common import testing_constants, testing_helper
 from wlsdeploy.testing.define.test_def import TestDef
-from wlsdeploy.testing.define.test_def_stage import TestDefStage
 from wlsdeploy.testing.exception import exception_helper
 from wlsdeploy.testing.stage_runner import StageRunner
+from wlsdeploy.testing.stage_scheduler import StageScheduler
 from wlsdeploy.testing.test_results import TestResult
 from wlsdeploy.testing.test_results import TestResults
 
@@ -25,7 +25,7 @@ class TestRunner(object):
         self._stage_modules_cache = {}
 
     def run_test(self, test_type, test_def_file, test_def_overrides_file, test_def_verifier_name=None,
-                 test_def_metadata_file=None, verify_only=False):
+                 test_def_metadata_file=None, verify_only=False, isolation_dir=None):
         """
         Runs the test specified in the given '''test_def''' object.
 
@@ -36,6 +36,8 @@ class TestRunner(object):
                                        verifying the test definition file
         :param test_def_metadata_file: A file object created from a JSON/YAML test definition metadata file
         :param verify_only: A flag indicating to only perform test verification steps
+        :param isolation_dir: A directory of the test's own, for its domains and logs
+                              directories, or None to use the ones in the test definition
         :return: TestResults object created when running the test
         :raises TestingException: if a TestingException is raised while running the test
         :raises TestDefinitionException: if test_def Is missing a metadata file field
@@ -50,7 +52,8 @@ class TestRunner(object):
         test_results = TestResults()
         stage_runner = StageRunner(self._logger)
 
-        test_def = TestDef(test_def_file, self._logger, test_def_overrides_file, test_def_metadata_file)
+        test_def = TestDef(test_def_file, self._logger, test_def_overrides_file, test_def_metadata_file,
+                           isolation_dir=isolation_dir)
 
         test_def_type = test_def.get_type()
 
@@ -94,15 +97,7 @@ class TestRunner(object):
             test_results.set_test_result(test_result)
 
         if test_results.get_errors_count() is 0 and verify_only is False:
-            for stage in test_def.get_stages():
-                test_result = stage_runner.run_stage(stage, test_def)
-                test_results.set_test_result(test_result)
-                if test_results.get_errors_count() > 0:
-                    if stage.continue_when_fail() == 'true':
-                        self._logger.warning('WLSDPLY-09849', stage.get_name(), TestDefStage.CONTINUE_WHEN_FAIL,
-                                             class_name=self._class_name, method_name=_method_name)
-                    else:
-                        break
+            StageScheduler(stage_runner, self._logger).run_stages(test_def, test_results)
 
         log_policy = test_def.get_stdout_log_policy()
 
@@ -166,8 +161,7 @@ class TestRunner(object):
             if stage_name is None:
                 stage_name = 'certified_%s' % self._test_type
 
-            verify_test_def_file = testing_helper.extract_file(verify_test_def_file_path, self._logger)
-            verify_test_def = TestDef(verify_test_def_file, self._logger)
+            verify_test_def = TestDef(verify_test_def_file_path, self._logger, from_resource=True)
 
             stage = verify_test_def.get_stage(stage_name)
 
@@ -233,8 +227,7 @@ class TestRunner(object):
 
             stage_name = testing_constants.METADATA_FILE_VERIFICATION_STAGE_NAME
 
-            verify_test_def_file = testing_helper.extract_file(verify_test_def_file_path, self._logger)
-            verify_test_def = TestDef(verify_test_def_file, self._logger)
+            verify_test_def = TestDef(verify_test_def_file_path, self._logger, from_resource=True)
 
             stage = verify_test_def.get_stage(stage_name)
 
@@ -0,0 +1,543 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import os
+
+import java.io.BufferedWriter as JBufferedWriter
+import java.io.File as JFile
+import java.io.FileOutputStream as JFileOutputStream
+import java.io.IOException as JIOException
+import java.io.OutputStreamWriter as JOutputStreamWriter
+import java.lang.System as JSystem
+import java.lang.Throwable as JThrowable
+import java.util.concurrent.Callable as JCallable
+import java.util.concurrent.ExecutionException as JExecutionException
+import java.util.concurrent.Executors as JExecutors
+
+# java classes from weblogic-deploy-tooling-ct
+from oracle.weblogic.deploy.testing import TestingConstants
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import testing_constants, testing_helper, tool_daemon
+from wlsdeploy.testing.common.results_json import quote_json_string
+from wlsdeploy.testing.define.test_def import TestDef
+from wlsdeploy.testing.define.test_def_settings import TestDefSettings
+from wlsdeploy.testing.exception import exception_helper
+from wlsdeploy.testing.logging.platform_logger import PlatformLogger
+from wlsdeploy.testing.test_results import TestResults
+
+_logger = PlatformLogger('wlsdeploy.testing', resource_bundle_name=TestingConstants.RESOURCE_BUNDLE_NAME)
+
+_TEST_DEF_FILE_EXTENSIONS = ['.json', '.yaml', '.yml']
+_RESULTS_FILE_NAME = 'test-results.json'
+
+_NAME = 'name'
+_TEST_DEF_FILE = 'test_def_file'
+_TEST_DEF_OVERRIDES_FILE = 'test_def_overrides_file'
+_TEST_DEF_METADATA_FILE = 'test_def_metadata_file'
+_TEST_DEFS = 'test_defs'
+
+# The field of the compare_models stage, with the file it writes its results to
+_COMPARISON_RESULTS_FILE = 'comparison_results_file'
+
+_PATH_SEPARATORS = ['/', '\\']
+_PARENT_DIR = '..'
+
+# The default maximum number of tests that run at the same time, when the tool
+# daemon is enabled. Otherwise, the WLST tools of all the tests run in this
+# process, and share its WLST and Jython state, so by default the tests run one
+# at a time.
+_DEFAULT_TOOL_DAEMON_THREADS = 4
+
+
+class TestSuiteRunner(object):
+    """
+    Runs many test definitions in a single process, using a bounded pool of threads,
+    so that the JVM is started, and the stages maps, metadata and verification tests
+    are loaded, once for all of them.
+
+    Each test gets a directory of its own, <results_dir>/<test-name>, with domains
+    and logs subdirectories, that are used instead of the ones in the test definition,
+    and the test's results are written to its test-results.json file. The admin servers
+    and the other files of the tests are not moved, so when two tests have the same
+    admin_url, or output file (e.g. the model file discover writes), the tests are run
+    one at a time.
+    When all the tests are done, the results of all of them are written to
+    <results_dir>/test-suite-results.json, and a <results_dir>/test-suite-summary.jsonl
+    file is written, with one line per test, followed by a summary trailer:
+
+        {"name": "create-smoke-test", "status": "passed", "errors_count": 0, ...}
+        {"summary": {"tests_count": 2, "failed_count": 0, "errors_count": 0, ...}}
+
+    Test definitions are added from a test suite file, or by finding the test
+    definition files in a directory.
+    """
+    _class_name = 'TestSuiteRunner'
+
+    SUMMARY_FILE_NAME = 'test-suite-summary.jsonl'
+    SUITE_RESULTS_FILE_NAME = 'test-suite-results.json'
+    STATUS_PASSED = 'passed'
+    STATUS_FAILED = 'failed'
+    STATUS_ERROR = 'error'
+
+    def __init__(self, results_dir, threads=None, logger=None):
+        """
+        :param results_dir: The directory the tests' directories, and the suite's results
+                            files, are put in
+        :param threads: The maximum number of tests to run at the same time. The default
+                        is 1, unless the tool daemon is enabled.
+        :param logger: The PlatformLogger to use, or None to use the default one
+        """
+        self._results_dir = results_dir
+        if logger is None:
+            self._logger = _logger
+        else:
+            self._logger = logger
+
+        if threads is None or threads < 1:
+            threads = 1
+            if tool_daemon.is_tool_daemon_enabled():
+                threads = _DEFAULT_TOOL_DAEMON_THREADS
+        self._threads = threads
+
+        self._test_defs = []
+        self._test_def_names = {}
+        self._suite_results = TestResults()
+
+    def get_test_defs_count(self):
+        return len(self._test_defs)
+
+    def get_suite_results(self):
+        """
+        Returns the TestResults object with the results of all the tests that ran,
+        with test areas prefixed by the test names.
+        """
+        return self._suite_results
+
+    def add_test_def(self, name, test_def_file, test_def_overrides_file=None, test_def_metadata_file=None):
+        """
+        Adds a test definition to run.
+
+        :param name: The name of the test, which is also used to name its directory
+        :param test_def_file: The path of the test definition file
+        :param test_def_overrides_file: The path of an overrides properties file for the test, or None
+        :param test_def_metadata_file: The path of a metadata file for the test, or None
+        :raises TestingException: if there already is a test with the same name, or the name
+                                  has a path separator or .. in it
+        """
+        _method_name = 'add_test_def'
+
+        if not _is_valid_test_name(name):
+            ex = exception_helper.create_testing_exception('WLSDPLY-09898', name)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        if name in self._test_def_names:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09967', name, test_def_file,
+                                                           self._test_defs[self._test_def_names[name]][_TEST_DEF_FILE])
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        self._test_def_names[name] = len(self._test_defs)
+        self._test_defs.append({
+            _NAME: name,
+            _TEST_DEF_FILE: test_def_file,
+            _TEST_DEF_OVERRIDES_FILE: test_def_overrides_file,
+            _TEST_DEF_METADATA_FILE: test_def_metadata_file
+        })
+        return
+
+    def add_suite_test_defs(self, test_suite_file):
+        """
+        Adds the test definitions listed in a JSON (or YAML) test suite file, that
+        looks like this:
+
+            {
+                "test_defs": [
+                    {
+                        "name": "create-smoke-test",
+                        "test_def_file": "smoke_test/certified/create-smoke-test.json",
+                        "test_def_overrides_file": "smoke_test/default-smoke-test-overrides.properties",
+                        "test_def_metadata_file": "metadata/create-metadata.json"
+                    },
+                    ...
+                ]
+            }
+
+        The overrides and metadata files are optional. If name is left out, the base
+        name of the test definition file is used. Relative file paths are resolved
+        against the directory the test suite file is in.
+
+        :param test_suite_file: The path of the test suite file
+        :raises TestingException: if the test suite file cannot be translated, or doesn't
+                                  list any test definitions
+        """
+        _method_name = 'add_suite_test_defs'
+
+        suite_dict = testing_helper.translate_file(str(test_suite_file), self._logger)
+        suite_dir = os.path.dirname(os.path.abspath(str(test_suite_file)))
+
+        test_defs = []
+        if suite_dict is not None and _TEST_DEFS in suite_dict:
+            test_defs = suite_dict[_TEST_DEFS]
+
+        if len(test_defs) == 0:
+            ex = exception_helper.create_testing_exception('WLSDPLY-09968', test_suite_file, _TEST_DEFS)
+            self._logger.throwing(ex, class_name=self._class_name, method_name=_method_name)
+            raise ex
+
+        for test_def in test_defs:
+            test_def_file = _resolve_path(suite_dir, test_def.get(_TEST_DEF_FILE))
+            name = test_def.get(_NAME)
+            if name is None:
+                name = _get_base_name(test_def_file)
+            self.add_test_def(name, test_def_file,
+                              _resolve_path(suite_dir, test_def.get(_TEST_DEF_OVERRIDES_FILE)),
+                              _resolve_path(suite_dir, test_def.get(_TEST_DEF_METADATA_FILE)))
+        return
+
+    def add_directory_test_defs(self, test_def_dir, test_def_overrides_file=None, test_def_metadata_file=None):
+        """
+        Adds every test definition file in test_def_dir, and its subdirectories. A
+        JSON or YAML file is taken to be a test definition if it has a stages field,
+        so metadata and step names files in the same directories are skipped. A test
+        is named after its file, without the extension, unless another test already
+        has that name (e.g. create-smoke-test.json and create-smoke-test.yaml), in
+        which case the extension is added to the name (e.g. create-smoke-test-yaml).
+
+        :param test_def_dir: The directory containing the test definition files
+        :param test_def_overrides_file: The path of an overrides properties file for all
+                                        the tests, or None
+        :param test_def_metadata_file: The path of a metadata file for all the tests, or None
+        :raises TestingException: if the directory does not exist, a test definition file
+                                  cannot be translated, or two tests end up with the same name
+        """
+        _method_name = 'add_directory_test_defs'
+
+        j_dir = testing_helper.verify_directory_exists(str(test_def_dir), self._logger)
+
+        for test_def_file in _list_test_def_files(j_dir):
+            test_def_dict = testing_helper.translate_file(test_def_file, self._logger)
+            if test_def_dict is None or testing_constants.STAGES not in test_def_dict:
+                self._logger.fine('WLSDPLY-09969', test_def_file, testing_constants.STAGES,
+                                  class_name=self._class_name, method_name=_method_name)
+                continue
+
+            name = _get_base_name(test_def_file)
+            if name in self._test_def_names:
+                name = '%s-%s' % (name, os.path.splitext(test_def_file)[1][1:].lower())
+            self.add_test_def(name, test_def_file, test_def_overrides_file, test_def_metadata_file)
+        return
+
+    def run_all(self, test_runner, test_type, test_def_verifier_name=None, verify_only=False):
+        """
+        Runs all the test definitions that were added, and writes the suite's results
+        files. A test that cannot be run (e.g. because its test definition is not valid)
+        is reported with an error status, and doesn't stop the others.
+
+        :param test_runner: The TestRunner to run the tests with
+        :param test_type: The type of the tests
+        :param test_def_verifier_name: The name of the verification test to use, or None
+        :param verify_only: A flag indicating to only perform test verification steps
+        :return: A list of per-test result dictionaries, in the order the tests were added
+        :raises TestingException: if the suite's results files cannot be written
+        """
+        _method_name = 'run_all'
+
+        threads = min(self._threads, max(len(self._test_defs), 1))
+        if threads > 1 and self.__has_shared_resource():
+            threads = 1
+        self._logger.info('WLSDPLY-09970', len(self._test_defs), threads,
+                          class_name=self._class_name, method_name=_method_name)
+
+        tasks = []
+        for test_def in self._test_defs:
+            test_dir = os.path.join(str(self._results_dir), test_def[_NAME])
+            tasks.append(_RunTestDefTask(test_runner, test_type, test_def, test_def_verifier_name,
+                                         verify_only, test_dir, self._logger))
+
+        executor = JExecutors.newFixedThreadPool(threads)
+        try:
+            futures = []
+            for task in tasks:
+                futures.append(executor.submit(task))
+            for i in range(len(futures)):
+                try:
+                    futures[i].get()
+                except JExecutionException, ee:
+                    tasks[i].set_failure(ee.getCause())
+        finally:
+            executor.shutdown()
+
+        test_results = []
+        for task in tasks:
+            test_results.append(task.get_result())
+            if task.get_test_results() is not None:
+                self._suite_results.add_test_results(task.get_result()[_NAME], task.get_test_results())
+
+        _write_file(os.path.join(str(self._results_dir), TestSuiteRunner.SUITE_RESULTS_FILE_NAME),
+                    self._suite_results.write_json, self._logger)
+        self.__write_summary_file(test_results)
+        return test_results
+
+    ####################################################################################
+    #
+    # Private methods, private inner classes and static methods only, beyond here please
+    #
+    ####################################################################################
+
+    def __has_shared_resource(self):
+        """
+        Returns True if two of the tests have the same admin_url, or output file, so
+        their admin servers would listen on the same port, or they would overwrite each
+        other's files, if they ran at the same time. A test whose test definition cannot
+        be loaded is left out, because it fails before it runs any stages.
+        """
+        _method_name = '__has_shared_resource'
+
+        resource_names = {}
+        for test_def in self._test_defs:
+            try:
+                resources = _get_shared_resources(test_def, self._logger)
+            except JThrowable:
+                continue
+            except Exception:
+                continue
+
+            for resource in resources:
+                if resource in resource_names and resource_names[resource] != test_def[_NAME]:
+                    self._logger.warning('WLSDPLY-09896', resource_names[resource], test_def[_NAME], resource[0],
+                                         resource[1], class_name=self._class_name, method_name=_method_name)
+                    return True
+                resource_names[resource] = test_def[_NAME]
+        return False
+
+    def __write_summary_file(self, test_results):
+        _method_name = '__write_summary_file'
+
+        summary_file = os.path.join(str(self._results_dir), TestSuiteRunner.SUMMARY_FILE_NAME)
+
+        failed_count = 0
+        for test_result in test_results:
+            if test_result['status'] != TestSuiteRunner.STATUS_PASSED:
+                failed_count += 1
+        results_summary = self._suite_results.get_summary()
+
+        lines = []
+        for test_result in test_results:
+            lines.append(_to_json_line(test_result))
+        lines.append('{"summary": {"tests_count": %d, "failed_count": %d, "errors_count": %d, '
+                     '"warnings_count": %d, "infos_count": %d}}'
+                     % (len(test_results), failed_count, results_summary['errors_count'],
+                        results_summary['warnings_count'], results_summary['infos_count']))
+        lines.append('')
+
+        _write_file(summary_file, lambda write: write('\n'.join(lines)), self._logger)
+
+        self._logger.info('WLSDPLY-09971', len(test_results), failed_count, results_summary['errors_count'],
+                          results_summary['warnings_count'], results_summary['infos_count'], summary_file,
+                          class_name=self._class_name, method_name=_method_name)
+        return
+
+
+class _RunTestDefTask(JCallable):
+    """
+    Runs a single test definition, on one of the pool's threads. The outcome is
+    kept on the task, rather than returned through the Future.
+    """
+    _class_name = '_RunTestDefTask'
+
+    def __init__(self, test_runner, test_type, test_def, test_def_verifier_name, verify_only, test_dir, logger):
+        self._test_runner = test_runner
+        self._test_type = test_type
+        self._test_def = test_def
+        self._test_def_verifier_name = test_def_verifier_name
+        self._verify_only = verify_only
+        self._test_dir = test_dir
+        self._logger = logger
+        self._test_results = None
+        self._result = {
+            'name': test_def[_NAME],
+            'test_def_file': test_def[_TEST_DEF_FILE],
+            'results_file': os.path.join(test_dir, _RESULTS_FILE_NAME),
+            'status': TestSuiteRunner.STATUS_PASSED,
+            'errors_count': 0,
+            'warnings_count': 0,
+            'infos_count': 0,
+            'elapsed_ms': 0,
+            'failure': None
+        }
+
+    def get_result(self):
+        return self._result
+
+    def get_test_results(self):
+        return self._test_results
+
+    def set_failure(self, failure):
+        _method_name = 'set_failure'
+
+        self._result['status'] = TestSuiteRunner.STATUS_ERROR
+        if isinstance(failure, JThrowable):
+            self._result['failure'] = failure.getLocalizedMessage()
+        else:
+            self._result['failure'] = str(failure)
+
+        self._logger.severe('WLSDPLY-09972', self._test_def[_NAME], self._result['failure'],
+                            class_name=self._class_name, method_name=_method_name)
+        return
+
+    def call(self):
+        _method_name = 'call'
+
+        start = JSystem.currentTimeMillis()
+        try:
+            self._test_results = self.__run()
+            self._result.update(self._test_results.get_summary())
+            if self._result['errors_count'] > 0:
+                self._result['status'] = TestSuiteRunner.STATUS_FAILED
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            _write_file(self._result['results_file'], self._test_results.write_json, self._logger)
+            self._logger.info('WLSDPLY-09973', self._test_def[_NAME], self._result['status'],
+                              self._result['errors_count'], self._result['warnings_count'],
+                              self._result['infos_count'], self._result['elapsed_ms'],
+                              class_name=self._class_name, method_name=_method_name)
+        except JThrowable, t:
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            self.set_failure(t)
+        except Exception, e:
+            self._result['elapsed_ms'] = JSystem.currentTimeMillis() - start
+            self.set_failure(e)
+
+        return None
+
+    def __run(self):
+        for dir_name in [TestDef.DOMAINS_DIR_NAME, TestDef.LOGS_DIR_NAME]:
+            j_dir = JFile(self._test_dir, dir_name)
+            if not j_dir.isDirectory():
+                j_dir.mkdirs()
+
+        return self._test_runner.run_test(self._test_type,
+                                          JFile(str(self._test_def[_TEST_DEF_FILE])).getAbsoluteFile(),
+                                          _to_file(self._test_def[_TEST_DEF_OVERRIDES_FILE]),
+                                          self._test_def_verifier_name,
+                                          _to_file(self._test_def[_TEST_DEF_METADATA_FILE]),
+                                          self._verify_only,
+                                          isolation_dir=self._test_dir)
+
+
+def _write_file(file_path, write_json, logger):
+    """
+    Writes a results file, passing the write method of the file's writer to write_json.
+
+    :raises TestingException: if the file cannot be written
+    """
+    _method_name = '_write_file'
+
+    j_file = JFile(str(file_path)).getAbsoluteFile()
+    try:
+        parent_dir = j_file.getParentFile()
+        if parent_dir is not None and not parent_dir.exists():
+            parent_dir.mkdirs()
+        writer = JBufferedWriter(JOutputStreamWriter(JFileOutputStream(j_file), 'UTF-8'))
+        try:
+            write_json(writer.write)
+        finally:
+            writer.close()
+    except JIOException, ioe:
+        ex = exception_helper.create_testing_exception('WLSDPLY-09974', j_file.getAbsolutePath(),
+                                                       ioe.getLocalizedMessage(), error=ioe)
+        logger.throwing(ex, class_name=TestSuiteRunner._class_name, method_name=_method_name)
+        raise ex
+    return
+
+
+def _get_shared_resources(test_def, logger):
+    """
+    Returns the (field name, value) tuples of the admin URLs and output files of a test
+    definition, with its overrides applied. The output files are the model and archive
+    files in the settings, which the discover stages write, and the comparison results
+    files of the stages. The domain homes and logs aren't, because they are under the
+    test's own directory.
+    """
+    loaded_test_def = TestDef(JFile(str(test_def[_TEST_DEF_FILE])).getAbsoluteFile(), logger,
+                              _to_file(test_def[_TEST_DEF_OVERRIDES_FILE]),
+                              _to_file(test_def[_TEST_DEF_METADATA_FILE]))
+    resources = []
+    for settings_id in loaded_test_def.get_settings_ids():
+        settings = loaded_test_def.get_settings(settings_id)
+        _add_resource(resources, TestDefSettings.ADMIN_URL, settings.get_admin_url())
+        _add_resource(resources, TestDefSettings.MODEL_FILE, _to_absolute_path(settings.get_model_file_name()))
+        _add_resource(resources, TestDefSettings.ARCHIVE_FILE, _to_absolute_path(settings.get_archive_file_name()))
+    for stage_name in loaded_test_def.get_stage_names():
+        stage = loaded_test_def.get_stage(stage_name)
+        _add_resource(resources, _COMPARISON_RESULTS_FILE,
+                      _to_absolute_path(stage.get_field_value(_COMPARISON_RESULTS_FILE)))
+    return resources
+
+
+def _add_resource(resources, field_name, value):
+    if value is not None and (field_name, str(value)) not in resources:
+        resources.append((field_name, str(value)))
+    return
+
+
+def _to_absolute_path(file_path):
+    if file_path is None:
+        return None
+    return os.path.normpath(os.path.abspath(str(file_path)))
+
+
+def _to_file(file_path):
+    if file_path is None or isinstance(file_path, JFile):
+        return file_path
+    return JFile(str(file_path)).getAbsoluteFile()
+
+
+def _resolve_path(base_dir, file_path):
+    if file_path is None or os.path.isabs(file_path):
+        return file_path
+    return os.path.join(base_dir, file_path)
+
+
+def _is_valid_test_name(name):
+    if name is None or len(name) == 0 or _PARENT_DIR in name:
+        return False
+    for separator in _PATH_SEPARATORS:
+        if separator in name:
+            return False
+    return True
+
+
+def _get_base_name(file_path):
+    return os.path.splitext(os.path.basename(str(file_path)))[0]
+
+
+def _list_test_def_files(j_dir):
+    """
+    Returns the paths of the JSON and YAML files in j_dir, and its subdirectories,
+    sorted, so that the tests are always added in the same order.
+    """
+    file_paths = []
+    file_names = list(j_dir.list())
+    file_names.sort()
+    for file_name in file_names:
+        j_file = JFile(j_dir, file_name)
+        if j_file.isDirectory():
+            file_paths.extend(_list_test_def_files(j_file))
+        elif os.path.splitext(file_name)[1].lower() in _TEST_DEF_FILE_EXTENSIONS:
+            file_paths.append(j_file.getAbsolutePath())
+    return file_paths
+
+
+def _to_json_line(test_result):
+    fields = []
+    for key in ['name', 'status', 'errors_count', 'warnings_count', 'infos_count', 'elapsed_ms',
+                'test_def_file', 'results_file', 'failure']:
+        value = test_result[key]
+        if isinstance(value, int) or isinstance(value, long):
+            fields.append('"%s": %d' % (key, value))
+        else:
+            fields.append('"%s": %s' % (key, quote_json_string(value)))
+    return '{%s}' % ', '.join(fields)
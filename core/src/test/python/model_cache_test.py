@@ -0,0 +1,42 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import unittest
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import PyOrderedDict
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common import model_cache
+
+
+class ModelCacheTestCase(unittest.TestCase):
+    """
+    Checks that a model read back from the model cache has the same values, as the
+    model that was put in it, so that a cache hit gives the same model as a miss.
+    """
+
+    def testEncodeDecodeModel(self):
+        model_dict = PyOrderedDict()
+        model_dict['domainInfo'] = PyOrderedDict()
+        model_dict['domainInfo']['AdminUserName'] = 'weblogic'
+        model_dict['domainInfo']['ServerStartMode'] = u'd\u00e9veloppement'
+        model_dict['topology'] = PyOrderedDict()
+        model_dict['topology']['Name'] = u'\u30c9\u30e1\u30a4\u30f3'
+        model_dict['topology']['ListenPort'] = 7001
+        model_dict['topology']['MaxMessageSize'] = 10000000000L
+        model_dict['topology']['ProductionModeEnabled'] = True
+        model_dict['topology']['Notes'] = [u'caf\u00e9', 'plain']
+
+        decoded_dict = model_cache.decode_model(model_cache.encode_model(model_dict))
+
+        self.assertEqual(decoded_dict.keys(), model_dict.keys())
+        self.assertEqual(decoded_dict, model_dict)
+        self.assertEqual(decoded_dict['domainInfo']['ServerStartMode'], u'd\u00e9veloppement')
+        self.assertEqual(decoded_dict['topology']['Name'], u'\u30c9\u30e1\u30a4\u30f3')
+        self.assertEqual(type(decoded_dict['topology']['MaxMessageSize']), type(10000000000L))
+
+
+if __name__ == '__main__':
+    unittest.main()
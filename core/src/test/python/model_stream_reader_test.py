@@ -0,0 +1,105 @@
+"""
+Copyright (c) 2017, 2018, Oracle and/or its affiliates. All rights reserved.
+The Universal Permissive License (UPL), Version 1.0
+"""
+import os
+import unittest
+
+import java.io.File as JFile
+
+# java classes from weblogic-deploy-tooling
+from oracle.weblogic.deploy.util import PyOrderedDict
+
+# python classes from weblogic-deploy-tooling
+from wlsdeploy.util.model_translator import FileToPython
+
+# python classes from weblogic-deploy-tooling-ct
+from wlsdeploy.testing.common.model_stream_reader import ModelStreamReader
+from wlsdeploy.testing.compare.model_comparer import ModelComparer
+
+_MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resources', 'models')
+_EXPECTED_MODEL_FILE = os.path.join(_MODELS_DIR, 'sample-expected-model.yaml')
+_ACTUAL_MODEL_FILE = os.path.join(_MODELS_DIR, 'sample-actual-model.json')
+
+# The messages with timings in them, which are different from run to run
+_TIMING_RESOURCE_IDS = ['WLSDPLY-09932']
+
+
+class ModelStreamReaderTestCase(unittest.TestCase):
+    """
+    Checks that reading the sample models a leaf at a time, with the ModelStreamReader
+    that compare_model_files() uses, gives the same results as reading them with the
+    FileToPython that compare_models() gets its model dictionaries from.
+    """
+
+    def testReadSampleModels(self):
+        for model_file in [_EXPECTED_MODEL_FILE, _ACTUAL_MODEL_FILE]:
+            parsed_model_dict = FileToPython(model_file, True).parse()
+            streamed_model_dict = _read_model_stream(model_file)
+
+            results = ModelComparer().compare_models(parsed_model_dict, streamed_model_dict)
+            self.assertEqual(results.get_errors_count(), 0, 'errors for %s: %s' % (model_file, results))
+            self.assertEqual(results.get_warnings_count(), 0, 'warnings for %s: %s' % (model_file, results))
+
+    def testCompareSampleModels(self):
+        model_comparer = ModelComparer()
+        model_comparer.compare_models(FileToPython(_EXPECTED_MODEL_FILE, True).parse(),
+                                      FileToPython(_ACTUAL_MODEL_FILE, True).parse())
+        parsed_lines = _get_results_lines(model_comparer)
+
+        model_comparer = ModelComparer()
+        model_comparer.compare_model_files(_EXPECTED_MODEL_FILE, _ACTUAL_MODEL_FILE)
+        streamed_lines = _get_results_lines(model_comparer)
+
+        self.assertNotEqual(len(parsed_lines), 0)
+        self.assertEqual(parsed_lines, streamed_lines)
+
+
+def _read_model_stream(model_file):
+    """
+    Returns the model dictionary built from the leaves the ModelStreamReader returns.
+    """
+    model_dict = PyOrderedDict()
+    reader = ModelStreamReader(model_file)
+    try:
+        for names, value in reader:
+            folder_dict = model_dict
+            for name in names[:-1]:
+                if name not in folder_dict:
+                    folder_dict[name] = PyOrderedDict()
+                folder_dict = folder_dict[name]
+            folder_dict[names[-1]] = value
+    finally:
+        reader.close()
+    return model_dict
+
+
+def _get_results_lines(model_comparer):
+    """
+    Returns the sorted lines of the results file of a comparison, without the
+    messages with timings in them. The messages of compare_model_files() are in
+    the order the folders were read, so only the sorted lines can be compared.
+    """
+    results_file = JFile.createTempFile('compare-results', '.json')
+    try:
+        model_comparer.write_compare_results(results_file.getAbsolutePath())
+        lines = []
+        results = open(results_file.getAbsolutePath())
+        try:
+            for line in results.readlines():
+                timing_line = False
+                for resource_id in _TIMING_RESOURCE_IDS:
+                    if '"%s"' % resource_id in line:
+                        timing_line = True
+                if not timing_line:
+                    lines.append(line)
+        finally:
+            results.close()
+    finally:
+        results_file.delete()
+    lines.sort()
+    return lines
+
+
+if __name__ == '__main__':
+    unittest.main()
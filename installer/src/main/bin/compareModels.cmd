@@ -51,6 +51,32 @@
 @rem                                       are always written to the compareModels.log log, so
 @rem                                       this argument is optional.
 @rem
+@rem     - -fingerprint_file               A file to keep the fingerprints of the model folders, and
+@rem                                       the results for them, in. The folders that didn't change in
+@rem                                       either model since the last comparison reuse the stored
+@rem                                       results, and the file is updated. This argument is optional.
+@rem
+@rem     - -stream_models                  Flag indicating to compare the model files a folder at a time,
+@rem                                       without reading either of them into memory first. This argument
+@rem                                       is optional and has no value.
+@rem
+@rem     - -compare_manifest_file          A .json/.yaml file listing the pairs of expected and actual
+@rem                                       model files to compare, in one run. When this argument, or
+@rem                                       -expected_models_dir, is used, the -expected_model_file and
+@rem                                       -actual_model_file arguments are not required.
+@rem
+@rem     - -expected_models_dir            A directory of expected model files. Each one is compared to
+@rem                                       the file with the same name in the -actual_models_dir directory.
+@rem
+@rem     - -actual_models_dir              A directory of actual model files.
+@rem
+@rem     - -compare_results_dir            The directory the results file for each pair, and the
+@rem                                       compare-summary.jsonl file, are written to. This argument is
+@rem                                       required when comparing more than one pair.
+@rem
+@rem     - -compare_threads                The number of pairs to compare at the same time. Defaults to
+@rem                                       the number of available processors.
+@rem
 @rem     - -wlst_path                      The path to the Oracle Home product directory where the
 @rem                                       wlst.cmd script is located. This argument is only needed
 @rem                                       for pre-12.2.1 upper stack products like SOA.
@@ -118,6 +144,8 @@ SET ORACLE_HOME=
 SET EXPECTED_MODEL_FILE=
 SET ACTUAL_MODEL_FILE=
 SET COMPARE_RESULTS_FILE=
+SET COMPARE_MANIFEST_FILE=
+SET EXPECTED_MODELS_DIR=
 SET WLST_PATH_DIR=
 SET MIN_JDK_VERSION=7
 
@@ -151,6 +179,16 @@ IF "%1" == "-compare_results_file" (
   SHIFT
   GOTO arg_continue
 )
+IF "%1" == "-compare_manifest_file" (
+  SET COMPARE_MANIFEST_FILE=%2
+  SHIFT
+  GOTO arg_continue
+)
+IF "%1" == "-expected_models_dir" (
+  SET EXPECTED_MODELS_DIR=%2
+  SHIFT
+  GOTO arg_continue
+)
 IF "%1" == "-wlst_path" (
   SHIFT
   GOTO arg_continue
@@ -205,6 +243,12 @@ IF "%ORACLE_HOME%" == "" (
   SET RETURN_CODE=99
   GOTO usage
 )
+@rem
+@rem The model files are only required when a single pair of models is compared.
+@rem The underlying WLST script verifies the batch arguments.
+@rem
+IF NOT "%COMPARE_MANIFEST_FILE%" == "" GOTO model_files_checked
+IF NOT "%EXPECTED_MODELS_DIR%" == "" GOTO model_files_checked
 IF "%EXPECTED_MODEL_FILE%" == "" (
   ECHO Required argument EXPECTED_MODEL_FILE not provided >&2
   SET RETURN_CODE=99
@@ -215,6 +259,7 @@ IF "%ACTUAL_MODEL_FILE%" == "" (
   SET RETURN_CODE=99
   GOTO usage
 )
+:model_files_checked
 IF NOT "%COMPARE_RESULTS_FILE%" == "" (
   FOR %%F in (%COMPARE_RESULTS_FILE%) do set dirname=%%~dpF
   copy /Y NUL "%dirname%\.writable" > NUL 2>&1 && set WRITEOK=1
@@ -379,6 +424,14 @@ ECHO              -actual_model_file ^<actual-model-file^>
 ECHO              [-expected_model_overrides_file ^<expected-model-overrides-file^>]
 ECHO              [-actual_model_overrides_file ^<actual-model-overrides-file^>]
 ECHO              [-compare_results_file ^<compare-results-file^>]
+ECHO              [-fingerprint_file ^<fingerprint-file^>]
+ECHO              [-stream_models]
+ECHO.
+ECHO    or: %~nx0 -oracle_home ^<oracle-home^>
+ECHO              -compare_manifest_file ^<compare-manifest-file^> ^| -expected_models_dir ^<expected-models-dir^>
+ECHO                                                                -actual_models_dir ^<actual-models-dir^>
+ECHO              -compare_results_dir ^<compare-results-dir^>
+ECHO              [-compare_threads ^<compare-threads^>]
 ECHO              [-java_home ^<java-home^>]
 ECHO              [-wlst_path ^<wlst-path^>]
 ECHO.
@@ -408,6 +461,27 @@ ECHO.
 ECHO         compare-results-file           - The file to write the comparison results to. Results
 ECHO                                          are always written to the compareModels.log log.
 ECHO.
+ECHO         fingerprint-file               - A file to keep the fingerprints of the model folders, and the
+ECHO                                          results for them, in. The folders that didn't change in either
+ECHO                                          model since the last comparison reuse the stored results.
+ECHO.
+ECHO         -stream_models                 - Compare the model files a folder at a time, without reading
+ECHO                                          either of them into memory first.
+ECHO.
+ECHO         compare-manifest-file          - A .json/.yaml file listing the pairs of expected and actual
+ECHO                                          model files to compare, in one run.
+ECHO.
+ECHO         expected-models-dir            - A directory of expected model files. Each one is compared to the
+ECHO                                          file with the same name in actual-models-dir.
+ECHO.
+ECHO         actual-models-dir              - A directory of actual model files.
+ECHO.
+ECHO         compare-results-dir            - The directory to write the results file for each pair, plus
+ECHO                                          the compare-summary.jsonl file, to.
+ECHO.
+ECHO         compare-threads                - The number of pairs to compare at the same time. Defaults
+ECHO                                          to the number of available processors.
+ECHO.
 ECHO         java-home                      - the Java Home to use with testing tool. Defaults to the
 ECHO                                          value of the JAVA_HOME environment variable, if not provided.
 ECHO.
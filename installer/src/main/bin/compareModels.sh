@@ -48,6 +48,32 @@
 #                                          are always written to the compareModels.log log, so
 #                                          this argument is optional.
 #
+#        - -fingerprint_file               A file to keep the fingerprints of the model folders, and
+#                                          the results for them, in. The folders that didn't change in
+#                                          either model since the last comparison reuse the stored
+#                                          results, and the file is updated. This argument is optional.
+#
+#        - -stream_models                  Flag indicating to compare the model files a folder at a time,
+#                                          without reading either of them into memory first. This argument
+#                                          is optional and has no value.
+#
+#        - -compare_manifest_file          A .json/.yaml file listing the pairs of expected and actual
+#                                          model files to compare, in one run. When this argument, or
+#                                          -expected_models_dir, is used, the -expected_model_file and
+#                                          -actual_model_file arguments are not required.
+#
+#        - -expected_models_dir            A directory of expected model files. Each one is compared to
+#                                          the file with the same name in the -actual_models_dir directory.
+#
+#        - -actual_models_dir              A directory of actual model files.
+#
+#        - -compare_results_dir            The directory the results file for each pair, and the
+#                                          compare-summary.jsonl file, are written to. This argument is
+#                                          required when comparing more than one pair.
+#
+#        - -compare_threads                The number of pairs to compare at the same time. Defaults to
+#                                          the number of available processors.
+#
 #        - -wlst_path                      The path to the Oracle Home product directory under
 #                                          which to find the wlst.sh script.  This is only
 #                                          needed for pre-12.2.1 upper stack products like SOA.
@@ -80,6 +106,14 @@ usage() {
   echo "          [-expected_model_overrides_file <expected-model-overrides-file>]"
   echo "          [-actual_model_overrides_file <actual-model-overrides-file>]"
   echo "          [-compare_results_file <compare-results-file>]"
+  echo "          [-fingerprint_file <fingerprint-file>]"
+  echo "          [-stream_models]"
+  echo ""
+  echo "   or: $1 -oracle_home <oracle-home>"
+  echo "          -compare_manifest_file <compare-manifest-file> | -expected_models_dir <expected-models-dir>"
+  echo "                                                            -actual_models_dir <actual-models-dir>"
+  echo "          -compare_results_dir <compare-results-dir>"
+  echo "          [-compare_threads <compare-threads>]"
   echo "          [-java_home <java-home>]"
   echo "          [-wlst_path <wlst-path>]"
   echo ""
@@ -109,6 +143,27 @@ usage() {
   echo "       compare-results-file           - The file to write the comparison results to. Results"
   echo "                                        are always written to the compareModels.log log."
   echo ""
+  echo "       fingerprint-file               - A file to keep the fingerprints of the model folders, and the"
+  echo "                                        results for them, in. The folders that didn't change in either"
+  echo "                                        model since the last comparison reuse the stored results."
+  echo ""
+  echo "       -stream_models                 - Compare the model files a folder at a time, without reading"
+  echo "                                        either of them into memory first."
+  echo ""
+  echo "       compare-manifest-file          - A .json/.yaml file listing the pairs of expected and actual"
+  echo "                                        model files to compare, in one run."
+  echo ""
+  echo "       expected-models-dir            - A directory of expected model files. Each one is compared to the"
+  echo "                                        file with the same name in actual-models-dir."
+  echo ""
+  echo "       actual-models-dir              - A directory of actual model files."
+  echo ""
+  echo "       compare-results-dir            - The directory to write the results file for each pair, plus"
+  echo "                                        the compare-summary.jsonl file, to."
+  echo ""
+  echo "       compare-threads                - The number of pairs to compare at the same time. Defaults"
+  echo "                                        to the number of available processors."
+  echo ""
   echo "       java-home                      - The Java Home to use with testing tool. Defaults to the"
   echo "                                        value of the JAVA_HOME environment variable, if not provided."
   echo ""
@@ -217,6 +272,14 @@ while [[ $# > 1 ]]; do
         -compare_results_file)
         shift
         ;;
+        -compare_manifest_file)
+        COMPARE_MANIFEST_FILE="$2"
+        shift
+        ;;
+        -expected_models_dir)
+        EXPECTED_MODELS_DIR="$2"
+        shift
+        ;;
         -wlst_path)
         WLST_PATH_DIR="$2"
         shift
@@ -241,22 +304,28 @@ elif [ ! -d ${ORACLE_HOME} ]; then
     exit 98
 fi
 
-if [ "${EXPECTED_MODEL_FILE}" = "" ]; then
-    echo "Required argument EXPECTED_MODEL_FILE not provided" >&2
-    usage `basename $0`
-    exit 99
-elif [ ! -f ${EXPECTED_MODEL_FILE} ]; then
-    echo "The specified EXPECTED_MODEL_FILE does not exist: ${EXPECTED_MODEL_FILE}" >&2
-    exit 98
-fi
+#
+# The model files are only required when a single pair of models is compared.
+# The underlying WLST script verifies the batch arguments.
+#
+if [ "${COMPARE_MANIFEST_FILE}" = "" ] && [ "${EXPECTED_MODELS_DIR}" = "" ]; then
+    if [ "${EXPECTED_MODEL_FILE}" = "" ]; then
+        echo "Required argument EXPECTED_MODEL_FILE not provided" >&2
+        usage `basename $0`
+        exit 99
+    elif [ ! -f ${EXPECTED_MODEL_FILE} ]; then
+        echo "The specified EXPECTED_MODEL_FILE does not exist: ${EXPECTED_MODEL_FILE}" >&2
+        exit 98
+    fi
 
-if [ "${ACTUAL_MODEL_FILE}" = "" ]; then
-    echo "Required argument ACTUAL_MODEL_FILE not provided" >&2
-    usage `basename $0`
-    exit 99
-elif [ ! -f ${ACTUAL_MODEL_FILE} ]; then
-    echo "The specified ACTUAL_MODEL_FILE does not exist: ${ACTUAL_MODEL_FILE}" >&2
-    exit 98
+    if [ "${ACTUAL_MODEL_FILE}" = "" ]; then
+        echo "Required argument ACTUAL_MODEL_FILE not provided" >&2
+        usage `basename $0`
+        exit 99
+    elif [ ! -f ${ACTUAL_MODEL_FILE} ]; then
+        echo "The specified ACTUAL_MODEL_FILE does not exist: ${ACTUAL_MODEL_FILE}" >&2
+        exit 98
+    fi
 fi
 
 if [ "${COMPARE_RESULTS_FILE}" != "" ]; then
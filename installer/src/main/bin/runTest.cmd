@@ -35,7 +35,26 @@
 @rem                                        system-test
 @rem
 @rem     - -test_def_file               The JSON file containing the definition of the
-@rem                                    test to run. This argument is required.
+@rem                                    test to run. This argument is required, unless
+@rem                                    -test_def_dir or -test_suite is used.
+@rem
+@rem     - -test_def_dir                A directory to search, recursively, for the test
+@rem                                    definition files of a suite of tests to run.
+@rem
+@rem     - -test_suite                  A JSON file with a "test_defs" list, naming the test
+@rem                                    definition files of a suite of tests to run.
+@rem
+@rem     - -test_results_dir            The directory to write the results of each test in a
+@rem                                    suite to. This argument is required, when -test_def_dir
+@rem                                    or -test_suite is used.
+@rem
+@rem     - -test_threads                Optional maximum number of tests in a suite to run at
+@rem                                    the same time. The default is 1, unless the tool
+@rem                                    daemon is enabled.
+@rem
+@rem     - -test_trace_file             Optional file to write the wall time, CPU time, allocated
+@rem                                    bytes and peak heap of each stage and step to, as a
+@rem                                    Chrome trace-event JSON file.
 @rem
 @rem     - -test_def_overrides_file     A properties file containing the properties to use for
 @rem                                    variables specified in values, in the test_def_file.
@@ -124,6 +143,8 @@ IF "%~1" == "" (
 SET ORACLE_HOME=
 SET TEST_TYPE=
 SET TEST_DEF_FILE=
+SET TEST_DEF_DIR=
+SET TEST_SUITE=
 SET WLST_PATH_DIR=
 SET MIN_JDK_VERSION=7
 
@@ -152,6 +173,28 @@ IF "%1" == "-test_def_file" (
   SHIFT
   GOTO arg_continue
 )
+IF "%1" == "-test_def_dir" (
+  SET TEST_DEF_DIR=%2
+  SHIFT
+  GOTO arg_continue
+)
+IF "%1" == "-test_suite" (
+  SET TEST_SUITE=%2
+  SHIFT
+  GOTO arg_continue
+)
+IF "%1" == "-test_results_dir" (
+  SHIFT
+  GOTO arg_continue
+)
+IF "%1" == "-test_threads" (
+  SHIFT
+  GOTO arg_continue
+)
+IF "%1" == "-test_trace_file" (
+  SHIFT
+  GOTO arg_continue
+)
 IF "%1" == "-test_def_overrides_file" (
   SHIFT
   GOTO arg_continue
@@ -226,7 +269,7 @@ IF "%TEST_TYPE%" == "" (
   SET RETURN_CODE=99
   GOTO usage
 )
-IF "%TEST_DEF_FILE%" == "" (
+IF "%TEST_DEF_FILE%%TEST_DEF_DIR%%TEST_SUITE%" == "" (
   ECHO Required argument TEST_DEF_FILE not provided >&2
   SET RETURN_CODE=99
   GOTO usage
@@ -322,6 +365,9 @@ SET "WLST_PROPERTIES=-Djava.util.logging.config.class=%LOG_CONFIG_CLASS% %WLST_P
 SET "WLST_PROPERTIES=%WLST_PROPERTIES% %WLSDEPLOY_PROPERTIES%"
 SET WLST_ARGS=-skipWLSModuleScanning
 
+@rem The tool daemon starts its workers with the same WLST script
+SET "WLSDEPLOY_TESTING_WLST=%WLST%"
+
 IF NOT DEFINED WLSDEPLOY_LOG_PROPERTIES (
   SET WLSDEPLOY_LOG_PROPERTIES=%WLSDEPLOY_HOME%\etc\logging.properties
 )
@@ -377,7 +423,11 @@ ECHO.
 ECHO Usage: %~nx0 [-help]
 ECHO              -oracle_home ^<oracle-home^>
 ECHO              -test_type ^<test-type^>
-ECHO              -test_def_file ^<test-def-file^>
+ECHO              -test_def_file ^<test-def-file^> ^|
+ECHO              -test_def_dir ^<test-def-dir^> -test_results_dir ^<test-results-dir^> ^|
+ECHO              -test_suite ^<test-suite-file^> -test_results_dir ^<test-results-dir^>
+ECHO              [-test_threads ^<test-threads^>]
+ECHO              [-test_trace_file ^<test-trace-file^>]
 ECHO              [-test_def_overrides_file ^<test-def-overrides-file^>]
 ECHO              [-test_def_verifier_name ^<verification-test-name^>]
 ECHO              [-test_def_metadata_file ^<test-def-metadata-file^>]
@@ -397,6 +447,19 @@ ECHO                                           system-test
 ECHO.
 ECHO         test-def-file               - The test definition file for the test to run.
 ECHO.
+ECHO         test-def-dir                - A directory to search, recursively, for the test
+ECHO                                       definition files of a suite of tests to run.
+ECHO.
+ECHO         test-suite-file             - A JSON file with a test_defs list, naming the test
+ECHO                                       definition files of a suite of tests to run.
+ECHO.
+ECHO         test-results-dir            - The directory to write the results of each test in
+ECHO                                       the suite to.
+ECHO.
+ECHO         test-threads                - The maximum number of tests in the suite to run at
+ECHO                                       the same time. The default is 1, unless the tool
+ECHO                                       daemon is enabled.
+ECHO.
 ECHO         test-def-overrides-file     - A properties file containing the properties to use for
 ECHO                                       variables specified in values, in the test-def-file.
 ECHO.
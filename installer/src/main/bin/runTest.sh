@@ -30,7 +30,26 @@
 #                                        system-test   
 #   
 #     - -test_def_file               The JSON file containing the definition of the
-#                                    test to run. This argument is required.
+#                                    test to run. This argument is required, unless
+#                                    -test_def_dir or -test_suite is used.
+#
+#     - -test_def_dir                A directory to search, recursively, for the test
+#                                    definition files of a suite of tests to run.
+#
+#     - -test_suite                  A JSON file with a "test_defs" list, naming the test
+#                                    definition files of a suite of tests to run.
+#
+#     - -test_results_dir            The directory to write the results of each test in a
+#                                    suite to. This argument is required, when -test_def_dir
+#                                    or -test_suite is used.
+#
+#     - -test_threads                Optional maximum number of tests in a suite to run at
+#                                    the same time. The default is 1, unless the tool
+#                                    daemon is enabled.
+#
+#     - -test_trace_file             Optional file to write the wall time, CPU time, allocated
+#                                    bytes and peak heap of each stage and step to, as a
+#                                    Chrome trace-event JSON file.
 #   
 #     - -test_def_overrides_file     A properties file containing the properties to use for
 #                                    variables specified in values, in the test_def_file.
@@ -81,7 +100,11 @@ usage() {
   echo "Usage: $1 [-help]"
   echo "          -oracle_home <oracle-home>"
   echo "          -test_type <test-type>"
-  echo "          -test_def_file <test-def-file>"
+  echo "          -test_def_file <test-def-file> |"
+  echo "          -test_def_dir <test-def-dir> -test_results_dir <test-results-dir> |"
+  echo "          -test_suite <test-suite-file> -test_results_dir <test-results-dir>"
+  echo "          [-test_threads <test-threads>]"
+  echo "          [-test_trace_file <test-trace-file>]"
   echo "          [-test_def_overrides_file <test-def-overrides-file>]"
   echo "          [-test_def_verifier_name <verification-test-name>]"
   echo "          [-test_def_metadata_file <test-def-metadata-file>]"
@@ -101,6 +124,19 @@ usage() {
   echo ""
   echo "        test-def-file               - The test definition file for the test to run."
   echo ""
+  echo "        test-def-dir                - A directory to search, recursively, for the test"
+  echo "                                      definition files of a suite of tests to run."
+  echo ""
+  echo "        test-suite-file             - A JSON file with a test_defs list, naming the test"
+  echo "                                      definition files of a suite of tests to run."
+  echo ""
+  echo "        test-results-dir            - The directory to write the results of each test in"
+  echo "                                      the suite to."
+  echo ""
+  echo "        test-threads                - The maximum number of tests in the suite to run at"
+  echo "                                      the same time. The default is 1, unless the tool"
+  echo "                                      daemon is enabled."
+  echo ""
   echo "        test-def-overrides-file     - A properties file containing the properties to use for"
   echo "                                      variables specified in values, in the test-def-file."
   echo ""
@@ -223,6 +259,23 @@ while [[ $# > 1 ]]; do
         TEST_DEF_FILE="$2"
         shift
         ;;
+        -test_def_dir)
+        TEST_DEF_DIR="$2"
+        shift
+        ;;
+        -test_suite)
+        TEST_SUITE="$2"
+        shift
+        ;;
+        -test_results_dir)
+        shift
+        ;;
+        -test_threads)
+        shift
+        ;;
+        -test_trace_file)
+        shift
+        ;;
         -test_def_overrides_file)
         shift
         ;;
@@ -264,13 +317,25 @@ if [ "${TEST_TYPE}" = "" ]; then
     exit 99
 fi
 
-if [ "${TEST_DEF_FILE}" = "" ]; then
+if [ "${TEST_DEF_FILE}" != "" ]; then
+    if [ ! -f ${TEST_DEF_FILE} ]; then
+        echo "The specified TEST_DEF_FILE does not exist: ${TEST_DEF_FILE}" >&2
+        exit 98
+    fi
+elif [ "${TEST_DEF_DIR}" != "" ]; then
+    if [ ! -d ${TEST_DEF_DIR} ]; then
+        echo "The specified TEST_DEF_DIR does not exist: ${TEST_DEF_DIR}" >&2
+        exit 98
+    fi
+elif [ "${TEST_SUITE}" != "" ]; then
+    if [ ! -f ${TEST_SUITE} ]; then
+        echo "The specified TEST_SUITE does not exist: ${TEST_SUITE}" >&2
+        exit 98
+    fi
+else
     echo "Required argument TEST_DEF_FILE not provided" >&2
     usage `basename $0`
     exit 99
-elif [ ! -f ${TEST_DEF_FILE} ]; then
-    echo "The specified TEST_DEF_FILE does not exist: ${TEST_DEF_FILE}" >&2
-    exit 98
 fi
 
 #
@@ -338,6 +403,9 @@ WLST_PROPERTIES="-Djava.util.logging.config.class=${LOG_CONFIG_CLASS} ${WLST_PRO
 WLST_ARGS=-skipWLSModuleScanning
 export WLST_PROPERTIES
 
+# The tool daemon starts its workers with the same WLST script
+WLSDEPLOY_TESTING_WLST=${WLST}; export WLSDEPLOY_TESTING_WLST
+
 if [ "${WLSDEPLOY_LOG_PROPERTIES}" = "" ]; then
     WLSDEPLOY_LOG_PROPERTIES=${WLSDEPLOY_HOME}/etc/logging.properties; export WLSDEPLOY_LOG_PROPERTIES
 fi